@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Live monitor for a running proof campaign.
+
+Tails every passport_*_output.log in one or more proofs directories by
+offset (only bytes appended since the last poll are read), tracks each job's
+phase from the markers the provers print, samples the current RSS of the
+running prover from /proc, and estimates campaign throughput and ETA from the
+jobs that have finished.
+
+Usage:
+    python3 campaign_monitor.py <proofs_dir> [<proofs_dir> ...] [--total N | --inputs DIR] [--interval 2]
+
+Example:
+    python3 campaign_monitor.py vimz/image_converter/blur/proofs_server_hd --inputs vimz/image_converter/blur/outputs_hd
+    python3 campaign_monitor.py veritas/benchmark/crop/proofs --total 50 --once
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import compressed_io
+from time_stats import parse_wall_clock
+
+
+# (marker, phase entered) in the order the provers print them
+PHASE_MARKERS = [
+    # VIMz
+    ('Running NOVA', 'key generation'),
+    ('Creating a RecursiveSNARK', 'RecursiveSNARK'),
+    ('Verifying a RecursiveSNARK', 'RecursiveSNARK verify'),
+    ('Generating a CompressedSNARK', 'CompressedSNARK prove'),
+    ('Verifying a CompressedSNARK', 'CompressedSNARK verify'),
+    # Veritas
+    ('Running `', 'circuit build'),
+    ('Circuit build took', 'proof generation'),
+    ('Proof generation took', 'verification'),
+    ('Verification took', 'finishing'),
+    # /usr/bin/time statistics are printed once the prover has exited
+    ('Command being timed', 'finishing'),
+]
+
+CLOCK_TICKS = os.sysconf('SC_CLK_TCK') if hasattr(os, 'sysconf') else 100
+
+
+def boot_time() -> float:
+    try:
+        with open('/proc/stat') as f:
+            for line in f:
+                if line.startswith('btime'):
+                    return float(line.split()[1])
+    except OSError:
+        pass
+    return 0.0
+
+
+class JobTail:
+    """Incremental reader and phase tracker for one *_output.log."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.name = path.name[:-len('_output.log')]
+        self.offset = 0
+        self.partial = ''
+        self.phase = 'starting'
+        self.first_seen = time.time()
+        self.started_at: Optional[float] = None
+        self.finished = False
+        self.exit_status: Optional[int] = None
+        self.wall_clock_s: Optional[float] = None
+        self.peak_memory_kb: Optional[int] = None
+        self.rss_kb: Optional[int] = None
+        self.pids: List[int] = []
+
+    def poll(self):
+        """Read and parse whatever was appended since the last poll."""
+        try:
+            size = self.path.stat().st_size
+        except OSError:
+            return
+        if size < self.offset:
+            # Truncated: the job was restarted
+            self.__init__(self.path)
+        if size == self.offset:
+            return
+        with open(self.path, 'rb') as f:
+            f.seek(self.offset)
+            chunk = f.read(size - self.offset)
+        self.offset = size
+
+        lines = (self.partial + chunk.decode('utf-8', errors='replace')).split('\n')
+        self.partial = lines.pop()
+        for line in lines:
+            self.parse_line(line.strip())
+
+    def parse_line(self, line: str):
+        for marker, phase in PHASE_MARKERS:
+            if line.startswith(marker):
+                self.phase = phase
+                return
+        if line.startswith('Elapsed (wall clock) time'):
+            self.wall_clock_s = parse_wall_clock(line.rsplit(': ', 1)[1])
+        elif line.startswith('Maximum resident set size (kbytes):'):
+            self.peak_memory_kb = int(line.split(':', 1)[1])
+        elif line.startswith('Exit status:'):
+            self.exit_status = int(line.split(':', 1)[1])
+            self.finished = True
+            self.phase = 'done' if self.exit_status == 0 else 'failed'
+        elif line.startswith('Command terminated by signal'):
+            self.finished = True
+            self.phase = 'killed'
+
+    def elapsed(self, now: float) -> float:
+        if self.finished and self.wall_clock_s is not None:
+            return self.wall_clock_s
+        return now - (self.started_at or self.first_seen)
+
+
+def find_prover_processes(jobs: List[JobTail]):
+    """
+    Attach running prover PIDs to jobs by matching the input file name on the
+    command line, and sample their RSS and start time from /proc.
+    """
+    running = {job.name: job for job in jobs if not job.finished}
+    for job in running.values():
+        job.rss_kb = None
+        job.pids = []
+    if not running:
+        return
+
+    btime = boot_time()
+    for entry in os.scandir('/proc'):
+        if not entry.name.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry.name}/cmdline', 'rb') as f:
+                cmdline = f.read().replace(b'\0', b' ').decode(errors='replace')
+            if '/usr/bin/time' in cmdline.split(' ', 1)[0]:
+                continue
+            job = next((j for name, j in running.items() if f'{name}.json' in cmdline), None)
+            if job is None:
+                continue
+            rss = None
+            with open(f'/proc/{entry.name}/status') as f:
+                for line in f:
+                    if line.startswith('VmRSS:'):
+                        rss = int(line.split()[1])
+                        break
+            with open(f'/proc/{entry.name}/stat') as f:
+                # starttime is field 22, counted after the parenthesized command name
+                fields = f.read().rsplit(')', 1)[1].split()
+                started = btime + int(fields[19]) / CLOCK_TICKS
+        except (OSError, ValueError, IndexError):
+            continue
+        job.pids.append(int(entry.name))
+        job.rss_kb = max(job.rss_kb or 0, rss or 0)
+        if btime and (job.started_at is None or started < job.started_at):
+            job.started_at = started
+
+
+def fmt_duration(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return '-'
+    seconds = int(seconds)
+    hours, rest = divmod(seconds, 3600)
+    minutes, seconds = divmod(rest, 60)
+    return f'{hours}:{minutes:02d}:{seconds:02d}' if hours else f'{minutes}:{seconds:02d}'
+
+
+def render(jobs: List[JobTail], total: Optional[int], now: float, started: float) -> str:
+    finished = [j for j in jobs if j.finished]
+    succeeded = [j for j in finished if j.exit_status == 0]
+    running = [j for j in jobs if not j.finished]
+
+    lines = [f"Campaign monitor  {time.strftime('%H:%M:%S')}  "
+             f"running={len(running)} done={len(succeeded)} failed={len(finished) - len(succeeded)}"
+             + (f" total={total}" if total else '')]
+
+    campaign_elapsed = now - started
+    if succeeded and campaign_elapsed > 0:
+        per_hour = len(succeeded) * 3600.0 / campaign_elapsed
+        median_wall = statistics.median(j.wall_clock_s for j in succeeded if j.wall_clock_s is not None) \
+            if any(j.wall_clock_s is not None for j in succeeded) else None
+        line = f"Throughput {per_hour:.1f} proofs/h, median job {fmt_duration(median_wall)}"
+        if total:
+            remaining = max(0, total - len(finished))
+            line += f", ETA {fmt_duration(remaining * 3600.0 / per_hour)} for {remaining} job(s)"
+        lines.append(line)
+
+    lines.append('')
+    lines.append(f"{'Job':<28} {'Phase':<24} {'Elapsed':>9} {'RSS GB':>8} {'Peak GB':>8}")
+    # Running jobs first, then the most recent finished ones
+    shown = running + sorted(finished, key=lambda j: j.path.stat().st_mtime, reverse=True)[:5]
+    for job in shown:
+        rss = f'{job.rss_kb / 1048576:.2f}' if job.rss_kb else '-'
+        peak = f'{job.peak_memory_kb / 1048576:.2f}' if job.peak_memory_kb else '-'
+        lines.append(f"{job.name:<28} {job.phase:<24} {fmt_duration(job.elapsed(now)):>9} {rss:>8} {peak:>8}")
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Live monitor for a running proof campaign')
+    parser.add_argument('proofs_dirs', nargs='+', help='Directories the batch script writes logs into')
+    parser.add_argument('--total', type=int, default=None, help='Jobs in the campaign (for the ETA)')
+    parser.add_argument('--inputs', default=None, help='Input JSON directory; its file count is the total')
+    parser.add_argument('--interval', type=float, default=2.0, help='Seconds between polls (default: 2)')
+    parser.add_argument('--once', action='store_true', help='Print one snapshot and exit')
+
+    args = parser.parse_args()
+
+    total = args.total
+    if total is None and args.inputs:
+        total = len(compressed_io.glob_files(args.inputs))
+
+    dirs = [Path(d) for d in args.proofs_dirs]
+    for d in dirs:
+        if not d.is_dir():
+            print(f"Error: Directory not found: {d}", file=sys.stderr)
+            sys.exit(1)
+
+    jobs: Dict[Path, JobTail] = {}
+    started = time.time()
+    interactive = sys.stdout.isatty() and not args.once
+    try:
+        while True:
+            for d in dirs:
+                for path in d.glob('*_output.log'):
+                    if path not in jobs:
+                        jobs[path] = JobTail(path)
+            for job in jobs.values():
+                job.poll()
+            find_prover_processes(list(jobs.values()))
+
+            known_starts = [j.started_at for j in jobs.values() if j.started_at]
+            known_starts += [j.path.stat().st_mtime - j.wall_clock_s
+                             for j in jobs.values() if j.finished and j.wall_clock_s is not None]
+            campaign_start = min(known_starts + [started])
+
+            output = render(sorted(jobs.values(), key=lambda j: j.name), total, time.time(), campaign_start)
+            if interactive:
+                # Clear the screen and redraw in place
+                sys.stdout.write('\033[H\033[2J')
+            print(output, flush=True)
+            if args.once:
+                break
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
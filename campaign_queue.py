@@ -0,0 +1,419 @@
+#!/usr/bin/env python3
+"""
+Distribute proof jobs across hosts through a shared queue directory.
+
+The queue is a directory on a filesystem every host can reach (NFS, sshfs, or
+a local path for a single box). Moves between states happen under an flock on
+<queue>/queue.lock, so any number of workers and one coordinator can share it:
+
+    <queue>/pending/<job>.json    waiting to be claimed
+    <queue>/claimed/<job>.json    claimed by a worker (claimed_by, claimed_at)
+    <queue>/done/<job>.json       finished, with the parsed metrics
+    <queue>/failed/<job>.json     exited non-zero or ran out of attempts
+    <queue>/workers/<id>.json     worker heartbeat and hardware metadata
+    <queue>/results/<backend>/<transformation>/proofs_<host>_<res>/
+                                  logs and proofs, laid out like the campaign
+                                  directories so the extract_*_metrics.py
+                                  scripts work on them unchanged
+
+Claimed jobs whose worker has not sent a heartbeat for --stale-after seconds
+are moved back to pending (up to --max-attempts). The coordinator exits once
+no job is pending or claimed and at least one has finished, so it can be
+started before the jobs are enqueued.
+
+Usage:
+    python3 campaign_queue.py enqueue <queue> --backend B --transformation T --inputs DIR|FILE ...
+    python3 campaign_queue.py worker <queue> [--threads N] [--cpus LIST] [--exit-when-empty]
+    python3 campaign_queue.py coordinator <queue> [--stale-after 120] [--output campaign_metrics.csv]
+    python3 campaign_queue.py status <queue>
+
+Example (single box, three workers):
+    python3 campaign_queue.py enqueue /tmp/q --backend veritas --transformation crop \\
+        --inputs veritas/benchmark/crop/outputs_hd
+    for i in 1 2 3; do python3 campaign_queue.py worker /tmp/q --worker-id w$i --threads 2 & done
+    python3 campaign_queue.py coordinator /tmp/q
+
+Workers sharing a box should get disjoint --cpus sets; `cpu_placement.py plan --jobs N`
+prints one per worker, split along NUMA nodes.
+"""
+
+import argparse
+import csv
+import fcntl
+import json
+import os
+import socket
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import compressed_io
+import cpu_placement
+import proof_runner
+
+
+STATES = ('pending', 'claimed', 'done', 'failed')
+
+DEFAULT_HEARTBEAT = 10
+DEFAULT_STALE_AFTER = 120
+DEFAULT_MAX_ATTEMPTS = 3
+
+
+@contextmanager
+def queue_lock(queue: Path):
+    """Exclusive lock on the queue for the duration of a state change."""
+    with open(queue / 'queue.lock', 'a') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def init_queue(queue: Path):
+    for name in STATES + ('workers', 'results'):
+        (queue / name).mkdir(parents=True, exist_ok=True)
+
+
+def read_json(path: Path) -> Dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def write_json(path: Path, data: Dict):
+    """Write via a temporary file so readers never see a partial file."""
+    # Unique per thread as well: the heartbeat thread and the main thread both write
+    tmp = path.with_name(f'.{path.name}.{os.getpid()}.{threading.get_ident()}.tmp')
+    with open(tmp, 'w') as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp, path)
+
+
+def job_id(backend: str, transformation: str, resolution: str, input_json: Path) -> str:
+    return f'{backend}-{transformation}-{resolution.lower()}-{compressed_io.input_stem(input_json)}'
+
+
+def cmd_enqueue(args):
+    queue = Path(args.queue)
+    init_queue(queue)
+
+    inputs = []
+    for item in args.inputs:
+        path = Path(item).resolve()
+        inputs += compressed_io.glob_files(path) if path.is_dir() else [path]
+    if not inputs:
+        print("Error: no JSON inputs found", file=sys.stderr)
+        sys.exit(1)
+
+    added = 0
+    with queue_lock(queue):
+        existing = {p.name for state in STATES for p in (queue / state).glob('*.json')}
+        for input_json in inputs:
+            jid = job_id(args.backend, args.transformation, args.resolution, input_json)
+            if f'{jid}.json' in existing:
+                continue
+            write_json(queue / 'pending' / f'{jid}.json', {
+                'id': jid,
+                'backend': args.backend,
+                'transformation': args.transformation,
+                'resolution': args.resolution,
+                'input_json': str(input_json),
+                'threads': args.threads,
+                'attempts': 0,
+                'enqueued_at': time.time(),
+            })
+            added += 1
+
+    print(f"✓ Enqueued {added} job(s) ({len(inputs) - added} already queued) in {queue}")
+
+
+def claim_job(queue: Path, worker_id: str) -> Optional[Dict]:
+    """Move the oldest pending job to claimed/ and return it."""
+    with queue_lock(queue):
+        for path in sorted((queue / 'pending').glob('*.json')):
+            job = read_json(path)
+            job.update({
+                'claimed_by': worker_id,
+                'claimed_at': time.time(),
+                'attempts': job.get('attempts', 0) + 1,
+            })
+            write_json(queue / 'claimed' / path.name, job)
+            path.unlink()
+            return job
+    return None
+
+
+def finish_job(queue: Path, worker_id: str, job: Dict, metrics: Dict) -> bool:
+    """
+    Record a finished job. Returns False if the job was re-queued while it ran
+    (the worker was considered dead), in which case the result is dropped.
+    """
+    claimed = queue / 'claimed' / f"{job['id']}.json"
+    with queue_lock(queue):
+        if not claimed.exists() or read_json(claimed).get('claimed_by') != worker_id:
+            return False
+        job['finished_at'] = time.time()
+        job['metrics'] = metrics
+        state = 'done' if metrics['exit_code'] == 0 else 'failed'
+        write_json(queue / state / claimed.name, job)
+        claimed.unlink()
+    return True
+
+
+class Heartbeat(threading.Thread):
+    """
+    Periodically rewrites workers/<id>.json while the worker is alive. The main
+    thread changes the state through update(), which holds the same lock as beat().
+    """
+
+    def __init__(self, queue: Path, worker_id: str, interval: float):
+        super().__init__(daemon=True)
+        self.path = queue / 'workers' / f'{worker_id}.json'
+        self.interval = interval
+        self.state = {
+            'worker_id': worker_id,
+            'pid': os.getpid(),
+            'started_at': time.time(),
+            'host': proof_runner.host_info(),
+            'current_job': None,
+            'jobs_done': 0,
+            'jobs_failed': 0,
+        }
+        self.stopped = threading.Event()
+        self.lock = threading.Lock()
+
+    def beat(self):
+        with self.lock:
+            self.state['heartbeat_at'] = time.time()
+            write_json(self.path, self.state)
+
+    def update(self, **changes):
+        """Change state fields and publish them right away."""
+        with self.lock:
+            self.state.update(changes)
+            self.state['heartbeat_at'] = time.time()
+            write_json(self.path, self.state)
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            try:
+                self.beat()
+            except Exception as e:
+                # A dead heartbeat thread makes the coordinator re-queue our running job
+                print(f"Warning: heartbeat failed: {e}", file=sys.stderr)
+
+    def stop(self):
+        self.stopped.set()
+        self.update(current_job=None, stopped_at=time.time())
+
+
+def cmd_worker(args):
+    queue = Path(args.queue)
+    init_queue(queue)
+    worker_id = args.worker_id or f'{socket.gethostname()}-{os.getpid()}'
+    host = args.host or socket.gethostname()
+
+    heartbeat = Heartbeat(queue, worker_id, args.heartbeat)
+    heartbeat.update(cpu_list=cpu_placement.format_cpulist(args.cpus) if args.cpus else None)
+    heartbeat.start()
+    pinned = f", pinned to {heartbeat.state['cpu_list']}" if args.cpus else ''
+    print(f"Worker {worker_id} ({host}, {heartbeat.state['host']['cpu_count']} cores{pinned}) polling {queue}")
+
+    processed = 0
+    try:
+        while args.max_jobs is None or processed < args.max_jobs:
+            job = claim_job(queue, worker_id)
+            if job is None:
+                if args.exit_when_empty:
+                    break
+                time.sleep(args.poll)
+                continue
+
+            heartbeat.update(current_job=job['id'])
+            print(f"[{worker_id}] {job['id']} (attempt {job['attempts']})")
+
+            output_dir = (queue / 'results' / job['backend'] / job['transformation']
+                          / f"proofs_{host}_{job['resolution'].lower()}")
+            metrics = proof_runner.run_proof(job['backend'], job['transformation'], Path(job['input_json']),
+                                             output_dir, job['resolution'], args.threads or job.get('threads'),
+                                             cpus=args.cpus)
+            metrics['worker_id'] = worker_id
+            metrics['host'] = host
+
+            if not finish_job(queue, worker_id, job, metrics):
+                print(f"  ! {job['id']} was re-queued while running, result dropped")
+            elif metrics['exit_code'] == 0:
+                heartbeat.update(jobs_done=heartbeat.state['jobs_done'] + 1)
+                print(f"  ✓ done in {metrics.get('wall_clock_s') or 0:.1f}s")
+            else:
+                heartbeat.update(jobs_failed=heartbeat.state['jobs_failed'] + 1)
+                print(f"  ✗ failed (exit code {metrics['exit_code']}), see {metrics['log_file']}")
+            heartbeat.update(current_job=None)
+            processed += 1
+    finally:
+        heartbeat.stop()
+
+    print(f"Worker {worker_id} exiting after {processed} job(s)")
+
+
+def requeue_stale(queue: Path, stale_after: float, max_attempts: int) -> List[str]:
+    """Move claimed jobs of silent workers back to pending (or failed)."""
+    now = time.time()
+    requeued = []
+    with queue_lock(queue):
+        for path in sorted((queue / 'claimed').glob('*.json')):
+            job = read_json(path)
+            worker_file = queue / 'workers' / f"{job.get('claimed_by')}.json"
+            try:
+                worker = read_json(worker_file)
+                last_seen = worker.get('heartbeat_at', 0)
+                # A worker that stopped cleanly no longer owns anything
+                alive = 'stopped_at' not in worker and now - last_seen <= stale_after
+            except (OSError, ValueError):
+                alive = now - job.get('claimed_at', 0) <= stale_after
+            if alive:
+                continue
+
+            job['requeued_from'] = job.pop('claimed_by', None)
+            job.pop('claimed_at', None)
+            if job.get('attempts', 0) >= max_attempts:
+                job['error'] = f"worker lost {job['attempts']} time(s)"
+                write_json(queue / 'failed' / path.name, job)
+            else:
+                write_json(queue / 'pending' / path.name, job)
+            path.unlink()
+            requeued.append(job['id'])
+    return requeued
+
+
+def queue_counts(queue: Path) -> Dict[str, int]:
+    return {state: len(list((queue / state).glob('*.json'))) for state in STATES}
+
+
+def print_status(queue: Path, stale_after: float):
+    counts = queue_counts(queue)
+    print(' '.join(f"{state}={count}" for state, count in counts.items()))
+    now = time.time()
+    for path in sorted((queue / 'workers').glob('*.json')):
+        try:
+            worker = read_json(path)
+        except (OSError, ValueError):
+            continue
+        age = now - worker.get('heartbeat_at', 0)
+        if 'stopped_at' in worker:
+            state = 'stopped'
+        else:
+            state = 'alive' if age <= stale_after else 'stale'
+        host = worker.get('host', {})
+        print(f"  {worker['worker_id']:<24} {state:<8} {host.get('hostname', '?'):<16} "
+              f"{host.get('cpu_count') or '?':>3} cores  done={worker.get('jobs_done', 0)} "
+              f"failed={worker.get('jobs_failed', 0)}  job={worker.get('current_job') or '-'}  "
+              f"last beat {age:.0f}s ago")
+
+
+def collect(queue: Path, output_file: Path) -> int:
+    """Merge the metrics of every finished job into one CSV."""
+    rows = []
+    for state in ('done', 'failed'):
+        for path in sorted((queue / state).glob('*.json')):
+            job = read_json(path)
+            row = {'job_id': job['id'], 'status': state, 'attempts': job.get('attempts')}
+            row.update(job.get('metrics') or {})
+            rows.append(row)
+    if not rows:
+        return 0
+
+    fieldnames = ['job_id', 'status', 'attempts']
+    for row in rows:
+        fieldnames += [k for k in row if k not in fieldnames]
+    with open(output_file, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow({k: ('' if row.get(k) is None else row[k]) for k in fieldnames})
+    return len(rows)
+
+
+def cmd_coordinator(args):
+    queue = Path(args.queue)
+    init_queue(queue)
+
+    while True:
+        for jid in requeue_stale(queue, args.stale_after, args.max_attempts):
+            print(f"! Re-queued stale job {jid}")
+        print(time.strftime('%H:%M:%S'), end=' ')
+        print_status(queue, args.stale_after)
+        counts = queue_counts(queue)
+        # A queue nothing has finished in yet has not been enqueued to, so keep waiting
+        finished = counts['done'] + counts['failed']
+        if counts['pending'] == 0 and counts['claimed'] == 0 and finished > 0:
+            break
+        time.sleep(args.interval)
+
+    count = collect(queue, Path(args.output))
+    print(f"✓ Campaign complete, {count} job(s) written to: {args.output}")
+
+
+def cmd_status(args):
+    print_status(Path(args.queue), args.stale_after)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Distribute proof jobs across hosts through a shared queue directory'
+    )
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    enqueue = subparsers.add_parser('enqueue', help='Add one job per input JSON')
+    enqueue.add_argument('queue', help='Queue directory')
+    enqueue.add_argument('--backend', '-b', choices=proof_runner.BACKENDS, required=True)
+    enqueue.add_argument('--transformation', '-t', required=True)
+    enqueue.add_argument('--inputs', '-i', nargs='+', required=True, help='Input JSON files or directories')
+    enqueue.add_argument('--resolution', '-r', default='HD', help='VIMz circuit resolution (default: HD)')
+    enqueue.add_argument('--threads', type=int, default=None,
+                         help='RAYON_NUM_THREADS for these jobs (default: worker setting)')
+    enqueue.set_defaults(func=cmd_enqueue)
+
+    worker = subparsers.add_parser('worker', help='Claim and run jobs until stopped')
+    worker.add_argument('queue', help='Queue directory')
+    worker.add_argument('--worker-id', default=None, help='Worker name (default: <hostname>-<pid>)')
+    worker.add_argument('--host', default=None,
+                        help='Host label for the proofs_<host>_<res> directory (default: hostname)')
+    worker.add_argument('--threads', type=int, default=None,
+                        help='RAYON_NUM_THREADS, overrides the job setting (default: all cores)')
+    worker.add_argument('--cpus', type=cpu_placement.parse_cpulist, default=None, metavar='LIST',
+                        help='Pin this worker\'s provers to these CPUs, e.g. 0-7 (see cpu_placement.py plan)')
+    worker.add_argument('--heartbeat', type=float, default=DEFAULT_HEARTBEAT,
+                        help=f'Heartbeat interval in seconds (default: {DEFAULT_HEARTBEAT})')
+    worker.add_argument('--poll', type=float, default=5, help='Seconds between polls when idle (default: 5)')
+    worker.add_argument('--max-jobs', type=int, default=None, help='Exit after this many jobs')
+    worker.add_argument('--exit-when-empty', action='store_true', help='Exit when no job is pending')
+    worker.set_defaults(func=cmd_worker)
+
+    coordinator = subparsers.add_parser('coordinator',
+                                        help='Re-queue stale jobs, report progress and merge results')
+    coordinator.add_argument('queue', help='Queue directory')
+    coordinator.add_argument('--stale-after', type=float, default=DEFAULT_STALE_AFTER,
+                             help=f'Seconds without heartbeat before a job is re-queued '
+                                  f'(default: {DEFAULT_STALE_AFTER})')
+    coordinator.add_argument('--max-attempts', type=int, default=DEFAULT_MAX_ATTEMPTS,
+                             help=f'Claims per job before it is marked failed (default: {DEFAULT_MAX_ATTEMPTS})')
+    coordinator.add_argument('--interval', type=float, default=10, help='Seconds between checks (default: 10)')
+    coordinator.add_argument('--output', '-o', default='campaign_metrics.csv',
+                             help='Merged metrics CSV (default: campaign_metrics.csv)')
+    coordinator.set_defaults(func=cmd_coordinator)
+
+    status = subparsers.add_parser('status', help='Show queue counts and workers')
+    status.add_argument('queue', help='Queue directory')
+    status.add_argument('--stale-after', type=float, default=DEFAULT_STALE_AFTER)
+    status.set_defaults(func=cmd_status)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,412 @@
+#!/usr/bin/env python3
+"""
+Predict sustained proofs/hour for a transformation mix on a machine with
+C cores and M GB of RAM, and recommend the concurrency / thread split.
+
+Each job class (backend, transformation, resolution) is characterized from the
+existing proofs_<host>_<res> directories:
+
+    cpu_s   user + system time from /usr/bin/time (single-thread work)
+    wall_s  elapsed wall clock
+    rss_gb  peak resident set size
+
+The observed parallelism cpu_s / wall_s of each proof on a host with N reference
+cores (the core count of the host that ran it, --reference-cores) gives an Amdahl
+serial fraction; f is their median, so a job with t threads takes cpu_s * (f + (1 - f) / t). --thread-scaling replaces
+the estimated f with the one thread_scaling.py measured; classes covered by it need
+no reference cores.
+
+k concurrent jobs share the C cores: each gets C // k threads and the C % k cores
+left over go one each to the first jobs. k * max(rss_gb) must stay <= M * headroom.
+
+Usage:
+    python3 capacity_planner.py --cores C --memory-gb M --mix <backend:transformation[:res]=weight> ...
+                                [--reference-cores [HOST=]N ...]
+
+Example:
+    python3 capacity_planner.py --cores 32 --memory-gb 64 --host server --reference-cores server=32 \\
+        --mix vimz:blur=1 veritas:crop=2
+    python3 capacity_planner.py --cores 8 --memory-gb 16 --reference-cores 8 --mix veritas:crop=1 \\
+        --calibrate veritas:crop=veritas/benchmark/crop/outputs_hd --calibrate-jobs 8
+"""
+
+import argparse
+import csv
+import json
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import compressed_io
+import cpu_placement
+import proof_runner
+from time_stats import parse_time_stats
+
+
+ROOT = Path(__file__).resolve().parent
+BENCHMARK_DIRS = {
+    'vimz': ROOT / 'vimz' / 'image_converter',
+    'veritas': ROOT / 'veritas' / 'benchmark',
+}
+
+# Fraction of physical RAM jobs may use; the rest is left for the OS and page cache
+DEFAULT_HEADROOM = 0.85
+
+
+def parse_job_class(spec: str) -> tuple:
+    """'backend:transformation[:resolution]' -> (backend, transformation, resolution)."""
+    parts = spec.split(':')
+    if len(parts) not in (2, 3) or parts[0] not in proof_runner.BACKENDS:
+        raise argparse.ArgumentTypeError(
+            f"Invalid job class '{spec}', expected backend:transformation[:resolution]"
+        )
+    resolution = parts[2].upper() if len(parts) == 3 else 'HD'
+    return parts[0], parts[1], resolution
+
+
+def parse_weighted(spec: str) -> tuple:
+    """'backend:transformation[:resolution]=value' -> (job class, value)."""
+    if '=' not in spec:
+        return parse_job_class(spec), '1'
+    key, value = spec.rsplit('=', 1)
+    return parse_job_class(key), value
+
+
+def load_profile(backend: str, transformation: str, resolution: str,
+                 host: Optional[str]) -> Optional[Dict[str, float]]:
+    """
+    Median cpu_s / wall_s and peak rss_gb for one job class from the
+    *_output.log files of its successful proofs (exit status 0), which carry
+    the /usr/bin/time -v statistics (Veritas writes them inline, VIMz appends
+    them). host=None merges every host.
+
+    'runs' holds (host, cpu_s, wall_s) per proof for the serial fraction.
+    """
+    base = BENCHMARK_DIRS[backend] / transformation
+    pattern = f'proofs_{host or "*"}_{resolution.lower()}'
+    samples = []
+    for proofs_dir in sorted(base.glob(pattern)):
+        # proofs_<host>_<res>
+        proofs_host = proofs_dir.name[len('proofs_'):].rsplit('_', 1)[0]
+        for log_file in compressed_io.glob_files(proofs_dir, 'passport_*_output.log'):
+            stats = parse_time_stats(compressed_io.read_text(log_file))
+            if None in (stats['user_time_s'], stats['system_time_s'],
+                        stats['wall_clock_s'], stats['peak_memory_kb']):
+                continue
+            # Failed proofs stop early or late and say nothing about a finished one
+            if stats['exit_status'] != 0 or stats['wall_clock_s'] <= 0:
+                continue
+            stats['host'] = proofs_host
+            samples.append(stats)
+
+    if not samples:
+        return None
+
+    return {
+        'samples': len(samples),
+        'cpu_s': statistics.median(s['user_time_s'] + s['system_time_s'] for s in samples),
+        'wall_s': statistics.median(s['wall_clock_s'] for s in samples),
+        'rss_gb': max(s['peak_memory_kb'] for s in samples) / (1024.0 * 1024.0),
+        'runs': [(s['host'], s['user_time_s'] + s['system_time_s'], s['wall_clock_s']) for s in samples],
+    }
+
+
+def serial_fraction(cpu_s: float, wall_s: float, reference_cores: int) -> float:
+    """Amdahl serial fraction from the speedup cpu_s / wall_s on reference_cores."""
+    speedup = max(1.0, cpu_s / wall_s)
+    if reference_cores <= 1:
+        return 1.0
+    fraction = (reference_cores / speedup - 1.0) / (reference_cores - 1.0)
+    return min(1.0, max(0.0, fraction))
+
+
+def reference_label(reference_cores: Dict[str, Optional[int]]) -> str:
+    """Distinct reference core counts of a job class, e.g. '8/32', or '-' when unknown."""
+    counts = sorted({cores for cores in reference_cores.values() if cores is not None})
+    return '/'.join(str(cores) for cores in counts) or '-'
+
+
+def load_thread_scaling(models_file: Path, host: Optional[str]) -> Dict[tuple, float]:
+    """
+    Measured serial fraction of the whole proof ("total" phase) per job class from a
+    thread_scaling.py models CSV. host=None takes the first host listed per class.
+    """
+    fractions = {}
+    with open(models_file, newline='') as f:
+        for row in csv.DictReader(f):
+            if row['phase'] != 'total' or (host and row['host'] != host):
+                continue
+            job = (row['backend'], row['transformation'], row['resolution'])
+            fractions.setdefault(job, float(row['serial_fraction']))
+    return fractions
+
+
+def predicted_wall(profile: Dict[str, float], threads: int) -> float:
+    """Predicted wall time of one job running with the given number of threads."""
+    f = profile['serial_fraction']
+    return profile['cpu_s'] * (f + (1.0 - f) / threads)
+
+
+def thread_split(cores: int, concurrency: int) -> List[int]:
+    """Threads of each concurrent job: cores // concurrency, plus one for the first cores % concurrency."""
+    threads, spare = divmod(cores, concurrency)
+    return [threads + 1] * spare + [threads] * (concurrency - spare)
+
+
+def plan(profiles: Dict[tuple, Dict], mix: Dict[tuple, float], cores: int,
+         memory_gb: float, headroom: float) -> List[Dict]:
+    """
+    Evaluate every concurrency level k (see thread_split) and return the
+    feasible candidates sorted by predicted proofs/hour, best first.
+    """
+    usable_gb = memory_gb * headroom
+    worst_rss = max(profiles[job]['rss_gb'] for job in mix)
+    total_weight = sum(mix.values())
+
+    candidates = []
+    for concurrency in range(1, cores + 1):
+        split = thread_split(cores, concurrency)
+        memory_needed = concurrency * worst_rss
+        # Each job slot completes 3600 / (mean wall time per proof under the mix) proofs an hour
+        proofs_per_hour = sum(
+            3600.0 * total_weight / sum(weight * predicted_wall(profiles[job], threads)
+                                        for job, weight in mix.items())
+            for threads in split
+        )
+        candidates.append({
+            'concurrency': concurrency,
+            'threads_per_job': split[-1],
+            'thread_split': split,
+            'mean_wall_s': concurrency * 3600.0 / proofs_per_hour,
+            'proofs_per_hour': proofs_per_hour,
+            'memory_needed_gb': memory_needed,
+            'fits_memory': memory_needed <= usable_gb,
+        })
+
+    feasible = [c for c in candidates if c['fits_memory']]
+    return sorted(feasible, key=lambda c: c['proofs_per_hour'], reverse=True)
+
+
+def calibrate(inputs: Dict[tuple, Path], mix: Dict[tuple, float], best: Dict,
+              jobs: int, output_dir: Path, pin: bool = False) -> Dict:
+    """
+    Run `jobs` proofs drawn from the mix with the recommended concurrency and
+    threads on this machine and measure the sustained throughput. pin gives each
+    concurrent job its own CPU set (cpu_placement.partition).
+    """
+    queue = []
+    files = {job: compressed_io.glob_files(inputs[job]) for job in mix}
+    for job, paths in files.items():
+        if not paths:
+            raise ValueError(f"No JSON inputs found in {inputs[job]}")
+    # Largest-remainder apportionment of the jobs across the mix weights
+    total_weight = sum(mix.values())
+    shares = {job: jobs * weight / total_weight for job, weight in mix.items()}
+    counts = {job: int(share) for job, share in shares.items()}
+    for job in sorted(shares, key=lambda j: shares[j] - counts[j], reverse=True)[:jobs - sum(counts.values())]:
+        counts[job] += 1
+    for job, count in counts.items():
+        for i in range(count):
+            queue.append((job, files[job][i % len(files[job])]))
+
+    if pin:
+        placements = cpu_placement.partition(best['concurrency'], best['threads_per_job'])
+        # partition() sizes every set alike; the spare CPUs go to the jobs planned with an extra thread
+        used = {cpu for placement in placements for cpu in placement['cpus']}
+        spare = [cpu for cpu in cpu_placement.allowed_cpus() if cpu not in used]
+        for placement, threads in zip(placements, best['thread_split']):
+            extra, spare = spare[:threads - placement['threads']], spare[threads - placement['threads']:]
+            if extra:
+                placement['cpus'] = sorted(placement['cpus'] + extra)
+                placement['cpu_list'] = cpu_placement.format_cpulist(placement['cpus'])
+                placement['numa_node'] = cpu_placement.node_of(placement['cpus'])
+                placement['threads'] = len(placement['cpus'])
+    else:
+        placements = [{'threads': threads} for threads in best['thread_split']]
+    slots = cpu_placement.SlotPool(placements)
+
+    def run(item):
+        (backend, transformation, resolution), input_json = item
+        job_dir = output_dir / f'{backend}_{transformation}_{resolution.lower()}'
+        with slots.slot() as placement:
+            if not pin:
+                return proof_runner.run_proof(backend, transformation, input_json, job_dir,
+                                              resolution, threads=placement['threads'])
+            return proof_runner.run_proof(backend, transformation, input_json, job_dir,
+                                          resolution, cpus=placement['cpus'])
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=best['concurrency']) as pool:
+        results = list(pool.map(run, queue))
+    elapsed = time.perf_counter() - start
+
+    succeeded = [r for r in results if r['exit_code'] == 0]
+    measured = len(succeeded) * 3600.0 / elapsed if elapsed > 0 else 0.0
+    return {
+        'jobs': len(queue),
+        'succeeded': len(succeeded),
+        'oom': sum(1 for r in results if r['oom']),
+        'pinned': pin,
+        'elapsed_s': elapsed,
+        'measured_proofs_per_hour': measured,
+        'predicted_proofs_per_hour': best['proofs_per_hour'],
+        'prediction_error': (best['proofs_per_hour'] - measured) / measured if measured else None,
+        'peak_memory_gb': max((r['peak_memory_kb'] or 0 for r in results), default=0) / (1024.0 * 1024.0),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Predict proofs/hour and recommend concurrency for a transformation mix'
+    )
+    parser.add_argument('--cores', '-c', type=int, default=os.cpu_count(),
+                        help='Target machine cores (default: this machine)')
+    parser.add_argument('--memory-gb', '-m', type=float, required=True,
+                        help='Target machine RAM in GB')
+    parser.add_argument('--mix', nargs='+', required=True, type=parse_weighted,
+                        help='Job classes with weights, e.g. vimz:blur=1 veritas:crop:HD=2')
+    parser.add_argument('--host', default=None,
+                        help='Use measurements from this host only (laptop, server; default: all)')
+    parser.add_argument('--reference-cores', nargs='+', default=[], metavar='[HOST=]N',
+                        help='Cores of the measuring host(s), e.g. server=32, or N for all hosts; '
+                             'required unless --thread-scaling covers every job class')
+    parser.add_argument('--headroom', type=float, default=DEFAULT_HEADROOM,
+                        help=f'Fraction of RAM jobs may use (default: {DEFAULT_HEADROOM})')
+    parser.add_argument('--thread-scaling', default=None, metavar='FILE',
+                        help='Serial fractions measured by thread_scaling.py report (thread_scaling_models.csv)')
+    parser.add_argument('--top', type=int, default=5, help='Candidates to show (default: 5)')
+    parser.add_argument('--calibrate', nargs='+', default=[], type=parse_weighted, metavar='CLASS=DIR',
+                        help='Input directory per job class; runs the recommendation locally')
+    parser.add_argument('--calibrate-jobs', type=int, default=None,
+                        help='Proofs to run during calibration (default: 2 x concurrency)')
+    parser.add_argument('--calibrate-output', default='calibration_proofs',
+                        help='Directory for calibration proofs and logs (default: calibration_proofs)')
+    parser.add_argument('--pin', action='store_true',
+                        help='Pin each calibration job to its own CPU set (see cpu_placement.py)')
+    parser.add_argument('--output', '-o', default=None, help='Write the plan as JSON')
+
+    args = parser.parse_args()
+
+    mix = {}
+    for job, weight in args.mix:
+        mix[job] = float(weight)
+    # Host -> cores of the host that measured it; None holds a bare N that applies to every host
+    reference = {}
+    for spec in args.reference_cores:
+        host, _, cores = spec.rpartition('=')
+        reference[host or None] = int(cores)
+    measured = {}
+    if args.thread_scaling:
+        if not Path(args.thread_scaling).exists():
+            print(f"Error: Thread scaling models not found: {args.thread_scaling}", file=sys.stderr)
+            sys.exit(1)
+        measured = load_thread_scaling(Path(args.thread_scaling), args.host)
+
+    profiles = {}
+    for job in mix:
+        profile = load_profile(*job, args.host)
+        if profile is None:
+            print(f"Error: no time stats found for {':'.join(job)}"
+                  f"{' on ' + args.host if args.host else ''}", file=sys.stderr)
+            sys.exit(1)
+        runs = profile.pop('runs')
+        # Each proof is scaled by the cores of the host that ran it
+        hosts = sorted({host for host, _, _ in runs})
+        profile['reference_cores'] = {host: reference.get(host, reference.get(None)) for host in hosts}
+        if job in measured:
+            profile['serial_fraction'] = measured[job]
+            profile['serial_fraction_source'] = 'thread_scaling'
+        elif None in profile['reference_cores'].values():
+            # CPU% only bounds the cores a proof used, not the cores its host had
+            missing = [host for host, cores in profile['reference_cores'].items() if cores is None]
+            print(f"Error: --reference-cores has no entry for host(s) {', '.join(missing)} "
+                  f"measuring {':'.join(job)} (pass HOST=N or N, or --thread-scaling)", file=sys.stderr)
+            sys.exit(1)
+        else:
+            profile['serial_fraction'] = statistics.median(
+                serial_fraction(cpu_s, wall_s, profile['reference_cores'][host]) for host, cpu_s, wall_s in runs
+            )
+            profile['serial_fraction_source'] = 'time_stats'
+        profiles[job] = profile
+
+    print("=========================================")
+    print("Capacity Plan")
+    print("=========================================")
+    print(f"Target: {args.cores} cores, {args.memory_gb:g} GB RAM "
+          f"({args.memory_gb * args.headroom:.1f} GB usable)")
+    print("")
+    print(f"{'Job class':<28} {'Weight':>6} {'Samples':>7} {'CPU s':>9} {'Wall s':>9} "
+          f"{'Ref cores':>9} {'Serial f':>8} {'Peak GB':>8}")
+    for job, profile in profiles.items():
+        print(f"{':'.join(job):<28} {mix[job]:>6g} {profile['samples']:>7} {profile['cpu_s']:>9.1f} "
+              f"{profile['wall_s']:>9.1f} {reference_label(profile['reference_cores']):>9} "
+              f"{profile['serial_fraction']:>8.3f} {profile['rss_gb']:>8.2f}")
+    if measured:
+        classes = [':'.join(job) for job, p in profiles.items() if p['serial_fraction_source'] == 'thread_scaling']
+        print(f"Serial f measured by thread_scaling.py: {', '.join(classes) or 'none of the mix'}")
+    print("")
+
+    candidates = plan(profiles, mix, args.cores, args.memory_gb, args.headroom)
+    if not candidates:
+        worst = max(p['rss_gb'] for p in profiles.values())
+        print(f"Error: a single job needs {worst:.2f} GB, more than the "
+              f"{args.memory_gb * args.headroom:.1f} GB usable", file=sys.stderr)
+        sys.exit(1)
+
+    print(f"{'Concurrency':>11} {'Threads/job':>11} {'Mean wall s':>11} {'Proofs/h':>9} {'Memory GB':>9}")
+    for c in candidates[:args.top]:
+        threads = '/'.join(str(t) for t in sorted(set(c['thread_split'])))
+        print(f"{c['concurrency']:>11} {threads:>11} {c['mean_wall_s']:>11.1f} "
+              f"{c['proofs_per_hour']:>9.1f} {c['memory_needed_gb']:>9.1f}")
+
+    best = candidates[0]
+    print("")
+    extra = sum(1 for t in best['thread_split'] if t > best['threads_per_job'])
+    spare = f" ({extra} of them with {best['threads_per_job'] + 1})" if extra else ''
+    print(f"✓ Recommended: {best['concurrency']} concurrent job(s) x "
+          f"RAYON_NUM_THREADS={best['threads_per_job']}{spare} "
+          f"-> ~{best['proofs_per_hour']:.1f} proofs/hour")
+
+    result = {
+        'cores': args.cores,
+        'memory_gb': args.memory_gb,
+        'headroom': args.headroom,
+        'mix': {':'.join(job): weight for job, weight in mix.items()},
+        'profiles': {':'.join(job): profile for job, profile in profiles.items()},
+        'recommended': best,
+        'candidates': candidates,
+    }
+
+    if args.calibrate:
+        inputs = {job: Path(directory) for job, directory in args.calibrate}
+        missing = [':'.join(job) for job in mix if job not in inputs]
+        if missing:
+            print(f"Error: --calibrate needs an input directory for {', '.join(missing)}", file=sys.stderr)
+            sys.exit(1)
+        jobs = args.calibrate_jobs or 2 * best['concurrency']
+        print("")
+        print(f"Calibrating with {jobs} proof(s) on this machine...")
+        try:
+            calibration = calibrate(inputs, mix, best, jobs, Path(args.calibrate_output), args.pin)
+        except ValueError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+        result['calibration'] = calibration
+        print(f"  Measured: {calibration['measured_proofs_per_hour']:.1f} proofs/hour "
+              f"({calibration['succeeded']}/{calibration['jobs']} succeeded, "
+              f"{calibration['oom']} OOM, peak {calibration['peak_memory_gb']:.2f} GB)")
+        if calibration['prediction_error'] is not None:
+            print(f"  Prediction error: {calibration['prediction_error'] * 100:+.1f}%")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(result, f, indent=2)
+        print(f"✓ Plan written to: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
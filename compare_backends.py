@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+Join VIMz and Veritas metrics into a cross-backend comparison report.
+
+Rows are joined on (transformation, host, passport_id) from the per-host
+metrics CSVs written by extract_vimz_metrics.py / extract_veritas_metrics.py:
+
+    vimz/image_converter/<transformation>/proofs_<host>_hd_metrics.csv
+    veritas/benchmark/<transformation>/proofs_<host>_hd_metrics.csv
+
+If a CSV is missing but the proofs directory exists, the logs are parsed directly.
+
+Equivalent phases:
+    setup   VIMz key generation                   | Veritas circuit build
+    prove   VIMz RecursiveSNARK + CompressedSNARK | Veritas proof generation
+    verify  VIMz CompressedSNARK::verify          | Veritas verification
+
+Usage:
+    python3 compare_backends.py [--output comparison.csv] [--markdown comparison.md]
+
+Example:
+    python3 compare_backends.py --hosts laptop server --transformations blur crop
+"""
+
+import argparse
+import csv
+import statistics
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import compressed_io
+import extract_veritas_metrics
+import extract_vimz_metrics
+
+
+ROOT = Path(__file__).resolve().parent
+VIMZ_ROOT = ROOT / 'vimz' / 'image_converter'
+VERITAS_ROOT = ROOT / 'veritas' / 'benchmark'
+
+HD_PIXELS = 720 * 1280
+
+# Frame pixels of the VIMz circuit resolutions
+VIMZ_FRAME_PIXELS = {
+    'SD': 640 * 480,
+    'HD': HD_PIXELS,
+    'FHD': 1920 * 1080,
+    '4K': 3840 * 2160,
+}
+
+# Transformations whose VIMz proof covers the full frame; crop and resize cover their
+# smaller output frame instead
+VIMZ_FULL_FRAME = ('blur', 'sharpness', 'brightness', 'contrast', 'grayscale')
+
+
+def vimz_pixels(transformation: str, resolution: str = 'HD') -> Optional[int]:
+    """Pixels covered by one VIMz proof of a circuit resolution (None if unknown)."""
+    if transformation in ('crop', 'resize'):
+        # HD circuits output SD, the larger ones FHD (see scaling_sweep.converter_command)
+        resolution = 'SD' if resolution == 'HD' else 'FHD'
+    elif transformation not in VIMZ_FULL_FRAME:
+        return None
+    return VIMZ_FRAME_PIXELS.get(resolution)
+
+
+BACKENDS = ('vimz', 'veritas')
+PHASES = ('setup', 'prove', 'verify', 'total')
+
+FIELDNAMES = [
+    'transformation', 'host', 'passport_id',
+] + [
+    f'{backend}_{field}'
+    for backend in BACKENDS
+    for field in ('setup_s', 'prove_s', 'verify_s', 'total_s', 'pixels',
+                  'peak_memory_gb', 'proofs_per_hour', 'pixels_per_s', 'gb_s_per_proof')
+] + [
+    f'{phase}_speedup' for phase in PHASES
+]
+
+
+def to_float(value) -> Optional[float]:
+    """Convert a CSV cell to float, treating '' and None as missing."""
+    if value is None or value == '':
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+def add(*values: Optional[float]) -> Optional[float]:
+    """Sum of values, or None if any of them is missing."""
+    if any(v is None for v in values):
+        return None
+    return sum(values)
+
+
+def ratio(numerator: Optional[float], denominator: Optional[float]) -> Optional[float]:
+    if numerator is None or not denominator:
+        return None
+    return numerator / denominator
+
+
+def load_rows(backend: str, transformation: str, host: str) -> Dict[str, dict]:
+    """
+    Load metrics rows for one backend/transformation/host keyed by passport_id.
+    """
+    base = VIMZ_ROOT if backend == 'vimz' else VERITAS_ROOT
+    proofs_dir = base / transformation / f'proofs_{host}_hd'
+    csv_file = base / transformation / f'proofs_{host}_hd_metrics.csv'
+
+    rows = {}
+    if csv_file.exists():
+        with open(csv_file, newline='') as f:
+            for row in csv.DictReader(f):
+                rows[row['passport_id']] = row
+    elif proofs_dir.exists():
+        parse = (extract_vimz_metrics.parse_vimz_log if backend == 'vimz'
+                 else extract_veritas_metrics.parse_veritas_log)
+        for log_file in compressed_io.glob_files(proofs_dir, 'passport_*_output.log'):
+            passport_id = log_file.name.split('_')[1]
+            rows[passport_id] = parse(log_file)
+    return rows
+
+
+def normalize(backend: str, transformation: str, row: dict) -> dict:
+    """Map one backend's metrics row onto the shared phase names."""
+    if backend == 'vimz':
+        setup = to_float(row.get('key_generation_time_s'))
+        prove = add(to_float(row.get('recursive_snark_creation_time_s')),
+                    to_float(row.get('compressed_snark_prove_time_s')))
+        verify_ms = to_float(row.get('compressed_snark_verify_time_ms'))
+        pixels = vimz_pixels(transformation)
+    else:
+        setup = to_float(row.get('circuit_build_time_s'))
+        prove = to_float(row.get('proof_generation_time_s'))
+        verify_ms = to_float(row.get('verification_time_ms'))
+        pixels = veritas_pixels(transformation, row)
+
+    verify = verify_ms / 1000.0 if verify_ms is not None else None
+    total = add(setup, prove, verify)
+    peak_gb = to_float(row.get('peak_memory_gb'))
+    if peak_gb is None and to_float(row.get('peak_memory_kb')) is not None:
+        peak_gb = to_float(row.get('peak_memory_kb')) / (1024.0 * 1024.0)
+    # Prefer the measured wall clock when the extractor provides it
+    elapsed = to_float(row.get('wall_clock_s')) or total
+
+    return {
+        'setup_s': setup,
+        'prove_s': prove,
+        'verify_s': verify,
+        'total_s': total,
+        'pixels': pixels,
+        'peak_memory_gb': peak_gb,
+        'proofs_per_hour': ratio(3600.0, total),
+        'pixels_per_s': ratio(pixels, prove),
+        'gb_s_per_proof': peak_gb * elapsed if peak_gb is not None and elapsed is not None else None,
+    }
+
+
+def veritas_pixels(transformation: str, row: dict) -> Optional[int]:
+    """
+    Pixels covered by a Veritas proof: the blur region the example printed
+    ("Image: HxW, blur region: ..."), otherwise derived from the circuit
+    variable count.
+    """
+    if transformation == 'blur':
+        region_height, region_width = to_float(row.get('region_height')), to_float(row.get('region_width'))
+        if region_height is not None and region_width is not None:
+            return int(region_height * region_width)
+    variables = to_float(row.get('variables'))
+    if variables is None:
+        return None
+    variables = int(variables)
+    if transformation == 'blur':
+        # H*W input pixels + BLUR_H*BLUR_W blurred pixels; logs that predate the
+        # "Image:" line were all HD frames
+        height, width = to_float(row.get('image_height')), to_float(row.get('image_width'))
+        frame = int(height * width) if height is not None and width is not None else HD_PIXELS
+        return variables - frame
+    if transformation == 'resize':
+        # 4 corner pixels per output pixel
+        return variables // 4
+    if transformation == 'grayscale':
+        # R, G, B per pixel
+        return variables // 3
+    return variables
+
+
+def join(transformations: List[str], hosts: List[str]) -> List[dict]:
+    """Join both backends on (transformation, host, passport_id)."""
+    joined = []
+    for transformation in transformations:
+        for host in hosts:
+            vimz = load_rows('vimz', transformation, host)
+            veritas = load_rows('veritas', transformation, host)
+            for passport_id in sorted(set(vimz) & set(veritas)):
+                row = {'transformation': transformation, 'host': host, 'passport_id': passport_id}
+                metrics = {
+                    'vimz': normalize('vimz', transformation, vimz[passport_id]),
+                    'veritas': normalize('veritas', transformation, veritas[passport_id]),
+                }
+                for backend in BACKENDS:
+                    for key, value in metrics[backend].items():
+                        row[f'{backend}_{key}'] = value
+                # Speedup > 1 means Veritas is faster than VIMz for that phase
+                for phase in PHASES:
+                    row[f'{phase}_speedup'] = ratio(metrics['vimz'][f'{phase}_s'],
+                                                    metrics['veritas'][f'{phase}_s'])
+                joined.append(row)
+    return joined
+
+
+def summarize(joined: List[dict]) -> List[dict]:
+    """Median of every numeric column per (transformation, host)."""
+    groups: Dict[tuple, List[dict]] = {}
+    for row in joined:
+        groups.setdefault((row['transformation'], row['host']), []).append(row)
+
+    summary = []
+    for (transformation, host), rows in groups.items():
+        entry = {'transformation': transformation, 'host': host, 'images': len(rows)}
+        for field in FIELDNAMES[3:]:
+            values = [r[field] for r in rows if r.get(field) is not None]
+            entry[field] = statistics.median(values) if values else None
+        summary.append(entry)
+    return summary
+
+
+def fmt(value, digits=2) -> str:
+    if value is None:
+        return 'N/A'
+    if isinstance(value, float) and value >= 1e5:
+        return f'{value:,.0f}'
+    return f'{value:,.{digits}f}' if isinstance(value, float) else f'{value:,}'
+
+
+def write_markdown(summary: List[dict], output_file: Path):
+    """Write the per-(transformation, host) medians as Markdown tables."""
+    lines = [
+        '# VIMz vs Veritas Comparison',
+        '',
+        'Medians per transformation and host, joined per passport image.',
+        'Speedup = median of per-image VIMz time / Veritas time (> 1 means Veritas is faster).',
+        '',
+        '## Phase Times (s)',
+        '',
+        '| Transformation | Host | Images | VIMz setup | Veritas setup | Setup speedup '
+        '| VIMz prove | Veritas prove | Prove speedup | VIMz verify | Veritas verify '
+        '| Verify speedup | Total speedup |',
+        '|---|---|---|---|---|---|---|---|---|---|---|---|---|',
+    ]
+    for s in summary:
+        lines.append(
+            f"| {s['transformation']} | {s['host']} | {s['images']} "
+            f"| {fmt(s['vimz_setup_s'])} | {fmt(s['veritas_setup_s'])} | {fmt(s['setup_speedup'])} "
+            f"| {fmt(s['vimz_prove_s'])} | {fmt(s['veritas_prove_s'])} | {fmt(s['prove_speedup'])} "
+            f"| {fmt(s['vimz_verify_s'], 3)} | {fmt(s['veritas_verify_s'], 3)} | {fmt(s['verify_speedup'])} "
+            f"| {fmt(s['total_speedup'])} |"
+        )
+    lines += [
+        '',
+        '## Throughput and Memory',
+        '',
+        '| Transformation | Host | VIMz proofs/h | Veritas proofs/h | VIMz pixels | Veritas pixels '
+        '| VIMz pixels/s | Veritas pixels/s | VIMz peak GB | Veritas peak GB '
+        '| VIMz GB·s/proof | Veritas GB·s/proof |',
+        '|---|---|---|---|---|---|---|---|---|---|---|---|',
+    ]
+    for s in summary:
+        lines.append(
+            f"| {s['transformation']} | {s['host']} "
+            f"| {fmt(s['vimz_proofs_per_hour'], 1)} | {fmt(s['veritas_proofs_per_hour'], 1)} "
+            f"| {fmt(s['vimz_pixels'], 0)} | {fmt(s['veritas_pixels'], 0)} "
+            f"| {fmt(s['vimz_pixels_per_s'], 0)} | {fmt(s['veritas_pixels_per_s'], 0)} "
+            f"| {fmt(s['vimz_peak_memory_gb'], 3)} | {fmt(s['veritas_peak_memory_gb'], 3)} "
+            f"| {fmt(s['vimz_gb_s_per_proof'], 1)} | {fmt(s['veritas_gb_s_per_proof'], 1)} |"
+        )
+    lines.append('')
+    output_file.write_text('\n'.join(lines))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Join VIMz and Veritas metrics into a comparison table'
+    )
+    parser.add_argument('--transformations', nargs='+',
+                        default=['blur', 'crop', 'grayscale', 'resize'],
+                        help='Transformations to compare (default: blur crop grayscale resize)')
+    parser.add_argument('--hosts', nargs='+', default=['laptop', 'server'],
+                        help='Hosts to compare (default: laptop server)')
+    parser.add_argument('--output', '-o', default='backend_comparison.csv',
+                        help='Per-image joined CSV (default: backend_comparison.csv)')
+    parser.add_argument('--markdown', '-m', default='backend_comparison.md',
+                        help='Markdown summary (default: backend_comparison.md)')
+
+    args = parser.parse_args()
+
+    joined = join(args.transformations, args.hosts)
+    if not joined:
+        print("Error: no passport_id found in both backends for the selected "
+              "transformations and hosts", file=sys.stderr)
+        sys.exit(1)
+
+    with open(args.output, 'w', newline='') as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=FIELDNAMES)
+        writer.writeheader()
+        for row in joined:
+            writer.writerow({k: ('' if row.get(k) is None else row[k]) for k in FIELDNAMES})
+
+    summary = summarize(joined)
+    write_markdown(summary, Path(args.markdown))
+
+    print(f"✓ Joined {len(joined)} image(s) across {len(summary)} transformation/host pair(s)")
+    print(f"✓ CSV written to: {args.output}")
+    print(f"✓ Markdown written to: {args.markdown}")
+
+
+if __name__ == '__main__':
+    main()
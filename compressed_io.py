@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""
+Transparent gzip/zstd compression for converter outputs, proof inputs and proof logs.
+
+A path ending in .gz or .zst is compressed on write and decompressed on read; any other
+path is plain text. Converters therefore write a compressed input when given
+`-o passport_0000.json.zst`, and the readers (input_validator.py, proof_runner.py,
+campaign_queue.py, the metrics extractors) accept passport_0000.json, .json.gz and
+.json.zst alike. The VIMz prover and the Veritas examples pick the decoder from the
+extension as well.
+
+Compression level and zstd worker threads default to the environment:
+
+    ZKP_GZIP_LEVEL         gzip level 1-9 (default 6)
+    ZKP_ZSTD_LEVEL         zstd level 1-22 (default 3)
+    ZKP_COMPRESS_THREADS   zstd worker threads, 0 = single-threaded (default), -1 = all cores
+
+gzip is always single-threaded. zstd needs the zstandard package (pip install zstandard).
+
+Commands:
+    compress   rewrite existing files in another format (e.g. archive a proofs directory)
+    bench      disk savings per format and level, and whether decompressing and parsing
+               a compressed input is faster than parsing the plain file read from disk
+
+Usage:
+    python3 compressed_io.py compress <file|dir> [...] --to zst|gz|json [--level N] [--threads N] [--keep]
+    python3 compressed_io.py bench <input.json> [...] [--gzip-levels 1 6] [--zstd-levels 3 19]
+                             [--disk-mbps 500] [--cold] [-o bench.csv]
+
+Example:
+    python3 compressed_io.py compress vimz/image_converter/blur/outputs_hd --to zst --level 19 --threads -1
+    python3 compressed_io.py compress vimz/image_converter/blur/proofs_server_hd --pattern '*_output.log' --to gz
+    python3 compressed_io.py bench vimz/image_converter/blur/outputs_hd/passport_0000.json --cold
+"""
+
+import argparse
+import csv
+import gzip
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+# Compressed suffix -> format
+COMPRESSIONS = {
+    '.gz': 'gzip',
+    '.zst': 'zstd',
+}
+SUFFIXES = {fmt: suffix for suffix, fmt in COMPRESSIONS.items()}
+
+# compress --to choices
+TARGETS = {
+    'zst': '.zst',
+    'gz': '.gz',
+    'json': '',
+}
+
+# Level variable per format; the ranges differ, so one value cannot serve both
+LEVEL_VARIABLES = {
+    'gzip': 'ZKP_GZIP_LEVEL',
+    'zstd': 'ZKP_ZSTD_LEVEL',
+}
+
+DEFAULT_LEVELS = {
+    'gzip': 6,
+    'zstd': 3,
+}
+
+# Plain suffixes that may carry a compression suffix
+BASE_SUFFIXES = ('.json', '.log')
+
+
+def compression(path) -> Optional[str]:
+    """'gzip', 'zstd' or None (plain) from the file extension."""
+    return COMPRESSIONS.get(Path(path).suffix)
+
+
+def split_name(path) -> Tuple[str, str]:
+    """
+    Split a file name into stem and full suffix: passport_0000.json.zst ->
+    ('passport_0000', '.json.zst'). Only .json/.log and their compressed forms count as
+    suffix, so offsets like '_f1.4' stay in the stem.
+    """
+    name = Path(path).name
+    suffix = ''
+    if Path(name).suffix in COMPRESSIONS:
+        suffix = Path(name).suffix
+        name = name[:-len(suffix)]
+    if Path(name).suffix in BASE_SUFFIXES:
+        suffix = Path(name).suffix + suffix
+        name = name[:-len(Path(name).suffix)]
+    return name, suffix
+
+
+def input_stem(path) -> str:
+    """Input name without .json and compression suffix (passport_0000.json.gz -> passport_0000)."""
+    return split_name(path)[0]
+
+
+def glob_files(directory, pattern: str = '*.json') -> List[Path]:
+    """Files matching pattern in plain, gzip or zstd form, sorted."""
+    directory = Path(directory)
+    found = set(directory.glob(pattern))
+    for suffix in COMPRESSIONS:
+        found.update(directory.glob(pattern + suffix))
+    return sorted(found)
+
+
+def env_level(fmt: str) -> int:
+    value = os.environ.get(LEVEL_VARIABLES[fmt])
+    return int(value) if value else DEFAULT_LEVELS[fmt]
+
+
+def env_threads() -> int:
+    return int(os.environ.get('ZKP_COMPRESS_THREADS') or 0)
+
+
+def require_zstd():
+    if zstandard is None:
+        raise RuntimeError("zstd files need the zstandard package (pip install zstandard)")
+
+
+def open_text(path, mode: str = 'r', level: Optional[int] = None, threads: Optional[int] = None,
+              errors: Optional[str] = None):
+    """
+    Open a plain, .gz or .zst file as text; mode is 'r', 'w' or 'a'. errors is passed
+    to the text decoder ('replace' for logs).
+
+    Appending to a compressed file adds a new gzip member / zstd frame, which the
+    readers decode as one stream.
+    """
+    fmt = compression(path)
+    if fmt is None:
+        return open(path, mode, errors=errors)
+    level = env_level(fmt) if level is None else level
+    if fmt == 'gzip':
+        return gzip.open(path, mode + 't', compresslevel=level, encoding='utf-8', errors=errors)
+
+    require_zstd()
+    if mode == 'r':
+        reader = zstandard.ZstdDecompressor().stream_reader(open(path, 'rb'), read_across_frames=True,
+                                                            closefd=True)
+        return io.TextIOWrapper(reader, encoding='utf-8', errors=errors)
+    threads = env_threads() if threads is None else threads
+    writer = zstandard.ZstdCompressor(level=level, threads=threads).stream_writer(open(path, mode + 'b'),
+                                                                                  closefd=True)
+    return io.TextIOWrapper(writer, encoding='utf-8')
+
+
+def read_text(path, errors: Optional[str] = 'replace') -> str:
+    with open_text(path, errors=errors) as f:
+        return f.read()
+
+
+def read_json(path):
+    with open_text(path) as f:
+        return json.load(f)
+
+
+def write_text(path, text: str, level: Optional[int] = None, threads: Optional[int] = None):
+    with open_text(path, 'w', level, threads) as f:
+        f.write(text)
+
+
+def convert_file(path: Path, to: str, level: Optional[int], threads: Optional[int], keep: bool) -> Path:
+    """Rewrite one file as plain ('json') or compressed; returns the new path."""
+    stem, suffix = split_name(path)
+    base = suffix[:-len(path.suffix)] if compression(path) else suffix
+    target = path.with_name(stem + base + TARGETS[to])
+    if target == path:
+        return path
+    # Stream in chunks so large logs and 4K inputs are not held in memory twice;
+    # surrogateescape round-trips any bytes that are not valid UTF-8
+    with open_text(path, errors='surrogateescape') as src, \
+            open_text(target, 'w', level, threads, errors='surrogateescape') as dst:
+        shutil.copyfileobj(src, dst, 1 << 20)
+    if not keep:
+        path.unlink()
+    return target
+
+
+def drop_page_cache(path: Path) -> bool:
+    """Evict one file's clean pages from the page cache; False where that is unsupported."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        finally:
+            os.close(fd)
+        return True
+    except (AttributeError, OSError):
+        return False
+
+
+def bench_file(source: Path, variants: List[Tuple[str, int]], threads: int, disk_mbps: float,
+               evict: bool, repeat: int, work_dir: Path) -> List[Dict]:
+    """Write source in every (format, level) and time reading + parsing each one back."""
+    text = read_text(source)
+    rows = []
+    for fmt, level in variants:
+        target = work_dir / (input_stem(source) + '.json' + SUFFIXES.get(fmt, ''))
+        start = time.perf_counter()
+        write_text(target, text, level, threads)
+        write_s = time.perf_counter() - start
+        size = target.stat().st_size
+
+        warm, cold = [], []
+        for _ in range(repeat):
+            if evict and drop_page_cache(target):
+                start = time.perf_counter()
+                read_json(target)
+                cold.append(time.perf_counter() - start)
+            start = time.perf_counter()
+            read_json(target)
+            warm.append(time.perf_counter() - start)
+        warm_s = min(warm)
+        rows.append({
+            'input': source.name,
+            'format': fmt,
+            'level': level if fmt != 'json' else None,
+            'threads': threads if fmt == 'zstd' else None,
+            'size_mb': round(size / 1e6, 2),
+            'ratio': round(len(text.encode()) / size, 2),
+            'write_s': round(write_s, 3),
+            # Page cache hot: decompression + parse only
+            'read_parse_warm_s': round(warm_s, 3),
+            'read_parse_cold_s': round(min(cold), 3) if cold else None,
+            # Same work plus transferring the file at --disk-mbps
+            'read_parse_disk_s': round(warm_s + size / (disk_mbps * 1e6), 3),
+        })
+        target.unlink()
+    return rows
+
+
+def print_bench(rows: List[Dict], disk_mbps: float):
+    print(f"{'Input':<22} {'Format':<6} {'Level':>5} {'MB':>8} {'Ratio':>6} {'Write s':>8} "
+          f"{'Warm s':>7} {'Cold s':>7} {f'@{disk_mbps:g}MB/s':>9}")
+    print("-" * 86)
+    for row in rows:
+        level = '-' if row['level'] is None else str(row['level'])
+        cold = '-' if row['read_parse_cold_s'] is None else f"{row['read_parse_cold_s']:.3f}"
+        print(f"{row['input'][:22]:<22} {row['format']:<6} {level:>5} {row['size_mb']:>8.2f} "
+              f"{row['ratio']:>6.2f} {row['write_s']:>8.3f} {row['read_parse_warm_s']:>7.3f} "
+              f"{cold:>7} {row['read_parse_disk_s']:>9.3f}")
+
+
+def cmd_compress(args):
+    files = []
+    for path in map(Path, args.paths):
+        files.extend(glob_files(path, args.pattern) if path.is_dir() else [path])
+    if not files:
+        print("Error: No files found", file=sys.stderr)
+        sys.exit(1)
+
+    before = after = 0
+    for path in files:
+        size = path.stat().st_size
+        target = convert_file(path, args.to, args.level, args.threads, args.keep)
+        before += size
+        after += target.stat().st_size
+        print(f"✓ {path.name} -> {target.name} ({size / 1e6:.1f} -> {target.stat().st_size / 1e6:.1f} MB)")
+    print(f"\n{len(files)} file(s): {before / 1e6:.1f} MB -> {after / 1e6:.1f} MB"
+          + (f" ({before / after:.1f}x)" if after else ''))
+
+
+def cmd_bench(args):
+    variants = [('json', 0)]
+    variants += [('gzip', level) for level in args.gzip_levels]
+    if zstandard is not None:
+        variants += [('zstd', level) for level in args.zstd_levels]
+    else:
+        print("Warning: zstandard is not installed, benchmarking gzip only", file=sys.stderr)
+
+    rows = []
+    with tempfile.TemporaryDirectory(dir=args.work_dir) as work_dir:
+        for source in map(Path, args.inputs):
+            if not source.exists():
+                print(f"Error: Input not found: {source}", file=sys.stderr)
+                sys.exit(1)
+            rows.extend(bench_file(source, variants, args.threads, args.disk_mbps,
+                                   args.cold, args.repeat, Path(work_dir)))
+    print_bench(rows, args.disk_mbps)
+    if args.cold and all(row['read_parse_cold_s'] is None for row in rows):
+        print("\nWarning: could not evict the files from the page cache, cold times not measured")
+
+    if args.output:
+        with open(args.output, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+            writer.writeheader()
+            writer.writerows(rows)
+        print(f"\n✓ Results written to: {args.output}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compress proof inputs and logs, and benchmark the formats')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('compress', help='Rewrite files as gzip, zstd or plain')
+    p.add_argument('paths', nargs='+', help='Files, or directories (see --pattern)')
+    p.add_argument('--to', choices=['zst', 'gz', 'json'], required=True,
+                   help="Target format ('json' decompresses to plain text)")
+    p.add_argument('--pattern', default='*.json', help='File pattern inside directories (default: *.json)')
+    p.add_argument('--level', type=int, default=None, help='Compression level (default: ZKP_GZIP_LEVEL / ZKP_ZSTD_LEVEL)')
+    p.add_argument('--threads', type=int, default=None,
+                   help='zstd worker threads, -1 = all cores (default: ZKP_COMPRESS_THREADS)')
+    p.add_argument('--keep', action='store_true', help='Keep the original files')
+    p.set_defaults(func=cmd_compress)
+
+    p = sub.add_parser('bench', help='Disk savings and read + parse time per format and level')
+    p.add_argument('inputs', nargs='+', help='Converted input JSON files')
+    p.add_argument('--gzip-levels', nargs='+', type=int, default=[1, 6])
+    p.add_argument('--zstd-levels', nargs='+', type=int, default=[3, 19])
+    p.add_argument('--threads', type=int, default=0, help='zstd worker threads for writing (default: 0)')
+    p.add_argument('--disk-mbps', type=float, default=500.0,
+                   help='Disk throughput used for the modelled read time (default: 500 MB/s)')
+    p.add_argument('--cold', action='store_true',
+                   help='Also time reads after evicting each file from the page cache')
+    p.add_argument('--repeat', type=int, default=3, help='Reads per variant, the fastest counts (default: 3)')
+    p.add_argument('--work-dir', default=None, help='Directory for the temporary files (default: system temp)')
+    p.add_argument('--output', '-o', default=None, help='Also write the table as CSV')
+    p.set_defaults(func=cmd_bench)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()
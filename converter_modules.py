@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Import converter scripts (vimz/image_converter/<t>/<t>.py, veritas/benchmark/<t>/<t>.py,
+vimz/py_modules/image_formatter.py) by their path relative to the repository root, so
+tools can call the converters' functions without running their main().
+
+Used by golden_bench.py and tile_planner.py:
+
+    from converter_modules import load_module
+    blur = load_module('veritas/benchmark/blur/blur.py')
+"""
+
+import importlib.util
+import sys
+from pathlib import Path
+from typing import Dict, Optional
+
+
+ROOT = Path(__file__).resolve().parent
+
+_modules: Dict[str, Optional[object]] = {}
+
+
+def load_module(relative_path: str):
+    """Import a converter script by path (its main() is not run). None if it fails."""
+    if relative_path not in _modules:
+        path = ROOT / relative_path
+        name = 'converter_' + relative_path.replace('/', '_').replace('.py', '')
+        try:
+            spec = importlib.util.spec_from_file_location(name, path)
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+        except Exception as e:
+            print(f"  ✗ Cannot import {relative_path}: {e}", file=sys.stderr)
+            module = None
+        _modules[relative_path] = module
+    return _modules[relative_path]
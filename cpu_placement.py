@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+Pin concurrent proof jobs to disjoint CPU sets.
+
+The VIMz (nova) and Veritas (plonky2) provers size their rayon pools to every core,
+so k concurrent jobs run k * cores threads that preempt each other and migrate
+between cores and NUMA nodes. A placement gives each job its own CPU set:
+
+    - sets are disjoint and cut node by node from /sys/devices/system/node, so a job
+      only spans two NUMA nodes when the node size is not a multiple of its threads
+    - within a node, CPUs are ordered by physical core, so SMT siblings stay together
+    - the job is started under taskset -c (the prover inherits the affinity; its memory
+      follows by first touch) and RAYON_NUM_THREADS is set to the set size
+
+proof_runner.py --cpus, campaign_queue.py worker --cpus, capacity_planner.py --pin and
+tile_planner.py --pin use it; every proof records cpu_list and numa_node in its metrics.
+
+Commands:
+    plan    print the NUMA layout and the CPU set of each of N jobs
+    bench   run the same proofs N at a time unpinned (rayon default) and pinned, and
+            compare throughput, CPU time and context switches
+
+Usage:
+    python3 cpu_placement.py plan --jobs N [--threads T]
+    python3 cpu_placement.py bench <backend> <transformation> <input_dir|input_json> [...]
+                             --jobs N [--proofs M] [--threads T] [--resolution HD] [-o bench.csv]
+
+Example:
+    python3 cpu_placement.py plan --jobs 4
+    python3 cpu_placement.py bench veritas crop veritas/benchmark/crop/outputs_hd --jobs 4 --proofs 8
+"""
+
+import argparse
+import csv
+import os
+import queue
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import compressed_io
+
+
+NODE_DIR = Path('/sys/devices/system/node')
+CPU_DIR = Path('/sys/devices/system/cpu')
+
+# Bench columns averaged per mode
+BENCH_METRICS = ('wall_clock_s', 'user_time_s', 'system_time_s', 'cpu_percent',
+                 'involuntary_context_switches', 'peak_memory_kb')
+
+
+def parse_cpulist(text: str) -> List[int]:
+    """Kernel CPU list ('0-3,8,10-11') -> sorted CPU numbers."""
+    cpus = set()
+    for part in text.strip().split(','):
+        if not part:
+            continue
+        if '-' in part:
+            first, last = part.split('-')
+            cpus.update(range(int(first), int(last) + 1))
+        else:
+            cpus.add(int(part))
+    return sorted(cpus)
+
+
+def format_cpulist(cpus: Iterable[int]) -> str:
+    """CPU numbers -> kernel CPU list with ranges."""
+    ranges: List[List[int]] = []
+    for cpu in sorted(cpus):
+        if ranges and cpu == ranges[-1][1] + 1:
+            ranges[-1][1] = cpu
+        else:
+            ranges.append([cpu, cpu])
+    return ','.join(str(a) if a == b else f'{a}-{b}' for a, b in ranges)
+
+
+def allowed_cpus() -> List[int]:
+    """CPUs this process may run on (respects an outer taskset / cgroup cpuset)."""
+    return sorted(os.sched_getaffinity(0))
+
+
+def numa_nodes(cpus: Optional[List[int]] = None) -> Dict[Optional[int], List[int]]:
+    """
+    Allowed CPUs per NUMA node. Without /sys/devices/system/node (containers,
+    non-NUMA kernels) all CPUs belong to one node None.
+    """
+    cpus = allowed_cpus() if cpus is None else cpus
+    nodes: Dict[Optional[int], List[int]] = {}
+    for node_dir in sorted(NODE_DIR.glob('node[0-9]*'), key=lambda p: int(p.name[4:])):
+        try:
+            node_cpus = set(parse_cpulist((node_dir / 'cpulist').read_text()))
+        except OSError:
+            continue
+        members = [cpu for cpu in cpus if cpu in node_cpus]
+        if members:
+            nodes[int(node_dir.name[4:])] = members
+    covered = {cpu for members in nodes.values() for cpu in members}
+    if not nodes or covered != set(cpus):
+        return {None: list(cpus)}
+    return nodes
+
+
+def core_key(cpu: int) -> Tuple[int, int, int]:
+    """(package, core, cpu): sorting by it puts SMT siblings next to each other."""
+    topology = CPU_DIR / f'cpu{cpu}' / 'topology'
+    try:
+        package = int((topology / 'physical_package_id').read_text())
+        core = int((topology / 'core_id').read_text())
+    except (OSError, ValueError):
+        return (0, cpu, cpu)
+    return (package, core, cpu)
+
+
+def node_of(cpus: Iterable[int]) -> Optional[int]:
+    """NUMA node holding all of cpus, None if they span nodes or the layout is unknown."""
+    cpus = set(cpus)
+    for node, members in numa_nodes().items():
+        if node is not None and cpus <= set(members):
+            return node
+    return None
+
+
+def partition(jobs: int, threads: Optional[int] = None, cpus: Optional[List[int]] = None) -> List[Dict]:
+    """
+    Disjoint CPU sets for `jobs` concurrent jobs of `threads` CPUs each (default:
+    the allowed CPUs divided evenly). Sets are filled node by node; only the CPUs
+    left over on each node are combined into sets that span nodes.
+    """
+    cpus = allowed_cpus() if cpus is None else sorted(cpus)
+    if jobs < 1:
+        raise ValueError("jobs must be at least 1")
+    threads = threads or len(cpus) // jobs
+    if threads < 1 or jobs * threads > len(cpus):
+        raise ValueError(f"{jobs} job(s) x {threads} thread(s) do not fit on {len(cpus)} CPU(s)")
+
+    sets: List[Tuple[Optional[int], List[int]]] = []
+    leftover: List[int] = []
+    for node, members in numa_nodes(cpus).items():
+        ordered = sorted(members, key=core_key)
+        while len(ordered) >= threads and len(sets) < jobs:
+            sets.append((node, ordered[:threads]))
+            ordered = ordered[threads:]
+        leftover += ordered
+    while len(sets) < jobs:
+        sets.append((None, leftover[:threads]))
+        leftover = leftover[threads:]
+
+    return [{
+        'slot': slot,
+        'cpus': sorted(members),
+        'cpu_list': format_cpulist(members),
+        'numa_node': node,
+        'threads': threads,
+    } for slot, (node, members) in enumerate(sets)]
+
+
+def taskset_argv(cpus: List[int]) -> List[str]:
+    """
+    argv prefix that pins a command (and everything it starts) to cpus. taskset sets the
+    affinity and then execs, which is safe from a multithreaded parent, unlike a preexec_fn.
+    """
+    return ['taskset', '-c', format_cpulist(cpus)]
+
+
+class SlotPool:
+    """
+    Hands out the placements of a partition to the threads of a ThreadPoolExecutor,
+    so a finishing job frees its CPU set for the next one.
+    """
+
+    def __init__(self, placements: List[Dict]):
+        self.free: queue.Queue = queue.Queue()
+        for placement in placements:
+            self.free.put(placement)
+
+    @contextmanager
+    def slot(self):
+        placement = self.free.get()
+        try:
+            yield placement
+        finally:
+            self.free.put(placement)
+
+
+def print_plan(placements: List[Dict]):
+    nodes = numa_nodes()
+    print(f"Allowed CPUs: {format_cpulist(allowed_cpus())} ({len(allowed_cpus())})")
+    for node, members in nodes.items():
+        label = 'unknown layout' if node is None else f'node {node}'
+        print(f"  {label:<14} {format_cpulist(members)} ({len(members)} CPUs)")
+    print(f"\n{'Slot':>4} {'Node':>5} {'Threads':>7}  CPUs")
+    for p in placements:
+        node = '-' if p['numa_node'] is None else p['numa_node']
+        print(f"{p['slot']:>4} {node:>5} {p['threads']:>7}  {p['cpu_list']}")
+
+
+def cmd_plan(args):
+    try:
+        placements = partition(args.jobs, args.threads)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    print_plan(placements)
+    print("\nOne campaign worker per slot:")
+    for p in placements:
+        print(f"  python3 campaign_queue.py worker <queue> --worker-id slot{p['slot']} --cpus {p['cpu_list']} &")
+
+
+def run_batch(args, inputs: List[Path], placements: Optional[List[Dict]], output_dir: Path) -> Tuple[List[Dict], float]:
+    """Run every input args.jobs at a time, pinned to placements or unpinned."""
+    import proof_runner  # proof_runner imports this module
+
+    pool = SlotPool(placements) if placements else None
+
+    def run(item: Tuple[int, Path]) -> Dict:
+        # One directory per run: an input proven twice must not share its log
+        index, input_json = item
+        run_dir = output_dir / f'run{index:03d}'
+        if pool is None:
+            return proof_runner.run_proof(args.backend, args.transformation, input_json, run_dir,
+                                          args.resolution, args.baseline_threads, validate=False)
+        with pool.slot() as placement:
+            return proof_runner.run_proof(args.backend, args.transformation, input_json, run_dir,
+                                          args.resolution, cpus=placement['cpus'], validate=False)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.jobs) as executor:
+        results = list(executor.map(run, enumerate(inputs)))
+    return results, time.perf_counter() - start
+
+
+def summarize(mode: str, results: List[Dict], elapsed: float) -> Dict:
+    succeeded = [r for r in results if r['exit_code'] == 0]
+    row = {
+        'mode': mode,
+        'proofs': len(results),
+        'succeeded': len(succeeded),
+        'elapsed_s': round(elapsed, 2),
+        'proofs_per_hour': round(len(succeeded) * 3600.0 / elapsed, 2) if elapsed > 0 else 0.0,
+    }
+    for key in BENCH_METRICS:
+        values = [r[key] for r in succeeded if r.get(key) is not None]
+        row[f'mean_{key}'] = round(statistics.mean(values), 2) if values else None
+    return row
+
+
+def cmd_bench(args):
+    inputs = []
+    for item in map(Path, args.inputs):
+        inputs += compressed_io.glob_files(item) if item.is_dir() else [item]
+    if not inputs:
+        print("Error: No input JSON files found", file=sys.stderr)
+        sys.exit(1)
+    inputs = [inputs[i % len(inputs)] for i in range(args.proofs or 2 * args.jobs)]
+    try:
+        placements = partition(args.jobs, args.threads)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    print_plan(placements)
+
+    summaries, runs = [], []
+    for mode, mode_placements in (('unpinned', None), ('pinned', placements)):
+        print(f"\n{mode}: {len(inputs)} proof(s), {args.jobs} at a time ...")
+        results, elapsed = run_batch(args, inputs, mode_placements, Path(args.output_dir) / mode)
+        summaries.append(summarize(mode, results, elapsed))
+        for r in results:
+            runs.append(dict(mode=mode, **{k: r.get(k) for k in ('input_json', 'cpu_list', 'numa_node', 'threads',
+                                                                  'exit_code') + BENCH_METRICS}))
+
+    print(f"\n{'Mode':<9} {'OK':>5} {'Elapsed':>9} {'Proofs/h':>9} {'Wall':>8} {'User':>8} {'Sys':>7} "
+          f"{'CPU%':>6} {'Invol.':>9}")
+    for s in summaries:
+        cells = [s[f'mean_{key}'] for key in ('wall_clock_s', 'user_time_s', 'system_time_s', 'cpu_percent',
+                                              'involuntary_context_switches')]
+        cells = ['-' if v is None else f'{v:.0f}' if i >= 3 else f'{v:.1f}' for i, v in enumerate(cells)]
+        print(f"{s['mode']:<9} {s['succeeded']:>2}/{s['proofs']:<2} {s['elapsed_s']:>8.1f}s "
+              f"{s['proofs_per_hour']:>9.1f} {cells[0]:>8} {cells[1]:>8} {cells[2]:>7} {cells[3]:>6} {cells[4]:>9}")
+    unpinned, pinned = summaries
+    if unpinned['proofs_per_hour'] and pinned['proofs_per_hour']:
+        print(f"\nPinned throughput: {pinned['proofs_per_hour'] / unpinned['proofs_per_hour']:.2f}x unpinned")
+
+    if args.output:
+        with open(args.output, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=list(runs[0].keys()))
+            writer.writeheader()
+            writer.writerows(runs)
+        print(f"✓ Per-proof results written to: {args.output}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Partition CPUs between concurrent proof jobs')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('plan', help='Show the CPU set of each of N concurrent jobs')
+    p.add_argument('--jobs', '-j', type=int, required=True, help='Concurrent jobs')
+    p.add_argument('--threads', '-t', type=int, default=None,
+                   help='CPUs per job (default: allowed CPUs / jobs)')
+    p.set_defaults(func=cmd_plan)
+
+    p = sub.add_parser('bench', help='Compare pinned and unpinned throughput for N concurrent jobs')
+    p.add_argument('backend', choices=('vimz', 'veritas'), help='Proving backend')
+    p.add_argument('transformation', help='Transformation (blur, crop, grayscale, ...)')
+    p.add_argument('inputs', nargs='+', help='Input JSON files or directories')
+    p.add_argument('--jobs', '-j', type=int, required=True, help='Concurrent jobs')
+    p.add_argument('--proofs', type=int, default=None, help='Proofs per mode (default: 2 x jobs)')
+    p.add_argument('--threads', '-t', type=int, default=None,
+                   help='CPUs per pinned job (default: allowed CPUs / jobs)')
+    p.add_argument('--baseline-threads', type=int, default=None,
+                   help='RAYON_NUM_THREADS of the unpinned jobs (default: unset, every core)')
+    p.add_argument('--resolution', '-r', default='HD', help='VIMz circuit resolution (default: HD)')
+    p.add_argument('--output-dir', default='placement_bench', help='Proofs and logs (default: placement_bench)')
+    p.add_argument('--output', '-o', default=None, help='Also write the per-proof results as CSV')
+    p.set_defaults(func=cmd_bench)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""
+Crop offset sweeps shared by the VIMz and Veritas crop converters.
+
+Both converters accept:
+
+    --offsets X,Y [X,Y ...]    one input per listed offset
+    --grid X_START X_STOP X_STEP Y_START Y_STOP Y_STEP
+                               one input per offset of the grid (stop values inclusive)
+
+and write each input as <output_stem>_x<X>_y<Y>.json (keeping a .gz / .zst suffix),
+creating the output directory if needed.
+"""
+
+import argparse
+from pathlib import Path
+from typing import List, Tuple
+
+from compressed_io import split_name
+
+
+def parse_offset(text: str) -> Tuple[int, int]:
+    """Parse a crop offset given as 'X,Y'."""
+    try:
+        x, y = text.split(',')
+        return int(x), int(y)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid offset '{text}', expected X,Y")
+
+
+def add_sweep_arguments(parser: argparse.ArgumentParser):
+    """Add the --offsets and --grid options to a crop converter's argument parser."""
+    parser.add_argument('--offsets', nargs='+', type=parse_offset, metavar='X,Y',
+                        help='Sweep mode: list of crop offsets, one output per offset')
+    parser.add_argument('--grid', nargs=6, type=int,
+                        metavar=('X_START', 'X_STOP', 'X_STEP', 'Y_START', 'Y_STOP', 'Y_STEP'),
+                        help='Sweep mode: grid of crop offsets (stop values inclusive)')
+
+
+def sweep_offsets(args) -> List[Tuple[int, int]]:
+    """
+    Collect crop offsets from --offsets and --grid (stop values are inclusive).
+    """
+    offsets = list(args.offsets or [])
+    if args.grid:
+        x_start, x_stop, x_step, y_start, y_stop, y_step = args.grid
+        for x in range(x_start, x_stop + 1, x_step):
+            for y in range(y_start, y_stop + 1, y_step):
+                offsets.append((x, y))
+    # Drop duplicates while keeping the requested order
+    return list(dict.fromkeys(offsets))
+
+
+def sweep_output_path(output, crop_x: int, crop_y: int) -> Path:
+    """
+    Output path for one offset of a sweep: <stem>_x<X>_y<Y><suffix>. Its directory
+    is created if missing.
+    """
+    stem, suffix = split_name(output)
+    path = Path(output).with_name(f"{stem}_x{crop_x}_y{crop_y}{suffix or '.json'}")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return path
@@ -3,7 +3,13 @@
 Extract metrics from Veritas proof generation log files and output to CSV.
 
 Usage:
-    python3 extract_veritas_metrics.py <proofs_directory> [output_csv]
+    python3 extract_veritas_metrics.py <proofs_directory> [output_csv] [--cores N]
+
+The /usr/bin/time counters (CPU time, page faults, context switches, file system I/O)
+are extracted along with the derived parallel efficiency, system-time share and
+faults per GB of peak RSS (see time_stats.py). The core count is read from each
+log's "Cores available" line; --cores supplies it for older logs without one, and
+otherwise cores and parallel_efficiency are left empty.
 
 Example:
     python3 extract_veritas_metrics.py veritas/benchmark/blur/proofs_laptop_hd
@@ -16,6 +22,9 @@ import csv
 from pathlib import Path
 from typing import Dict, Optional
 
+import time_stats
+from compressed_io import glob_files, open_text
+
 
 def extract_metric(line: str, pattern: str, default: Optional[float] = None) -> Optional[float]:
     """Extract a numeric value from a line using a regex pattern."""
@@ -28,11 +37,26 @@ def extract_metric(line: str, pattern: str, default: Optional[float] = None) ->
     return default
 
 
-def parse_veritas_log(log_file: Path) -> Dict[str, Optional[float]]:
+# "Input load took: 0.012345s (1234567 bytes on disk, 4567890 bytes decoded)"
+# "Input parse took: 0.234567s (4567890 bytes)"
+INPUT_LOAD_PATTERN = re.compile(r'^Input load took:?\s*([0-9.]+)s \(([0-9]+) bytes on disk, ([0-9]+) bytes decoded\)')
+INPUT_PARSE_PATTERN = re.compile(r'^Input parse took:?\s*([0-9.]+)s \(([0-9]+) bytes\)')
+INPUT_FIELDS = ['input_load_time_s', 'input_parse_time_s', 'input_bytes_on_disk', 'input_bytes']
+
+# "Image: 720x1280, blur region: rows 1..501, cols 1..901" (blur prints the region, the other
+# examples print the image size first)
+IMAGE_PATTERN = re.compile(r'^Image:\s*([0-9]+)x([0-9]+)')
+BLUR_REGION_PATTERN = re.compile(r'blur region: rows ([0-9]+)\.\.([0-9]+), cols ([0-9]+)\.\.([0-9]+)')
+IMAGE_FIELDS = ['image_height', 'image_width', 'region_height', 'region_width']
+
+
+def parse_veritas_log(log_file: Path, cores: Optional[int] = None) -> Dict[str, Optional[float]]:
     """
     Parse a Veritas output log file and extract metrics.
     
     Returns a dictionary with the following keys:
+    - input_load_time_s, input_parse_time_s, input_bytes_on_disk, input_bytes
+    - image_height, image_width (region_height, region_width for blur)
     - circuit_build_time_s
     - proof_generation_time_s
     - verification_time_ms
@@ -40,8 +64,12 @@ def parse_veritas_log(log_file: Path) -> Dict[str, Optional[float]]:
     - variables
     - peak_memory_kb
     - peak_memory_mb
+    - /usr/bin/time counters and derived efficiency metrics (time_stats.COUNTER_FIELDS
+      and time_stats.DERIVED_FIELDS; cores is used when the log records no core count)
     """
     metrics = {
+        **{field: None for field in INPUT_FIELDS},
+        **{field: None for field in IMAGE_FIELDS},
         'circuit_build_time_s': None,
         'proof_generation_time_s': None,
         'verification_time_ms': None,
@@ -52,13 +80,34 @@ def parse_veritas_log(log_file: Path) -> Dict[str, Optional[float]]:
     }
     
     try:
-        with open(log_file, 'r') as f:
+        with open_text(log_file) as f:
             content = f.read()
             lines = content.split('\n')
         
         for line in lines:
+            # Input phases, before the first timed prover phase:
+            # "Input load took: 0.012345678s (1234567 bytes on disk, 4567890 bytes decoded)"
+            if line.startswith('Input load took') and INPUT_LOAD_PATTERN.match(line):
+                seconds, on_disk, decoded = INPUT_LOAD_PATTERN.match(line).groups()
+                metrics['input_load_time_s'] = float(seconds)
+                metrics['input_bytes_on_disk'] = int(on_disk)
+                metrics['input_bytes'] = int(decoded)
+            elif line.startswith('Input parse took') and INPUT_PARSE_PATTERN.match(line):
+                metrics['input_parse_time_s'] = float(INPUT_PARSE_PATTERN.match(line).group(1))
+
+            # Image size (and blur region) as read from the input
+            elif line.startswith('Image:') and IMAGE_PATTERN.match(line):
+                height, width = IMAGE_PATTERN.match(line).groups()
+                metrics['image_height'] = int(height)
+                metrics['image_width'] = int(width)
+                region = BLUR_REGION_PATTERN.search(line)
+                if region:
+                    start_row, end_row, start_col, end_col = (int(v) for v in region.groups())
+                    metrics['region_height'] = end_row - start_row
+                    metrics['region_width'] = end_col - start_col
+
             # Circuit build time: "Circuit build took: 17.595223716s"
-            if 'Circuit build took:' in line:
+            elif 'Circuit build took:' in line:
                 value = extract_metric(line, r'Circuit build took:\s*([0-9.]+)s')
                 if value is not None:
                     metrics['circuit_build_time_s'] = value
@@ -94,6 +143,10 @@ def parse_veritas_log(log_file: Path) -> Dict[str, Optional[float]]:
                     metrics['peak_memory_kb'] = int(value)
                     metrics['peak_memory_mb'] = round(value / 1024.0, 2)
                     metrics['peak_memory_gb'] = round(value / (1024.0 * 1024.0), 3)
+
+        stats = time_stats.parse_time_stats(content)
+        metrics.update({k: stats[k] for k in time_stats.COUNTER_FIELDS})
+        metrics.update(time_stats.derive_efficiency(stats, time_stats.parse_cores(content) or cores))
     
     except Exception as e:
         print(f"Error reading {log_file}: {e}", file=sys.stderr)
@@ -102,14 +155,17 @@ def parse_veritas_log(log_file: Path) -> Dict[str, Optional[float]]:
 
 
 def find_log_files(directory: Path) -> list:
-    """Find all passport_xxxx_output.log files in the directory."""
-    log_files = sorted(directory.glob('passport_*_output.log'))
+    """Find all passport_xxxx_output.log files (plain or .gz/.zst) in the directory."""
+    log_files = glob_files(directory, 'passport_*_output.log')
     return log_files
 
 
 def main():
+    # Only used for logs that do not record their core count
+    cores = time_stats.pop_cores_arg(sys.argv)
+
     if len(sys.argv) < 2:
-        print("Usage: python3 extract_veritas_metrics.py <proofs_directory> [output_csv]")
+        print("Usage: python3 extract_veritas_metrics.py <proofs_directory> [output_csv] [--cores N]")
         print("\nExample:")
         print("  python3 extract_veritas_metrics.py veritas/benchmark/blur/proofs_laptop_hd")
         print("  python3 extract_veritas_metrics.py veritas/benchmark/blur/proofs_laptop_hd results.csv")
@@ -149,7 +205,7 @@ def main():
         else:
             passport_num = log_file.stem
         
-        metrics = parse_veritas_log(log_file)
+        metrics = parse_veritas_log(log_file, cores)
         metrics['file'] = log_file.name
         metrics['passport_id'] = passport_num
         
@@ -174,6 +230,7 @@ def main():
     fieldnames = [
         'passport_id',
         'file',
+    ] + INPUT_FIELDS + IMAGE_FIELDS + [
         'circuit_build_time_s',
         'proof_generation_time_s',
         'verification_time_ms',
@@ -182,7 +239,7 @@ def main():
         'peak_memory_kb',
         'peak_memory_mb',
         'peak_memory_gb',
-    ]
+    ] + time_stats.COUNTER_FIELDS + time_stats.DERIVED_FIELDS
     
     with open(output_file, 'w', newline='') as csvfile:
         writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
@@ -201,12 +258,18 @@ def main():
     print("-" * 60)
     
     numeric_fields = [
+        'input_load_time_s',
+        'input_parse_time_s',
         'circuit_build_time_s',
         'proof_generation_time_s',
         'verification_time_ms',
         'constraints',
         'variables',
         'peak_memory_mb',
+        'parallel_efficiency',
+        'sys_share',
+        'minor_faults_per_gb',
+        'involuntary_switches_per_s',
     ]
     
     for field in numeric_fields:
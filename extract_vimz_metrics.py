@@ -3,7 +3,16 @@
 Extract metrics from VIMz proof generation log files and output to CSV.
 
 Usage:
-    python3 extract_vimz_metrics.py <proofs_directory> [output_csv]
+    python3 extract_vimz_metrics.py <proofs_directory> [output_csv] [--cores N]
+
+The /usr/bin/time counters (CPU time, page faults, context switches, file system I/O)
+are extracted along with the derived parallel efficiency, system-time share and
+faults per GB of peak RSS (see time_stats.py). The core count is read from each
+log's "Cores available" line; --cores supplies it for older logs without one, and
+otherwise cores and parallel_efficiency are left empty.
+
+Logs produced with `vimz --step-timing` also get per-step percentiles in the CSV,
+and a per-image step-time trace is written to <proofs_directory>_step_trace.csv.
 
 Example:
     python3 extract_vimz_metrics.py vimz/image_converter/blur/proofs_laptop_hd
@@ -14,7 +23,31 @@ import re
 import sys
 import csv
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
+
+import time_stats
+from compressed_io import glob_files, open_text
+
+# Per-step summaries reported for each phase of RecursiveSNARK creation
+STEP_PHASES = ('witness', 'prove')
+STEP_PERCENTILES = (50, 90, 99)
+
+# "Proof <step> took 0.012345s (bincode, 10432 bytes)" -> proof_<key>_time_s
+PROOF_IO_STEPS = {
+    'serialization': 'serialize',
+    'write': 'write',
+    'read': 'read',
+    'deserialization': 'deserialize',
+}
+PROOF_IO_PATTERN = re.compile(r'^Proof (\w+) took ([0-9.]+)s \((\w+), ([0-9]+) bytes\)')
+PROOF_IO_FIELDS = ['proof_format', 'proof_size_bytes'] + \
+    [f'proof_{key}_time_s' for key in PROOF_IO_STEPS.values()]
+
+# "Input load took 0.012345s (1234567 bytes on disk, 4567890 bytes decoded)"
+# "Input parse took 0.234567s (4567890 bytes)"
+INPUT_LOAD_PATTERN = re.compile(r'^Input load took:?\s*([0-9.]+)s \(([0-9]+) bytes on disk, ([0-9]+) bytes decoded\)')
+INPUT_PARSE_PATTERN = re.compile(r'^Input parse took:?\s*([0-9.]+)s \(([0-9]+) bytes\)')
+INPUT_FIELDS = ['input_load_time_s', 'input_parse_time_s', 'input_bytes_on_disk', 'input_bytes']
 
 
 def extract_metric(line: str, pattern: str, default: Optional[float] = None) -> Optional[float]:
@@ -28,18 +61,82 @@ def extract_metric(line: str, pattern: str, default: Optional[float] = None) ->
     return default
 
 
-def parse_vimz_log(log_file: Path) -> Dict[str, Optional[float]]:
+def parse_step_timings(lines: List[str]) -> Dict[str, List[int]]:
+    """
+    Read the per-step durations printed by `vimz --step-timing` from the log lines:
+
+        STEP_TIMING witness_us 1203,1187,...
+        STEP_TIMING prove_us 5021,4990,...
+
+    Returns {'witness': [...], 'prove': [...]} in microseconds (empty if absent).
+    """
+    timings = {phase: [] for phase in STEP_PHASES}
+    for line in lines:
+        if line.startswith('STEP_TIMING '):
+            _, label, values = line.split(maxsplit=2)
+            phase = label[:-len('_us')]
+            if phase in timings:
+                timings[phase] = [int(v) for v in values.split(',') if v]
+    return timings
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Linear-interpolated percentile of an unsorted list."""
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * pct / 100.0
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def summarize_steps(timings: Dict[str, List[int]]) -> Dict[str, Optional[float]]:
     """
-    Parse a VIMz output log file and extract metrics.
+    Percentiles (ms) of each phase's per-step times, plus the drift: median of the
+    last tenth of the steps divided by the median of the first tenth (> 1 means
+    later steps are slower).
+    """
+    summary = {}
+    for phase in STEP_PHASES:
+        values = timings.get(phase) or []
+        for pct in STEP_PERCENTILES:
+            summary[f'{phase}_step_p{pct}_ms'] = round(percentile(values, pct) / 1000.0, 3) if values else None
+        summary[f'{phase}_step_max_ms'] = round(max(values) / 1000.0, 3) if values else None
+        tenth = max(1, len(values) // 10)
+        if len(values) >= 2 * tenth and percentile(values[:tenth], 50) > 0:
+            summary[f'{phase}_step_drift'] = round(percentile(values[-tenth:], 50) / percentile(values[:tenth], 50), 3)
+        else:
+            summary[f'{phase}_step_drift'] = None
+    summary['steps'] = len(timings.get('prove') or timings.get('witness') or []) or None
+    return summary
+
+
+STEP_FIELDS = [f'{phase}_step_p{pct}_ms' for phase in STEP_PHASES for pct in STEP_PERCENTILES] + \
+    [f'{phase}_step_{stat}' for phase in STEP_PHASES for stat in ('max_ms', 'drift')]
+
+
+def parse_vimz_log(log_file: Path, cores: Optional[int] = None) -> Dict[str, Optional[float]]:
+    """Metrics of a VIMz output log file, see parse_vimz_log_with_steps."""
+    return parse_vimz_log_with_steps(log_file, cores)[0]
+
+
+def parse_vimz_log_with_steps(log_file: Path, cores: Optional[int] = None
+                              ) -> Tuple[Dict[str, Optional[float]], Dict[str, List[int]]]:
+    """
+    Parse a VIMz output log file and extract metrics, plus the raw per-step
+    durations of --step-timing (see parse_step_timings).
     
     Returns a dictionary with the following keys:
+    - input_load_time_s, input_parse_time_s, input_bytes_on_disk, input_bytes
     - key_generation_time_s
     - recursive_snark_creation_time_s
+    - witness_generation_time_s, folding_time_s (with --step-timing)
+    - steps and per-step percentiles, max and drift (with --step-timing, see summarize_steps)
     - recursive_snark_verify_time_s
     - recursive_snark_verify_time_ms
     - compressed_snark_prove_time_s
     - compressed_snark_verify_time_s
     - compressed_snark_verify_time_ms
+    - proof_format, proof_size_bytes and proof_{serialize,write,read,deserialize}_time_s
     - constraints_primary
     - variables_primary
     - constraints_secondary
@@ -47,15 +144,21 @@ def parse_vimz_log(log_file: Path) -> Dict[str, Optional[float]]:
     - peak_memory_kb
     - peak_memory_mb
     - peak_memory_gb
+    - /usr/bin/time counters and derived efficiency metrics (time_stats.COUNTER_FIELDS
+      and time_stats.DERIVED_FIELDS; cores is used when the log records no core count)
     """
     metrics = {
+        **{field: None for field in INPUT_FIELDS},
         'key_generation_time_s': None,
         'recursive_snark_creation_time_s': None,
+        'witness_generation_time_s': None,
+        'folding_time_s': None,
         'recursive_snark_verify_time_s': None,
         'recursive_snark_verify_time_ms': None,
         'compressed_snark_prove_time_s': None,
         'compressed_snark_verify_time_s': None,
         'compressed_snark_verify_time_ms': None,
+        **{field: None for field in PROOF_IO_FIELDS},
         'constraints_primary': None,
         'variables_primary': None,
         'constraints_secondary': None,
@@ -64,15 +167,26 @@ def parse_vimz_log(log_file: Path) -> Dict[str, Optional[float]]:
         'peak_memory_mb': None,
         'peak_memory_gb': None,
     }
+    timings = {phase: [] for phase in STEP_PHASES}
     
     try:
-        with open(log_file, 'r') as f:
+        with open_text(log_file) as f:
             content = f.read()
             lines = content.split('\n')
         
         for line in lines:
+            # Input phases, before the first timed prover phase:
+            # "Input load took 0.012345s (1234567 bytes on disk, 4567890 bytes decoded)"
+            if line.startswith('Input load took') and INPUT_LOAD_PATTERN.match(line):
+                seconds, on_disk, decoded = INPUT_LOAD_PATTERN.match(line).groups()
+                metrics['input_load_time_s'] = float(seconds)
+                metrics['input_bytes_on_disk'] = int(on_disk)
+                metrics['input_bytes'] = int(decoded)
+            elif line.startswith('Input parse took') and INPUT_PARSE_PATTERN.match(line):
+                metrics['input_parse_time_s'] = float(INPUT_PARSE_PATTERN.match(line).group(1))
+
             # Key generation time: "Creating keys from R1CS took 28.576486843s"
-            if 'Creating keys from R1CS took' in line:
+            elif 'Creating keys from R1CS took' in line:
                 value = extract_metric(line, r'Creating keys from R1CS took\s+([0-9.]+)s')
                 if value is not None:
                     metrics['key_generation_time_s'] = value
@@ -82,6 +196,12 @@ def parse_vimz_log(log_file: Path) -> Dict[str, Optional[float]]:
                 value = extract_metric(line, r'RecursiveSNARK creation took\s+([0-9.]+)s')
                 if value is not None:
                     metrics['recursive_snark_creation_time_s'] = value
+
+            # With --step-timing: "Witness generation took 402.123456s" / "Folding took 0.788700s"
+            elif line.startswith('Witness generation took'):
+                metrics['witness_generation_time_s'] = extract_metric(line, r'took\s+([0-9.]+)s')
+            elif line.startswith('Folding took'):
+                metrics['folding_time_s'] = extract_metric(line, r'took\s+([0-9.]+)s')
             
             # RecursiveSNARK verify time: "RecursiveSNARK::verify: ... took 1.596634548s"
             elif 'RecursiveSNARK::verify' in line and 'took' in line:
@@ -117,6 +237,14 @@ def parse_vimz_log(log_file: Path) -> Dict[str, Optional[float]]:
                     metrics['compressed_snark_verify_time_s'] = value
                     metrics['compressed_snark_verify_time_ms'] = value * 1000.0
             
+            # Proof I/O: "Proof serialization took 0.012345s (bincode, 10432 bytes)"
+            elif line.startswith('Proof ') and PROOF_IO_PATTERN.match(line):
+                step, seconds, proof_format, size = PROOF_IO_PATTERN.match(line).groups()
+                if step in PROOF_IO_STEPS:
+                    metrics[f'proof_{PROOF_IO_STEPS[step]}_time_s'] = float(seconds)
+                    metrics['proof_format'] = proof_format
+                    metrics['proof_size_bytes'] = int(size)
+
             # Primary circuit constraints: "Number of constraints per step (primary circuit): 559724"
             elif 'Number of constraints per step (primary circuit):' in line:
                 value = extract_metric(line, r'Number of constraints per step \(primary circuit\):\s*([0-9]+)')
@@ -148,23 +276,33 @@ def parse_vimz_log(log_file: Path) -> Dict[str, Optional[float]]:
                     metrics['peak_memory_kb'] = int(value)
                     metrics['peak_memory_mb'] = round(value / 1024.0, 2)
                     metrics['peak_memory_gb'] = round(value / (1024.0 * 1024.0), 3)
+
+        timings = parse_step_timings(lines)
+        metrics.update(summarize_steps(timings))
+
+        stats = time_stats.parse_time_stats(content)
+        metrics.update({k: stats[k] for k in time_stats.COUNTER_FIELDS})
+        metrics.update(time_stats.derive_efficiency(stats, time_stats.parse_cores(content) or cores))
     
     except Exception as e:
         print(f"Warning: Error reading {log_file}: {e}", file=sys.stderr)
         # Return empty metrics but still include the row
     
-    return metrics
+    return metrics, timings
 
 
 def find_log_files(directory: Path) -> list:
-    """Find all passport_xxxx_output.log files in the directory."""
-    log_files = sorted(directory.glob('passport_*_output.log'))
+    """Find all passport_xxxx_output.log files (plain or .gz/.zst) in the directory."""
+    log_files = glob_files(directory, 'passport_*_output.log')
     return log_files
 
 
 def main():
+    # Only used for logs that do not record their core count
+    cores = time_stats.pop_cores_arg(sys.argv)
+
     if len(sys.argv) < 2:
-        print("Usage: python3 extract_vimz_metrics.py <proofs_directory> [output_csv]")
+        print("Usage: python3 extract_vimz_metrics.py <proofs_directory> [output_csv] [--cores N]")
         print("\nExample:")
         print("  python3 extract_vimz_metrics.py vimz/image_converter/blur/proofs_laptop_hd")
         print("  python3 extract_vimz_metrics.py vimz/image_converter/blur/proofs_laptop_hd results.csv")
@@ -195,6 +333,7 @@ def main():
     # Extract metrics from all log files
     all_metrics = []
     failed_files = []
+    step_traces = []
     
     for log_file in log_files:
         # Extract passport number from filename (e.g., passport_0000_output.log -> 0000)
@@ -204,9 +343,14 @@ def main():
         else:
             passport_num = log_file.stem
         
-        metrics = parse_vimz_log(log_file)
+        metrics, timings = parse_vimz_log_with_steps(log_file, cores)
         metrics['file'] = log_file.name
         metrics['passport_id'] = passport_num
+
+        for step, witness_us in enumerate(timings['witness']):
+            prove_us = timings['prove'][step] if step < len(timings['prove']) else None
+            step_traces.append({'passport_id': passport_num, 'step': step,
+                                'witness_us': witness_us, 'prove_us': prove_us})
         
         # Always include the row, even if no metrics were extracted
         all_metrics.append(metrics)
@@ -227,13 +371,17 @@ def main():
     fieldnames = [
         'passport_id',
         'file',
+    ] + INPUT_FIELDS + [
         'key_generation_time_s',
         'recursive_snark_creation_time_s',
+        'witness_generation_time_s',
+        'folding_time_s',
         'recursive_snark_verify_time_s',
         'recursive_snark_verify_time_ms',
         'compressed_snark_prove_time_s',
         'compressed_snark_verify_time_s',
         'compressed_snark_verify_time_ms',
+    ] + PROOF_IO_FIELDS + [
         'constraints_primary',
         'variables_primary',
         'constraints_secondary',
@@ -241,7 +389,8 @@ def main():
         'peak_memory_kb',
         'peak_memory_mb',
         'peak_memory_gb',
-    ]
+        'steps',
+    ] + STEP_FIELDS + time_stats.COUNTER_FIELDS + time_stats.DERIVED_FIELDS
     
     with open(output_file, 'w', newline='') as csvfile:
         writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
@@ -254,23 +403,42 @@ def main():
     
     print(f"\n✓ Processed {len(all_metrics)} files (all rows included)")
     print(f"✓ CSV written to: {output_file}")
+
+    if step_traces:
+        trace_file = output_file.parent / f"{output_file.stem.replace('_metrics', '')}_step_trace.csv"
+        with open(trace_file, 'w', newline='') as csvfile:
+            writer = csv.DictWriter(csvfile, fieldnames=['passport_id', 'step', 'witness_us', 'prove_us'])
+            writer.writeheader()
+            writer.writerows(step_traces)
+        print(f"✓ Step trace written to: {trace_file}")
     
     # Print summary statistics (only for files with metrics)
     print("\nSummary Statistics (files with extracted metrics):")
     print("-" * 70)
     
     numeric_fields = [
+        'input_load_time_s',
+        'input_parse_time_s',
         'key_generation_time_s',
         'recursive_snark_creation_time_s',
+        'witness_generation_time_s',
+        'folding_time_s',
         'recursive_snark_verify_time_ms',
         'compressed_snark_prove_time_s',
         'compressed_snark_verify_time_ms',
+        'proof_size_bytes',
+        'proof_serialize_time_s',
+        'proof_deserialize_time_s',
         'constraints_primary',
         'variables_primary',
         'constraints_secondary',
         'variables_secondary',
         'peak_memory_mb',
-    ]
+        'parallel_efficiency',
+        'sys_share',
+        'minor_faults_per_gb',
+        'involuntary_switches_per_s',
+    ] + STEP_FIELDS
     
     for field in numeric_fields:
         values = [m[field] for m in all_metrics if m.get(field) is not None]
@@ -0,0 +1,590 @@
+#!/usr/bin/env python3
+"""
+Golden-output benchmark and regression suite for the converter hot loops.
+
+The legacy reference implementations of compress, conv2d, resize_image (VIMz),
+resize_image_bilinear and apply_blur (Veritas) are frozen below. Every implementation
+found in the converter scripts and in vimz/py_modules/image_formatter.py - including any
+faster <name>_fast variant - is run on the same inputs:
+
+    - centre crops of the passport images at QVGA (240x320), SD (480x640) and HD (720x1280)
+    - synthetic edge cases: saturated 0/255 pixels, a 0/255 checkerboard, odd widths,
+      row counts that are not a multiple of 10, tiny and single-row images
+
+Each output is serialized the way the converters write it (json.dumps with indent 4 for
+VIMz, 2 for Veritas) and must be byte-identical to the reference output; an exception
+must be of the same type. Implementations whose code is identical to the reference (or to
+another candidate) are run once. Throughput per resolution (ops/sec and Mpixel/s) is
+appended to a history CSV so speedups and regressions can be followed over time.
+
+The default run (2 passports, QVGA/SD/HD) takes a few minutes; --quick (1 passport,
+QVGA/SD) well under one. The exit status is 1 when any output differs.
+
+Usage:
+    python3 golden_bench.py [--functions NAME ...] [--resolutions QVGA SD HD] [--passports N]
+                            [--repeat N] [--history FILE | --no-history] [--quick]
+
+Example:
+    python3 golden_bench.py --quick
+    python3 golden_bench.py --functions compress conv2d --resolutions HD --repeat 3
+"""
+
+import argparse
+import ast
+import csv
+import inspect
+import json
+import socket
+import sys
+import textwrap
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+from converter_modules import load_module
+from results_db import git_revision
+
+
+ROOT = Path(__file__).resolve().parent
+DEFAULT_PASSPORTS = ROOT / 'vimz' / 'image_converter' / 'passports_hd'
+DEFAULT_HISTORY = ROOT / 'golden_history.csv'
+
+# (height, width) of the centre crop taken from each passport
+RESOLUTIONS = {
+    'QVGA': (240, 320),
+    'SD': (480, 640),
+    'HD': (720, 1280),
+}
+
+BLUR_KERNEL = np.array([[1, 1, 1], [1, 1, 1], [1, 1, 1]])
+SHARPEN_KERNEL = np.array([[0, -1, 0], [-1, 5, -1], [0, -1, 0]])
+
+HISTORY_FIELDS = [
+    'timestamp', 'git_revision', 'host', 'function', 'variant', 'implementation',
+    'resolution', 'height', 'width', 'pixels', 'repeat', 'seconds_per_op',
+    'ops_per_s', 'mpixels_per_s', 'speedup', 'identical',
+]
+
+
+# ---------------------------------------------------------------------------
+# Legacy reference implementations (frozen - do not optimize)
+# ---------------------------------------------------------------------------
+
+def compress(image_array):
+    array_in = image_array.tolist()
+    output_array = []
+
+    for i in range(len(array_in)):
+        row = []
+        hexValue = ''
+        for j in range(len(array_in[i])):
+            if np.isscalar(array_in[i][j]):
+                hexValue = hex(int(array_in[i][j]))[2:].zfill(6) + hexValue
+            else:
+                for k in range(0, 3):
+                    hexValue = hex(int(array_in[i][j][k]))[2:].zfill(2) + hexValue
+            if j % 10 == 9:
+                row.append("0x" + hexValue)
+                hexValue = ''
+        output_array.append(row)
+    return output_array
+
+
+def conv2d(array, kernel, weight=1):
+    array_height, array_width = len(array), len(array[0])
+    kernel_height, kernel_width = len(kernel), len(kernel[0])
+
+    border_size = kernel_height // 2
+    extended = [[0 for _ in range(array_width + border_size * 2)]
+                for _ in range(array_height + border_size * 2)]
+    for i in range(array_height):
+        for j in range(array_width):
+            extended[i+border_size][j+border_size] = array[i][j]
+
+    convolved_array = [[0 for _ in range(array_width)] for _ in range(array_height)]
+
+    for i in range(array_height):
+        for j in range(array_width):
+            conv_value = 0
+            for m in range(kernel_height):
+                for n in range(kernel_width):
+                    conv_value += extended[i + m][j + n] * kernel[m][n]
+            convolved_array[i][j] = conv_value // weight
+            if convolved_array[i][j] > 255:
+                convolved_array[i][j] = 255
+            elif convolved_array[i][j] < 0:
+                convolved_array[i][j] = 0
+
+    return convolved_array
+
+
+def resize_image(image_array, new_height, new_width):
+    height, width, channels = image_array.shape
+
+    x_ratio = float(width) / float(new_width)
+    y_ratio = float(height) / float(new_height)
+
+    new_img_array = np.zeros((new_height, new_width, channels), dtype=np.uint8)
+
+    if height == 720:
+        for i in range(new_height):
+            for j in range(new_width):
+                x_l = int(j * x_ratio)
+                x_h = int(j * x_ratio) + 1
+                y_l = int(i * y_ratio)
+                y_h = int(i * y_ratio) + 1
+
+                a = image_array[y_l, x_l]
+                b = image_array[y_l, x_h]
+                c = image_array[y_h, x_l]
+                d = image_array[y_h, x_h]
+
+                weight = 2 if i % 2 == 0 else 1
+                weight = float(weight) / 3
+                summ = a * weight + b * weight + c * (1 - weight) + d * (1 - weight)
+                new_img_array[i, j] = summ / 2
+    else:
+        for i in range(new_height):
+            for j in range(new_width):
+                x_l = int(j * x_ratio)
+                x_h = int(j * x_ratio) + 1
+                y_l = int(i * y_ratio)
+                y_h = int(i * y_ratio) + 1
+
+                a = image_array[y_l, x_l]
+                b = image_array[y_l, x_h]
+                c = image_array[y_h, x_l]
+                d = image_array[y_h, x_h]
+
+                weight = float(1) / 2
+                summ = a * weight + b * weight + c * weight + d * weight
+                new_img_array[i, j] = summ / 2
+
+    return new_img_array
+
+
+def resize_image_bilinear(image_array, new_height, new_width):
+    height, width = image_array.shape
+
+    resized = np.zeros((new_height, new_width), dtype=np.uint8)
+
+    for i in range(new_height):
+        for j in range(new_width):
+            x_l = int((width - 1) * j / (new_width - 1)) if new_width > 1 else 0
+            y_l = int((height - 1) * i / (new_height - 1)) if new_height > 1 else 0
+
+            x_h = x_l if x_l * (new_width - 1) == (width - 1) * j else min(x_l + 1, width - 1)
+            y_h = y_l if y_l * (new_height - 1) == (height - 1) * i else min(y_l + 1, height - 1)
+
+            a = int(image_array[y_l, x_l])
+            b = int(image_array[y_l, x_h])
+            c = int(image_array[y_h, x_l])
+            d = int(image_array[y_h, x_h])
+
+            x_ratio_weighted = ((width - 1) * j) - (new_width - 1) * ((width - 1) * j // (new_width - 1)) if new_width > 1 else 0
+            y_ratio_weighted = ((height - 1) * i) - (new_height - 1) * ((height - 1) * i // (new_height - 1)) if new_height > 1 else 0
+
+            denom = (new_width - 1) * (new_height - 1) if (new_width > 1 and new_height > 1) else 1
+            s = (a * (new_width - 1 - x_ratio_weighted) * (new_height - 1 - y_ratio_weighted) +
+                 b * x_ratio_weighted * (new_height - 1 - y_ratio_weighted) +
+                 c * y_ratio_weighted * (new_width - 1 - x_ratio_weighted) +
+                 d * x_ratio_weighted * y_ratio_weighted)
+
+            new_val = int(round(s / denom)) if denom > 0 else int(round((a + b + c + d) / 4))
+            resized[i, j] = max(0, min(255, new_val))
+
+    return resized
+
+
+def apply_blur(image_array, blur_region=None):
+    height, width = image_array.shape
+    if blur_region:
+        start_row, start_col, blur_h, blur_w = blur_region
+        end_row = min(start_row + blur_h, height - 1)
+        end_col = min(start_col + blur_w, width - 1)
+    else:
+        start_row, start_col = 1, 1
+        end_row, end_col = height - 1, width - 1
+
+    blurred = image_array.copy()
+
+    for i in range(start_row, end_row):
+        for j in range(start_col, end_col):
+            sum_val = (int(image_array[i-1][j-1]) + int(image_array[i-1][j]) + int(image_array[i-1][j+1]) +
+                       int(image_array[i][j-1])   + int(image_array[i][j])   + int(image_array[i][j+1]) +
+                       int(image_array[i+1][j-1]) + int(image_array[i+1][j]) + int(image_array[i+1][j+1]))
+
+            blurred[i][j] = int(round(sum_val / 9.0))
+            blurred[i][j] = max(0, min(255, blurred[i][j]))
+
+    return blurred
+
+
+# ---------------------------------------------------------------------------
+# Functions under test: reference, converter modules, JSON indent, call variants
+# ---------------------------------------------------------------------------
+
+VIMZ_CONVERTERS = ['blur', 'brightness', 'contrast', 'crop', 'grayscale', 'resize', 'sharpness']
+IMAGE_FORMATTER = 'vimz/py_modules/image_formatter.py'
+
+
+def variants_compress(case: Dict) -> List[Tuple[str, tuple]]:
+    return [('rgb', (case['rgb'],)), ('gray', (case['gray'],))]
+
+
+def variants_conv2d(case: Dict) -> List[Tuple[str, tuple]]:
+    # The converters convolve one channel at a time, as a view from np.rollaxis
+    channel = np.rollaxis(case['rgb'], axis=-1)[0]
+    return [('blur', (channel, BLUR_KERNEL, 9)), ('sharpen', (channel, SHARPEN_KERNEL))]
+
+
+def variants_resize_image(case: Dict) -> List[Tuple[str, tuple]]:
+    height, width = case['gray'].shape
+    return [('2/3x1/2', (case['rgb'], height * 2 // 3, width // 2))]
+
+
+def variants_resize_image_bilinear(case: Dict) -> List[Tuple[str, tuple]]:
+    height, width = case['gray'].shape
+    return [('2/3x1/2', (case['gray'], height * 2 // 3, width // 2))]
+
+
+def variants_apply_blur(case: Dict) -> List[Tuple[str, tuple]]:
+    height, width = case['gray'].shape
+    return [('full', (case['gray'],)), ('region', (case['gray'], (1, 1, height // 2, width // 2)))]
+
+
+# name -> (reference, JSON indent, variants, [(module path, attribute), ...])
+FUNCTIONS: Dict[str, Tuple[Callable, int, Callable, List[Tuple[str, str]]]] = {
+    'compress': (compress, 4, variants_compress,
+                 [(f'vimz/image_converter/{t}/{t}.py', 'compress') for t in VIMZ_CONVERTERS] +
+                 [(IMAGE_FORMATTER, 'compress')]),
+    'conv2d': (conv2d, 4, variants_conv2d,
+               [('vimz/image_converter/blur/blur.py', 'conv2d'),
+                ('vimz/image_converter/sharpness/sharpness.py', 'conv2d'),
+                (IMAGE_FORMATTER, 'conv2d')]),
+    'resize_image': (resize_image, 4, variants_resize_image,
+                     [('vimz/image_converter/resize/resize.py', 'resize_image'),
+                      (IMAGE_FORMATTER, 'resize_array')]),
+    'resize_image_bilinear': (resize_image_bilinear, 2, variants_resize_image_bilinear,
+                              [('veritas/benchmark/resize/resize.py', 'resize_image_bilinear')]),
+    'apply_blur': (apply_blur, 2, variants_apply_blur,
+                   [('veritas/benchmark/blur/blur.py', 'apply_blur')]),
+}
+
+
+def fingerprint(func: Callable) -> Optional[str]:
+    """AST of a function without its name, docstring and comments; None if unavailable."""
+    try:
+        tree = ast.parse(textwrap.dedent(inspect.getsource(func)))
+    except (OSError, TypeError, SyntaxError):
+        return None
+    node = tree.body[0]
+    node.name = '_'
+    if (node.body and isinstance(node.body[0], ast.Expr)
+            and isinstance(node.body[0].value, ast.Constant) and isinstance(node.body[0].value.value, str)):
+        node.body = node.body[1:]
+    return ast.dump(node, annotate_fields=False)
+
+
+def collect_candidates(name: str) -> Tuple[List[Dict], List[str]]:
+    """
+    Candidate implementations for one function, grouped by identical code.
+
+    Returns (candidates, same_as_reference) where each candidate is
+    {'label': 'blur.py:conv2d, sharpness.py:conv2d', 'func': callable}.
+    """
+    reference, _, _, locations = FUNCTIONS[name]
+    reference_print = fingerprint(reference)
+    groups: Dict[str, Dict] = {}
+    same_as_reference = []
+
+    for relative_path, attribute in locations:
+        module = load_module(relative_path)
+        if module is None:
+            continue
+        for attr in (attribute, attribute + '_fast'):
+            func = getattr(module, attr, None)
+            if not callable(func):
+                continue
+            label = f"{Path(relative_path).name}:{attr}"
+            code = fingerprint(func) or label
+            if code == reference_print:
+                same_as_reference.append(label)
+                continue
+            group = groups.setdefault(code, {'labels': [], 'func': func})
+            group['labels'].append(label)
+
+    candidates = [{'label': ', '.join(g['labels']), 'func': g['func']} for g in groups.values()]
+    return candidates, same_as_reference
+
+
+# ---------------------------------------------------------------------------
+# Inputs
+# ---------------------------------------------------------------------------
+
+def to_gray(rgb: np.ndarray) -> np.ndarray:
+    """Grayscale the way the Veritas converters do (PIL convert('L'))."""
+    return np.array(Image.fromarray(rgb).convert('L'), dtype=np.uint8)
+
+
+def passport_cases(passports_dir: Path, count: int, resolutions: List[str]) -> List[Dict]:
+    images = sorted(passports_dir.glob('*.png'))[:count]
+    cases = []
+    for image_path in images:
+        with Image.open(image_path) as image:
+            full = np.array(image.convert('RGB'))
+        for resolution in resolutions:
+            height, width = RESOLUTIONS[resolution]
+            if full.shape[0] < height or full.shape[1] < width:
+                print(f"  Skipping {image_path.name} at {resolution}: image is {full.shape[0]}x{full.shape[1]}")
+                continue
+            top = (full.shape[0] - height) // 2
+            left = (full.shape[1] - width) // 2
+            rgb = np.ascontiguousarray(full[top:top + height, left:left + width])
+            cases.append({'name': f"{image_path.stem}@{resolution}", 'resolution': resolution,
+                          'rgb': rgb, 'gray': to_gray(rgb)})
+    return cases
+
+
+def synthetic_cases(seed: int = 0) -> List[Dict]:
+    rng = np.random.default_rng(seed)
+
+    def random_rgb(height, width):
+        return rng.integers(0, 256, size=(height, width, 3), dtype=np.uint8)
+
+    checker = ((np.indices((22, 30)).sum(axis=0) % 2) * 255).astype(np.uint8)
+    specs = [
+        ('saturated_white', np.full((20, 30, 3), 255, dtype=np.uint8)),
+        ('saturated_black', np.zeros((20, 30, 3), dtype=np.uint8)),
+        ('checkerboard', np.dstack([checker] * 3)),
+        ('odd_width', random_rgb(24, 37)),
+        ('rows_not_multiple_of_10', random_rgb(23, 40)),
+        ('odd_width_and_rows', random_rgb(33, 47)),
+        ('tiny_3x3', random_rgb(3, 3)),
+        ('single_row', random_rgb(1, 20)),
+    ]
+    return [{'name': name, 'resolution': None, 'rgb': rgb, 'gray': to_gray(rgb)} for name, rgb in specs]
+
+
+# ---------------------------------------------------------------------------
+# Running
+# ---------------------------------------------------------------------------
+
+def serialize(result, indent: int) -> bytes:
+    if isinstance(result, np.ndarray):
+        result = result.tolist()
+    # conv2d returns nested lists of numpy integers
+    return json.dumps(result, indent=indent, default=lambda o: o.item()).encode()
+
+
+def run_once(func: Callable, args: tuple, indent: int) -> Tuple[bytes, float]:
+    """Serialized output (or the exception type) and the call time in seconds."""
+    args = tuple(a.copy() if isinstance(a, np.ndarray) else a for a in args)
+    start = time.perf_counter()
+    try:
+        result = func(*args)
+    except Exception as e:
+        return f"!error {type(e).__name__}".encode(), time.perf_counter() - start
+    elapsed = time.perf_counter() - start
+    return serialize(result, indent), elapsed
+
+
+def first_difference(a: bytes, b: bytes) -> str:
+    for offset, (x, y) in enumerate(zip(a, b)):
+        if x != y:
+            break
+    else:
+        offset = min(len(a), len(b))
+    return (f"first difference at byte {offset}: "
+            f"{a[max(0, offset - 20):offset + 20]!r} vs {b[max(0, offset - 20):offset + 20]!r}")
+
+
+def timed(func: Callable, args: tuple, indent: int, repeat: int) -> Tuple[bytes, float]:
+    """Output of the first call and the mean seconds per call over `repeat` calls."""
+    output, total = run_once(func, args, indent)
+    for _ in range(repeat - 1):
+        total += run_once(func, args, indent)[1]
+    return output, total / repeat
+
+
+def run_function(name: str, cases: List[Dict], repeat: int) -> Tuple[List[Dict], int]:
+    """Check every candidate of one function on every case; returns (timing rows, mismatches)."""
+    reference, indent, variants, _ = FUNCTIONS[name]
+    candidates, same_as_reference = collect_candidates(name)
+
+    print(f"\n{name}")
+    if same_as_reference:
+        print(f"  Identical to reference (not re-run): {', '.join(same_as_reference)}")
+    if not candidates:
+        print("  No other implementations; timing the reference only")
+
+    rows = []
+    mismatches = 0
+    for case in cases:
+        for variant, args in variants(case):
+            # Synthetic edge cases only check bytes; passport crops are also timed
+            count = repeat if case['resolution'] else 1
+            expected, ref_seconds = timed(reference, args, indent, count)
+            height, width = case['gray'].shape
+            if case['resolution']:
+                rows.append(timing_row(name, variant, 'reference', case, height, width, count, ref_seconds,
+                                       ref_seconds, True))
+
+            for candidate in candidates:
+                output, seconds = timed(candidate['func'], args, indent, count)
+                identical = output == expected
+                if not identical:
+                    mismatches += 1
+                    print(f"  ✗ {candidate['label']} on {case['name']} ({variant}): output differs, "
+                          f"{first_difference(expected, output)}")
+                if case['resolution']:
+                    rows.append(timing_row(name, variant, candidate['label'], case, height, width, count,
+                                           seconds, ref_seconds, identical))
+
+    if not candidates:
+        print(f"  ✓ Reference run on {len(cases)} input(s)")
+    elif not mismatches:
+        print(f"  ✓ {len(candidates)} implementation(s) byte-identical to reference on {len(cases)} input(s)")
+    else:
+        print(f"  ✗ {mismatches} mismatching output(s)")
+    return rows, mismatches
+
+
+def timing_row(function: str, variant: str, implementation: str, case: Dict, height: int, width: int,
+               repeat: int, seconds: float, ref_seconds: float, identical: bool) -> Dict:
+    return {
+        'function': function,
+        'variant': variant,
+        'implementation': implementation,
+        'case': case['name'],
+        'resolution': case['resolution'],
+        'height': height,
+        'width': width,
+        'pixels': height * width,
+        'repeat': repeat,
+        'seconds': seconds,
+        'ref_seconds': ref_seconds,
+        'identical': identical,
+    }
+
+
+def summarize(rows: List[Dict]) -> List[Dict]:
+    """Average the passports into one row per (function, variant, implementation, resolution)."""
+    groups: Dict[Tuple, List[Dict]] = {}
+    for row in rows:
+        key = (row['function'], row['variant'], row['implementation'], row['resolution'])
+        groups.setdefault(key, []).append(row)
+
+    summary = []
+    for (function, variant, implementation, resolution), items in groups.items():
+        seconds = sum(r['seconds'] for r in items) / len(items)
+        ref_seconds = sum(r['ref_seconds'] for r in items) / len(items)
+        pixels = items[0]['pixels']
+        summary.append({
+            'function': function,
+            'variant': variant,
+            'implementation': implementation,
+            'resolution': resolution,
+            'height': items[0]['height'],
+            'width': items[0]['width'],
+            'pixels': pixels,
+            'repeat': sum(r['repeat'] for r in items),
+            'seconds_per_op': round(seconds, 6),
+            'ops_per_s': round(1.0 / seconds, 3) if seconds > 0 else None,
+            'mpixels_per_s': round(pixels / seconds / 1e6, 3) if seconds > 0 else None,
+            'speedup': round(ref_seconds / seconds, 2) if seconds > 0 else None,
+            'identical': all(r['identical'] for r in items),
+        })
+    return summary
+
+
+def print_summary(summary: List[Dict]):
+    print(f"\n{'Function':<22} {'Variant':<8} {'Res':<5} {'Implementation':<40} "
+          f"{'ops/s':>9} {'Mpx/s':>8} {'Speedup':>8} {'Same':>5}")
+    print("-" * 111)
+    for row in summary:
+        implementation = row['implementation']
+        if len(implementation) > 40:
+            implementation = implementation[:37] + '...'
+        print(f"{row['function']:<22} {row['variant']:<8} {row['resolution']:<5} {implementation:<40} "
+              f"{row['ops_per_s']:>9.2f} {row['mpixels_per_s']:>8.3f} {row['speedup']:>7.2f}x "
+              f"{'yes' if row['identical'] else 'NO':>5}")
+
+
+def append_history(history_file: Path, summary: List[Dict], host: str):
+    stamp = time.strftime('%Y-%m-%dT%H:%M:%S')
+    revision = git_revision()
+    new_file = not history_file.exists()
+    history_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(history_file, 'a', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=HISTORY_FIELDS)
+        if new_file:
+            writer.writeheader()
+        for row in summary:
+            writer.writerow({'timestamp': stamp, 'git_revision': revision, 'host': host, **row})
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Check converter implementations against the frozen legacy outputs and record ops/sec'
+    )
+    parser.add_argument('--functions', nargs='+', choices=list(FUNCTIONS), default=list(FUNCTIONS),
+                        help='Functions to check (default: all)')
+    parser.add_argument('--resolutions', nargs='+', choices=list(RESOLUTIONS), default=['QVGA', 'SD', 'HD'],
+                        help='Passport crop sizes to time (default: QVGA SD HD)')
+    parser.add_argument('--passports', type=int, default=2, help='Passport images to use (default: 2)')
+    parser.add_argument('--passports-dir', default=str(DEFAULT_PASSPORTS),
+                        help='Directory of passport PNGs (default: vimz/image_converter/passports_hd)')
+    parser.add_argument('--repeat', type=int, default=1, help='Timed calls per input (default: 1)')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for the random synthetic cases (default: 0)')
+    parser.add_argument('--history', default=str(DEFAULT_HISTORY),
+                        help=f'History CSV to append to (default: {DEFAULT_HISTORY.name})')
+    parser.add_argument('--no-history', action='store_true', help='Do not append to the history file')
+    parser.add_argument('--host', default=socket.gethostname(), help='Host label (default: hostname)')
+    parser.add_argument('--quick', action='store_true', help='1 passport at QVGA and SD only')
+
+    args = parser.parse_args()
+    if args.quick:
+        args.passports = 1
+        args.resolutions = [r for r in args.resolutions if r != 'HD'] or ['QVGA']
+    if args.repeat < 1 or args.passports < 0:
+        print("Error: --repeat must be >= 1 and --passports >= 0", file=sys.stderr)
+        sys.exit(1)
+
+    passports_dir = Path(args.passports_dir)
+    if args.passports and not passports_dir.is_dir():
+        print(f"Error: Passport directory not found: {passports_dir}", file=sys.stderr)
+        sys.exit(1)
+
+    cases = synthetic_cases(args.seed) + passport_cases(passports_dir, args.passports, args.resolutions)
+    print(f"Golden benchmark: {len(args.functions)} function(s), {len(cases)} input(s) "
+          f"({args.passports} passport(s) at {', '.join(args.resolutions)} + synthetic edge cases)")
+
+    started = time.perf_counter()
+    rows = []
+    mismatches = 0
+    for name in args.functions:
+        function_rows, function_mismatches = run_function(name, cases, args.repeat)
+        rows.extend(function_rows)
+        mismatches += function_mismatches
+
+    summary = summarize(rows)
+    if summary:
+        print_summary(summary)
+    print(f"\nTotal time: {time.perf_counter() - started:.1f}s")
+
+    if summary and not args.no_history:
+        append_history(Path(args.history), summary, args.host)
+        print(f"✓ History appended to: {args.history}")
+
+    if mismatches:
+        print(f"✗ {mismatches} output(s) differ from the reference", file=sys.stderr)
+        sys.exit(1)
+    print("✓ All outputs byte-identical to the reference")
+
+
+if __name__ == '__main__':
+    main()
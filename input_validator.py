@@ -0,0 +1,623 @@
+#!/usr/bin/env python3
+"""
+Pre-flight validation of converted proof inputs, before any key generation or circuit build.
+
+The provers only notice a bad input late: the Veritas examples after parsing the whole
+JSON, VIMz when the witness generator reaches the bad row, and a "transformed" image that
+was not produced by the matching algorithm only when proving fails minutes later. This
+checks each input in well under a second:
+
+    shapes       rows of equal length, original/transformed dimensions that agree with
+                 each other, the header fields and (VIMz) the circuit resolution
+    packing      VIMz rows are "0x" + 60 hex digits (10 pixels of 24 bits each)
+    padding      VIMz blur/sharpness originals start and end with a zero row
+    ranges       pixel values in 0..255 (VIMz grayscale packs them into 24 bits)
+    transform    the transformation is recomputed with numpy from "original" and
+                 compared pixel by pixel with the transformed data
+
+An "original_ref" into the original store is resolved first (original_store.py), which
+also checks the stored block against its sha256.
+
+proof_runner.py runs it before launching each proof (--no-validate skips it) and the
+batch_generate_proofs.sh scripts run it over the input directory first (VALIDATE=0 skips it).
+
+Usage:
+    python3 input_validator.py <backend> <transformation> <input_json|input_dir> [...]
+                               [--resolution HD] [--no-recompute] [--jobs N]
+
+Example:
+    python3 input_validator.py vimz blur vimz/image_converter/blur/outputs_hd --resolution HD
+    python3 input_validator.py veritas resize veritas/benchmark/resize/outputs_hd/passport_0000.json
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+import compressed_io
+import original_store
+
+# The VIMz point-operation tables live in the image formatter library
+ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(ROOT / 'vimz' / 'py_modules'))
+from image_formatter import brightness_lut, contrast_lut  # noqa: E402
+
+
+BACKENDS = ('vimz', 'veritas')
+
+VIMZ_TRANSFORMATIONS = ('blur', 'brightness', 'contrast', 'crop', 'grayscale', 'resize', 'sharpness')
+VERITAS_TRANSFORMATIONS = ('blur', 'crop', 'grayscale', 'resize')
+
+# (height, width) of the frame each VIMz circuit resolution folds over (nova main.rs)
+VIMZ_FRAMES = {
+    'HD': (720, 1280),
+    '4K': (2160, 3840),
+    '8K': (4320, 7680),
+}
+
+# Resized frame per source resolution
+VIMZ_RESIZED = {
+    'HD': (480, 640),
+    '4K': (1080, 1920),
+}
+
+# 3x3 kernels and weights of the VIMz convolution transforms
+VIMZ_KERNELS = {
+    'blur': (np.ones((3, 3), dtype=np.int64), 9),
+    'sharpness': (np.array([[0, -1, 0], [-1, 5, -1], [0, -1, 0]], dtype=np.int64), 1),
+}
+
+# One packed VIMz entry: "0x" + 10 pixels x 6 hex digits
+PIXELS_PER_ENTRY = 10
+ENTRY_LENGTH = 2 + 6 * PIXELS_PER_ENTRY
+
+# Value of every hex digit byte, 255 for anything else
+HEX_VALUES = np.full(256, 255, dtype=np.uint8)
+for _value, _digit in enumerate('0123456789abcdef'):
+    HEX_VALUES[ord(_digit)] = _value
+    HEX_VALUES[ord(_digit.upper())] = _value
+
+# Mismatch examples listed per array
+MAX_EXAMPLES = 3
+
+
+def describe_mismatch(name: str, expected: np.ndarray, actual: np.ndarray, what: str,
+                      offset: Tuple[int, int] = (0, 0)) -> Optional[str]:
+    """One error line for the pixels where actual differs from expected, or None."""
+    if expected.shape != actual.shape:
+        return f"{name}: shape {actual.shape} does not match the recomputed {what} {expected.shape}"
+    differs = expected != actual
+    if differs.ndim == 3:
+        differs = differs.any(axis=2)
+    positions = np.argwhere(differs)
+    if not len(positions):
+        return None
+    examples = []
+    for row, col in positions[:MAX_EXAMPLES]:
+        examples.append(f"({row + offset[0]}, {col + offset[1]}): expected "
+                        f"{expected[row, col].tolist()}, got {actual[row, col].tolist()}")
+    return (f"{name}: {len(positions)} pixel(s) differ from the recomputed {what}, e.g. "
+            + '; '.join(examples))
+
+
+def int_matrix(value, name: str, errors: List[str], channels: Optional[int] = None) -> Optional[np.ndarray]:
+    """
+    Veritas pixel matrix as an int64 array, or None after recording why it is unusable.
+
+    channels=None expects [[v, ...], ...]; channels=3 expects [[[R, G, B], ...], ...].
+    """
+    if not isinstance(value, list) or not value:
+        errors.append(f"{name}: missing or empty")
+        return None
+    try:
+        array = np.array(value)
+    except ValueError:
+        errors.append(f"{name}: rows have different lengths")
+        return None
+    ndim = 2 if channels is None else 3
+    if array.ndim != ndim or (channels and array.shape[2] != channels) or array.dtype == object:
+        errors.append(f"{name}: expected a {'H x W' if channels is None else 'H x W x 3'} matrix, "
+                      f"got shape {array.shape}")
+        return None
+    if array.dtype.kind not in 'iu':
+        errors.append(f"{name}: pixel values must be integers, got {array.dtype}")
+        return None
+    out_of_range = (array < 0) | (array > 255)
+    if out_of_range.any():
+        errors.append(f"{name}: {int(out_of_range.sum())} value(s) outside 0..255")
+        return None
+    return array.astype(np.int64)
+
+
+def check_header(data: Dict, fields: List[Tuple[str, int]], errors: List[str], where: str = ''):
+    """Header fields that are present must equal the dimensions of the data."""
+    for key, actual in fields:
+        expected = data.get(key)
+        if expected is not None and expected != actual:
+            errors.append(f"{where}{key}: header says {expected}, data has {actual}")
+
+
+def decode_rows(rows, name: str, errors: List[str], gray: bool = False) -> Optional[np.ndarray]:
+    """
+    Unpack VIMz compressed rows into a uint8 image, vectorized.
+
+    Each entry packs 10 pixels, pixel 0 in the least significant 24 bits: B<<16|G<<8|R for
+    RGB, the value itself for grayscale. Returns (H, W, 3) or (H, W) with W = 10 * entries
+    per row, or None after recording the errors.
+    """
+    if not isinstance(rows, list) or not rows or not all(isinstance(row, list) for row in rows):
+        errors.append(f"{name}: missing, empty or not a list of rows")
+        return None
+    groups = len(rows[0])
+    uneven = [i for i, row in enumerate(rows) if len(row) != groups]
+    if groups == 0 or uneven:
+        errors.append(f"{name}: rows must have the same non-zero number of entries "
+                      f"(row 0 has {groups}, {len(uneven)} row(s) differ)")
+        return None
+
+    entries = np.array(list(chain.from_iterable(rows)))
+    if entries.dtype.kind != 'U':
+        errors.append(f"{name}: entries must be hex strings")
+        return None
+    if entries.dtype.itemsize // 4 > ENTRY_LENGTH:
+        errors.append(f"{name}: entries longer than {ENTRY_LENGTH} characters (more than 10 pixels)")
+        return None
+    try:
+        packed = entries.astype(f'S{ENTRY_LENGTH}').view(np.uint8).reshape(-1, ENTRY_LENGTH)
+    except UnicodeEncodeError:
+        errors.append(f"{name}: entries must be ASCII hex strings")
+        return None
+
+    def first(mask):
+        row, entry = divmod(int(np.argmax(mask)), groups)
+        return f"{int(mask.sum())} in total, first at row {row}, entry {entry}: {rows[row][entry]!r}"
+
+    bad_prefix = (packed[:, 0] != ord('0')) | ((packed[:, 1] | 0x20) != ord('x'))
+    if bad_prefix.any():
+        errors.append(f"{name}: entries without a 0x prefix, {first(bad_prefix)}")
+        return None
+    # Shorter entries are zero-padded by the S dtype
+    short = packed[:, -1] == 0
+    if short.any():
+        errors.append(f"{name}: entries must hold exactly {ENTRY_LENGTH - 2} hex digits, {first(short)}")
+        return None
+    digits = HEX_VALUES[packed[:, 2:]]
+    bad_digit = (digits == 255).any(axis=1)
+    if bad_digit.any():
+        errors.append(f"{name}: invalid hex digits, {first(bad_digit)}")
+        return None
+
+    # Most significant pixel first in the string, so reverse to get pixel 0 first
+    digits = digits.reshape(-1, PIXELS_PER_ENTRY, 6)[:, ::-1, :]
+    if gray:
+        too_large = digits[..., :4].any(axis=(1, 2))
+        if too_large.any():
+            errors.append(f"{name}: grayscale values above 255, {first(too_large)}")
+            return None
+        pixels = digits[..., 4] * 16 + digits[..., 5]
+        return pixels.reshape(len(rows), groups * PIXELS_PER_ENTRY)
+    channels = [digits[..., 2 * k] * 16 + digits[..., 2 * k + 1] for k in (2, 1, 0)]
+    return np.stack(channels, axis=-1).reshape(len(rows), groups * PIXELS_PER_ENTRY, 3)
+
+
+def is_padding_row(row, groups: int) -> bool:
+    return isinstance(row, list) and len(row) == groups and all(entry == "0x00" for entry in row)
+
+
+def vimz_convolve(image: np.ndarray, kernel: np.ndarray, weight: int) -> np.ndarray:
+    """conv2d of the converters per channel: zero border, floor division, clamp to 0..255."""
+    height, width = image.shape[:2]
+    extended = np.pad(image.astype(np.int32), ((1, 1), (1, 1), (0, 0)))
+    total = np.zeros(image.shape, dtype=np.int32)
+    for m in range(3):
+        for n in range(3):
+            if kernel[m, n]:
+                total += kernel[m, n] * extended[m:m + height, n:n + width]
+    return np.clip(total // weight, 0, 255).astype(np.uint8)
+
+
+def vimz_resize(image: np.ndarray, new_height: int, new_width: int) -> np.ndarray:
+    """resize_image of the converters with the same float operations in the same order."""
+    height, width = image.shape[:2]
+    x_ratio = float(width) / float(new_width)
+    y_ratio = float(height) / float(new_height)
+    x_l = (np.arange(new_width) * x_ratio).astype(np.int64)
+    y_l = (np.arange(new_height) * y_ratio).astype(np.int64)
+    x_h, y_h = x_l + 1, y_l + 1
+
+    source = image.astype(np.float64)
+    a = source[y_l[:, None], x_l[None, :]]
+    b = source[y_l[:, None], x_h[None, :]]
+    c = source[y_h[:, None], x_l[None, :]]
+    d = source[y_h[:, None], x_h[None, :]]
+    if height == 720:
+        weight = np.where(np.arange(new_height) % 2 == 0, 2.0, 1.0) / 3
+        weight = weight[:, None, None]
+        summ = a * weight + b * weight + c * (1 - weight) + d * (1 - weight)
+    else:
+        weight = float(1) / 2
+        summ = a * weight + b * weight + c * weight + d * weight
+    return (summ / 2).astype(np.uint8)
+
+
+def validate_vimz(data: Dict, transformation: str, resolution: Optional[str],
+                  recompute: bool, errors: List[str]):
+    rows = data.get('original')
+    frame = VIMZ_FRAMES.get(resolution)
+
+    # blur/sharpness fold over 3 rows at a time, so the original carries a zero row
+    # above and below the image
+    if transformation in VIMZ_KERNELS and isinstance(rows, list) and len(rows) >= 2:
+        groups = len(rows[1]) if isinstance(rows[1], list) else 0
+        for index in (0, len(rows) - 1):
+            if not is_padding_row(rows[index], groups):
+                errors.append(f"original: row {index} must be a padding row of {groups} \"0x00\" entries")
+        rows = rows[1:-1]
+
+    original = decode_rows(rows, 'original', errors)
+    if original is None:
+        return
+    height, width = original.shape[:2]
+
+    if transformation == 'crop':
+        info = data.get('info')
+        if not isinstance(info, int) or info < 0:
+            errors.append("info: missing or not a non-negative integer")
+            return
+        crop_x, crop_y, index = info >> 24, (info >> 12) & 0xFFF, info & 0xFFF
+        if index:
+            errors.append(f"info: low 12 bits must be 0, got {index}")
+        if crop_x >= width or crop_y >= height:
+            errors.append(f"info: crop offset ({crop_x}, {crop_y}) lies outside the {width}x{height} original")
+        if frame and height < frame[0]:
+            errors.append(f"original: {height} rows, the {resolution} circuit folds over {frame[0]}")
+        return
+
+    if frame and (height, width) != frame:
+        errors.append(f"original: {width}x{height}, the {resolution} circuit expects {frame[1]}x{frame[0]}")
+
+    transformed = decode_rows(data.get('transformed'), 'transformed', errors,
+                              gray=transformation == 'grayscale')
+    if transformed is None:
+        return
+
+    if transformation == 'resize':
+        target = VIMZ_RESIZED.get(resolution) or VIMZ_RESIZED.get('HD' if height == 720 else '4K')
+        # Each folding step reads 3:2 (HD) or 2:1 (4K) original:resized rows
+        if target and transformed.shape[:2] != target:
+            errors.append(f"transformed: {transformed.shape[1]}x{transformed.shape[0]}, "
+                          f"expected {target[1]}x{target[0]}")
+            return
+        expected = vimz_resize(original, *transformed.shape[:2]) if recompute else None
+    else:
+        if transformed.shape[:2] != (height, width):
+            errors.append(f"transformed: {transformed.shape[1]}x{transformed.shape[0]} does not match "
+                          f"the {width}x{height} original")
+            return
+        expected = None
+        if transformation in ('brightness', 'contrast'):
+            factor = data.get('factor')
+            if not isinstance(factor, int) or factor < 0:
+                errors.append("factor: missing or not a non-negative integer (factor * 10)")
+                return
+            lut = brightness_lut if transformation == 'brightness' else contrast_lut
+            expected = lut(factor / 10)[original] if recompute else None
+        elif not recompute:
+            pass
+        elif transformation in VIMZ_KERNELS:
+            expected = vimz_convolve(original, *VIMZ_KERNELS[transformation])
+        elif transformation == 'grayscale':
+            expected = np.array(Image.fromarray(original).convert('L'))
+
+    if expected is not None:
+        mismatch = describe_mismatch('transformed', expected, transformed, transformation)
+        if mismatch:
+            errors.append(mismatch)
+
+
+def veritas_blur_bounds(shape: Tuple[int, int], region) -> Tuple[int, int, int, int]:
+    """blur_bounds() of blur.py / blur-benchmark.rs."""
+    height, width = shape
+    if region:
+        start_row, start_col, blur_h, blur_w = region
+        return start_row, start_col, min(start_row + blur_h, height - 1), min(start_col + blur_w, width - 1)
+    return 1, 1, height - 1, width - 1
+
+
+def validate_veritas_blur(data: Dict, original: np.ndarray, recompute: bool, errors: List[str]):
+    height, width = original.shape
+    if height < 3 or width < 3:
+        errors.append(f"original: image must be at least 3x3, got {height}x{width}")
+        return
+    region = data.get('blur_region')
+    if region is not None:
+        if not isinstance(region, list) or len(region) != 4 or not all(isinstance(v, int) for v in region):
+            errors.append(f"blur_region: expected [start_row, start_col, height, width], got {region!r}")
+            return
+        if region[0] < 1 or region[1] < 1 or region[2] < 1 or region[3] < 1:
+            errors.append(f"blur_region: must start at row/col >= 1 and be non-empty, got {region}")
+            return
+    start_row, start_col, end_row, end_col = veritas_blur_bounds((height, width), region)
+    if start_row >= end_row or start_col >= end_col:
+        errors.append(f"blur_region: {region} lies outside the {height}x{width} image interior")
+        return
+
+    tile = data.get('tile')
+    if isinstance(tile, dict):
+        # The tile is the window interior: one halo pixel on every side
+        check_header(tile, [('height', height - 2), ('width', width - 2)], errors, 'tile.')
+
+    # Rebuild the full blurred image from whichever encoding was written (load_blurred)
+    if 'blurred' in data:
+        blurred = int_matrix(data['blurred'], 'blurred', errors)
+        if blurred is None:
+            return
+        if blurred.shape != original.shape:
+            errors.append(f"blurred: {blurred.shape[0]}x{blurred.shape[1]} does not match "
+                          f"the {height}x{width} original")
+            return
+    elif isinstance(data.get('blurred_region'), dict):
+        block = data['blurred_region']
+        pixels = int_matrix(block.get('pixels'), 'blurred_region.pixels', errors)
+        if pixels is None:
+            return
+        row0, col0 = block.get('start_row'), block.get('start_col')
+        if not isinstance(row0, int) or not isinstance(col0, int) or row0 < 0 or col0 < 0 \
+                or row0 + pixels.shape[0] > height or col0 + pixels.shape[1] > width:
+            errors.append(f"blurred_region: {pixels.shape[0]}x{pixels.shape[1]} pixels at "
+                          f"({row0}, {col0}) do not fit in the {height}x{width} image")
+            return
+        check_header(block, [('height', pixels.shape[0]), ('width', pixels.shape[1])], errors, 'blurred_region.')
+        blurred = original.copy()
+        blurred[row0:row0 + pixels.shape[0], col0:col0 + pixels.shape[1]] = pixels
+    elif isinstance(data.get('blurred_delta'), list):
+        blurred = original.copy()
+        for run in data['blurred_delta']:
+            if not isinstance(run, list) or len(run) != 3 or not isinstance(run[0], int) \
+                    or not isinstance(run[1], int) or not isinstance(run[2], list):
+                errors.append("blurred_delta: entries must be [row, start_col, [values...]]")
+                return
+            row, col0, values = run
+            values = np.array(values)
+            if values.size and values.dtype.kind not in 'iu':
+                errors.append(f"blurred_delta: row {row} has non-integer values")
+                return
+            if row < 0 or row >= height or col0 < 0 or col0 + len(values) > width:
+                errors.append(f"blurred_delta: run of {len(values)} at ({row}, {col0}) does not fit "
+                              f"in the {height}x{width} image")
+                return
+            if (values < 0).any() or (values > 255).any():
+                errors.append("blurred_delta: values outside 0..255")
+                return
+            blurred[row, col0:col0 + len(values)] = values
+    else:
+        errors.append('no "blurred", "blurred_region" or "blurred_delta" field')
+        return
+
+    if recompute:
+        window = original[start_row - 1:end_row + 1, start_col - 1:end_col + 1]
+        inner_h, inner_w = end_row - start_row, end_col - start_col
+        total = sum(window[m:m + inner_h, n:n + inner_w] for m in range(3) for n in range(3))
+        expected = original.copy()
+        expected[start_row:end_row, start_col:end_col] = np.clip(np.rint(total / 9.0), 0, 255)
+        mismatch = describe_mismatch('blurred', expected, blurred, 'blur')
+        if mismatch:
+            errors.append(mismatch)
+
+
+def validate_veritas_resize(data: Dict, original: np.ndarray, recompute: bool, errors: List[str]):
+    resized = int_matrix(data.get('resized'), 'resized', errors)
+    if resized is None:
+        return
+    check_header(data, [('resized_height', resized.shape[0]), ('resized_width', resized.shape[1])], errors)
+
+    height, width = original.shape
+    new_height, new_width = resized.shape
+    row0 = col0 = src_row0 = src_col0 = 0
+    full_h, full_w, full_new_h, full_new_w = height, width, new_height, new_width
+    tile = data.get('tile')
+    if tile is not None:
+        keys = ('row', 'col', 'source_row', 'source_col', 'image_height', 'image_width',
+                'resized_image_height', 'resized_image_width')
+        missing = [key for key in keys if not isinstance(tile.get(key) if isinstance(tile, dict) else None, int)]
+        if missing:
+            errors.append(f"tile: header is missing {', '.join(missing)}")
+            return
+        row0, col0, src_row0, src_col0, full_h, full_w, full_new_h, full_new_w = (tile[key] for key in keys)
+        check_header(tile, [('height', new_height), ('width', new_width)], errors, 'tile.')
+        if row0 + new_height > full_new_h or col0 + new_width > full_new_w:
+            errors.append(f"tile: {new_height}x{new_width} at ({row0}, {col0}) lies outside the "
+                          f"{full_new_h}x{full_new_w} resized image")
+            return
+
+    # get_positions / get_ratios of resize-benchmark.rs, on the full image's grid
+    def axis(start, count, size, new_size):
+        index = np.arange(start, start + count, dtype=np.int64)
+        if new_size <= 1:
+            zeros = np.zeros_like(index)
+            return zeros, zeros, zeros
+        scaled = (size - 1) * index
+        low = scaled // (new_size - 1)
+        high = np.where(low * (new_size - 1) == scaled, low, np.minimum(low + 1, size - 1))
+        return low, high, scaled - (new_size - 1) * low
+
+    y_l, y_h, y_w = axis(row0, new_height, full_h, full_new_h)
+    x_l, x_h, x_w = axis(col0, new_width, full_w, full_new_w)
+    y_l, y_h, x_l, x_h = y_l - src_row0, y_h - src_row0, x_l - src_col0, x_h - src_col0
+    if min(y_l.min(), x_l.min()) < 0 or y_h.max() >= height or x_h.max() >= width:
+        errors.append(f"original: the {height}x{width} source window does not cover the resized pixels")
+        return
+    if not recompute:
+        return
+
+    a = original[y_l[:, None], x_l[None, :]]
+    b = original[y_l[:, None], x_h[None, :]]
+    c = original[y_h[:, None], x_l[None, :]]
+    d = original[y_h[:, None], x_h[None, :]]
+    x_w, y_w = x_w[None, :], y_w[:, None]
+    span_x, span_y = full_new_w - 1, full_new_h - 1
+    if span_x > 0 and span_y > 0:
+        total = (a * (span_x - x_w) * (span_y - y_w) + b * x_w * (span_y - y_w)
+                 + c * y_w * (span_x - x_w) + d * x_w * y_w)
+        expected = np.rint(total / (span_x * span_y))
+    else:
+        expected = np.rint(a * 1.0)
+    mismatch = describe_mismatch('resized', np.clip(expected, 0, 255).astype(np.int64), resized,
+                                 'resize', (row0, col0))
+    if mismatch:
+        errors.append(mismatch)
+
+
+def validate_veritas(data: Dict, transformation: str, recompute: bool, errors: List[str]):
+    channels = 3 if transformation == 'grayscale' else None
+    original = int_matrix(data.get('original'), 'original', errors, channels)
+    if original is None:
+        return
+    height, width = original.shape[:2]
+    if transformation == 'resize':
+        check_header(data, [('original_height', height), ('original_width', width)], errors)
+        validate_veritas_resize(data, original, recompute, errors)
+        return
+    check_header(data, [('height', height), ('width', width)], errors)
+
+    if transformation == 'blur':
+        validate_veritas_blur(data, original, recompute, errors)
+
+    elif transformation == 'grayscale':
+        gray = int_matrix(data.get('grayscale'), 'grayscale', errors)
+        if gray is None:
+            return
+        if gray.shape != (height, width):
+            errors.append(f"grayscale: {gray.shape[0]}x{gray.shape[1]} does not match the {height}x{width} original")
+            return
+        if recompute:
+            expected = (299 * original[..., 0] + 587 * original[..., 1] + 114 * original[..., 2]) // 1000
+            mismatch = describe_mismatch('grayscale', expected, gray, 'grayscale')
+            if mismatch:
+                errors.append(mismatch)
+
+    elif transformation == 'crop':
+        cropped = int_matrix(data.get('cropped'), 'cropped', errors)
+        if cropped is None:
+            return
+        check_header(data, [('crop_height', cropped.shape[0]), ('crop_width', cropped.shape[1])], errors)
+        crop_x, crop_y = data.get('crop_x'), data.get('crop_y')
+        if not isinstance(crop_x, int) or not isinstance(crop_y, int) or crop_x < 0 or crop_y < 0:
+            errors.append("crop_x/crop_y: missing or not non-negative integers")
+            return
+        if crop_x + cropped.shape[1] > width or crop_y + cropped.shape[0] > height:
+            errors.append(f"cropped: {cropped.shape[1]}x{cropped.shape[0]} at ({crop_x}, {crop_y}) "
+                          f"does not fit in the {width}x{height} original")
+            return
+        if recompute:
+            expected = original[crop_y:crop_y + cropped.shape[0], crop_x:crop_x + cropped.shape[1]]
+            mismatch = describe_mismatch('cropped', expected, cropped, 'crop')
+            if mismatch:
+                errors.append(mismatch)
+
+
+def validate_data(backend: str, transformation: str, data: Dict, resolution: Optional[str] = None,
+                  recompute: bool = True) -> List[str]:
+    """Check one parsed input; returns the list of problems (empty if it is valid)."""
+    errors: List[str] = []
+    if not isinstance(data, dict):
+        return ["input is not a JSON object"]
+    if backend == 'vimz':
+        if transformation not in VIMZ_TRANSFORMATIONS:
+            return [f"no validator for VIMz {transformation}"]
+        validate_vimz(data, transformation, resolution, recompute, errors)
+    elif backend == 'veritas':
+        if transformation not in VERITAS_TRANSFORMATIONS:
+            return [f"no validator for Veritas {transformation}"]
+        validate_veritas(data, transformation, recompute, errors)
+    else:
+        raise ValueError(f"Unknown backend: {backend} (expected one of {', '.join(BACKENDS)})")
+    return errors
+
+
+def validate_file(backend: str, transformation: str, input_json: Path, resolution: Optional[str] = None,
+                  recompute: bool = True) -> Dict:
+    """Load and check one input file; returns {'input_json', 'errors', 'seconds'}."""
+    start = time.perf_counter()
+    try:
+        data = original_store.load_input(input_json)
+    except (OSError, ValueError, RuntimeError) as e:
+        errors = [f"cannot read JSON: {e}"]
+    else:
+        errors = validate_data(backend, transformation, data, resolution, recompute)
+    return {
+        'input_json': str(input_json),
+        'errors': errors,
+        'seconds': round(time.perf_counter() - start, 3),
+    }
+
+
+def _validate_job(job: Tuple) -> Dict:
+    return validate_file(*job)
+
+
+def collect_inputs(paths: List[str]) -> List[Path]:
+    """Input files from file and directory arguments (*.json[.gz|.zst] of each directory, sorted)."""
+    files = []
+    for path in map(Path, paths):
+        files.extend(compressed_io.glob_files(path) if path.is_dir() else [path])
+    return files
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Check converted proof inputs before launching the prover'
+    )
+    parser.add_argument('backend', choices=BACKENDS, help='Proving backend')
+    parser.add_argument('transformation', help='Transformation (blur, crop, grayscale, ...)')
+    parser.add_argument('inputs', nargs='+', help='Input JSON files or directories of them')
+    parser.add_argument('--resolution', '-r', default=None,
+                        help='VIMz circuit resolution the inputs must match (HD, 4K)')
+    parser.add_argument('--no-recompute', action='store_true',
+                        help='Only check structure and ranges, do not recompute the transformation')
+    parser.add_argument('--jobs', '-j', type=int, default=os.cpu_count() or 1,
+                        help='Files validated in parallel (default: all cores)')
+    parser.add_argument('--quiet', '-q', action='store_true', help='Only print invalid files')
+
+    args = parser.parse_args()
+
+    files = collect_inputs(args.inputs)
+    if not files:
+        print("Error: No input JSON files found", file=sys.stderr)
+        sys.exit(1)
+
+    start = time.perf_counter()
+    jobs = [(args.backend, args.transformation, path, args.resolution, not args.no_recompute)
+            for path in files]
+    if args.jobs > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=min(args.jobs, len(jobs))) as pool:
+            results = list(pool.map(_validate_job, jobs))
+    else:
+        results = [_validate_job(job) for job in jobs]
+
+    invalid = [result for result in results if result['errors']]
+    for result in results:
+        if result['errors']:
+            print(f"✗ {result['input_json']}")
+            for error in result['errors']:
+                print(f"    {error}")
+        elif not args.quiet:
+            print(f"✓ {result['input_json']} ({result['seconds']:.2f}s)")
+
+    elapsed = time.perf_counter() - start
+    print(f"\n{len(results) - len(invalid)}/{len(results)} input(s) valid "
+          f"({args.backend} {args.transformation}, {elapsed:.1f}s)")
+    if invalid:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Content-addressed store for the "original" block of the converter outputs.
+
+Every transform input of a passport carries the same original: the VIMz blur, sharpness,
+brightness, contrast, grayscale, resize and crop JSONs all embed the compressed RGB image,
+and the Veritas blur, crop and resize JSONs the grayscale matrix. With --original-store DIR
+a converter writes that block once per image as DIR/<sha256>.json (the compact JSON text,
+named by its SHA-256) and puts a reference in its place:
+
+    "original_ref": {"sha256": "<hex>", "path": "../../originals/<hex>.json"}
+
+The path is relative to the input file, so a dataset stays relocatable as long as the
+store moves with it. VIMz blur/sharpness inputs add "pad_rows": 1 for the zero row above
+and below the image. A second converter run on the same image finds the block through
+DIR/index/<encoding>-<image hash> and skips compressing the original altogether.
+
+Readers resolve the reference: load_input() here (used by input_validator.py and thus the
+pre-flight check of proof_runner.py), the VIMz prover (load_input in main.rs) and the
+Veritas examples (examples/common/input.rs). A store block inherits the compression of
+the output it was first written for (.json.zst, .json.gz or .json, see compressed_io.py).
+
+Commands:
+    dedup    move the original of existing inputs into a store (rewrites the inputs)
+    inline   put the original back, e.g. before copying inputs to a host without the store
+
+Usage:
+    python3 original_store.py dedup <file|dir> [...] --store DIR
+    python3 original_store.py inline <file|dir> [...]
+
+Example:
+    DEDUP=1 vimz/image_converter/batch_convert.sh blur passports_hd blur/outputs_hd
+    python3 original_store.py dedup veritas/benchmark/*/outputs_hd --store veritas/benchmark/originals
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from compressed_io import glob_files, open_text, read_json, read_text, split_name
+
+
+# Entry of a VIMz zero padding row (a real entry packs 10 pixels in 60 hex digits)
+PADDING_ENTRY = "0x00"
+
+
+def add_store_arguments(parser: argparse.ArgumentParser):
+    """Add the --original-store option to a converter's argument parser."""
+    group = parser.add_argument_group('original store')
+    group.add_argument('--original-store', default=None, metavar='DIR',
+                       help='Write the original once per image into DIR and reference it by hash '
+                            '(see original_store.py)')
+
+
+def block_text(original) -> str:
+    """Compact JSON text of an original block; its SHA-256 is the block's address."""
+    return json.dumps(original, separators=(',', ':'))
+
+
+def sha256_hex(text: str) -> str:
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def write_atomic(path: Path, text: str):
+    """Write via a temporary file and rename, so concurrent converters never see a partial block."""
+    _, suffix = split_name(path)
+    tmp = path.with_name(f'.{path.name}.{os.getpid()}.tmp{suffix}')
+    with open_text(tmp, 'w') as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+class OriginalStore:
+    """
+    One store directory. Blocks are immutable and named by content, so several converters
+    (or batch jobs) may share a store; an existing block is never rewritten.
+    """
+
+    def __init__(self, root, suffix: str = '.json'):
+        self.root = Path(root)
+        self.suffix = suffix
+        self.index_dir = self.root / 'index'
+
+    @classmethod
+    def from_args(cls, args: argparse.Namespace) -> Optional['OriginalStore']:
+        """Store for a converter run, or None without --original-store."""
+        if not args.original_store:
+            return None
+        return cls(args.original_store, split_name(args.output)[1] or '.json')
+
+    def image_key(self, image_np, encoding: str) -> str:
+        """Index key of a decoded image under one encoding ('vimz', 'veritas', ...)."""
+        h = hashlib.sha256(f'{encoding}:{image_np.dtype}:{image_np.shape}:'.encode())
+        h.update(image_np.tobytes())
+        return f'{encoding}-{h.hexdigest()}'
+
+    def block_path(self, digest: str) -> Optional[Path]:
+        for path in glob_files(self.root, f'{digest}.json'):
+            return path
+        return None
+
+    def put(self, original) -> Path:
+        """Store an original block (no-op if present); returns its path."""
+        text = block_text(original)
+        digest = sha256_hex(text)
+        path = self.block_path(digest)
+        if path is None:
+            self.root.mkdir(parents=True, exist_ok=True)
+            path = self.root / f'{digest}{self.suffix}'
+            write_atomic(path, text)
+        return path
+
+    def original_ref(self, image_np, encoding: str, encode: Callable[[], List], output,
+                     pad_rows: int = 0) -> Dict:
+        """
+        Reference to the original of image_np for the input written to output. encode()
+        builds the block and only runs when the image is not in the store yet.
+        """
+        index = self.index_dir / self.image_key(image_np, encoding)
+        path = None
+        if index.exists():
+            path = self.block_path(index.read_text().strip())
+        if path is None:
+            path = self.put(encode())
+            self.index_dir.mkdir(parents=True, exist_ok=True)
+            write_atomic(index, split_name(path)[0])
+        return reference(path, output, pad_rows)
+
+
+def reference(block: Path, output, pad_rows: int = 0) -> Dict:
+    ref = {
+        "sha256": split_name(block)[0],
+        "path": os.path.relpath(block, Path(output).resolve().parent),
+    }
+    if pad_rows:
+        ref["pad_rows"] = pad_rows
+    return ref
+
+
+def load_block(ref: Dict, input_path) -> List:
+    """Original block of a reference, checked against its hash and re-padded."""
+    path = Path(input_path).parent / ref['path']
+    text = read_text(path, errors=None)
+    if sha256_hex(text) != ref['sha256']:
+        raise ValueError(f"original store block {path} does not match its sha256 {ref['sha256']}")
+    original = json.loads(text)
+    pad_rows = ref.get('pad_rows', 0)
+    if pad_rows:
+        zeros = [PADDING_ENTRY] * (len(original[0]) if original else 0)
+        original = [list(zeros) for _ in range(pad_rows)] + original + [list(zeros) for _ in range(pad_rows)]
+    return original
+
+
+def resolve(data: Dict, input_path) -> Dict:
+    """Input with its "original_ref" replaced by the referenced "original" (first key, as written)."""
+    if not isinstance(data, dict) or 'original_ref' not in data:
+        return data
+    resolved = {"original": load_block(data['original_ref'], input_path)}
+    resolved.update((key, value) for key, value in data.items() if key != 'original_ref')
+    return resolved
+
+
+def load_input(path) -> Dict:
+    """read_json() that also resolves an original store reference."""
+    return resolve(read_json(path), path)
+
+
+def split_padding(original: List) -> Tuple[List, int]:
+    """Strip VIMz zero padding rows from both ends; returns (block, pad_rows)."""
+    pad_rows = 0
+    while (len(original) > 2 * pad_rows + 1
+           and all(entry == PADDING_ENTRY for entry in original[pad_rows])
+           and all(entry == PADDING_ENTRY for entry in original[-1 - pad_rows])):
+        pad_rows += 1
+    return (original[pad_rows:len(original) - pad_rows] if pad_rows else original), pad_rows
+
+
+def converter_indent(original: List) -> int:
+    """JSON indentation of the converter that wrote an original: 4 for VIMz hex rows, 2 for Veritas."""
+    return 4 if original and original[0] and isinstance(original[0][0], str) else 2
+
+
+def dump_input(data: Dict, path: Path, indent: int):
+    write_atomic(path, json.dumps(data, indent=indent))
+
+
+def collect(paths: List[str]) -> List[Path]:
+    files = []
+    for path in map(Path, paths):
+        files.extend(glob_files(path) if path.is_dir() else [path])
+    if not files:
+        print("Error: No input files found", file=sys.stderr)
+        sys.exit(1)
+    return files
+
+
+def cmd_dedup(args):
+    store_root = Path(args.store).resolve()
+    before = after = 0
+    for path in collect(args.paths):
+        if path.resolve().parent == store_root:
+            continue
+        size = path.stat().st_size
+        data = read_json(path)
+        if 'original' not in data:
+            print(f"  {path.name}: no inline original, skipped")
+            continue
+        block, pad_rows = split_padding(data['original'])
+        store = OriginalStore(args.store, split_name(path)[1] or '.json')
+        rewritten = {"original_ref": reference(store.put(block), path, pad_rows)}
+        rewritten.update((key, value) for key, value in data.items() if key != 'original')
+        dump_input(rewritten, path, converter_indent(data['original']))
+        before += size
+        after += path.stat().st_size
+        print(f"✓ {path.name}: {size / 1e6:.1f} -> {path.stat().st_size / 1e6:.2f} MB")
+
+    blocks = glob_files(args.store)
+    stored = sum(p.stat().st_size for p in blocks)
+    print(f"\nInputs: {before / 1e6:.1f} MB -> {after / 1e6:.1f} MB, "
+          f"store: {len(blocks)} block(s), {stored / 1e6:.1f} MB")
+    if before:
+        print(f"Dataset: {before / 1e6:.1f} MB -> {(after + stored) / 1e6:.1f} MB "
+              f"(inputs + store)")
+
+
+def cmd_inline(args):
+    for path in collect(args.paths):
+        data = read_json(path)
+        if 'original_ref' not in data:
+            continue
+        resolved = resolve(data, path)
+        dump_input(resolved, path, converter_indent(resolved['original']))
+        print(f"✓ {path.name}: {path.stat().st_size / 1e6:.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Deduplicate the original block of converted inputs')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('dedup', help='Move inline originals into a store and reference them')
+    p.add_argument('paths', nargs='+', help='Input files or directories')
+    p.add_argument('--store', required=True, help='Store directory (shared by all transforms of a backend)')
+    p.set_defaults(func=cmd_dedup)
+
+    p = sub.add_parser('inline', help='Replace references with the original block')
+    p.add_argument('paths', nargs='+', help='Input files or directories')
+    p.set_defaults(func=cmd_inline)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+Run a single VIMz or Veritas proof the same way the batch_generate_proofs.sh
+scripts do and return its parsed metrics.
+
+Each run writes the usual files into the output directory:
+
+    <name>_output.log      prover stdout + appended resource statistics
+    <name>_time_stats.log  /usr/bin/time -v output
+    <name>_resources.csv   resource time series of the prover, one row per second:
+                           elapsed_s, rss_kb, cpu_s (user + system, all its processes)
+    <name>_proof.json      proof (VIMz: <name>_proof.bin with --proof-format bincode)
+                           and what verify_throughput.py needs to check it again:
+                           VIMz <name>_public.json + <circuit>_vk.<ext>, Veritas <name>_vk.bin
+
+Usage:
+    python3 proof_runner.py <backend> <transformation> <input_json> <output_dir>
+                            [--resolution HD] [--threads N] [--cpus LIST] [--step-timing]
+                            [--memory-cap-gb GB] [--no-validate] [--proof-format json|bincode]
+
+The input is checked with input_validator.py first; an invalid input is not proven
+(exit code 65, the reasons in the log and in "input_errors").
+
+--cpus pins the prover to a CPU set (see cpu_placement.py) and sizes its rayon pool to
+match; the set and its NUMA node are recorded as cpu_list and numa_node.
+
+Example:
+    python3 proof_runner.py vimz blur vimz/image_converter/blur/outputs_hd/passport_0000.json /tmp/proofs
+    python3 proof_runner.py veritas crop veritas/benchmark/crop/outputs_hd/passport_0000.json /tmp/proofs --threads 4
+"""
+
+import argparse
+import json
+import os
+import platform
+import signal
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import compressed_io
+import cpu_placement
+import extract_veritas_metrics
+import extract_vimz_metrics
+import input_validator
+from time_stats import CORES_LABEL, derive_efficiency, parse_time_stats
+
+
+ROOT = Path(__file__).resolve().parent
+VIMZ_ROOT = ROOT / 'vimz'
+VERITAS_ROOT = ROOT / 'veritas'
+
+BACKENDS = ('vimz', 'veritas')
+
+# sysexits EX_DATAERR: the input failed pre-flight validation and the prover was not started
+EXIT_INVALID_INPUT = 65
+
+# VIMz proof file extension per encoding; main.rs picks the encoding from it
+PROOF_EXTENSIONS = {
+    'json': 'json',
+    'bincode': 'bin',
+}
+
+# Veritas example names that differ from the transformation name
+VERITAS_EXAMPLES = {
+    'grayscale': 'gray-benchmark',
+}
+
+
+def host_info() -> Dict:
+    """Hardware metadata for the machine running the proofs."""
+    info = {
+        'hostname': socket.gethostname(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'cpu_model': platform.processor() or None,
+        'memory_total_kb': None,
+    }
+    try:
+        with open('/proc/cpuinfo') as f:
+            for line in f:
+                if line.startswith('model name'):
+                    info['cpu_model'] = line.split(':', 1)[1].strip()
+                    break
+        with open('/proc/meminfo') as f:
+            for line in f:
+                if line.startswith('MemTotal:'):
+                    info['memory_total_kb'] = int(line.split()[1])
+                    break
+    except OSError:
+        pass
+    return info
+
+
+def descendants(pid: int) -> List[int]:
+    """PIDs of every process below pid, from the ppid field of /proc/<pid>/stat."""
+    children: Dict[int, List[int]] = {}
+    for entry in Path('/proc').iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            # The command name may contain spaces; the fields after ')' do not
+            ppid = int((entry / 'stat').read_text().rsplit(')', 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(entry.name))
+
+    found, stack = [], [pid]
+    while stack:
+        for child in children.get(stack.pop(), []):
+            found.append(child)
+            stack.append(child)
+    return found
+
+
+def rss_kb(pid: int) -> int:
+    """Resident set size of one process in KB (0 once it has exited)."""
+    try:
+        with open(f'/proc/{pid}/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1])
+    except (OSError, ValueError):
+        pass
+    return 0
+
+
+def cpu_seconds(pid: int) -> float:
+    """User + system CPU time of one process in seconds (0 once it has exited)."""
+    try:
+        # utime and stime are fields 14 and 15; the command name may contain spaces
+        fields = Path(f'/proc/{pid}/stat').read_text().rsplit(')', 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / os.sysconf('SC_CLK_TCK')
+    except (OSError, IndexError, ValueError):
+        return 0.0
+
+
+def watch_prover(proc: subprocess.Popen, cap_gb: Optional[float], resources_file: Path,
+                 interval: float = 0.2, sample_every: float = 1.0) -> bool:
+    """
+    Wait for proc, writing the combined RSS and CPU time of everything below it to
+    resources_file every sample_every seconds, and SIGKILLing those processes once
+    their RSS exceeds cap_gb (no cap when None).
+
+    proc is /usr/bin/time, which survives and still reports the statistics of the
+    killed prover ("Command terminated by signal 9"). Returns True if the cap was hit.
+    """
+    cap_kb = cap_gb * 1024 * 1024 if cap_gb else None
+    start = time.monotonic()
+    next_sample = start
+    with open(resources_file, 'w') as resources:
+        resources.write('elapsed_s,rss_kb,cpu_s\n')
+        while proc.poll() is None:
+            pids = descendants(proc.pid)
+            rss = sum(rss_kb(pid) for pid in pids)
+            now = time.monotonic()
+            if now >= next_sample:
+                resources.write(f'{now - start:.1f},{rss},{sum(cpu_seconds(pid) for pid in pids):.2f}\n')
+                resources.flush()
+                next_sample += sample_every
+            if cap_kb is not None and rss > cap_kb:
+                for pid in pids:
+                    try:
+                        os.kill(pid, signal.SIGKILL)
+                    except ProcessLookupError:
+                        pass
+                proc.wait()
+                return True
+            time.sleep(interval)
+    return False
+
+
+def build_command(backend: str, transformation: str, input_json: Path, output_proof: Path,
+                  resolution: str = 'HD', step_timing: bool = False) -> Tuple[List[str], Path]:
+    """
+    Return (argv, cwd) for one proof, mirroring batch_generate_proofs.sh.
+
+    step_timing adds VIMz's per-step witness/fold timing output (ignored for Veritas).
+    """
+    if backend == 'vimz':
+        # Crop uses the optimized circuit
+        circuit = f'optimized_crop_step_{resolution}' if transformation == 'crop' \
+            else f'{transformation}_step_{resolution}'
+        argv = [
+            'vimz',
+            '--circuit', f'circuits/{circuit}.r1cs',
+            '--function', transformation,
+            '--input', str(input_json),
+            '--output', str(output_proof),
+            '--resolution', resolution,
+            '--witnessgenerator', f'circuits/{circuit}_cpp/{circuit}',
+        ]
+        if step_timing:
+            argv.append('--step-timing')
+        return argv, VIMZ_ROOT
+
+    if backend == 'veritas':
+        example = VERITAS_EXAMPLES.get(transformation, f'{transformation}-benchmark')
+        binary = VERITAS_ROOT / 'target' / 'release' / 'examples' / example
+        # Prefer the prebuilt example so concurrent runs don't contend for the cargo lock
+        if binary.exists():
+            argv = [str(binary), str(input_json)]
+        else:
+            argv = ['cargo', 'run', '--release', '--example', example, '--', str(input_json)]
+        return argv + ['--proof', str(output_proof)], VERITAS_ROOT
+
+    raise ValueError(f"Unknown backend: {backend} (expected one of {', '.join(BACKENDS)})")
+
+
+def run_proof(backend: str, transformation: str, input_json: Path, output_dir: Path,
+              resolution: str = 'HD', threads: Optional[int] = None,
+              env: Optional[Dict[str, str]] = None, step_timing: bool = False,
+              memory_cap_gb: Optional[float] = None, validate: bool = True,
+              cpus: Optional[List[int]] = None, proof_format: str = 'json') -> Dict:
+    """
+    Run one proof under /usr/bin/time -v and return its metrics.
+
+    threads sets RAYON_NUM_THREADS for the prover (both backends use rayon).
+    memory_cap_gb kills the prover as soon as its RSS exceeds the cap, so a run
+    that would not fit fails fast instead of pushing the host into swap or the OOM killer.
+    validate checks the input with input_validator first and skips the proof if it is invalid.
+    cpus pins the prover to these CPUs (taskset -c); threads then defaults to len(cpus).
+    proof_format 'bincode' makes VIMz write a binary proof (the prover picks it from the .bin extension).
+    """
+    input_json = Path(input_json).resolve()
+    output_dir = Path(output_dir).resolve()
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    name = compressed_io.input_stem(input_json)
+    log_file = output_dir / f'{name}_output.log'
+    time_stats = output_dir / f'{name}_time_stats.log'
+    resources_file = output_dir / f'{name}_resources.csv'
+    # Veritas proofs are always JSON
+    extension = PROOF_EXTENSIONS[proof_format] if backend == 'vimz' else 'json'
+    output_proof = output_dir / f'{name}_proof.{extension}'
+
+    argv, cwd = build_command(backend, transformation, input_json, output_proof, resolution, step_timing)
+
+    run_env = dict(os.environ)
+    if env:
+        run_env.update(env)
+    if cpus and threads is None:
+        threads = len(cpus)
+    if threads is not None:
+        run_env['RAYON_NUM_THREADS'] = str(threads)
+
+    input_errors = []
+    if validate:
+        input_errors = input_validator.validate_file(backend, transformation, input_json,
+                                                     resolution if backend == 'vimz' else None)['errors']
+
+    with open(log_file, 'w') as log, open(time_stats, 'w') as stats:
+        memory_capped = False
+        if input_errors:
+            log.write('Input validation failed, prover not started:\n')
+            log.writelines(f'  {error}\n' for error in input_errors)
+            exit_code = EXIT_INVALID_INPUT
+        else:
+            try:
+                pin = cpu_placement.taskset_argv(cpus) if cpus else []
+                proc = subprocess.Popen(pin + ['/usr/bin/time', '-v'] + argv, cwd=cwd, env=run_env,
+                                        stdout=log, stderr=stats)
+                memory_capped = watch_prover(proc, memory_cap_gb, resources_file)
+                exit_code = proc.wait()
+            except OSError as e:
+                # Same exit code the shell reports for a missing command
+                stats.write(f"Error: {e}\n")
+                exit_code = 127
+
+    stats_text = time_stats.read_text()
+    # Efficiency is relative to the cores the prover was allowed to use
+    cores = threads or os.cpu_count()
+    with open(log_file, 'a') as log:
+        log.write('\n=== Memory and Resource Statistics ===\n')
+        log.write(stats_text)
+        log.write(f'{CORES_LABEL}: {cores}\n')
+
+    parse = extract_vimz_metrics.parse_vimz_log if backend == 'vimz' \
+        else extract_veritas_metrics.parse_veritas_log
+    metrics = parse(log_file)
+    metrics.update({k: v for k, v in parse_time_stats(stats_text).items() if v is not None})
+    metrics.update(derive_efficiency(metrics, cores))
+    metrics.update({
+        'backend': backend,
+        'transformation': transformation,
+        'resolution': resolution,
+        'input_json': str(input_json),
+        'log_file': str(log_file),
+        'timeseries_file': str(resources_file) if resources_file.exists() else None,
+        'proof_file': str(output_proof) if output_proof.exists() else None,
+        'threads': threads,
+        'cpu_list': cpu_placement.format_cpulist(cpus) if cpus else None,
+        'numa_node': cpu_placement.node_of(cpus) if cpus else None,
+        'exit_code': exit_code,
+        # 137 = 128 + SIGKILL, which is what the OOM killer sends
+        'oom': memory_capped or exit_code == 137 or 'Command terminated by signal 9' in stats_text,
+        'memory_cap_gb': memory_cap_gb,
+        'memory_capped': memory_capped,
+        'input_errors': input_errors or None,
+    })
+    return metrics
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Run one VIMz or Veritas proof and print its metrics as JSON'
+    )
+    parser.add_argument('backend', choices=BACKENDS, help='Proving backend')
+    parser.add_argument('transformation', help='Transformation (blur, crop, grayscale, ...)')
+    parser.add_argument('input_json', help='Converted input JSON')
+    parser.add_argument('output_dir', help='Directory for the proof, log and time stats')
+    parser.add_argument('--resolution', '-r', default='HD', help='VIMz circuit resolution (default: HD)')
+    parser.add_argument('--threads', '-t', type=int, default=None,
+                        help='RAYON_NUM_THREADS for the prover (default: all cores)')
+    parser.add_argument('--cpus', type=cpu_placement.parse_cpulist, default=None, metavar='LIST',
+                        help='Pin the prover to these CPUs, e.g. 0-7 (threads default to their count)')
+    parser.add_argument('--step-timing', action='store_true',
+                        help='Log per-step witness generation and folding times (VIMz)')
+    parser.add_argument('--memory-cap-gb', type=float, default=None,
+                        help='Kill the prover once its resident memory exceeds this many GB')
+    parser.add_argument('--proof-format', choices=sorted(PROOF_EXTENSIONS), default='json',
+                        help='VIMz proof encoding (default: json)')
+    parser.add_argument('--no-validate', action='store_true',
+                        help='Launch the prover without checking the input first')
+
+    args = parser.parse_args()
+
+    metrics = run_proof(args.backend, args.transformation, Path(args.input_json),
+                        Path(args.output_dir), args.resolution, args.threads,
+                        step_timing=args.step_timing, memory_cap_gb=args.memory_cap_gb,
+                        validate=not args.no_validate, cpus=args.cpus,
+                        proof_format=args.proof_format)
+    print(json.dumps(metrics, indent=2))
+    if metrics['exit_code'] != 0:
+        sys.exit(metrics['exit_code'])
+
+
+if __name__ == '__main__':
+    main()
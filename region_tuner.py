@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+Find the largest Veritas region that proves within a memory budget.
+
+Veritas proves blur, grayscale and crop over a HEIGHTxWIDTH region, and its memory
+grows with the region's pixel count. The region sizes in blur-benchmark.rs
+(80x80 on a 4GB laptop, 400x700 safe on 32GB, 500x900 may fail) were found by hand.
+This tuner automates the search:
+
+    1. A memory model (peak_memory_gb ~ a + b * pixels, fitted with scaling_sweep.py
+       from scaling_sweep.csv, or the figures noted in blur-benchmark.rs for blur)
+       picks the first region to try.
+    2. A binary search over the region height (width follows the aspect ratio) runs
+       real proofs. Each proof is killed as soon as its RSS exceeds the budget, so a
+       region that does not fit fails in seconds instead of swapping or hitting the OOM killer.
+       Every successful run also refines the model.
+    3. The largest region that proved is appended to region_fits.csv for this host.
+       Successful runs are also appended to the sweep CSV, which improves the model next time.
+
+Usage:
+    python3 region_tuner.py --transformation <blur|grayscale|crop> --memory-gb GB --image IMG
+                            [--aspect H:W] [--step ROWS] [--max-runs N] [--threads N] [--plan]
+
+Example:
+    python3 region_tuner.py -t blur --memory-gb 32 --image veritas/benchmark/passports_hd/passport_0000.png
+    python3 region_tuner.py -t grayscale --memory-gb 4 --image veritas/benchmark/passports_hd/passport_0000.png --plan
+"""
+
+import argparse
+import csv
+import math
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from PIL import Image
+
+import proof_runner
+import scaling_sweep
+
+
+ROOT = Path(__file__).resolve().parent
+TRANSFORMATIONS = ('blur', 'grayscale', 'crop')
+
+# (pixels, peak GB) used until real sweep points exist for the transformation: the
+# blur figures noted in blur-benchmark.rs for a c7a.4xlarge, and the HD->SD resize
+# estimate from batch_generate_proofs.sh (pixels of the resized image)
+PRIOR_POINTS = {
+    'blur': [(400 * 700, 25.0), (718 * 1278, 64.0)],
+    'resize': [(480 * 640, 6.0)],
+}
+
+# The first probe aims below the budget, since the model is only an estimate until
+# it has been refitted on this host
+MODEL_SAFETY = 0.9
+
+RESULT_FIELDS = [
+    'timestamp', 'host', 'transformation', 'memory_budget_gb', 'threads', 'aspect',
+    'region', 'height', 'width', 'pixels', 'peak_memory_gb', 'prove_s', 'total_s',
+    'smallest_failure', 'runs', 'model_a', 'model_b', 'model_source', 'image',
+]
+
+
+def parse_aspect(value: str) -> float:
+    """'H:W' -> width / height."""
+    try:
+        height, width = (float(v) for v in value.split(':'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid aspect '{value}', expected HEIGHT:WIDTH (e.g. 9:16)")
+    if height <= 0 or width <= 0:
+        raise argparse.ArgumentTypeError(f"Invalid aspect '{value}', values must be positive")
+    return width / height
+
+
+def max_region(transformation: str, image_height: int, image_width: int) -> Tuple[int, int]:
+    """Largest region the converter accepts for this image."""
+    if transformation == 'blur':
+        # Blur starts at (1, 1) and stops one pixel short of the far border
+        return image_height - 2, image_width - 2
+    return image_height, image_width
+
+
+def region_for_height(height: int, aspect: float, limits: Tuple[int, int]) -> Tuple[int, int]:
+    height = max(1, min(height, limits[0]))
+    width = max(1, min(int(round(height * aspect)), limits[1]))
+    return height, width
+
+
+def height_for_pixels(pixels: float, aspect: float) -> int:
+    return int(math.sqrt(max(pixels, 0) / aspect))
+
+
+def sweep_points(sweep_file: Path, transformation: str, host: str) -> List[Tuple[int, float]]:
+    """(pixels, peak GB) from earlier sweeps, preferring this host's own points."""
+    if not sweep_file.exists():
+        return []
+    by_host: Dict[str, List[Tuple[int, float]]] = {}
+    with open(sweep_file, newline='') as f:
+        for row in csv.DictReader(f):
+            if row['backend'] != 'veritas' or row['transformation'] != transformation:
+                continue
+            if row['pixels'] and row['peak_memory_gb']:
+                by_host.setdefault(row['host'], []).append((int(row['pixels']), float(row['peak_memory_gb'])))
+    if host in by_host:
+        return by_host[host]
+    return [point for points in by_host.values() for point in points]
+
+
+def fit_memory(points: List[Tuple[int, float]]) -> Optional[Dict]:
+    """peak GB ~ a + b * pixels; None if there is nothing to fit or memory does not grow."""
+    if not points:
+        return None
+    fit = scaling_sweep.fit_model([p for p, _ in points], [gb for _, gb in points], ['n'])
+    if fit['b'] <= 0:
+        return None
+    return fit
+
+
+def memory_model(transformation: str, host: str, sweep_file: Path) -> Tuple[Optional[Dict], str]:
+    """Fitted memory model and a description of where its points came from."""
+    points = sweep_points(sweep_file, transformation, host)
+    if points:
+        return fit_memory(points), f'{len(points)} sweep point(s)'
+    return fit_memory(list(PRIOR_POINTS.get(transformation, []))), 'built-in estimates'
+
+
+def pixels_for_memory(fit: Dict, memory_gb: float) -> float:
+    return (memory_gb - fit['a']) / fit['b']
+
+
+def model_guess(fit: Optional[Dict], memory_gb: float, aspect: float) -> Optional[int]:
+    """Region height the model expects to fit in memory_gb; None below its fixed cost."""
+    if fit is None:
+        return None
+    height = height_for_pixels(pixels_for_memory(fit, memory_gb), aspect)
+    return height if height >= 1 else None
+
+
+class Search:
+    """
+    Binary search over the region height. `fits` is the tallest height that proved,
+    `fails` the shortest that did not (limit + 1 until one fails).
+    """
+
+    def __init__(self, limit: int, step: int):
+        self.fits = 0
+        self.fails = limit + 1
+        self.step = step
+
+    def done(self) -> bool:
+        return self.fails - self.fits <= self.step
+
+    def next_height(self, guess: Optional[int] = None) -> int:
+        # A model guess is only used while it lies strictly inside the open interval
+        if guess is not None and self.fits < guess < self.fails:
+            return guess
+        # The model says the boundary was just reached: check one step above it
+        if guess is not None and 0 < self.fits and guess <= self.fits and self.fits + self.step < self.fails:
+            return self.fits + self.step
+        return (self.fits + self.fails) // 2
+
+    def record(self, height: int, success: bool):
+        if success:
+            self.fits = max(self.fits, height)
+        else:
+            self.fails = min(self.fails, height)
+
+
+def probe(args, image: Path, height: int, width: int, run: int) -> Tuple[bool, Dict]:
+    """Convert and prove one region under the memory cap."""
+    point = f'{height}x{width}'
+    run_dir = Path(args.work_dir) / f'{args.transformation}_{point}'
+    run_dir.mkdir(parents=True, exist_ok=True)
+    input_json = run_dir / f'{image.stem}.json'
+
+    argv, resolution = scaling_sweep.converter_command('veritas', args.transformation, point, image, input_json)
+    if subprocess.call(argv, stdout=subprocess.DEVNULL) != 0:
+        print(f"  ✗ Conversion failed for {point}", file=sys.stderr)
+        return False, {}
+
+    metrics = proof_runner.run_proof('veritas', args.transformation, input_json, run_dir / f'run_{run}',
+                                     resolution, args.threads, memory_cap_gb=args.memory_gb)
+    if metrics['exit_code'] == 127:
+        print(f"Error: Could not start the prover, see {metrics['log_file']}", file=sys.stderr)
+        sys.exit(1)
+    return metrics['exit_code'] == 0 and not metrics['memory_capped'], metrics
+
+
+def print_plan(fit: Optional[Dict], source: str, args, aspect: float, limits: Tuple[int, int]):
+    if fit is None:
+        print(f"No memory model for veritas {args.transformation} yet (run scaling_sweep.py or the tuner once)")
+        return
+    print(f"Memory model ({source}): peak_gb ~ {fit['a']:.3g} + {fit['b']:.3g} * pixels")
+    for label, budget in (('budget', args.memory_gb), ('first probe', args.memory_gb * MODEL_SAFETY)):
+        guess = model_guess(fit, budget, aspect)
+        if guess is None:
+            print(f"  {label:<12} {budget:6.1f} GB -> below the model's fixed cost, bisecting instead")
+            continue
+        height, width = region_for_height(guess, aspect, limits)
+        print(f"  {label:<12} {budget:6.1f} GB -> {height}x{width} ({height * width:,} pixels)")
+
+
+def append_result(results_file: Path, row: Dict):
+    new_file = not results_file.exists()
+    with open(results_file, 'a', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=RESULT_FIELDS)
+        if new_file:
+            writer.writeheader()
+        writer.writerow({k: ('' if row.get(k) is None else row[k]) for k in RESULT_FIELDS})
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Find the largest Veritas region that proves within a memory budget'
+    )
+    parser.add_argument('--transformation', '-t', choices=TRANSFORMATIONS, required=True)
+    parser.add_argument('--memory-gb', '-m', type=float, required=True,
+                        help='Memory budget; each proof is killed once it uses more')
+    parser.add_argument('--image', '-i', required=True, help='Source PNG image')
+    parser.add_argument('--aspect', type=parse_aspect, default=None,
+                        help='Region aspect HEIGHT:WIDTH (default: the largest region of the image)')
+    parser.add_argument('--step', type=int, default=8,
+                        help='Stop once fits/fails heights are this many rows apart (default: 8)')
+    parser.add_argument('--max-runs', type=int, default=8, help='Proofs to run at most (default: 8)')
+    parser.add_argument('--threads', type=int, default=None, help='RAYON_NUM_THREADS (default: all cores)')
+    parser.add_argument('--host', default=socket.gethostname(), help='Host label (default: hostname)')
+    parser.add_argument('--sweep', default='scaling_sweep.csv',
+                        help='Sweep CSV for the memory model; successful runs are appended (default: scaling_sweep.csv)')
+    parser.add_argument('--work-dir', default='tuner_runs', help='Inputs and logs (default: tuner_runs)')
+    parser.add_argument('--output', '-o', default='region_fits.csv',
+                        help='Per-host results CSV (default: region_fits.csv)')
+    parser.add_argument('--plan', action='store_true', help='Only print the model prediction, run nothing')
+
+    args = parser.parse_args()
+
+    image = Path(args.image).resolve()
+    if not image.exists():
+        print(f"Error: Image not found: {image}", file=sys.stderr)
+        sys.exit(1)
+    if args.memory_gb <= 0 or args.step < 1 or args.max_runs < 1:
+        print("Error: --memory-gb must be positive, --step and --max-runs at least 1", file=sys.stderr)
+        sys.exit(1)
+
+    with Image.open(image) as img:
+        image_width, image_height = img.size
+    limits = max_region(args.transformation, image_height, image_width)
+    aspect = args.aspect or limits[1] / limits[0]
+
+    sweep_file = Path(args.sweep)
+    fit, source = memory_model(args.transformation, args.host, sweep_file)
+
+    print(f"Veritas {args.transformation}, budget {args.memory_gb:g} GB, host {args.host}")
+    print(f"Largest possible region: {limits[0]}x{limits[1]}, aspect {aspect:.3f} (width/height)")
+    print_plan(fit, source, args, aspect, limits)
+    if args.plan:
+        return
+
+    search = Search(limits[0], args.step)
+    guess = model_guess(fit, args.memory_gb * MODEL_SAFETY, aspect)
+    best: Optional[Dict] = None
+    runs = 0
+
+    while not search.done() and runs < args.max_runs:
+        height, width = region_for_height(search.next_height(guess), aspect, limits)
+        runs += 1
+        print(f"\n[run {runs}/{args.max_runs}] {height}x{width} ({height * width:,} pixels)"
+              + (f", model {fit['a'] + fit['b'] * height * width:.1f} GB" if fit else ''))
+        success, metrics = probe(args, image, height, width, runs)
+        search.record(height, success)
+
+        if success:
+            row = scaling_sweep.to_row('veritas', args.transformation, args.host, f'{height}x{width}',
+                                       height * width, f'{image.stem}.json', metrics)
+            scaling_sweep.append_rows(sweep_file, [row])
+            print(f"  ✓ peak {row['peak_memory_gb'] or 0:.2f} GB, prove {row['prove_s'] or 0:.1f}s")
+            if best is None or height > best['height']:
+                best = dict(row, height=height, width=width)
+            if row['peak_memory_gb']:
+                # Refit on this host's measurements; the model only steers the next
+                # probe while it points inside the remaining interval
+                fit = fit_memory(sweep_points(sweep_file, args.transformation, args.host)) or fit
+                source = 'this host'
+        elif metrics.get('memory_capped'):
+            print(f"  ✗ killed at the {args.memory_gb:g} GB cap")
+        elif metrics:
+            reason = 'OOM' if metrics['oom'] else f"exit code {metrics['exit_code']}"
+            print(f"  ✗ failed ({reason}), see {metrics['log_file']}")
+
+        # After the first probe the model aims at the budget itself
+        guess = model_guess(fit, args.memory_gb, aspect)
+
+    print()
+    if best is None:
+        print(f"✗ No region proved within {args.memory_gb:g} GB after {runs} run(s)")
+        sys.exit(1)
+
+    failure = None
+    if search.fails <= limits[0]:
+        failure = '{}x{}'.format(*region_for_height(search.fails, aspect, limits))
+    state = 'converged' if search.done() else f'stopped after --max-runs {args.max_runs}'
+    print(f"✓ Largest region: {best['height']}x{best['width']} ({best['height'] * best['width']:,} pixels), "
+          f"peak {best['peak_memory_gb'] or 0:.2f} GB ({state}"
+          + (f", {failure} does not fit)" if failure else ', full frame fits)'))
+
+    append_result(Path(args.output), {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'host': args.host,
+        'transformation': args.transformation,
+        'memory_budget_gb': args.memory_gb,
+        'threads': args.threads,
+        'aspect': round(aspect, 4),
+        'region': f"{best['height']}x{best['width']}",
+        'height': best['height'],
+        'width': best['width'],
+        'pixels': best['height'] * best['width'],
+        'peak_memory_gb': round(best['peak_memory_gb'], 3) if best['peak_memory_gb'] else None,
+        'prove_s': best['prove_s'],
+        'total_s': best['total_s'],
+        'smallest_failure': failure,
+        'runs': runs,
+        'model_a': round(fit['a'], 6) if fit else None,
+        'model_b': fit['b'] if fit else None,
+        'model_source': source,
+        'image': image.name,
+    })
+    print(f"✓ Result appended to: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
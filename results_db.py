@@ -0,0 +1,467 @@
+#!/usr/bin/env python3
+"""
+Append-only SQLite store for every proof result in the repository.
+
+One typed `proofs` table replaces the string-valued performance_results_*.json
+files and the per-backend *_metrics.csv column sets. Each row is one proof:
+
+    backend, transformation, resolution, region, pixels, host, run_id,
+    passport_id, input_id, git_revision, source, phase times (shared
+    setup/prove/verify plus the raw per-backend phases), constraints/variables,
+    /usr/bin/time counters, CPU placement, exit status and pointers to the proof
+    log and the <name>_resources.csv time series proof_runner.py records.
+
+input_id is the full input stem (passport_0000_x10_y20, passport_0000_f1.4,
+passport_0000_tile_r0_c1, ...), so crop/factor sweeps and tiles of one passport
+stay separate rows. Rows are unique on (backend, transformation, host, run_id,
+input_id, resolution, region), so re-running an import only adds what is new. Importers are tried in order of
+fidelity: proof logs first, then the performance_results_*.json files fill the
+gaps.
+
+Usage:
+    python3 results_db.py [--db results.db] import [--queue DIR ...] [--sweep CSV ...]
+    python3 results_db.py [--db results.db] summary [--output summary.md]
+    python3 results_db.py [--db results.db] query "SELECT ..."
+
+Example:
+    python3 results_db.py import
+    python3 results_db.py summary --output BENCHMARK_RESULTS.md
+    python3 results_db.py query "SELECT host, COUNT(*) FROM proofs GROUP BY host"
+"""
+
+import argparse
+import csv
+import json
+import re
+import sqlite3
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import compare_backends
+import compressed_io
+import extract_veritas_metrics
+import extract_vimz_metrics
+from time_stats import parse_time_stats
+
+
+ROOT = Path(__file__).resolve().parent
+DEFAULT_DB = ROOT / 'results.db'
+
+COLUMNS = [
+    # (name, SQLite type)
+    ('backend', 'TEXT NOT NULL'),
+    ('transformation', 'TEXT NOT NULL'),
+    ('resolution', 'TEXT'),
+    ('region', 'TEXT'),
+    ('pixels', 'INTEGER'),
+    ('host', 'TEXT NOT NULL'),
+    ('run_id', 'TEXT NOT NULL'),
+    ('passport_id', 'TEXT NOT NULL'),
+    ('input_id', 'TEXT NOT NULL'),
+    ('git_revision', 'TEXT'),
+    ('source', 'TEXT NOT NULL'),
+    ('imported_at', 'REAL NOT NULL'),
+    # Shared phases (see compare_backends.py for the mapping)
+    ('setup_s', 'REAL'),
+    ('prove_s', 'REAL'),
+    ('verify_s', 'REAL'),
+    ('total_s', 'REAL'),
+    # VIMz phases
+    ('key_generation_s', 'REAL'),
+    ('recursive_snark_creation_s', 'REAL'),
+    ('recursive_snark_verify_s', 'REAL'),
+    ('compressed_snark_prove_s', 'REAL'),
+    ('compressed_snark_verify_s', 'REAL'),
+    # Veritas phases
+    ('circuit_build_s', 'REAL'),
+    ('proof_generation_s', 'REAL'),
+    ('verification_s', 'REAL'),
+    # Circuit size (VIMz: primary circuit per step)
+    ('constraints', 'INTEGER'),
+    ('variables', 'INTEGER'),
+    ('constraints_secondary', 'INTEGER'),
+    ('variables_secondary', 'INTEGER'),
+    # /usr/bin/time -v
+    ('peak_memory_kb', 'INTEGER'),
+    ('user_time_s', 'REAL'),
+    ('system_time_s', 'REAL'),
+    ('cpu_percent', 'REAL'),
+    ('wall_clock_s', 'REAL'),
+    ('exit_code', 'INTEGER'),
+    # CPU placement (proof_runner.py --cpus, see cpu_placement.py)
+    ('threads', 'INTEGER'),
+    ('cpu_list', 'TEXT'),
+    ('numa_node', 'INTEGER'),
+    ('error', 'TEXT'),
+    ('log_path', 'TEXT'),
+    ('timeseries_path', 'TEXT'),
+]
+COLUMN_NAMES = [name for name, _ in COLUMNS]
+
+KEY = "backend, transformation, host, run_id, input_id, COALESCE(resolution, ''), COALESCE(region, '')"
+
+SCHEMA = f'''
+CREATE TABLE IF NOT EXISTS proofs (
+    id INTEGER PRIMARY KEY,
+    {(',' + chr(10) + '    ').join(f'{name} {kind}' for name, kind in COLUMNS)}
+);
+CREATE UNIQUE INDEX IF NOT EXISTS proofs_key ON proofs ({KEY});
+CREATE INDEX IF NOT EXISTS proofs_group ON proofs (backend, transformation, resolution, host);
+'''
+
+
+def rebuild_keyed_on_passport(conn: sqlite3.Connection):
+    """
+    Databases created before input_id existed are unique on passport_id alone, which
+    drops sweep and tile rows. Copy them into a table with the current key; their
+    input_id is the passport id they were stored under.
+    """
+    existing = [row[1] for row in conn.execute('PRAGMA table_info(proofs)')]
+    if not existing or 'input_id' in existing:
+        return
+    conn.execute('DROP INDEX IF EXISTS proofs_group')
+    conn.execute('ALTER TABLE proofs RENAME TO proofs_old')
+    conn.executescript(SCHEMA)
+    copied = [name for name in COLUMN_NAMES if name in existing]
+    conn.execute(f"INSERT OR IGNORE INTO proofs ({', '.join(copied)}, input_id) "
+                 f"SELECT {', '.join(copied)}, passport_id FROM proofs_old")
+    conn.execute('DROP TABLE proofs_old')
+    conn.commit()
+
+
+def connect(db_file: Path) -> sqlite3.Connection:
+    conn = sqlite3.connect(str(db_file))
+    rebuild_keyed_on_passport(conn)
+    conn.executescript(SCHEMA)
+    # Databases created before a column was added get it as NULL for the old rows
+    existing = {row[1] for row in conn.execute('PRAGMA table_info(proofs)')}
+    for name, kind in COLUMNS:
+        if name not in existing:
+            conn.execute(f'ALTER TABLE proofs ADD COLUMN {name} {kind}')
+    conn.commit()
+    return conn
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def to_number(value, kind=float):
+    """Typed value from a log/CSV/JSON cell; '', 'N/A...' and None become NULL."""
+    if value is None or value == '':
+        return None
+    try:
+        return kind(float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def make_row(backend: str, transformation: str, host: str, run_id: str, input_id: str,
+             metrics: Dict, source: str, revision: Optional[str], **extra) -> Dict:
+    """Map one backend's metric dict onto the typed schema."""
+    phases = compare_backends.normalize(backend, transformation, metrics)
+    row = {
+        'backend': backend,
+        'transformation': transformation,
+        'resolution': 'HD',
+        'region': None,
+        'pixels': phases['pixels'],
+        'host': host,
+        'run_id': run_id,
+        'passport_id': passport_from(input_id),
+        'input_id': input_id,
+        'git_revision': revision,
+        'source': source,
+        'imported_at': time.time(),
+        'setup_s': phases['setup_s'],
+        'prove_s': phases['prove_s'],
+        'verify_s': phases['verify_s'],
+        'total_s': phases['total_s'],
+        'peak_memory_kb': to_number(metrics.get('peak_memory_kb'), int),
+        'user_time_s': to_number(metrics.get('user_time_s')),
+        'system_time_s': to_number(metrics.get('system_time_s')),
+        'cpu_percent': to_number(metrics.get('cpu_percent')),
+        'wall_clock_s': to_number(metrics.get('wall_clock_s')),
+        # proof_runner reports exit_code, /usr/bin/time (parse_time_stats) exit_status
+        'exit_code': to_number(metrics['exit_code'] if metrics.get('exit_code') is not None
+                               else metrics.get('exit_status'), int),
+        'threads': to_number(metrics.get('threads'), int),
+        'cpu_list': metrics.get('cpu_list') or None,
+        'numa_node': to_number(metrics.get('numa_node'), int),
+    }
+    if backend == 'vimz':
+        row.update({
+            'key_generation_s': to_number(metrics.get('key_generation_time_s')),
+            'recursive_snark_creation_s': to_number(metrics.get('recursive_snark_creation_time_s')),
+            'recursive_snark_verify_s': to_number(metrics.get('recursive_snark_verify_time_s')),
+            'compressed_snark_prove_s': to_number(metrics.get('compressed_snark_prove_time_s')),
+            'compressed_snark_verify_s': to_number(metrics.get('compressed_snark_verify_time_s')),
+            'constraints': to_number(metrics.get('constraints_primary'), int),
+            'variables': to_number(metrics.get('variables_primary'), int),
+            'constraints_secondary': to_number(metrics.get('constraints_secondary'), int),
+            'variables_secondary': to_number(metrics.get('variables_secondary'), int),
+        })
+    else:
+        verification_ms = to_number(metrics.get('verification_time_ms'))
+        row.update({
+            'circuit_build_s': to_number(metrics.get('circuit_build_time_s')),
+            'proof_generation_s': to_number(metrics.get('proof_generation_time_s')),
+            'verification_s': verification_ms / 1000.0 if verification_ms is not None else None,
+            'constraints': to_number(metrics.get('constraints'), int),
+            'variables': to_number(metrics.get('variables'), int),
+        })
+    row.update(extra)
+    return row
+
+
+def insert_rows(conn: sqlite3.Connection, rows: Iterable[Dict]) -> int:
+    """
+    Insert rows, ignoring ones already stored; returns the number added or repaired.
+    Stored rows without an exit code (log imports before exit_status was read) take
+    the one the new row carries, so failed runs drop out of the summary.
+    """
+    before = conn.total_changes
+    conn.executemany(
+        f"INSERT INTO proofs ({', '.join(COLUMN_NAMES)}) "
+        f"VALUES ({', '.join('?' for _ in COLUMN_NAMES)}) "
+        f"ON CONFLICT ({KEY}) DO UPDATE SET exit_code = excluded.exit_code "
+        f"WHERE proofs.exit_code IS NULL AND excluded.exit_code IS NOT NULL",
+        ([row.get(name) for name in COLUMN_NAMES] for row in rows),
+    )
+    conn.commit()
+    return conn.total_changes - before
+
+
+def passport_from(name: str) -> str:
+    match = re.search(r'passport_(\d+)', name)
+    return match.group(1) if match else compressed_io.input_stem(name)
+
+
+def log_input_id(log_file: Path) -> str:
+    """Input stem a proof log belongs to (passport_0000_x10_y20_output.log -> passport_0000_x10_y20)."""
+    stem = compressed_io.input_stem(log_file)
+    return stem[:-len('_output')] if stem.endswith('_output') else stem
+
+
+def import_logs(revision: Optional[str]) -> List[Dict]:
+    """Every passport_*_output.log under the campaign proofs_<host>_<res> directories."""
+    rows = []
+    for backend, base in (('vimz', compare_backends.VIMZ_ROOT), ('veritas', compare_backends.VERITAS_ROOT)):
+        parse = extract_vimz_metrics.parse_vimz_log if backend == 'vimz' \
+            else extract_veritas_metrics.parse_veritas_log
+        for proofs_dir in sorted(base.glob('*/proofs_*_*')):
+            if not proofs_dir.is_dir():
+                continue
+            transformation = proofs_dir.parent.name
+            # proofs_<host>_<res>
+            host, resolution = proofs_dir.name[len('proofs_'):].rsplit('_', 1)
+            for log_file in compressed_io.glob_files(proofs_dir, 'passport_*_output.log'):
+                text = compressed_io.read_text(log_file)
+                metrics = parse(log_file)
+                metrics.update({k: v for k, v in parse_time_stats(text).items() if v is not None})
+                input_id = log_input_id(log_file)
+                resources = proofs_dir / f'{input_id}_resources.csv'
+                rows.append(make_row(backend, transformation, host, proofs_dir.name,
+                                     input_id, metrics, 'log', revision,
+                                     resolution=resolution.upper(),
+                                     log_path=str(log_file.relative_to(ROOT)),
+                                     timeseries_path=str(resources.relative_to(ROOT)) if resources.exists() else None))
+    return rows
+
+
+def import_performance_json(revision: Optional[str]) -> List[Dict]:
+    """performance_results*.json written by the batch scripts (all values are strings)."""
+    rows = []
+    for backend, base in (('vimz', compare_backends.VIMZ_ROOT), ('veritas', compare_backends.VERITAS_ROOT)):
+        for results_file in sorted(base.glob('*/performance_results*.json')):
+            transformation = results_file.parent.name
+            match = re.match(r'performance_results_(\w+)\.json', results_file.name)
+            try:
+                entries = json.loads(results_file.read_text())
+            except ValueError as e:
+                print(f"Warning: skipping {results_file}: {e}", file=sys.stderr)
+                continue
+            for entry in entries:
+                # Host and run directory come from the proof path when the file name has no host
+                proof_dir = Path(entry.get('proof_file', '')).parent.name
+                host = match.group(1) if match else (proof_dir[len('proofs_'):].rsplit('_', 1)[0]
+                                                     if proof_dir.startswith('proofs_') else 'unknown')
+                run_id = proof_dir if proof_dir.startswith('proofs_') else f'proofs_{host}_hd'
+                metrics = dict(entry)
+                # The batch scripts use shorter key names than the extractors
+                metrics.setdefault('recursive_snark_creation_time_s', entry.get('recursive_creation_time_s'))
+                metrics.setdefault('recursive_snark_verify_time_s', entry.get('recursive_verify_time_s'))
+                metrics.setdefault('compressed_snark_prove_time_s', entry.get('compressed_prove_time_s'))
+                metrics.setdefault('compressed_snark_verify_time_s', entry.get('compressed_verify_time_s'))
+                metrics.setdefault('constraints_primary', entry.get('primary_constraints'))
+                metrics.setdefault('variables_primary', entry.get('primary_variables'))
+                verify_s = to_number(metrics['compressed_snark_verify_time_s'])
+                metrics['compressed_snark_verify_time_ms'] = verify_s * 1000.0 if verify_s is not None else None
+                metrics = {k: (None if isinstance(v, str) and v.startswith('N/A') else v)
+                           for k, v in metrics.items()}
+                rows.append(make_row(backend, transformation, host, run_id,
+                                     compressed_io.input_stem(entry['file']),
+                                     metrics, 'performance_json', revision,
+                                     resolution=entry.get('resolution', 'HD'),
+                                     error=entry.get('error')))
+    return rows
+
+
+def import_queue(queue: Path, revision: Optional[str]) -> List[Dict]:
+    """Finished jobs of a campaign_queue.py queue directory."""
+    rows = []
+    for state in ('done', 'failed'):
+        for job_file in sorted((queue / state).glob('*.json')):
+            job = json.loads(job_file.read_text())
+            metrics = job.get('metrics') or {}
+            host = metrics.get('host') or 'unknown'
+            rows.append(make_row(job['backend'], job['transformation'], host,
+                                 f"queue:{queue.name}", compressed_io.input_stem(job['input_json']),
+                                 metrics, 'queue', revision,
+                                 resolution=job.get('resolution', 'HD'),
+                                 error=job.get('error'), log_path=metrics.get('log_file'),
+                                 timeseries_path=metrics.get('timeseries_file')))
+    return rows
+
+
+def import_sweep(sweep_csv: Path, revision: Optional[str]) -> List[Dict]:
+    """Points recorded by scaling_sweep.py run (already normalized)."""
+    rows = []
+    with open(sweep_csv, newline='') as f:
+        for i, point in enumerate(csv.DictReader(f)):
+            peak_gb = to_number(point['peak_memory_gb'])
+            rows.append({
+                'backend': point['backend'],
+                'transformation': point['transformation'],
+                'resolution': point['point'] if point['point'].upper() in ('SD', 'HD', 'FHD', '4K') else 'HD',
+                'region': point['point'],
+                'pixels': to_number(point['pixels'], int),
+                'host': point['host'],
+                'run_id': f'sweep:{sweep_csv.name}:{i}',
+                'passport_id': passport_from(point['input']),
+                'input_id': compressed_io.input_stem(point['input']),
+                'git_revision': revision,
+                'source': 'sweep',
+                'imported_at': time.time(),
+                'setup_s': to_number(point['setup_s']),
+                'prove_s': to_number(point['prove_s']),
+                'verify_s': to_number(point['verify_s']),
+                'total_s': to_number(point['total_s']),
+                'constraints': to_number(point['constraints'], int),
+                'variables': to_number(point['variables'], int),
+                'wall_clock_s': to_number(point['wall_clock_s']),
+                'peak_memory_kb': int(peak_gb * 1024 * 1024) if peak_gb is not None else None,
+            })
+    return rows
+
+
+def cmd_import(args):
+    conn = connect(Path(args.db))
+    revision = args.git_revision or git_revision()
+
+    sources = [('logs', lambda: import_logs(revision)),
+               ('performance_results json', lambda: import_performance_json(revision))]
+    for queue in args.queue:
+        sources.append((f'queue {queue}', lambda q=Path(queue): import_queue(q, revision)))
+    for sweep in args.sweep:
+        sources.append((f'sweep {sweep}', lambda s=Path(sweep): import_sweep(s, revision)))
+
+    for name, load in sources:
+        start = time.perf_counter()
+        rows = load()
+        added = insert_rows(conn, rows)
+        print(f"✓ {name}: {added} new or updated of {len(rows)} row(s) ({time.perf_counter() - start:.2f}s)")
+
+    total = conn.execute('SELECT COUNT(*) FROM proofs').fetchone()[0]
+    print(f"✓ {total} proof(s) in {args.db}")
+
+
+def fmt(value, digits=2) -> str:
+    return 'N/A' if value is None else f'{value:,.{digits}f}'
+
+
+def summarize(conn: sqlite3.Connection) -> str:
+    """Markdown summary: medians per backend/transformation/resolution/host."""
+    groups: Dict[tuple, Dict[str, List[float]]] = {}
+    fields = ('setup_s', 'prove_s', 'verify_s', 'total_s', 'peak_memory_kb', 'cpu_percent')
+    query = (f"SELECT backend, transformation, resolution, host, {', '.join(fields)} FROM proofs "
+             f"WHERE exit_code IS NULL OR exit_code = 0 ORDER BY backend, transformation, resolution, host")
+    for row in conn.execute(query):
+        values = groups.setdefault(row[:4], {field: [] for field in fields})
+        for field, value in zip(fields, row[4:]):
+            if value is not None:
+                values[field].append(value)
+
+    lines = [
+        '| Backend | Transformation | Resolution | Host | Proofs | Setup (s) | Prove (s) | Verify (s) '
+        '| Total (s) | Proofs/h | Peak GB | CPU % |',
+        '|---|---|---|---|---|---|---|---|---|---|---|---|',
+    ]
+    for (backend, transformation, resolution, host), values in groups.items():
+        median = {f: statistics.median(v) if v else None for f, v in values.items()}
+        count = max(len(v) for v in values.values())
+        proofs_per_hour = 3600.0 / median['total_s'] if median['total_s'] else None
+        peak_gb = median['peak_memory_kb'] / (1024.0 * 1024.0) if median['peak_memory_kb'] else None
+        lines.append(
+            f"| {backend} | {transformation} | {resolution or 'N/A'} | {host} | {count} | {fmt(median['setup_s'])} "
+            f"| {fmt(median['prove_s'])} | {fmt(median['verify_s'], 3)} | {fmt(median['total_s'])} "
+            f"| {fmt(proofs_per_hour, 1)} | {fmt(peak_gb, 3)} | {fmt(median['cpu_percent'], 0)} |"
+        )
+    return '\n'.join(lines) + '\n'
+
+
+def cmd_summary(args):
+    start = time.perf_counter()
+    conn = connect(Path(args.db))
+    table = summarize(conn)
+    elapsed = time.perf_counter() - start
+
+    if args.output:
+        Path(args.output).write_text('# Benchmark Results (medians)\n\n' + table)
+        print(f"✓ Summary written to: {args.output}")
+    else:
+        print(table, end='')
+    print(f"Generated in {elapsed * 1000:.0f} ms", file=sys.stderr)
+
+
+def cmd_query(args):
+    conn = connect(Path(args.db))
+    cursor = conn.execute(args.sql)
+    writer = csv.writer(sys.stdout)
+    writer.writerow([d[0] for d in cursor.description])
+    writer.writerows(cursor)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Typed SQLite store for all proof results')
+    parser.add_argument('--db', default=str(DEFAULT_DB), help=f'Database file (default: {DEFAULT_DB.name})')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    imp = subparsers.add_parser('import', help='Import logs, JSON results, queues and sweeps')
+    imp.add_argument('--queue', nargs='+', default=[], help='campaign_queue.py queue directories')
+    imp.add_argument('--sweep', nargs='+', default=[], help='scaling_sweep.py CSV files')
+    imp.add_argument('--git-revision', default=None, help='Revision to record (default: current HEAD)')
+    imp.set_defaults(func=cmd_import)
+
+    summary = subparsers.add_parser('summary', help='Regenerate the summary table')
+    summary.add_argument('--output', '-o', default=None, help='Markdown file (default: stdout)')
+    summary.set_defaults(func=cmd_summary)
+
+    query = subparsers.add_parser('query', help='Run SQL and print CSV')
+    query.add_argument('sql', help='SQL statement')
+    query.set_defaults(func=cmd_query)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,406 @@
+#!/usr/bin/env python3
+"""
+Sweep proof cost over pixel counts and fit scaling models.
+
+Three subcommands share one CSV of sweep points:
+
+    run      convert one image at each point, prove it and append the metrics
+    import   append points from existing proofs_<host>_hd directories
+    fit      fit time ~ a + b * n log2 n (or a + b * n) and memory ~ a + b * n
+             per backend/transformation/host and extrapolate to larger frames
+
+Points are HEIGHTxWIDTH regions for Veritas (the region blurred, converted to
+grayscale or cropped; resize takes the target resolution SD or FHD) and circuit
+resolutions HD/4K for VIMz, the only sizes vimz/circuits is built for (resize:
+HD -> SD and 4K -> FHD). With two points a VIMz fit goes exactly through both
+measurements, so its curve is not an estimate checked against a third point.
+The Veritas examples read the region from each input, so a single release build
+covers the whole sweep.
+
+`run` resizes the source image to the frame each point is converted from (the
+point's resolution for VIMz, HD for Veritas regions, the --from-res frame for
+resize). The VIMz converters only use -r as a label, so without this every
+point would prove a frame the size of --image.
+
+Usage:
+    python3 scaling_sweep.py run --backend <vimz|veritas> --transformation T --image IMG --points P ...
+    python3 scaling_sweep.py import [--backends vimz veritas] [--transformations ...]
+    python3 scaling_sweep.py fit [--extrapolate HD 4K]
+
+Example:
+    python3 scaling_sweep.py run --backend veritas --transformation blur \\
+        --image veritas/benchmark/passports_hd/passport_0000.png --points 80x80 200x200 400x700
+    python3 scaling_sweep.py import
+    python3 scaling_sweep.py fit --extrapolate HD 4K
+"""
+
+import argparse
+import csv
+import math
+import socket
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from PIL import Image
+
+import compare_backends
+import proof_runner
+
+
+ROOT = Path(__file__).resolve().parent
+
+# Circuit resolutions with a *_step_<res> circuit in vimz/circuits
+VIMZ_RESOLUTIONS = ('HD', '4K')
+
+RESOLUTIONS = {
+    'SD': (480, 640),
+    'HD': (720, 1280),
+    'FHD': (1080, 1920),
+    '4K': (2160, 3840),
+}
+
+CONVERTERS = {
+    'vimz': ROOT / 'vimz' / 'image_converter',
+    'veritas': ROOT / 'veritas' / 'benchmark',
+}
+
+FIELDNAMES = [
+    'backend', 'transformation', 'host', 'point', 'pixels', 'input', 'constraints', 'variables',
+    'setup_s', 'prove_s', 'verify_s', 'total_s', 'wall_clock_s', 'peak_memory_gb',
+]
+
+TIME_METRICS = ('setup_s', 'prove_s', 'total_s')
+MEMORY_METRICS = ('peak_memory_gb',)
+
+MODELS = {
+    'n': lambda n: n,
+    'n log n': lambda n: n * math.log2(n),
+}
+
+
+def point_pixels(backend: str, transformation: str, point: str) -> Optional[int]:
+    """Pixels covered by one sweep point."""
+    if backend == 'vimz':
+        # Same count as `import` assigns to existing VIMz proofs
+        return compare_backends.vimz_pixels(transformation, point.upper())
+    if point.upper() in RESOLUTIONS:
+        height, width = RESOLUTIONS[point.upper()]
+    else:
+        height, width = parse_region(point)
+    return height * width
+
+
+def parse_region(point: str) -> Tuple[int, int]:
+    """'HEIGHTxWIDTH' -> (height, width)."""
+    try:
+        height, width = (int(v) for v in point.lower().split('x'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid point '{point}', expected HEIGHTxWIDTH or SD/HD/FHD/4K")
+    if height <= 0 or width <= 0:
+        raise argparse.ArgumentTypeError(f"Invalid point '{point}', dimensions must be positive")
+    return height, width
+
+
+def converter_command(backend: str, transformation: str, point: str,
+                      image: Path, output: Path) -> Tuple[List[str], str]:
+    """
+    Return (argv, resolution) to convert `image` for one sweep point.
+    """
+    script = CONVERTERS[backend] / transformation / f'{transformation}.py'
+    argv = [sys.executable, str(script), '-i', str(image), '-o', str(output)]
+
+    if backend == 'vimz':
+        resolution = point.upper()
+        if resolution not in VIMZ_RESOLUTIONS:
+            raise ValueError(f"VIMz points are circuit resolutions ({', '.join(VIMZ_RESOLUTIONS)}), got '{point}'")
+        if transformation == 'resize':
+            argv += ['--from-res', resolution, '--to-res', 'SD' if resolution == 'HD' else 'FHD']
+        else:
+            argv += ['-r', resolution]
+        return argv, resolution
+
+    if transformation == 'resize':
+        to_res = point.upper()
+        if to_res not in ('SD', 'FHD'):
+            raise ValueError(f"Veritas resize points are target resolutions (SD, FHD), got '{point}'")
+        argv += ['--from-res', 'HD' if to_res == 'SD' else '4K', '--to-res', to_res]
+        return argv, 'HD'
+
+    height, width = parse_region(point)
+    if transformation == 'blur':
+        # Start at (1, 1) so the 3x3 kernel never reads past the border
+        argv += ['-r', 'HD', '--blur-region', '1', '1', str(height), str(width)]
+    elif transformation == 'grayscale':
+        argv += ['-r', 'HD', '--process-region', '--region-height', str(height), '--region-width', str(width)]
+    elif transformation == 'crop':
+        argv += ['-r', 'HD', '--crop-x', '0', '--crop-y', '0',
+                 '--crop-width', str(width), '--crop-height', str(height)]
+    else:
+        raise ValueError(f"Unsupported Veritas transformation for region sweeps: {transformation}")
+    return argv, 'HD'
+
+
+def source_resolution(backend: str, transformation: str, point: str) -> str:
+    """Resolution of the frame the converter reads for one sweep point."""
+    if backend == 'vimz':
+        return point.upper()
+    if transformation == 'resize':
+        return 'HD' if point.upper() == 'SD' else '4K'
+    return 'HD'
+
+
+def sized_source(image: Path, resolution: str, point_dir: Path) -> Path:
+    """`image`, or a copy resized into point_dir when it is not the size of `resolution`."""
+    height, width = RESOLUTIONS[resolution]
+    with Image.open(image) as source:
+        if source.size == (width, height):
+            return image
+        resized = source.resize((width, height), Image.LANCZOS)
+    path = point_dir / f'{image.stem}_{resolution.lower()}.png'
+    resized.save(path)
+    return path
+
+
+def to_row(backend: str, transformation: str, host: str, point: str, pixels: Optional[int],
+           input_name: str, metrics: Dict) -> Dict:
+    """Flatten one proof's metrics into a sweep CSV row."""
+    phases = compare_backends.normalize(backend, transformation, metrics)
+    if backend == 'vimz':
+        constraints = metrics.get('constraints_primary')
+        variables = metrics.get('variables_primary')
+    else:
+        constraints = metrics.get('constraints')
+        variables = metrics.get('variables')
+    return {
+        'backend': backend,
+        'transformation': transformation,
+        'host': host,
+        'point': point,
+        'pixels': pixels if pixels is not None else phases['pixels'],
+        'input': input_name,
+        'constraints': constraints,
+        'variables': variables,
+        'setup_s': phases['setup_s'],
+        'prove_s': phases['prove_s'],
+        'verify_s': phases['verify_s'],
+        'total_s': phases['total_s'],
+        'wall_clock_s': metrics.get('wall_clock_s'),
+        'peak_memory_gb': phases['peak_memory_gb'],
+    }
+
+
+def append_rows(csv_file: Path, rows: List[Dict]):
+    """Append rows to the sweep CSV, writing the header for a new file."""
+    new_file = not csv_file.exists()
+    with open(csv_file, 'a', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDNAMES)
+        if new_file:
+            writer.writeheader()
+        for row in rows:
+            writer.writerow({k: ('' if row.get(k) is None else row[k]) for k in FIELDNAMES})
+
+
+def cmd_run(args):
+    work_dir = Path(args.work_dir)
+    image = Path(args.image).resolve()
+    rows = []
+
+    for point in args.points:
+        pixels = point_pixels(args.backend, args.transformation, point)
+        point_dir = work_dir / f'{args.backend}_{args.transformation}_{point}'
+        point_dir.mkdir(parents=True, exist_ok=True)
+        input_json = point_dir / f'{image.stem}.json'
+
+        source = sized_source(image, source_resolution(args.backend, args.transformation, point), point_dir)
+        argv, resolution = converter_command(args.backend, args.transformation, point, source, input_json)
+        print(f"[{point}] {pixels or 0:,} pixels" + (f" (source resized to {source.name})" if source != image else ''))
+        if subprocess.call(argv, stdout=subprocess.DEVNULL) != 0:
+            print(f"  ✗ Conversion failed for {point}", file=sys.stderr)
+            continue
+
+        for repeat in range(args.repeats):
+            metrics = proof_runner.run_proof(args.backend, args.transformation, input_json,
+                                             point_dir / f'run_{repeat}', resolution, args.threads)
+            if metrics['exit_code'] != 0:
+                reason = 'OOM' if metrics['oom'] else f"exit code {metrics['exit_code']}"
+                print(f"  ✗ Proof failed ({reason}), see {metrics['log_file']}")
+                break
+            row = to_row(args.backend, args.transformation, args.host, point, pixels,
+                         input_json.name, metrics)
+            rows.append(row)
+            print(f"  ✓ prove {row['prove_s'] or 0:.2f}s, total {row['total_s'] or 0:.2f}s, "
+                  f"peak {row['peak_memory_gb'] or 0:.2f} GB")
+
+    append_rows(Path(args.output), rows)
+    print(f"✓ Appended {len(rows)} point(s) to: {args.output}")
+
+
+def cmd_import(args):
+    rows = []
+    for backend in args.backends:
+        base = compare_backends.VIMZ_ROOT if backend == 'vimz' else compare_backends.VERITAS_ROOT
+        for transformation in args.transformations:
+            for proofs_dir in sorted((base / transformation).glob('proofs_*_hd')):
+                if not proofs_dir.is_dir():
+                    continue
+                host = proofs_dir.name[len('proofs_'):-len('_hd')]
+                for passport_id, metrics in compare_backends.load_rows(backend, transformation, host).items():
+                    row = to_row(backend, transformation, host, 'HD', None,
+                                 f'passport_{passport_id}.json', metrics)
+                    if row['pixels'] is not None:
+                        rows.append(row)
+
+    append_rows(Path(args.output), rows)
+    print(f"✓ Imported {len(rows)} proof(s) into: {args.output}")
+
+
+def fit_linear(xs: List[float], ys: List[float]) -> Optional[Tuple[float, float]]:
+    """Least-squares y = a + b * x; with one distinct x the line goes through the origin."""
+    distinct = set(xs)
+    if len(distinct) == 1:
+        x = xs[0]
+        return 0.0, statistics.mean(ys) / x if x else 0.0
+    mean_x, mean_y = statistics.mean(xs), statistics.mean(ys)
+    sxx = sum((x - mean_x) ** 2 for x in xs)
+    sxy = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+    slope = sxy / sxx
+    return mean_y - slope * mean_x, slope
+
+
+def fit_model(pixels: List[int], values: List[float], candidates: List[str]) -> Dict:
+    """
+    Fit each candidate model and return the one with the lowest RMS relative
+    error. With fewer than three distinct pixel counts every candidate fits
+    exactly, so the first candidate (the prior) is kept.
+    """
+    best = None
+    for name in candidates:
+        g = MODELS[name]
+        xs = [g(n) for n in pixels]
+        a, b = fit_linear(xs, values)
+        errors = [((a + b * x) - y) / y for x, y in zip(xs, values) if y]
+        rms = math.sqrt(sum(e * e for e in errors) / len(errors)) if errors else 0.0
+        fit = {'model': name, 'a': a, 'b': b, 'rms_rel_error': rms}
+        if best is None or (len(set(pixels)) >= 3 and rms < best['rms_rel_error']):
+            best = fit
+    best['points'] = len(set(pixels))
+    return best
+
+
+def predict(fit: Dict, pixels: int) -> float:
+    return fit['a'] + fit['b'] * MODELS[fit['model']](pixels)
+
+
+def parse_target(value: str) -> int:
+    """Extrapolation target: SD/HD/FHD/4K, HEIGHTxWIDTH or a pixel count."""
+    if value.upper() in RESOLUTIONS:
+        height, width = RESOLUTIONS[value.upper()]
+        return height * width
+    if 'x' in value.lower():
+        height, width = parse_region(value)
+        return height * width
+    return int(value)
+
+
+def cmd_fit(args):
+    csv_file = Path(args.input)
+    if not csv_file.exists():
+        print(f"Error: Sweep file not found: {csv_file}", file=sys.stderr)
+        sys.exit(1)
+
+    groups: Dict[tuple, List[Dict]] = {}
+    with open(csv_file, newline='') as f:
+        for row in csv.DictReader(f):
+            key = (row['backend'], row['transformation'], row['host'])
+            groups.setdefault(key, []).append(row)
+
+    targets = [(t, parse_target(t)) for t in args.extrapolate]
+    results = []
+    for (backend, transformation, host), rows in sorted(groups.items()):
+        print(f"\n{backend} {transformation} ({host}): "
+              f"{len(set(r['pixels'] for r in rows))} pixel count(s), {len(rows)} proof(s)")
+        for metric in TIME_METRICS + MEMORY_METRICS:
+            samples = [(int(r['pixels']), float(r[metric])) for r in rows if r['pixels'] and r[metric]]
+            if not samples:
+                continue
+            # Median per pixel count so large campaigns don't drown out single sweep points
+            by_pixels: Dict[int, List[float]] = {}
+            for n, value in samples:
+                by_pixels.setdefault(n, []).append(value)
+            pixels = sorted(by_pixels)
+            values = [statistics.median(by_pixels[n]) for n in pixels]
+
+            candidates = ['n'] if metric in MEMORY_METRICS else ['n log n', 'n']
+            fit = fit_model(pixels, values, candidates)
+            predictions = {label: predict(fit, n) for label, n in targets}
+            unit = 'GB' if metric in MEMORY_METRICS else 's'
+            extrapolated = ', '.join(f"{label} {value:,.2f}{unit}" for label, value in predictions.items())
+            print(f"  {metric:<15} ~ {fit['a']:.4g} + {fit['b']:.4g} * {fit['model']:<7} "
+                  f"(rms {fit['rms_rel_error'] * 100:.1f}%)  -> {extrapolated}")
+
+            result = {
+                'backend': backend, 'transformation': transformation, 'host': host, 'metric': metric,
+                'model': fit['model'], 'a': fit['a'], 'b': fit['b'],
+                'points': fit['points'], 'rms_rel_error': fit['rms_rel_error'],
+            }
+            for label, value in predictions.items():
+                result[f'predicted_{label}'] = value
+            results.append(result)
+
+    if args.output and results:
+        fieldnames = list(results[0].keys())
+        with open(args.output, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            writer.writeheader()
+            writer.writerows(results)
+        print(f"\n✓ Models written to: {args.output}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Sweep proof cost over pixel counts and fit scaling models'
+    )
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run = subparsers.add_parser('run', help='Convert, prove and record each sweep point')
+    run.add_argument('--backend', '-b', choices=proof_runner.BACKENDS, required=True)
+    run.add_argument('--transformation', '-t', required=True)
+    run.add_argument('--image', '-i', required=True, help='Source PNG image')
+    run.add_argument('--points', '-p', nargs='+', required=True,
+                     help='HEIGHTxWIDTH regions (Veritas), HD/4K (VIMz) or SD/FHD (Veritas resize)')
+    run.add_argument('--repeats', type=int, default=1, help='Proofs per point (default: 1)')
+    run.add_argument('--threads', type=int, default=None, help='RAYON_NUM_THREADS (default: all cores)')
+    run.add_argument('--host', default=socket.gethostname(), help='Host label (default: hostname)')
+    run.add_argument('--work-dir', default='sweep_runs', help='Inputs and logs (default: sweep_runs)')
+    run.add_argument('--output', '-o', default='scaling_sweep.csv', help='Sweep CSV (default: scaling_sweep.csv)')
+    run.set_defaults(func=cmd_run)
+
+    imp = subparsers.add_parser('import', help='Add points from existing proofs_<host>_hd directories')
+    imp.add_argument('--backends', nargs='+', choices=proof_runner.BACKENDS, default=list(proof_runner.BACKENDS))
+    imp.add_argument('--transformations', nargs='+', default=['blur', 'crop', 'grayscale', 'resize'])
+    imp.add_argument('--output', '-o', default='scaling_sweep.csv', help='Sweep CSV (default: scaling_sweep.csv)')
+    imp.set_defaults(func=cmd_import)
+
+    fit = subparsers.add_parser('fit', help='Fit scaling models and extrapolate')
+    fit.add_argument('--input', '-i', default='scaling_sweep.csv', help='Sweep CSV (default: scaling_sweep.csv)')
+    fit.add_argument('--extrapolate', '-e', nargs='+', default=['HD', '4K'],
+                     help='Targets: SD/HD/FHD/4K, HEIGHTxWIDTH or pixel counts (default: HD 4K)')
+    fit.add_argument('--output', '-o', default='scaling_models.csv', help='Fitted models (default: scaling_models.csv)')
+    fit.set_defaults(func=cmd_fit)
+
+    args = parser.parse_args()
+    if args.command == 'run':
+        # Reject points that cannot be converted or proven before running anything
+        for point in args.points:
+            try:
+                converter_command(args.backend, args.transformation, point, Path(args.image), Path(args.work_dir))
+            except (ValueError, argparse.ArgumentTypeError) as e:
+                run.error(str(e))
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()
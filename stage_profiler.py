@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Stage-level profiling for the image converters.
+
+Every VIMz and Veritas converter accepts:
+
+    --profile               print the time spent in each stage
+                            (decode, transform, compress/encode, serialize, write)
+    --profile-log FILE      also append one JSON line per conversion to FILE (for batches)
+    --profile-cprofile DIR  save a cProfile dump per stage as DIR/<image>_<stage>.prof
+    --profile-memory        record the tracemalloc peak per stage (slows the conversion down)
+
+The batch_convert.sh scripts set --profile-log when run with PROFILE=1, then print the
+aggregated table. The table can also be produced directly:
+
+Usage:
+    python3 stage_profiler.py <profile.jsonl> [<profile.jsonl> ...] [-o table.csv]
+
+Example:
+    PROFILE=1 vimz/image_converter/batch_convert.sh blur passports_hd blur/outputs_hd
+    python3 stage_profiler.py vimz/image_converter/blur/outputs_hd/conversion_profile.jsonl
+"""
+
+import argparse
+import cProfile
+import csv
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from compressed_io import open_text
+
+
+# Canonical stage order for reports; converters may add their own stages
+STAGES = ('decode', 'transform', 'compress', 'encode', 'serialize', 'write')
+
+
+def add_profile_arguments(parser: argparse.ArgumentParser):
+    """Add the --profile* options to a converter's argument parser."""
+    group = parser.add_argument_group('profiling')
+    group.add_argument('--profile', action='store_true',
+                       help='Print the time spent in each conversion stage')
+    group.add_argument('--profile-log', default=None, metavar='FILE',
+                       help='Append per-stage timings as a JSON line to FILE (implies --profile)')
+    group.add_argument('--profile-cprofile', default=None, metavar='DIR',
+                       help='Save a cProfile dump per stage into DIR')
+    group.add_argument('--profile-memory', action='store_true',
+                       help='Record the tracemalloc peak of each stage')
+
+
+class StageProfiler:
+    """
+    Times named stages of one conversion. When disabled, stage() is a no-op so the
+    converters can leave the instrumentation in place.
+    """
+
+    def __init__(self, converter: str, image: str, enabled: bool = False, log_file: Optional[str] = None,
+                 cprofile_dir: Optional[str] = None, memory: bool = False):
+        self.converter = converter
+        self.image = image
+        self.log_file = log_file
+        self.cprofile_dir = Path(cprofile_dir) if cprofile_dir else None
+        self.memory = memory
+        self.enabled = enabled or bool(log_file or cprofile_dir or memory)
+        self.timings: Dict[str, float] = {}
+        self.memory_peaks: Dict[str, int] = {}
+        self.profiles: Dict[str, cProfile.Profile] = {}
+        self.started = time.perf_counter()
+
+    @classmethod
+    def from_args(cls, converter: str, args: argparse.Namespace) -> 'StageProfiler':
+        return cls(converter, Path(args.input).stem, args.profile, args.profile_log,
+                   args.profile_cprofile, args.profile_memory)
+
+    @contextmanager
+    def stage(self, name: str):
+        if not self.enabled:
+            yield
+            return
+
+        profiler = self.profiles.setdefault(name, cProfile.Profile()) if self.cprofile_dir else None
+        if self.memory:
+            tracemalloc.start()
+        if profiler:
+            profiler.enable()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            if profiler:
+                profiler.disable()
+            if self.memory:
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                self.memory_peaks[name] = max(self.memory_peaks.get(name, 0), peak)
+            # A stage entered more than once (e.g. per offset) accumulates
+            self.timings[name] = self.timings.get(name, 0.0) + elapsed
+
+    def write_json(self, data, path, indent=None, separators=None):
+        """
+        json.dump split into the serialize and write stages (same bytes on disk). A .gz or
+        .zst path is compressed (see compressed_io.py), which counts as write.
+        """
+        with self.stage('serialize'):
+            text = json.dumps(data, indent=indent, separators=separators)
+        with self.stage('write'):
+            with open_text(path, 'w') as f:
+                f.write(text)
+
+    def finish(self):
+        """Print the per-stage table and append the record to the profile log."""
+        if not self.enabled:
+            return
+        total = time.perf_counter() - self.started
+        print(f"Profile ({self.converter}, {self.image}):")
+        for name, seconds in self.timings.items():
+            line = f"  {name:<12} {seconds * 1000:10.1f} ms  {100 * seconds / total:5.1f}%"
+            if name in self.memory_peaks:
+                line += f"  peak {self.memory_peaks[name] / 1048576:8.1f} MB"
+            print(line)
+        print(f"  {'total':<12} {total * 1000:10.1f} ms")
+
+        if self.profiles:
+            self.cprofile_dir.mkdir(parents=True, exist_ok=True)
+            for name, profile in self.profiles.items():
+                profile.dump_stats(str(self.cprofile_dir / f'{self.image}_{name}.prof'))
+            print(f"  cProfile dumps: {self.cprofile_dir}/{self.image}_<stage>.prof")
+
+        if self.log_file:
+            record = {
+                'converter': self.converter,
+                'image': self.image,
+                'total_s': round(total, 6),
+                'stages': {name: round(seconds, 6) for name, seconds in self.timings.items()},
+                'memory_peak_bytes': self.memory_peaks or None,
+            }
+            Path(self.log_file).parent.mkdir(parents=True, exist_ok=True)
+            with open(self.log_file, 'a') as f:
+                f.write(json.dumps(record) + '\n')
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * pct / 100.0
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def aggregate(records: List[Dict]) -> List[Dict]:
+    """One row per (converter, stage) across all conversions in a batch."""
+    by_converter: Dict[str, List[Dict]] = {}
+    for record in records:
+        by_converter.setdefault(record['converter'], []).append(record)
+
+    rows = []
+    for converter, items in sorted(by_converter.items()):
+        batch_total = sum(r['total_s'] for r in items)
+        names = [s for s in STAGES if any(s in r['stages'] for r in items)]
+        names += sorted({s for r in items for s in r['stages']} - set(names))
+        for name in names + ['total']:
+            if name == 'total':
+                values = [r['total_s'] for r in items]
+            else:
+                values = [r['stages'][name] for r in items if name in r['stages']]
+            peaks = [r['memory_peak_bytes'][name] for r in items
+                     if r.get('memory_peak_bytes') and name in r['memory_peak_bytes']]
+            rows.append({
+                'converter': converter,
+                'stage': name,
+                'images': len(values),
+                'mean_ms': round(1000 * statistics.mean(values), 2),
+                'p50_ms': round(1000 * percentile(values, 50), 2),
+                'p90_ms': round(1000 * percentile(values, 90), 2),
+                'total_s': round(sum(values), 3),
+                'share_percent': round(100 * sum(values) / batch_total, 1) if batch_total else None,
+                'peak_mb': round(max(peaks) / 1048576, 1) if peaks else None,
+            })
+    return rows
+
+
+def print_table(rows: List[Dict]):
+    print(f"{'Converter':<20} {'Stage':<12} {'Images':>6} {'Mean ms':>10} {'p50 ms':>10} "
+          f"{'p90 ms':>10} {'Total s':>9} {'Share':>6} {'Peak MB':>8}")
+    print("-" * 99)
+    for row in rows:
+        peak = f"{row['peak_mb']:.1f}" if row['peak_mb'] is not None else '-'
+        share = f"{row['share_percent']:.1f}%" if row['share_percent'] is not None else '-'
+        print(f"{row['converter']:<20} {row['stage']:<12} {row['images']:>6} {row['mean_ms']:>10.1f} "
+              f"{row['p50_ms']:>10.1f} {row['p90_ms']:>10.1f} {row['total_s']:>9.2f} "
+              f"{share:>6} {peak:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Aggregate converter stage profiles into one table')
+    parser.add_argument('logs', nargs='+', help='profile JSON-lines files written with --profile-log')
+    parser.add_argument('--output', '-o', default=None, help='Also write the table as CSV')
+
+    args = parser.parse_args()
+
+    records = []
+    for log in args.logs:
+        path = Path(log)
+        if not path.exists():
+            print(f"Error: Profile log not found: {path}", file=sys.stderr)
+            sys.exit(1)
+        with open(path) as f:
+            records.extend(json.loads(line) for line in f if line.strip())
+
+    if not records:
+        print("Error: No profile records found", file=sys.stderr)
+        sys.exit(1)
+
+    rows = aggregate(records)
+    print_table(rows)
+
+    if args.output:
+        with open(args.output, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+            writer.writeheader()
+            writer.writerows(rows)
+        print(f"\n✓ Table written to: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
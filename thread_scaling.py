@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+Measure how each prover phase scales with RAYON_NUM_THREADS.
+
+Both backends parallelize with rayon, but not every phase benefits equally: VIMz key
+generation and the per-step folding are largely sequential, the compression SNARK is
+not; Veritas circuit build is single-threaded while proving fans out. This tool proves
+one representative input per job class at thread counts 1, 2, 4, ... up to all cores
+and reports, per phase:
+
+    speedup      T(1) / T(t)
+    efficiency   speedup / t
+    serial f     Amdahl serial fraction from a least-squares fit T(t) = a + b / t,
+                 f = a / (a + b); the speedup can never exceed 1 / f
+    knee         smallest thread count after which doubling gains less than --min-gain
+
+The "total" phase (wall clock) decides placement: a proof gains little beyond the knee,
+so a host of C cores is better used by C // knee concurrent jobs. capacity_planner.py
+--thread-scaling takes the measured serial fraction from the models CSV instead of
+estimating it from /usr/bin/time.
+
+Commands:
+    run      prove each input at every thread count and append the phase times
+    report   aggregate the runs and write per-phase speedup models
+
+Usage:
+    python3 thread_scaling.py run --inputs <backend:transformation[:res]=INPUT> ... [--threads-list 1 2 4 ...]
+    python3 thread_scaling.py report [--input thread_scaling.csv] [--output thread_scaling_models.csv]
+
+Example:
+    python3 thread_scaling.py run --repeats 3 --inputs \\
+        vimz:blur=vimz/image_converter/blur/outputs_hd/passport_0000.json \\
+        veritas:crop=veritas/benchmark/crop/outputs_hd/passport_0000.json
+    python3 thread_scaling.py report
+    python3 capacity_planner.py --memory-gb 64 --mix vimz:blur=1 veritas:crop=1 \\
+        --thread-scaling thread_scaling_models.csv
+"""
+
+import argparse
+import csv
+import os
+import socket
+import statistics
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import capacity_planner
+import cpu_placement
+import proof_runner
+from scaling_sweep import fit_linear
+
+
+# (phase, metric, factor to seconds) per backend, in execution order
+PHASES = {
+    'vimz': [
+        ('keygen', 'key_generation_time_s', 1.0),
+        ('folding', 'recursive_snark_creation_time_s', 1.0),
+        ('compression', 'compressed_snark_prove_time_s', 1.0),
+        ('verify', 'compressed_snark_verify_time_s', 1.0),
+    ],
+    'veritas': [
+        ('circuit_build', 'circuit_build_time_s', 1.0),
+        ('proving', 'proof_generation_time_s', 1.0),
+        ('verify', 'verification_time_ms', 0.001),
+    ],
+}
+
+TOTAL_PHASE = 'total'
+
+# Relative gain of the next tested thread count below which the curve has flattened
+DEFAULT_MIN_GAIN = 0.10
+
+FIELDNAMES = [
+    'backend', 'transformation', 'resolution', 'host', 'input', 'threads', 'cpu_list',
+    'repeat', 'phase', 'time_s',
+]
+
+
+def default_thread_counts(cores: int) -> List[int]:
+    """1, 2, 4, ... below cores, then cores itself."""
+    counts = []
+    threads = 1
+    while threads < cores:
+        counts.append(threads)
+        threads *= 2
+    counts.append(cores)
+    return counts
+
+
+def phase_times(backend: str, metrics: Dict) -> Dict[str, float]:
+    """Seconds per phase of one proof; total is the wall clock (or the phase sum without it)."""
+    times = {}
+    for phase, metric, factor in PHASES[backend]:
+        if metrics.get(metric) is not None:
+            times[phase] = metrics[metric] * factor
+    total = metrics.get('wall_clock_s') or (sum(times.values()) if times else None)
+    if total:
+        times[TOTAL_PHASE] = total
+    return times
+
+
+def append_rows(csv_file: Path, rows: List[Dict]):
+    """Append rows to the runs CSV, writing the header for a new file."""
+    new_file = not csv_file.exists()
+    with open(csv_file, 'a', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDNAMES)
+        if new_file:
+            writer.writeheader()
+        for row in rows:
+            writer.writerow({k: ('' if row.get(k) is None else row[k]) for k in FIELDNAMES})
+
+
+def cmd_run(args):
+    thread_counts = sorted(set(args.threads_list or default_thread_counts(os.cpu_count() or 1)))
+    work_dir = Path(args.work_dir)
+    rows = []
+
+    for (backend, transformation, resolution), input_path in args.inputs:
+        input_json = Path(input_path)
+        if not input_json.exists():
+            print(f"Error: Input not found: {input_json}", file=sys.stderr)
+            sys.exit(1)
+        label = f'{backend}:{transformation}:{resolution}'
+        print(f"\n{label} ({input_json.name})")
+
+        for threads in thread_counts:
+            cpus = None
+            if args.pin:
+                try:
+                    cpus = cpu_placement.partition(1, threads)[0]['cpus']
+                except ValueError as e:
+                    print(f"  ✗ {threads} thread(s): {e}", file=sys.stderr)
+                    continue
+            for repeat in range(args.repeats):
+                run_dir = work_dir / f'{backend}_{transformation}_{resolution.lower()}' / f't{threads:03d}_r{repeat}'
+                metrics = proof_runner.run_proof(backend, transformation, input_json, run_dir, resolution,
+                                                 threads=threads, cpus=cpus)
+                if metrics['exit_code'] != 0:
+                    reason = 'OOM' if metrics['oom'] else f"exit code {metrics['exit_code']}"
+                    print(f"  ✗ {threads} thread(s): proof failed ({reason}), see {metrics['log_file']}")
+                    break
+                times = phase_times(backend, metrics)
+                for phase, seconds in times.items():
+                    rows.append({
+                        'backend': backend,
+                        'transformation': transformation,
+                        'resolution': resolution,
+                        'host': args.host,
+                        'input': input_json.name,
+                        'threads': threads,
+                        'cpu_list': metrics.get('cpu_list'),
+                        'repeat': repeat,
+                        'phase': phase,
+                        'time_s': seconds,
+                    })
+                summary = ', '.join(f"{phase} {seconds:.2f}s" for phase, seconds in times.items())
+                print(f"  ✓ {threads:>3} thread(s): {summary}")
+
+    append_rows(Path(args.output), rows)
+    print(f"\n✓ Appended {len(rows)} phase time(s) to: {args.output}")
+
+
+def amdahl_fit(curve: Dict[int, float]) -> Tuple[float, float, float]:
+    """
+    Least-squares T(t) = a + b / t over the measured thread counts; returns
+    (a, b, serial fraction a / (a + b)). a is clipped at 0: a phase that scales
+    super-linearly (caches) is reported as fully parallel.
+    """
+    threads = sorted(curve)
+    a, b = fit_linear([1.0 / t for t in threads], [curve[t] for t in threads])
+    if b <= 0:
+        # No measurable gain from threads at all
+        return statistics.mean(curve.values()), 0.0, 1.0
+    a = max(0.0, a)
+    return a, b, a / (a + b)
+
+
+def knee_point(curve: Dict[int, float], min_gain: float) -> int:
+    """Smallest thread count whose successor is less than min_gain faster."""
+    threads = sorted(curve)
+    for current, following in zip(threads, threads[1:]):
+        if curve[following] <= 0 or curve[current] / curve[following] - 1.0 < min_gain:
+            return current
+    return threads[-1]
+
+
+def load_runs(csv_file: Path) -> Dict[tuple, Dict[int, List[float]]]:
+    """Phase times grouped by (backend, transformation, resolution, host, phase) and thread count."""
+    groups: Dict[tuple, Dict[int, List[float]]] = {}
+    with open(csv_file, newline='') as f:
+        for row in csv.DictReader(f):
+            if not row['time_s']:
+                continue
+            key = (row['backend'], row['transformation'], row['resolution'], row['host'], row['phase'])
+            groups.setdefault(key, {}).setdefault(int(row['threads']), []).append(float(row['time_s']))
+    return groups
+
+
+def phase_order(key: tuple) -> tuple:
+    backend, transformation, resolution, host, phase = key
+    names = [p for p, _, _ in PHASES.get(backend, [])] + [TOTAL_PHASE]
+    return backend, transformation, resolution, host, names.index(phase) if phase in names else len(names)
+
+
+def cmd_report(args):
+    csv_file = Path(args.input)
+    if not csv_file.exists():
+        print(f"Error: Runs file not found: {csv_file}", file=sys.stderr)
+        sys.exit(1)
+
+    results = []
+    current = None
+    groups = load_runs(csv_file)
+    for key in sorted(groups, key=phase_order):
+        backend, transformation, resolution, host, phase = key
+        # Median per thread count so a noisy repeat does not move the curve
+        curve = {t: statistics.median(values) for t, values in groups[key].items()}
+        if 1 not in curve:
+            print(f"  {':'.join(key)}: no single-thread run, skipped", file=sys.stderr)
+            continue
+        if key[:4] != current:
+            current = key[:4]
+            print(f"\n{backend} {transformation} {resolution} ({host})")
+            print(f"  {'Phase':<14} {'Threads':>7} {'Time s':>9} {'Speedup':>8} {'Eff.':>6}")
+
+        a, b, fraction = amdahl_fit(curve)
+        knee = knee_point(curve, args.min_gain)
+        cores = args.cores or max(curve)
+        for threads in sorted(curve):
+            speedup = curve[1] / curve[threads] if curve[threads] > 0 else None
+            efficiency = speedup / threads if speedup is not None else None
+            print(f"  {phase:<14} {threads:>7} {curve[threads]:>9.2f} "
+                  f"{speedup or 0:>7.2f}x {(efficiency or 0) * 100:>5.0f}%")
+            results.append({
+                'backend': backend,
+                'transformation': transformation,
+                'resolution': resolution,
+                'host': host,
+                'phase': phase,
+                'threads': threads,
+                'time_s': curve[threads],
+                'speedup': speedup,
+                'efficiency': efficiency,
+                'amdahl_time_s': a + b / threads,
+                'serial_fraction': fraction,
+                'max_speedup': 1.0 / fraction if fraction > 0 else None,
+                'knee_threads': knee,
+                'jobs_per_host': max(1, cores // knee),
+            })
+        limit = f"max speedup {1.0 / fraction:.1f}x" if fraction > 0 else "no serial part measured"
+        print(f"  {'':<14} serial f {fraction:.3f} ({limit}), knee at {knee} thread(s)")
+        if phase == TOTAL_PHASE:
+            print(f"  ✓ {cores} cores: {max(1, cores // knee)} concurrent job(s) x "
+                  f"RAYON_NUM_THREADS={knee}")
+
+    if not results:
+        print("Error: No thread sweeps with a single-thread baseline found", file=sys.stderr)
+        sys.exit(1)
+
+    with open(args.output, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=list(results[0].keys()))
+        writer.writeheader()
+        writer.writerows({k: ('' if v is None else v) for k, v in row.items()} for row in results)
+    print(f"\n✓ Models written to: {args.output}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Measure per-phase prover speedup over RAYON_NUM_THREADS'
+    )
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run = subparsers.add_parser('run', help='Prove each input at every thread count')
+    run.add_argument('--inputs', '-i', nargs='+', required=True, type=capacity_planner.parse_weighted,
+                     metavar='CLASS=INPUT',
+                     help='One representative input per job class, e.g. vimz:blur=passport_0000.json')
+    run.add_argument('--threads-list', '-t', nargs='+', type=int, default=None,
+                     help='Thread counts (default: 1, 2, 4, ... up to all cores)')
+    run.add_argument('--repeats', type=int, default=1, help='Proofs per thread count (default: 1)')
+    run.add_argument('--pin', action='store_true',
+                     help='Pin each proof to as many CPUs as threads (see cpu_placement.py)')
+    run.add_argument('--host', default=socket.gethostname(), help='Host label (default: hostname)')
+    run.add_argument('--work-dir', default='thread_scaling_runs',
+                     help='Proofs and logs (default: thread_scaling_runs)')
+    run.add_argument('--output', '-o', default='thread_scaling.csv',
+                     help='Runs CSV, appended (default: thread_scaling.csv)')
+    run.set_defaults(func=cmd_run)
+
+    report = subparsers.add_parser('report', help='Speedup, efficiency, serial fraction and knee per phase')
+    report.add_argument('--input', '-i', default='thread_scaling.csv', help='Runs CSV (default: thread_scaling.csv)')
+    report.add_argument('--min-gain', type=float, default=DEFAULT_MIN_GAIN,
+                        help=f'Gain of the next thread count that still counts as scaling '
+                             f'(default: {DEFAULT_MIN_GAIN})')
+    report.add_argument('--cores', type=int, default=None,
+                        help='Host cores for the jobs-per-host recommendation (default: highest thread count)')
+    report.add_argument('--output', '-o', default='thread_scaling_models.csv',
+                        help='Per-phase models (default: thread_scaling_models.csv)')
+    report.set_defaults(func=cmd_report)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,419 @@
+#!/usr/bin/env python3
+"""
+Prove full-frame Veritas blur and resize as tiles sized to a memory budget.
+
+A full HD blur needs ~64GB in one plonky2 circuit, more than a 32GB server has. The
+planner splits the frame into the fewest tiles that the memory model (see
+region_tuner.py) expects to fit:
+
+    blur    tiles partition the image interior (the 1-pixel border is never blurred);
+            each input is the tile plus a 1-pixel halo, so the 3x3 kernel of every
+            tile pixel reads exactly the pixels of the full-frame blur
+    resize  tiles partition the resized image; each input carries the source window
+            its interpolation reads, and resize-benchmark.rs keeps the full image's
+            sampling grid from the "tile" header
+
+The inputs are written by the converters (blur.py / resize.py --tile), proven through
+proof_runner.py with --jobs tiles at a time, each capped at memory-gb / jobs (and with
+--pin on its own CPU set, see cpu_placement.py), and the combined cost and coverage are reported. The tile inputs directory also works with
+batch_generate_proofs.sh.
+
+Usage:
+    python3 tile_planner.py --transformation <blur|resize> --image IMG --memory-gb GB
+                            [--jobs N] [--pin] [--tile HxW] [--to-res SD|FHD] [--emit | --run] [--check]
+
+Example:
+    python3 tile_planner.py -t blur -i veritas/benchmark/passports_hd/passport_0000.png --memory-gb 32
+    python3 tile_planner.py -t blur -i veritas/benchmark/passports_hd/passport_0000.png --memory-gb 32 \\
+        --jobs 2 --run --work-dir tiles_blur
+    python3 tile_planner.py -t resize -i veritas/benchmark/passports_hd/passport_0000.png --memory-gb 4 --emit --check
+"""
+
+import argparse
+import csv
+import json
+import math
+import socket
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+import compare_backends
+import cpu_placement
+import proof_runner
+import region_tuner
+import scaling_sweep
+from converter_modules import load_module
+
+
+ROOT = Path(__file__).resolve().parent
+CONVERTERS = {
+    'blur': 'veritas/benchmark/blur/blur.py',
+    'resize': 'veritas/benchmark/resize/resize.py',
+}
+
+# Target sizes of resize.py --to-res, and the source resolution each one is resized from
+RESIZE_TARGETS = {
+    'SD': ((480, 640), 'HD'),
+    'FHD': ((1080, 1920), '4K'),
+}
+
+# Grids up to this many splits per axis are considered
+MAX_SPLITS = 64
+
+RESULT_FIELDS = [
+    'tile', 'row', 'col', 'height', 'width', 'window', 'window_pixels', 'predicted_gb',
+    'status', 'setup_s', 'prove_s', 'verify_s', 'total_s', 'peak_memory_gb', 'log_file',
+]
+
+
+def parse_tile_size(value: str) -> Tuple[int, int]:
+    try:
+        height, width = (int(v) for v in value.lower().split('x'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid tile size '{value}', expected HEIGHTxWIDTH")
+    if height < 1 or width < 1:
+        raise argparse.ArgumentTypeError(f"Invalid tile size '{value}', dimensions must be positive")
+    return height, width
+
+
+def target_area(transformation: str, image_shape: Tuple[int, int], to_res: str) -> Tuple[int, int, int, int]:
+    """(first row, first col, height, width) of the pixels the tiles must cover."""
+    if transformation == 'blur':
+        height, width = image_shape
+        return 1, 1, height - 2, width - 2
+    (height, width), _ = RESIZE_TARGETS[to_res]
+    return 0, 0, height, width
+
+
+def even_splits(total: int, parts: int) -> List[Tuple[int, int]]:
+    """(offset, size) of `parts` near-equal pieces of `total`."""
+    bounds = [round(k * total / parts) for k in range(parts + 1)]
+    return [(bounds[k], bounds[k + 1] - bounds[k]) for k in range(parts)]
+
+
+def fixed_splits(total: int, size: int) -> List[Tuple[int, int]]:
+    """(offset, size) of pieces of `size`, the last one holding the remainder."""
+    return [(offset, min(size, total - offset)) for offset in range(0, total, size)]
+
+
+def choose_grid(height: int, width: int, fit: Dict, budget_gb: float) -> Optional[Tuple[int, int]]:
+    """
+    Fewest (rows, cols) whose largest tile the model expects to fit in budget_gb;
+    ties go to the squarer tiles, which need the least halo.
+    """
+    best = None
+    for rows in range(1, min(MAX_SPLITS, height) + 1):
+        tile_h = math.ceil(height / rows)
+        for cols in range(1, min(MAX_SPLITS, width) + 1):
+            tile_w = math.ceil(width / cols)
+            if fit['a'] + fit['b'] * tile_h * tile_w > budget_gb:
+                continue
+            key = (rows * cols, (tile_h + 2) * (tile_w + 2) * rows * cols)
+            if best is None or key < best[0]:
+                best = (key, (rows, cols))
+            break  # More columns only add tiles
+    return best[1] if best else None
+
+
+def plan_tiles(args, image_shape: Tuple[int, int], fit: Optional[Dict]) -> List[Dict]:
+    row0, col0, height, width = target_area(args.transformation, image_shape, args.to_res)
+    budget = args.memory_gb / args.jobs * region_tuner.MODEL_SAFETY
+
+    if args.tile:
+        row_splits = fixed_splits(height, args.tile[0])
+        col_splits = fixed_splits(width, args.tile[1])
+    else:
+        if fit is None:
+            print(f"Error: No memory model for veritas {args.transformation}; pass --tile HxW "
+                  f"or run scaling_sweep.py first", file=sys.stderr)
+            sys.exit(1)
+        grid = choose_grid(height, width, fit, budget)
+        if grid is None:
+            print(f"Error: Even {MAX_SPLITS}x{MAX_SPLITS} tiles do not fit in {budget:.1f} GB per job "
+                  f"(model fixed cost {fit['a']:.1f} GB)", file=sys.stderr)
+            sys.exit(1)
+        row_splits = even_splits(height, grid[0])
+        col_splits = even_splits(width, grid[1])
+
+    module = load_module(CONVERTERS[args.transformation])
+    to_height, to_width = height, width
+    tiles = []
+    for r, (row, tile_h) in enumerate(row_splits):
+        for c, (col, tile_w) in enumerate(col_splits):
+            tile = (row0 + row, col0 + col, tile_h, tile_w)
+            if args.transformation == 'blur':
+                window = module.tile_window(image_shape, tile)
+            else:
+                window = module.source_window(image_shape, to_height, to_width, tile)
+            window_pixels = (window[2] - window[0]) * (window[3] - window[1])
+            tiles.append({
+                'tile': f'tile_r{r:02d}_c{c:02d}',
+                'row': tile[0],
+                'col': tile[1],
+                'height': tile_h,
+                'width': tile_w,
+                'window': window,
+                'window_pixels': window_pixels,
+                'predicted_gb': fit['a'] + fit['b'] * tile_h * tile_w if fit else None,
+            })
+    return tiles
+
+
+def check_coverage(tiles: List[Dict], area: Tuple[int, int, int, int]) -> Tuple[int, int]:
+    """(covered, overlapping) pixels of the target area; a valid plan covers it exactly once."""
+    row0, col0, height, width = area
+    counts = np.zeros((height, width), dtype=np.uint16)
+    for t in tiles:
+        counts[t['row'] - row0:t['row'] - row0 + t['height'], t['col'] - col0:t['col'] - col0 + t['width']] += 1
+    return int((counts > 0).sum()), int((counts > 1).sum())
+
+
+def print_plan(tiles: List[Dict], area: Tuple[int, int, int, int], image_pixels: int, args):
+    covered, overlapping = check_coverage(tiles, area)
+    target_pixels = area[2] * area[3]
+    window_pixels = sum(t['window_pixels'] for t in tiles)
+    print(f"Plan: {len(tiles)} tile(s) over {area[2]}x{area[3]} ({target_pixels:,} pixels), "
+          f"{args.jobs} at a time, {args.memory_gb / args.jobs:.1f} GB each")
+    print(f"  Coverage: {100.0 * covered / target_pixels:.2f}%, overlap {overlapping} pixel(s)")
+    print(f"  Input pixels: {window_pixels:,} ({window_pixels / image_pixels:.3f}x the source image, "
+          f"halo/window overhead included)")
+    print(f"\n{'Tile':<14} {'Region':<22} {'Window':<26} {'Predicted':>10}")
+    for t in tiles:
+        region = f"{t['height']}x{t['width']} @ {t['row']},{t['col']}"
+        window = "rows {}-{}, cols {}-{}".format(t['window'][0], t['window'][2], t['window'][1], t['window'][3])
+        predicted = f"{t['predicted_gb']:.1f} GB" if t['predicted_gb'] is not None else '-'
+        print(f"{t['tile']:<14} {region:<22} {window:<26} {predicted:>10}")
+    if covered != target_pixels or overlapping:
+        print("✗ Tiles do not cover the frame exactly once", file=sys.stderr)
+        sys.exit(1)
+
+
+def converter_argv(args, image: Path, tile: Dict, output: Path) -> List[str]:
+    argv = [sys.executable, str(ROOT / CONVERTERS[args.transformation]), '-i', str(image), '-o', str(output)]
+    if args.transformation == 'blur':
+        argv += ['-r', 'HD']
+    else:
+        argv += ['--from-res', RESIZE_TARGETS[args.to_res][1], '--to-res', args.to_res]
+    return argv + ['--tile', str(tile['row']), str(tile['col']), str(tile['height']), str(tile['width'])]
+
+
+def emit_inputs(args, image: Path, tiles: List[Dict], inputs_dir: Path) -> bool:
+    inputs_dir.mkdir(parents=True, exist_ok=True)
+
+    def convert(tile: Dict) -> bool:
+        output = inputs_dir / f"{tile['tile']}.json"
+        argv = converter_argv(args, image, tile, output)
+        return subprocess.call(argv, stdout=subprocess.DEVNULL) == 0
+
+    with ThreadPoolExecutor(max_workers=args.jobs) as pool:
+        results = list(pool.map(convert, tiles))
+    for tile, ok in zip(tiles, results):
+        if not ok:
+            print(f"  ✗ Conversion failed for {tile['tile']}", file=sys.stderr)
+    print(f"✓ {sum(results)}/{len(tiles)} tile input(s) written to: {inputs_dir}")
+    return all(results)
+
+
+def check_stitched(args, image: Path, tiles: List[Dict], inputs_dir: Path) -> bool:
+    """Stitch the emitted tiles and compare them with the converter's full-frame output."""
+    module = load_module(CONVERTERS[args.transformation])
+    with Image.open(image) as img:
+        gray = np.array(img.convert('L'), dtype=np.uint8)
+
+    if args.transformation == 'blur':
+        expected = module.apply_blur(gray)
+        key = 'blurred'
+    else:
+        (to_height, to_width), _ = RESIZE_TARGETS[args.to_res]
+        expected = module.resize_image_bilinear(gray, to_height, to_width)
+        key = 'resized'
+
+    mismatched = []
+    for t in tiles:
+        with open(inputs_dir / f"{t['tile']}.json") as f:
+            data = json.load(f)
+        row0, col0, row1, col1 = t['window']
+        pixels = np.array(data[key], dtype=np.uint8)
+        if args.transformation == 'blur':
+            # The blurred tile is the window interior
+            pixels = pixels[1:-1, 1:-1]
+        original_ok = np.array_equal(np.array(data['original'], dtype=np.uint8), gray[row0:row1, col0:col1])
+        tile_ok = np.array_equal(pixels, expected[t['row']:t['row'] + t['height'], t['col']:t['col'] + t['width']])
+        if not (original_ok and tile_ok):
+            mismatched.append(t['tile'])
+
+    if mismatched:
+        print(f"✗ {len(mismatched)} tile(s) differ from the full-frame {args.transformation}: "
+              f"{', '.join(mismatched)}", file=sys.stderr)
+        return False
+    print(f"✓ Stitched tiles match the full-frame {args.transformation} exactly")
+    return True
+
+
+def prove_tiles(args, tiles: List[Dict], inputs_dir: Path, proofs_dir: Path) -> float:
+    """Prove every tile, --jobs at a time; fills in each tile's result and returns the batch wall time."""
+    cap = args.memory_gb / args.jobs
+    slots = cpu_placement.SlotPool(cpu_placement.partition(args.jobs, args.threads)) if args.pin else None
+
+    def prove(tile: Dict) -> Dict:
+        input_json = inputs_dir / f"{tile['tile']}.json"
+        if slots is None:
+            return proof_runner.run_proof('veritas', args.transformation, input_json,
+                                          proofs_dir, 'HD', args.threads, memory_cap_gb=cap)
+        with slots.slot() as placement:
+            return proof_runner.run_proof('veritas', args.transformation, input_json,
+                                          proofs_dir, 'HD', memory_cap_gb=cap, cpus=placement['cpus'])
+
+    started = time.time()
+    with ThreadPoolExecutor(max_workers=args.jobs) as pool:
+        for tile, metrics in zip(tiles, pool.map(prove, tiles)):
+            phases = compare_backends.normalize('veritas', args.transformation, metrics)
+            if metrics['exit_code'] == 0:
+                status = 'ok'
+            elif metrics['memory_capped']:
+                status = 'memory cap'
+            else:
+                status = 'OOM' if metrics['oom'] else f"exit {metrics['exit_code']}"
+            tile.update({k: phases[k] for k in ('setup_s', 'prove_s', 'verify_s', 'total_s', 'peak_memory_gb')})
+            tile.update({'status': status, 'log_file': metrics['log_file']})
+            mark = '✓' if status == 'ok' else '✗'
+            print(f"  {mark} {tile['tile']}: {status}, prove {tile['prove_s'] or 0:.1f}s, "
+                  f"peak {tile['peak_memory_gb'] or 0:.2f} GB")
+    return time.time() - started
+
+
+def report(tiles: List[Dict], area: Tuple[int, int, int, int], wall_s: float) -> Dict:
+    proven = [t for t in tiles if t.get('status') == 'ok']
+    covered, _ = check_coverage(proven, area) if proven else (0, 0)
+    target_pixels = area[2] * area[3]
+
+    def total(key):
+        return sum(t[key] or 0 for t in proven)
+
+    summary = {
+        'tiles': len(tiles),
+        'proven': len(proven),
+        'coverage_percent': round(100.0 * covered / target_pixels, 3),
+        'setup_s': round(total('setup_s'), 3),
+        'prove_s': round(total('prove_s'), 3),
+        'verify_s': round(total('verify_s'), 3),
+        'total_s': round(total('total_s'), 3),
+        'batch_wall_s': round(wall_s, 3),
+        'max_peak_memory_gb': max((t['peak_memory_gb'] or 0 for t in proven), default=None),
+    }
+    print(f"\nProven {summary['proven']}/{summary['tiles']} tile(s), coverage {summary['coverage_percent']:.2f}%")
+    print(f"  Sum of tile phases: setup {summary['setup_s']:.1f}s, prove {summary['prove_s']:.1f}s, "
+          f"verify {summary['verify_s']:.2f}s, total {summary['total_s']:.1f}s")
+    print(f"  Batch wall clock: {wall_s:.1f}s, max peak {summary['max_peak_memory_gb'] or 0:.2f} GB")
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Prove full-frame Veritas blur or resize as tiles sized to a memory budget'
+    )
+    parser.add_argument('--transformation', '-t', choices=list(CONVERTERS), required=True)
+    parser.add_argument('--image', '-i', required=True, help='Source PNG image')
+    parser.add_argument('--memory-gb', '-m', type=float, required=True, help='Memory budget of the host')
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                        help='Tiles proven concurrently; each gets memory-gb / jobs (default: 1)')
+    parser.add_argument('--tile', type=parse_tile_size, default=None,
+                        help='Fixed tile size HEIGHTxWIDTH instead of the model-sized grid')
+    parser.add_argument('--to-res', choices=list(RESIZE_TARGETS), default='SD',
+                        help='Resize target (default: SD)')
+    parser.add_argument('--threads', type=int, default=None, help='RAYON_NUM_THREADS per tile proof')
+    parser.add_argument('--pin', action='store_true',
+                        help='Pin each concurrent tile proof to its own CPU set (threads default to cores / jobs)')
+    parser.add_argument('--host', default=socket.gethostname(), help='Host label for the memory model')
+    parser.add_argument('--sweep', default='scaling_sweep.csv',
+                        help='Sweep CSV for the memory model (default: scaling_sweep.csv)')
+    parser.add_argument('--work-dir', default='tile_runs', help='Tile inputs, proofs and report (default: tile_runs)')
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--emit', action='store_true', help='Write the tile inputs')
+    mode.add_argument('--run', action='store_true', help='Write the tile inputs and prove them')
+    parser.add_argument('--check', action='store_true',
+                        help='Compare the stitched tile inputs with the full-frame converter output')
+
+    args = parser.parse_args()
+
+    image = Path(args.image).resolve()
+    if not image.exists():
+        print(f"Error: Image not found: {image}", file=sys.stderr)
+        sys.exit(1)
+    if args.jobs < 1 or args.memory_gb <= 0:
+        print("Error: --jobs must be at least 1 and --memory-gb positive", file=sys.stderr)
+        sys.exit(1)
+    if args.pin:
+        try:
+            cpu_placement.partition(args.jobs, args.threads)
+        except ValueError as e:
+            print(f"Error: --pin: {e}", file=sys.stderr)
+            sys.exit(1)
+
+    with Image.open(image) as img:
+        image_width, image_height = img.size
+    image_shape = (image_height, image_width)
+    if args.transformation == 'resize':
+        from_res = RESIZE_TARGETS[args.to_res][1]
+        if image_shape != scaling_sweep.RESOLUTIONS[from_res]:
+            print(f"Error: Resize to {args.to_res} expects a {from_res} image, got {image_height}x{image_width}",
+                  file=sys.stderr)
+            sys.exit(1)
+
+    fit, source = region_tuner.memory_model(args.transformation, args.host, Path(args.sweep))
+    print(f"Veritas {args.transformation} of {image.name} ({image_height}x{image_width}), "
+          f"budget {args.memory_gb:g} GB")
+    if fit:
+        print(f"Memory model ({source}): peak_gb ~ {fit['a']:.3g} + {fit['b']:.3g} * tile pixels")
+
+    area = target_area(args.transformation, image_shape, args.to_res)
+    tiles = plan_tiles(args, image_shape, fit)
+    print_plan(tiles, area, image_height * image_width, args)
+
+    work_dir = Path(args.work_dir)
+    inputs_dir = work_dir / 'inputs'
+    if not (args.emit or args.run or args.check):
+        return
+
+    print()
+    if not emit_inputs(args, image, tiles, inputs_dir):
+        sys.exit(1)
+    if args.check and not check_stitched(args, image, tiles, inputs_dir):
+        sys.exit(1)
+    if not args.run:
+        return
+
+    print(f"\nProving {len(tiles)} tile(s), {args.jobs} at a time")
+    wall_s = prove_tiles(args, tiles, inputs_dir, work_dir / 'proofs')
+    summary = report(tiles, area, wall_s)
+
+    with open(work_dir / 'tile_results.csv', 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=RESULT_FIELDS)
+        writer.writeheader()
+        for t in tiles:
+            writer.writerow({k: ('' if t.get(k) is None else t[k]) for k in RESULT_FIELDS})
+    with open(work_dir / 'tile_report.json', 'w') as f:
+        json.dump({
+            'transformation': args.transformation,
+            'image': image.name,
+            'memory_gb': args.memory_gb,
+            'jobs': args.jobs,
+            'threads': args.threads,
+            'host': args.host,
+            'summary': summary,
+            'tiles': tiles,
+        }, f, indent=2)
+    print(f"✓ Report written to: {work_dir / 'tile_report.json'}")
+    if summary['proven'] != summary['tiles']:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
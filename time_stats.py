@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Parse the resource counters that /usr/bin/time -v appends to every proof log
+and derive CPU-efficiency metrics from them.
+
+Used by the VIMz and Veritas extractors and by proof_runner.py.
+
+The core count comes from the "Cores available: N" line that proof_runner.py and the
+batch_generate_proofs.sh scripts append to the statistics, or from --cores for logs
+written before that line existed. Without either, cores and parallel_efficiency are
+left empty rather than guessed from the machine reading the log.
+
+Derived metrics:
+    parallel_efficiency   (user + sys) / (wall × cores); 1.0 = every core busy the whole run
+    sys_share             sys / (user + sys); high values point at allocation churn or lock contention
+    minor_faults_per_gb   minor page faults per GB of peak RSS (1 GB touched once ≈ 262k faults with 4 KiB pages)
+    major_faults_per_gb   major page faults per GB of peak RSS
+    involuntary_switches_per_s  involuntary context switches per wall second (thread oversubscription)
+
+Usage:
+    python3 time_stats.py <log_or_time_stats_file[.gz|.zst]> [--cores N]
+"""
+
+import argparse
+import json
+import re
+import sys
+from typing import Dict, List, Optional
+
+from compressed_io import open_text
+
+
+# /usr/bin/time -v label -> (key, type)
+COUNTERS = {
+    'User time (seconds)': ('user_time_s', float),
+    'System time (seconds)': ('system_time_s', float),
+    'Maximum resident set size (kbytes)': ('peak_memory_kb', int),
+    'Major (requiring I/O) page faults': ('major_page_faults', int),
+    'Minor (reclaiming a frame) page faults': ('minor_page_faults', int),
+    'Voluntary context switches': ('voluntary_context_switches', int),
+    'Involuntary context switches': ('involuntary_context_switches', int),
+    'File system inputs': ('fs_inputs', int),
+    'File system outputs': ('fs_outputs', int),
+    'Exit status': ('exit_status', int),
+}
+
+COUNTER_FIELDS = [key for key, _ in COUNTERS.values() if key not in ('peak_memory_kb', 'exit_status')] + \
+    ['cpu_percent', 'wall_clock_s']
+
+# Line recording the cores the prover could use, appended after the /usr/bin/time -v output
+CORES_LABEL = 'Cores available'
+
+DERIVED_FIELDS = [
+    'cores',
+    'parallel_efficiency',
+    'sys_share',
+    'minor_faults_per_gb',
+    'major_faults_per_gb',
+    'involuntary_switches_per_s',
+]
+
+
+def parse_wall_clock(value: str) -> Optional[float]:
+    """Convert /usr/bin/time's 'h:mm:ss' or 'm:ss.ss' to seconds."""
+    try:
+        seconds = 0.0
+        for part in value.strip().split(':'):
+            seconds = seconds * 60 + float(part)
+        return seconds
+    except ValueError:
+        return None
+
+
+def parse_time_stats(text: str) -> Dict[str, Optional[float]]:
+    """
+    Parse the counters printed by /usr/bin/time -v.
+
+    Returns user_time_s, system_time_s, cpu_percent, wall_clock_s, peak_memory_kb,
+    page faults, context switches, file system inputs/outputs and exit_status.
+    """
+    stats = {key: None for key, _ in COUNTERS.values()}
+    stats.update({'cpu_percent': None, 'wall_clock_s': None})
+    for line in text.split('\n'):
+        line = line.strip()
+        if line.startswith('Percent of CPU this job got:'):
+            match = re.search(r'([0-9.]+)%', line)
+            if match:
+                stats['cpu_percent'] = float(match.group(1))
+        elif line.startswith('Elapsed (wall clock) time'):
+            stats['wall_clock_s'] = parse_wall_clock(line.rsplit(': ', 1)[1])
+        elif ':' in line:
+            label, value = line.split(':', 1)
+            if label in COUNTERS:
+                key, kind = COUNTERS[label]
+                try:
+                    stats[key] = kind(value)
+                except ValueError:
+                    pass
+    return stats
+
+
+def parse_cores(text: str) -> Optional[int]:
+    """The core count recorded on a "Cores available: N" line, or None."""
+    match = re.search(rf'^\s*{CORES_LABEL}:\s*([0-9]+)\s*$', text, re.MULTILINE)
+    return int(match.group(1)) if match else None
+
+
+def pop_cores_arg(argv: List[str]) -> Optional[int]:
+    """
+    Remove "--cores N" (anywhere on the command line) from argv and return N, or None
+    when absent. Used by the extractors, whose other arguments are positional.
+    """
+    if '--cores' not in argv:
+        return None
+    index = argv.index('--cores')
+    try:
+        cores = int(argv[index + 1])
+    except (IndexError, ValueError):
+        print("Error: --cores needs an integer", file=sys.stderr)
+        sys.exit(1)
+    del argv[index:index + 2]
+    return cores
+
+
+def derive_efficiency(stats: Dict[str, Optional[float]], cores: Optional[int] = None) -> Dict[str, Optional[float]]:
+    """
+    Derived CPU/memory-efficiency metrics from parsed time stats.
+
+    cores is the number of cores the proof could use; when unknown, cores and
+    parallel_efficiency are None.
+    """
+    user = stats.get('user_time_s')
+    system = stats.get('system_time_s')
+    wall = stats.get('wall_clock_s')
+    peak_gb = stats['peak_memory_kb'] / (1024.0 * 1024.0) if stats.get('peak_memory_kb') else None
+
+    derived = {key: None for key in DERIVED_FIELDS}
+    derived['cores'] = cores
+    if user is not None and system is not None:
+        cpu = user + system
+        if wall and cores:
+            derived['parallel_efficiency'] = round(cpu / (wall * cores), 4)
+        if cpu > 0:
+            derived['sys_share'] = round(system / cpu, 4)
+    if peak_gb:
+        for kind in ('minor', 'major'):
+            faults = stats.get(f'{kind}_page_faults')
+            if faults is not None:
+                derived[f'{kind}_faults_per_gb'] = round(faults / peak_gb, 1)
+    if wall and stats.get('involuntary_context_switches') is not None:
+        derived['involuntary_switches_per_s'] = round(stats['involuntary_context_switches'] / wall, 1)
+    return derived
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Print /usr/bin/time -v counters and derived efficiency metrics')
+    parser.add_argument('file', help='Proof *_output.log or *_time_stats.log (plain, .gz or .zst)')
+    parser.add_argument('--cores', type=int, default=None,
+                        help='Cores on the host that ran the proof, for files without a '
+                             f'"{CORES_LABEL}" line (default: leave efficiency empty)')
+
+    args = parser.parse_args()
+
+    with open_text(args.file, errors='replace') as f:
+        text = f.read()
+    stats = parse_time_stats(text)
+    stats.update(derive_efficiency(stats, parse_cores(text) or args.cores))
+    print(json.dumps(stats, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Verification throughput of existing proofs, without proving anything.
+
+Verification is what a service runs at volume, but the provers only verify once, inline.
+This tool runs the verify-only mode of a backend on a directory of proofs for each worker
+count and reports verifications/s, latency percentiles and memory per worker:
+
+    VIMz     vimz --verify DIR --workers N    <name>_proof.{json,bin,bincode}, <name>_public.json
+                                              and the circuit's <circuit>_vk.{json,bin,bincode}
+    Veritas  verify-benchmark DIR --workers N <name>_proof.json and <name>_vk.bin
+
+proof_runner.py and the batch_generate_proofs.sh scripts write these artifacts next to
+every proof. Each verifier loads all proofs and keys first; a verification's latency is
+proof deserialization plus the verifier call. Memory per worker is the growth of the
+verifier's resident set over that loaded baseline, divided by the workers; the verifiers
+reset their peak RSS after loading, so load transients do not count.
+
+Both provers verify with rayon; unless --threads is given every run gets
+RAYON_NUM_THREADS = cores // workers, so higher worker counts do not oversubscribe.
+
+Usage:
+    python3 verify_throughput.py <backend> <proof_dir> [--workers 1 2 4 ...] [--threads N]
+                                 [--vk FILE] [--log-dir DIR] [--output CSV]
+
+Example:
+    python3 verify_throughput.py vimz vimz/image_converter/blur/proofs_server_hd --workers 1 4 16
+    python3 verify_throughput.py veritas veritas/benchmark/crop/proofs_server_hd -o verify_crop.csv
+"""
+
+import argparse
+import csv
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import proof_runner
+from extract_vimz_metrics import percentile
+from thread_scaling import default_thread_counts
+
+
+FIELDNAMES = [
+    'backend', 'proof_dir', 'workers', 'rayon_threads', 'proofs', 'failed', 'elapsed_s',
+    'verifications_per_s', 'p50_ms', 'p90_ms', 'p99_ms', 'max_ms',
+    'baseline_rss_mb', 'peak_rss_mb', 'memory_per_worker_mb', 'log_file',
+]
+
+
+def build_command(backend: str, proof_dir: Path, workers: int, vk: Optional[str]) -> Tuple[List[str], Path]:
+    """Return (argv, cwd) of one verify-only run."""
+    if backend == 'vimz':
+        argv = ['vimz', '--verify', str(proof_dir), '--workers', str(workers)]
+        if vk:
+            argv += ['--vk', str(Path(vk).resolve())]
+        return argv, proof_runner.VIMZ_ROOT
+
+    binary = proof_runner.VERITAS_ROOT / 'target' / 'release' / 'examples' / 'verify-benchmark'
+    if binary.exists():
+        argv = [str(binary)]
+    else:
+        argv = ['cargo', 'run', '--release', '--example', 'verify-benchmark', '--']
+    return argv + [str(proof_dir), '--workers', str(workers)], proof_runner.VERITAS_ROOT
+
+
+def parse_verify_output(text: str) -> Tuple[List[Tuple[str, bool, int]], Dict[str, int]]:
+    """
+    Per-proof results and the summary of a verify-only run:
+
+        VERIFY passport_0000 ok 152311
+        VERIFY_SUMMARY workers=4 proofs=100 elapsed_us=... baseline_rss_kb=... peak_rss_kb=...
+
+    Returns ([(name, ok, latency_us), ...], {'workers': 4, 'proofs': 100, ...}).
+    """
+    results = []
+    summary = {}
+    for line in text.splitlines():
+        if line.startswith('VERIFY '):
+            _, name, status, latency_us = line.split()
+            results.append((name, status == 'ok', int(latency_us)))
+        elif line.startswith('VERIFY_SUMMARY '):
+            for field in line.split()[1:]:
+                key, value = field.split('=', 1)
+                summary[key] = int(value)
+    return results, summary
+
+
+def summarize(backend: str, proof_dir: Path, threads: int, results: List[Tuple[str, bool, int]],
+              summary: Dict[str, int], log_file: Path) -> Dict:
+    workers = summary['workers']
+    latencies_ms = [latency_us / 1000.0 for _, _, latency_us in results]
+    elapsed_s = summary['elapsed_us'] / 1e6
+    verified = sum(1 for _, ok, _ in results if ok)
+    growth_kb = max(0, summary['peak_rss_kb'] - summary['baseline_rss_kb'])
+    return {
+        'backend': backend,
+        'proof_dir': str(proof_dir),
+        'workers': workers,
+        'rayon_threads': threads,
+        'proofs': summary['proofs'],
+        'failed': len(results) - verified,
+        'elapsed_s': round(elapsed_s, 3),
+        'verifications_per_s': round(verified / elapsed_s, 2) if elapsed_s > 0 else None,
+        'p50_ms': round(percentile(latencies_ms, 50), 3) if latencies_ms else None,
+        'p90_ms': round(percentile(latencies_ms, 90), 3) if latencies_ms else None,
+        'p99_ms': round(percentile(latencies_ms, 99), 3) if latencies_ms else None,
+        'max_ms': round(max(latencies_ms), 3) if latencies_ms else None,
+        'baseline_rss_mb': round(summary['baseline_rss_kb'] / 1024.0, 1),
+        'peak_rss_mb': round(summary['peak_rss_kb'] / 1024.0, 1),
+        'memory_per_worker_mb': round(growth_kb / 1024.0 / workers, 1),
+        'log_file': str(log_file),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Measure verification throughput of existing proofs'
+    )
+    parser.add_argument('backend', choices=proof_runner.BACKENDS, help='Proving backend')
+    parser.add_argument('proof_dir', help='Directory of proofs with their verifier keys')
+    parser.add_argument('--workers', '-w', nargs='+', type=int, default=None,
+                        help='Worker counts to measure (default: 1, 2, 4, ... up to all cores)')
+    parser.add_argument('--threads', '-t', type=int, default=None,
+                        help='RAYON_NUM_THREADS of every run (default: cores // workers)')
+    parser.add_argument('--vk', default=None,
+                        help='VIMz verifier key (default: the one *_vk.* file in the proof directory)')
+    parser.add_argument('--log-dir', default='verify_logs', help='Verifier output (default: verify_logs)')
+    parser.add_argument('--output', '-o', default=None, help='Also write the results as CSV')
+
+    args = parser.parse_args()
+
+    proof_dir = Path(args.proof_dir).resolve()
+    if not proof_dir.is_dir():
+        print(f"Error: Proof directory not found: {args.proof_dir}", file=sys.stderr)
+        sys.exit(1)
+    cores = os.cpu_count() or 1
+    log_dir = Path(args.log_dir)
+    log_dir.mkdir(parents=True, exist_ok=True)
+
+    print("=========================================")
+    print("Verification Throughput")
+    print("=========================================")
+    print(f"Backend: {args.backend}, proofs: {proof_dir}")
+    print("")
+
+    rows = []
+    for workers in sorted(set(args.workers or default_thread_counts(cores))):
+        threads = args.threads or max(1, cores // workers)
+        argv, cwd = build_command(args.backend, proof_dir, workers, args.vk)
+        env = dict(os.environ, RAYON_NUM_THREADS=str(threads))
+        log_file = log_dir / f'{args.backend}_{proof_dir.name}_w{workers:03d}.log'
+        try:
+            proc = subprocess.run(argv, cwd=cwd, env=env, stdout=subprocess.PIPE,
+                                  stderr=subprocess.STDOUT, text=True)
+            output, exit_code = proc.stdout, proc.returncode
+        except OSError as e:
+            output, exit_code = f"Error: {e}\n", 127
+        log_file.write_text(output)
+
+        results, summary = parse_verify_output(output)
+        if exit_code != 0 or not summary:
+            print(f"✗ {workers} worker(s): verifier failed (exit code {exit_code}), see {log_file}")
+            continue
+        row = summarize(args.backend, proof_dir, threads, results, summary, log_file)
+        rows.append(row)
+        print(f"✓ {workers:>3} worker(s) x {threads} thread(s): {row['verifications_per_s']} verif/s, "
+              f"p50 {row['p50_ms']} ms, p99 {row['p99_ms']} ms, "
+              f"{row['memory_per_worker_mb']} MB/worker, {row['failed']} failed")
+
+    if not rows:
+        print("Error: No verify run succeeded", file=sys.stderr)
+        sys.exit(1)
+
+    print("")
+    print(f"{'Workers':>7} {'Threads':>7} {'Verif/s':>9} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} "
+          f"{'Base MB':>8} {'MB/worker':>9}")
+    for row in rows:
+        print(f"{row['workers']:>7} {row['rayon_threads']:>7} {row['verifications_per_s'] or 0:>9.2f} "
+              f"{row['p50_ms'] or 0:>9.2f} {row['p90_ms'] or 0:>9.2f} {row['p99_ms'] or 0:>9.2f} "
+              f"{row['baseline_rss_mb']:>8.1f} {row['memory_per_worker_mb']:>9.1f}")
+    best = max(rows, key=lambda r: r['verifications_per_s'] or 0)
+    print("")
+    print(f"✓ Best: {best['workers']} worker(s) x RAYON_NUM_THREADS={best['rayon_threads']} "
+          f"-> {best['verifications_per_s']} verifications/s")
+
+    if args.output:
+        with open(args.output, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=FIELDNAMES)
+            writer.writeheader()
+            for row in rows:
+                writer.writerow({k: ('' if row.get(k) is None else row[k]) for k in FIELDNAMES})
+        print(f"✓ Results written to: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
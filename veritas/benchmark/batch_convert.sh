@@ -6,6 +6,10 @@
 # Example:
 #   ./batch_convert.sh blur passports_hd blur/outputs_hd
 #   ./batch_convert.sh blur passports_hd blur/outputs_hd --blur-region 1 1 6 6
+#   ./batch_convert.sh blur passports_hd blur/outputs_hd --blur-region 1 1 500 900 --output-mode region
+#   ./batch_convert.sh crop-sweep passports_hd crop/outputs_sweep 0,0 236,105 400,200
+#   ./batch_convert.sh grayscale passports_hd grayscale/outputs_hd 480 640
+#   ./batch_convert.sh resize passports_hd resize/outputs_hd --to-res SD
 
 TRANSFORMATION="${1:-blur}"  # Default to blur
 INPUT_DIR="${2:-passports_hd}"
@@ -37,6 +41,27 @@ echo "Found $TOTAL image(s) to process"
 echo "========================================="
 echo ""
 
+# COMPRESS=zst or COMPRESS=gz writes .json.zst / .json.gz inputs (see compressed_io.py;
+# ZKP_GZIP_LEVEL / ZKP_ZSTD_LEVEL set the level per format, ZKP_COMPRESS_THREADS the zstd threads)
+OUTPUT_EXT=".json${COMPRESS:+.$COMPRESS}"
+
+# PROFILE=1 times each converter stage and prints a per-stage table at the end
+PROFILE_ARGS=()
+PROFILE_LOG="$FULL_OUTPUT_DIR/conversion_profile.jsonl"
+if [ "${PROFILE:-0}" == "1" ]; then
+    mkdir -p "$FULL_OUTPUT_DIR"
+    : > "$PROFILE_LOG"
+    PROFILE_ARGS=(--profile-log "$PROFILE_LOG")
+fi
+
+# DEDUP=1 writes each image's grayscale original once into the original store (ORIGINAL_STORE,
+# default originals/ next to this script) and references it by hash from the blur, crop and
+# resize inputs (see original_store.py); grayscale inputs keep their RGB original inline
+STORE_ARGS=()
+if [ "${DEDUP:-0}" == "1" ]; then
+    STORE_ARGS=(--original-store "${ORIGINAL_STORE:-$SCRIPT_DIR/originals}")
+fi
+
 # Counter for progress
 COUNT=0
 
@@ -50,26 +75,28 @@ for img in "$FULL_INPUT_DIR"/*.png; do
         
         # Choose the appropriate converter and parameters
         if [ "$TRANSFORMATION" == "blur" ]; then
-            OUTPUT_FILE="$FULL_OUTPUT_DIR/${BASENAME}.json"
+            OUTPUT_FILE="$FULL_OUTPUT_DIR/${BASENAME}${OUTPUT_EXT}"
             
-            # Check if additional blur region parameters are provided
-            if [ $# -ge 7 ] && [ "$4" == "--blur-region" ]; then
-                # Custom blur region: --blur-region start_row start_col height width
-                python3 "$SCRIPT_DIR/blur/blur.py" \
-                    -i "$img" \
-                    -o "$OUTPUT_FILE" \
-                    -r HD \
-                    --blur-region "$5" "$6" "$7" "$8"
-            else
-                # Default: blur entire image (excluding borders)
-                python3 "$SCRIPT_DIR/blur/blur.py" \
-                    -i "$img" \
-                    -o "$OUTPUT_FILE" \
-                    -r HD
-            fi
+            # Additional parameters are passed through to blur.py:
+            #   --blur-region start_row start_col height width
+            #   --output-mode full|region|delta
+            # Without --blur-region (or --tile) the default 500x900 region is written into the
+            # input, so the prover never falls back to the whole interior (~64 GB).
+            REGION_ARGS=(--blur-region 1 1 500 900)
+            for arg in "${@:4}"; do
+                if [ "$arg" == "--blur-region" ] || [ "$arg" == "--tile" ]; then
+                    REGION_ARGS=()
+                fi
+            done
+            python3 "$SCRIPT_DIR/blur/blur.py" "${PROFILE_ARGS[@]}" "${STORE_ARGS[@]}" \
+                -i "$img" \
+                -o "$OUTPUT_FILE" \
+                -r HD \
+                "${REGION_ARGS[@]}" \
+                "${@:4}"
         
         elif [ "$TRANSFORMATION" == "crop" ]; then
-            OUTPUT_FILE="$FULL_OUTPUT_DIR/${BASENAME}.json"
+            OUTPUT_FILE="$FULL_OUTPUT_DIR/${BASENAME}${OUTPUT_EXT}"
             
             # Check if crop coordinates are provided
             if [ $# -ge 6 ]; then
@@ -78,7 +105,7 @@ for img in "$FULL_INPUT_DIR"/*.png; do
                 CROP_Y="${5:-0}"
                 CROP_W="${6:-}"
                 CROP_H="${7:-}"
-                python3 "$SCRIPT_DIR/crop/crop.py" \
+                python3 "$SCRIPT_DIR/crop/crop.py" "${PROFILE_ARGS[@]}" "${STORE_ARGS[@]}" \
                     -i "$img" \
                     -o "$OUTPUT_FILE" \
                     -r HD \
@@ -89,7 +116,7 @@ for img in "$FULL_INPUT_DIR"/*.png; do
             else
                 # Default: crop same region as VIMz optimized_crop (matching circuit parameters)
                 # VIMz crops: 640×480 pixels at position (236, 105)
-                python3 "$SCRIPT_DIR/crop/crop.py" \
+                python3 "$SCRIPT_DIR/crop/crop.py" "${PROFILE_ARGS[@]}" "${STORE_ARGS[@]}" \
                     -i "$img" \
                     -o "$OUTPUT_FILE" \
                     -r HD \
@@ -99,38 +126,47 @@ for img in "$FULL_INPUT_DIR"/*.png; do
                     --crop-height 480
             fi
         
+        elif [ "$TRANSFORMATION" == "crop-sweep" ]; then
+            # One output per crop offset (X,Y ...) given from the 4th argument on;
+            # the original is serialized once per image
+            OUTPUT_FILE="$FULL_OUTPUT_DIR/${BASENAME}${OUTPUT_EXT}"
+            python3 "$SCRIPT_DIR/crop/crop.py" "${PROFILE_ARGS[@]}" "${STORE_ARGS[@]}" \
+                -i "$img" \
+                -o "$OUTPUT_FILE" \
+                -r HD \
+                --crop-width 640 \
+                --crop-height 480 \
+                --offsets "${@:4}"
+        
         elif [ "$TRANSFORMATION" == "resize" ]; then
-            OUTPUT_FILE="$FULL_OUTPUT_DIR/${BASENAME}.json"
+            OUTPUT_FILE="$FULL_OUTPUT_DIR/${BASENAME}${OUTPUT_EXT}"
             # Default: resize from HD to SD (matching VIMz)
-            python3 "$SCRIPT_DIR/resize/resize.py" \
+            # Additional parameters override it, e.g. --from-res 4K --to-res FHD
+            python3 "$SCRIPT_DIR/resize/resize.py" "${PROFILE_ARGS[@]}" "${STORE_ARGS[@]}" \
                 -i "$img" \
                 -o "$OUTPUT_FILE" \
                 --from-res HD \
-                --to-res SD
+                --to-res SD \
+                "${@:4}"
         
         elif [ "$TRANSFORMATION" == "grayscale" ] || [ "$TRANSFORMATION" == "gray" ]; then
-            OUTPUT_FILE="$FULL_OUTPUT_DIR/${BASENAME}.json"
+            OUTPUT_FILE="$FULL_OUTPUT_DIR/${BASENAME}${OUTPUT_EXT}"
             # Convert RGB to grayscale (full image, matching VIMz)
-            # Region: 480x640, for 4GB memory
-            #python3 "$SCRIPT_DIR/grayscale/grayscale.py" \
-            #    -i "$img" \
-            #    -o "$OUTPUT_FILE" \
-            #    -r HD \
-            #    --process-region \
-            #    --region-height 480 \
-            #    --region-width 640
-            # Region: 720x1280, for server memory
-            python3 "$SCRIPT_DIR/grayscale/grayscale.py" \
+            # Region height/width (default 720x1280, for server memory; 480x640 fits 4GB)
+            # The gray-benchmark example reads the region size from the JSON, no rebuild needed
+            REGION_H="${4:-720}"
+            REGION_W="${5:-1280}"
+            python3 "$SCRIPT_DIR/grayscale/grayscale.py" "${PROFILE_ARGS[@]}" \
                 -i "$img" \
                 -o "$OUTPUT_FILE" \
                 -r HD \
                 --process-region \
-                --region-height 720 \
-                --region-width 1280
+                --region-height "$REGION_H" \
+                --region-width "$REGION_W"
         
         else
             echo "  ✗ Unknown transformation: $TRANSFORMATION"
-            echo "  Supported transformations: blur, crop, resize, grayscale"
+            echo "  Supported transformations: blur, crop, crop-sweep, resize, grayscale"
             continue
         fi
         
@@ -149,3 +185,7 @@ echo "Processed $COUNT image(s)"
 echo "JSON files saved to: $FULL_OUTPUT_DIR"
 echo "========================================="
 
+if [ "${PROFILE:-0}" == "1" ] && [ -s "$PROFILE_LOG" ]; then
+    echo ""
+    python3 "$SCRIPT_DIR/../../stage_profiler.py" "$PROFILE_LOG"
+fi
@@ -13,6 +13,9 @@ VERITAS_ROOT="$(pwd)"
 INPUT_DIR="${1:-benchmark/blur/outputs_hd}"  # Default to outputs_hd
 OUTPUT_DIR="${2:-benchmark/blur/proofs}"     # Default to proofs directory
 TRANSFORMATION="${3:-blur}"                  # Transformation type (blur, crop, etc.)
+# Any further arguments are passed to the example, e.g. --blur-region 1 1 80 80
+# (dimensions and regions are otherwise read from each input JSON)
+EXAMPLE_ARGS=("${@:4}")
 
 # Construct full paths
 FULL_INPUT_DIR="$VERITAS_ROOT/$INPUT_DIR"
@@ -33,7 +36,7 @@ echo "Transformation: $TRANSFORMATION"
 echo "========================================="
 
 # Count total files
-TOTAL=$(find "$FULL_INPUT_DIR" -name "*.json" 2>/dev/null | wc -l)
+TOTAL=$(find "$FULL_INPUT_DIR" \( -name "*.json" -o -name "*.json.gz" -o -name "*.json.zst" \) 2>/dev/null | wc -l)
 
 if [ "$TOTAL" -eq 0 ]; then
     echo "Error: No JSON files found in $FULL_INPUT_DIR"
@@ -43,6 +46,15 @@ fi
 echo "Found $TOTAL JSON file(s) to process"
 echo ""
 
+# Pre-flight check of every input before the first proof (set VALIDATE=0 to skip)
+if [ "${VALIDATE:-1}" == "1" ]; then
+    if ! python3 "$VERITAS_ROOT/../input_validator.py" veritas "$TRANSFORMATION" "$FULL_INPUT_DIR" --quiet; then
+        echo "Error: Invalid inputs in $FULL_INPUT_DIR (fix them or set VALIDATE=0)"
+        exit 1
+    fi
+    echo ""
+fi
+
 # Array to store all results
 declare -a JSON_RESULTS
 
@@ -50,10 +62,12 @@ declare -a JSON_RESULTS
 COUNT=0
 
 # Process each JSON file
-for json_file in "$FULL_INPUT_DIR"/*.json; do
+# Plain, gzip and zstd inputs (the provers decompress .gz/.zst themselves)
+for json_file in "$FULL_INPUT_DIR"/*.json "$FULL_INPUT_DIR"/*.json.gz "$FULL_INPUT_DIR"/*.json.zst; do
     if [ -f "$json_file" ]; then
         COUNT=$((COUNT + 1))
-        BASENAME=$(basename "$json_file" .json)
+        BASENAME=$(basename "$json_file")
+        BASENAME="${BASENAME%%.json*}"
         OUTPUT_PROOF="$FULL_OUTPUT_DIR/${BASENAME}_proof.json"
         LOG_FILE="$FULL_OUTPUT_DIR/${BASENAME}_output.log"
         TIME_STATS="$FULL_OUTPUT_DIR/${BASENAME}_time_stats.log"
@@ -68,7 +82,7 @@ for json_file in "$FULL_INPUT_DIR"/*.json; do
         
         # Run veritas with time -v to capture memory usage
         # Capture stdout to log file and stderr (time stats) to separate file
-        (/usr/bin/time -v cargo run --release --example "$EXAMPLE_NAME" -- "$json_file" 2>&1) \
+        (/usr/bin/time -v cargo run --release --example "$EXAMPLE_NAME" -- "$json_file" --proof "$OUTPUT_PROOF" "${EXAMPLE_ARGS[@]}" 2>&1) \
             > "$LOG_FILE" 2> "$TIME_STATS"
         VERITAS_EXIT=$?
         
@@ -77,6 +91,8 @@ for json_file in "$FULL_INPUT_DIR"/*.json; do
             echo "" >> "$LOG_FILE"
             echo "=== Memory and Resource Statistics ===" >> "$LOG_FILE"
             cat "$TIME_STATS" >> "$LOG_FILE"
+            # Cores the prover could use, read by the extract_*_metrics.py efficiency metrics
+            echo "Cores available: ${RAYON_NUM_THREADS:-$(nproc)}" >> "$LOG_FILE"
         fi
         
         # Check for OOM kill (exit code 137 = 128 + 9 (SIGKILL))
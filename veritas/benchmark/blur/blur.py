@@ -2,32 +2,42 @@
 """
 Convert an image to JSON format for Veritas blur transformation.
 Uses 3x3 box blur kernel matching Veritas blur.rs implementation.
+
+Output modes (--output-mode):
+  full   - "original" and the full "blurred" matrix (default)
+  region - "original" plus only the blurred region and its offsets
+  delta  - "original" plus one [row, start_col, [values...]] run per changed row
+region and delta are written without indentation.
+
+--tile START_ROW START_COL HEIGHT WIDTH writes one tile of a full-frame blur (see
+tile_planner.py): "original" is the tile plus a 1-pixel halo, the whole interior of it
+is blurred, and a "tile" header records where it sits in the full image.
 """
 
-import json
 import sys
 import argparse
 from pathlib import Path
 from PIL import Image
 import numpy as np
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'py_modules'))
+import repo_modules  # noqa: F401
+from stage_profiler import StageProfiler, add_profile_arguments
+from original_store import OriginalStore, add_store_arguments
 
-def apply_blur(image_array, blur_region=None):
+
+def blur_bounds(shape, blur_region=None):
     """
-    Apply 3x3 box blur to image array.
-    Matches the algorithm from Veritas blur.rs.
-    
+    Resolve the half-open pixel bounds that apply_blur writes to.
+
     Args:
-        image_array: 2D numpy array of pixel values (grayscale, 0-255)
+        shape: (height, width) of the image
         blur_region: Tuple (start_row, start_col, height, width) or None for full image
-    
+
     Returns:
-        2D numpy array of blurred pixels
+        Tuple (start_row, start_col, end_row, end_col)
     """
-    height, width = image_array.shape
-    blurred = np.zeros_like(image_array, dtype=np.uint8)
-    
-    # Determine blur region
+    height, width = shape
     if blur_region:
         start_row, start_col, blur_h, blur_w = blur_region
         end_row = min(start_row + blur_h, height - 1)
@@ -36,6 +46,23 @@ def apply_blur(image_array, blur_region=None):
         # Blur entire image (excluding borders)
         start_row, start_col = 1, 1
         end_row, end_col = height - 1, width - 1
+    return start_row, start_col, end_row, end_col
+
+
+def apply_blur(image_array, blur_region=None):
+    """
+    Apply 3x3 box blur to image array.
+    Matches the algorithm from Veritas blur.rs.
+    
+    Args:
+        image_array: 2D numpy array of pixel values (grayscale, 0-255)
+        blur_region: Tuple (start_row, start_col, height, width) or None for full image
+    
+    Returns:
+        2D numpy array of blurred pixels
+    """
+    # Determine blur region
+    start_row, start_col, end_row, end_col = blur_bounds(image_array.shape, blur_region)
     
     # Copy original image first
     blurred = image_array.copy()
@@ -57,6 +84,64 @@ def apply_blur(image_array, blur_region=None):
     return blurred
 
 
+def tile_window(shape, tile):
+    """
+    Source window for one tile of a full-frame blur: the tile plus a 1-pixel halo.
+
+    Args:
+        shape: (height, width) of the full image
+        tile: Tuple (start_row, start_col, height, width) of blurred pixels, inside the interior
+
+    Returns:
+        Tuple (row0, col0, row1, col1) of the half-open window
+    """
+    height, width = shape
+    start_row, start_col, tile_h, tile_w = tile
+    if start_row < 1 or start_col < 1 or tile_h < 1 or tile_w < 1 \
+            or start_row + tile_h > height - 1 or start_col + tile_w > width - 1:
+        raise ValueError(f"Tile {tile} lies outside the {height}x{width} image interior")
+    return start_row - 1, start_col - 1, start_row + tile_h + 1, start_col + tile_w + 1
+
+
+def encode_blurred(image_np, blurred_np, blur_region, output_mode):
+    """
+    Build the blurred part of the output for the selected mode.
+
+    Args:
+        image_np: 2D numpy array of original pixels
+        blurred_np: 2D numpy array returned by apply_blur
+        blur_region: Tuple (start_row, start_col, height, width) or None
+        output_mode: 'full', 'region' or 'delta'
+
+    Returns:
+        Dict of JSON fields to merge into the output structure
+    """
+    if output_mode == 'full':
+        return {"blurred": blurred_np.tolist()}
+
+    if output_mode == 'region':
+        start_row, start_col, end_row, end_col = blur_bounds(image_np.shape, blur_region)
+        return {
+            "blurred_region": {
+                "start_row": start_row,
+                "start_col": start_col,
+                "height": end_row - start_row,
+                "width": end_col - start_col,
+                "pixels": blurred_np[start_row:end_row, start_col:end_col].tolist()
+            }
+        }
+
+    # Delta: one [row, start_col, values] run per row, spanning its first to last changed
+    # pixel (unchanged pixels inside the span are stored as-is)
+    changed = blurred_np != image_np
+    runs = []
+    for i in np.flatnonzero(changed.any(axis=1)):
+        cols = np.flatnonzero(changed[i])
+        start, end = int(cols[0]), int(cols[-1]) + 1
+        runs.append([int(i), start, blurred_np[i, start:end].tolist()])
+    return {"blurred_delta": runs}
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='Convert an image to JSON format for Veritas blur transformation'
@@ -72,18 +157,29 @@ def main():
     parser.add_argument('--blur-region', nargs=4, type=int,
                        metavar=('START_ROW', 'START_COL', 'HEIGHT', 'WIDTH'),
                        help='Blur region: start_row start_col height width (default: full image excluding borders)')
+    parser.add_argument('--output-mode', choices=['full', 'region', 'delta'],
+                       default='full',
+                       help='Blurred data encoding: full matrix, region only, or per-row delta runs (default: full)')
+    parser.add_argument('--tile', nargs=4, type=int,
+                       metavar=('START_ROW', 'START_COL', 'HEIGHT', 'WIDTH'),
+                       help='Write one tile of a full-frame blur: the tile plus a 1-pixel halo')
     parser.add_argument('--resize', nargs=2, type=int,
                        metavar=('HEIGHT', 'WIDTH'),
                        help='Resize image to HEIGHT x WIDTH before processing')
+    add_profile_arguments(parser)
+    add_store_arguments(parser)
     
     args = parser.parse_args()
+    profiler = StageProfiler.from_args('veritas/blur', args)
+    store = OriginalStore.from_args(args)
     
     print(f"Processing: {args.input}")
     print(f"Resolution: {args.resolution}")
+    print(f"Output mode: {args.output_mode}")
     
     try:
         # Load original image
-        with Image.open(args.input) as image:
+        with profiler.stage('decode'), Image.open(args.input) as image:
             # Convert to grayscale
             if image.mode != 'L':
                 image = image.convert('L')
@@ -97,9 +193,28 @@ def main():
             image_np = np.array(image, dtype=np.uint8)
             print(f"Image size: {image_np.shape[0]}x{image_np.shape[1]} pixels")
         
+        # A tile is proven as its own image: the blur of the window interior
+        # equals the full-frame blur there, since the kernel only reads the halo
+        tile_header = None
+        if args.tile:
+            if args.blur_region:
+                raise ValueError("--tile and --blur-region cannot be combined")
+            row0, col0, row1, col1 = tile_window(image_np.shape, args.tile)
+            tile_header = {
+                "start_row": args.tile[0],
+                "start_col": args.tile[1],
+                "height": args.tile[2],
+                "width": args.tile[3],
+                "image_height": image_np.shape[0],
+                "image_width": image_np.shape[1]
+            }
+            image_np = image_np[row0:row1, col0:col1]
+            print(f"Tile window: rows {row0}-{row1}, cols {col0}-{col1} (1-pixel halo)")
+        
         # Apply blur transformation
         blur_region = tuple(args.blur_region) if args.blur_region else None
-        blurred_np = apply_blur(image_np, blur_region)
+        with profiler.stage('transform'):
+            blurred_np = apply_blur(image_np, blur_region)
         
         if blur_region:
             print(f"Applied blur to region: row {blur_region[0]}-{blur_region[0]+blur_region[2]}, "
@@ -108,29 +223,53 @@ def main():
             print(f"Applied blur to entire image (excluding 1-pixel border)")
         
         # Convert to lists for JSON serialization
-        original = image_np.tolist()
-        blurred = blurred_np.tolist()
-        
-        # Create output structure (matching Veritas expected format)
-        output = {
-            "original": original,
-            "blurred": blurred,
-            "height": len(original),
-            "width": len(original[0]) if original else 0,
+        with profiler.stage('encode'):
+            # Create output structure (matching Veritas expected format)
+            if store:
+                output = {"original_ref": store.original_ref(
+                    image_np, 'veritas', image_np.tolist, args.output)}
+            else:
+                output = {"original": image_np.tolist()}
+            output.update(encode_blurred(image_np, blurred_np, blur_region, args.output_mode))
+        output.update({
+            "height": image_np.shape[0],
+            "width": image_np.shape[1],
             "blur_region": blur_region if blur_region else None,
-            "resolution": args.resolution
-        }
+            "resolution": args.resolution,
+            "output_mode": args.output_mode
+        })
+        if tile_header:
+            output["tile"] = tile_header
+            # The whole tile interior is blurred; say so, or the prover falls back to its
+            # default region
+            start_row, start_col, end_row, end_col = blur_bounds(image_np.shape)
+            output["blur_region"] = [start_row, start_col, end_row - start_row, end_col - start_col]
         
         # Save to JSON
         output_path = Path(args.output)
         output_path.parent.mkdir(parents=True, exist_ok=True)
         
-        with open(output_path, 'w') as f:
-            json.dump(output, f, indent=2)
+        if args.output_mode == 'full':
+            profiler.write_json(output, output_path, indent=2)
+        else:
+            # Compact: region and delta exist to shrink the input, indentation would undo that
+            profiler.write_json(output, output_path, separators=(',', ':'))
         
         print(f"✓ Saved: {args.output}")
-        print(f"  Original rows: {len(original)}")
-        print(f"  Blurred rows: {len(blurred)}")
+        if store:
+            print(f"  Original: {output['original_ref']['path']} (store)")
+        else:
+            print(f"  Original rows: {image_np.shape[0]}")
+        if args.output_mode == 'full':
+            print(f"  Blurred rows: {len(output['blurred'])}")
+        elif args.output_mode == 'region':
+            region = output['blurred_region']
+            print(f"  Blurred region: {region['height']}x{region['width']} "
+                  f"at ({region['start_row']}, {region['start_col']})")
+        else:
+            runs = output['blurred_delta']
+            print(f"  Delta runs: {len(runs)} rows, {sum(len(r[2]) for r in runs)} pixels")
+        profiler.finish()
         
     except Exception as e:
         print(f"Error: {e}")
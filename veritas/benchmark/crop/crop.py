@@ -2,6 +2,9 @@
 """
 Convert an image to JSON format for Veritas crop transformation.
 Crops a region from the original image (simple format, matching Veritas crop.rs).
+
+Sweep mode (--offsets / --grid) serializes the original once and writes one
+input per crop offset as <output_stem>_x<X>_y<Y>.json.
 """
 
 import json
@@ -11,6 +14,13 @@ from pathlib import Path
 from PIL import Image
 import numpy as np
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'py_modules'))
+import repo_modules  # noqa: F401
+from stage_profiler import StageProfiler, add_profile_arguments
+from original_store import OriginalStore, add_store_arguments
+from compressed_io import open_text
+from crop_sweep import add_sweep_arguments, sweep_offsets, sweep_output_path
+
 
 def apply_crop(image_array, crop_x=0, crop_y=0, crop_width=None, crop_height=None, resolution='HD'):
     """
@@ -55,6 +65,55 @@ def apply_crop(image_array, crop_x=0, crop_y=0, crop_width=None, crop_height=Non
     return cropped
 
 
+def build_output(original_field, shape, cropped, crop_x, crop_y, resolution):
+    """
+    Create the output structure (matching Veritas expected format). original_field
+    is {"original": ...} or {"original_ref": ...}, shape the original's (height, width).
+    """
+    output = dict(original_field)
+    output.update({
+        "cropped": cropped,
+        "height": shape[0],
+        "width": shape[1],
+        "crop_x": crop_x,
+        "crop_y": crop_y,
+        "crop_width": len(cropped[0]) if cropped else 0,
+        "crop_height": len(cropped),
+        "resolution": resolution
+    })
+    return output
+
+
+def write_sweep(image_np, original_field, offsets, args, profiler):
+    """
+    Write one crop input per offset, serializing the original only once.
+
+    The "original" block (or its "original_ref") is dumped once and joined
+    with the per-offset fields, so each file is byte-identical to a single run.
+    """
+    with profiler.stage('serialize'):
+        head = json.dumps(original_field, indent=2)[:-2]
+    
+    written = []
+    for crop_x, crop_y in offsets:
+        with profiler.stage('transform'):
+            cropped_np = apply_crop(image_np, crop_x, crop_y,
+                                    args.crop_width, args.crop_height, args.resolution)
+        with profiler.stage('encode'):
+            fields = build_output({}, image_np.shape, cropped_np.tolist(), crop_x, crop_y, args.resolution)
+        with profiler.stage('serialize'):
+            tail = json.dumps(fields, indent=2)[1:]
+        
+        path = sweep_output_path(args.output, crop_x, crop_y)
+        with profiler.stage('write'):
+            with open_text(path, 'w') as f:
+                f.write(head)
+                f.write(',')
+                f.write(tail)
+        written.append((path, cropped_np.shape))
+    return written
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='Convert an image to JSON format for Veritas crop transformation'
@@ -75,15 +134,21 @@ def main():
                        help='Crop width (default: 100 or available)')
     parser.add_argument('--crop-height', type=int, default=None,
                        help='Crop height (default: 100 or available)')
+    add_sweep_arguments(parser)
+    add_profile_arguments(parser)
+    add_store_arguments(parser)
     
     args = parser.parse_args()
+    profiler = StageProfiler.from_args('veritas/crop', args)
+    store = OriginalStore.from_args(args)
+    offsets = sweep_offsets(args)
     
     print(f"Processing: {args.input}")
     print(f"Resolution: {args.resolution}")
     
     try:
         # Load original image
-        with Image.open(args.input) as image:
+        with profiler.stage('decode'), Image.open(args.input) as image:
             # Convert to grayscale
             if image.mode != 'L':
                 image = image.convert('L')
@@ -91,39 +156,50 @@ def main():
             image_np = np.array(image, dtype=np.uint8)
             print(f"Image size: {image_np.shape[0]}x{image_np.shape[1]} pixels")
         
+        # The full original, inline or as a reference into the original store
+        with profiler.stage('encode'):
+            if store:
+                original_field = {"original_ref": store.original_ref(
+                    image_np, 'veritas', image_np.tolist, args.output)}
+            else:
+                original_field = {"original": image_np.tolist()}
+        
+        if offsets:
+            print(f"Crop sweep: {len(offsets)} offset(s)")
+            written = write_sweep(image_np, original_field, offsets, args, profiler)
+            for path, shape in written:
+                print(f"✓ Saved: {path} (size {shape[1]}x{shape[0]})")
+            profiler.finish()
+            return
+        
         # Apply crop transformation (matching VIMz: HD = 1280x720)
-        cropped_np = apply_crop(image_np, args.crop_x, args.crop_y, 
-                                args.crop_width, args.crop_height, args.resolution)
+        with profiler.stage('transform'):
+            cropped_np = apply_crop(image_np, args.crop_x, args.crop_y, 
+                                    args.crop_width, args.crop_height, args.resolution)
         
         print(f"Cropped region: {args.crop_x},{args.crop_y} size {cropped_np.shape[1]}x{cropped_np.shape[0]}")
         
         # Convert to lists for JSON serialization
-        original = image_np.tolist()
-        cropped = cropped_np.tolist()
-        
-        # Create output structure (matching Veritas expected format)
-        output = {
-            "original": original,
-            "cropped": cropped,
-            "height": len(original),
-            "width": len(original[0]) if original else 0,
-            "crop_x": args.crop_x,
-            "crop_y": args.crop_y,
-            "crop_width": len(cropped[0]) if cropped else 0,
-            "crop_height": len(cropped),
-            "resolution": args.resolution
-        }
+        with profiler.stage('encode'):
+            cropped = cropped_np.tolist()
+            
+            # Create output structure (matching Veritas expected format)
+            output = build_output(original_field, image_np.shape, cropped, args.crop_x, args.crop_y,
+                                  args.resolution)
         
         # Save to JSON
         output_path = Path(args.output)
         output_path.parent.mkdir(parents=True, exist_ok=True)
         
-        with open(output_path, 'w') as f:
-            json.dump(output, f, indent=2)
+        profiler.write_json(output, output_path, indent=2)
         
         print(f"✓ Saved: {args.output}")
-        print(f"  Original rows: {len(original)}")
+        if store:
+            print(f"  Original: {output['original_ref']['path']} (store)")
+        else:
+            print(f"  Original rows: {image_np.shape[0]}")
         print(f"  Cropped rows: {len(cropped)}")
+        profiler.finish()
         
     except Exception as e:
         print(f"Error: {e}")
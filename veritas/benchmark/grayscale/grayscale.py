@@ -5,13 +5,16 @@ Converts RGB image to grayscale using standard formula: 0.299*R + 0.587*G + 0.11
 Matches VIMz behavior: processes full image.
 """
 
-import json
 import sys
 import argparse
 from pathlib import Path
 from PIL import Image
 import numpy as np
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'py_modules'))
+import repo_modules  # noqa: F401
+from stage_profiler import StageProfiler, add_profile_arguments
+
 
 def rgb_to_grayscale(image_array):
     """
@@ -53,15 +56,17 @@ def main():
                        help='Region height (default: 240)')
     parser.add_argument('--region-width', type=int, default=320,
                        help='Region width (default: 320)')
+    add_profile_arguments(parser)
     
     args = parser.parse_args()
+    profiler = StageProfiler.from_args('veritas/grayscale', args)
     
     print(f"Processing: {args.input}")
     print(f"Resolution: {args.resolution}")
     
     try:
         # Load original image
-        with Image.open(args.input) as image:
+        with profiler.stage('decode'), Image.open(args.input) as image:
             # Keep original as RGB (or convert to RGB if needed)
             if image.mode != 'RGB':
                 image = image.convert('RGB')
@@ -70,7 +75,8 @@ def main():
             print(f"Image size: {image_np.shape[0]}x{image_np.shape[1]} pixels")
         
         # Apply grayscale transformation to full image first
-        grayscale_np_full = rgb_to_grayscale(image_np)
+        with profiler.stage('transform'):
+            grayscale_np_full = rgb_to_grayscale(image_np)
         
         # Extract region if requested (to fit memory constraints)
         if args.process_region:
@@ -86,16 +92,17 @@ def main():
         
         # Convert to lists for JSON serialization
         # Original: RGB format (height, width, 3) -> list of [R, G, B] per pixel
-        original = []
-        for i in range(image_np.shape[0]):
-            row = []
-            for j in range(image_np.shape[1]):
-                pixel = [int(image_np[i, j, 0]), int(image_np[i, j, 1]), int(image_np[i, j, 2])]
-                row.append(pixel)
-            original.append(row)
-        
-        # Grayscale: single value per pixel
-        grayscale = grayscale_np.tolist()
+        with profiler.stage('encode'):
+            original = []
+            for i in range(image_np.shape[0]):
+                row = []
+                for j in range(image_np.shape[1]):
+                    pixel = [int(image_np[i, j, 0]), int(image_np[i, j, 1]), int(image_np[i, j, 2])]
+                    row.append(pixel)
+                original.append(row)
+            
+            # Grayscale: single value per pixel
+            grayscale = grayscale_np.tolist()
         
         # Create output structure (matching Veritas expected format)
         output = {
@@ -110,12 +117,12 @@ def main():
         output_path = Path(args.output)
         output_path.parent.mkdir(parents=True, exist_ok=True)
         
-        with open(output_path, 'w') as f:
-            json.dump(output, f, indent=2)
+        profiler.write_json(output, output_path, indent=2)
         
         print(f"✓ Saved: {args.output}")
         print(f"  Original rows: {len(original)} (RGB)")
         print(f"  Grayscale rows: {len(grayscale)}")
+        profiler.finish()
         
     except Exception as e:
         print(f"Error: {e}")
@@ -0,0 +1,16 @@
+"""
+Makes the shared modules at the repository root (stage_profiler, original_store,
+compressed_io, ...) importable from the converters:
+
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'py_modules'))
+    import repo_modules  # noqa: F401
+    from stage_profiler import StageProfiler
+"""
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[3]
+
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
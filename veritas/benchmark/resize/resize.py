@@ -2,17 +2,59 @@
 """
 Convert an image to JSON format for Veritas resize transformation.
 Resizes from HD (720x1280) to SD (480x640), matching VIMz behavior.
+
+--tile ROW COL HEIGHT WIDTH writes one tile of the resized image (see tile_planner.py):
+"resized" holds only the tile, "original" only the source window its pixels are
+interpolated from, and a "tile" header carries the offsets and full dimensions so
+resize-benchmark.rs keeps the full image's sampling grid.
 """
 
-import json
 import sys
 import argparse
 from pathlib import Path
 from PIL import Image
 import numpy as np
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'py_modules'))
+import repo_modules  # noqa: F401
+from stage_profiler import StageProfiler, add_profile_arguments
+from original_store import OriginalStore, add_store_arguments
+
+
+def source_position(index, size, new_size):
+    """
+    Low and high source index sampled for one output index (resize.rs get_positions).
+    """
+    low = (size - 1) * index // (new_size - 1) if new_size > 1 else 0
+    high = low if low * (new_size - 1) == (size - 1) * index else min(low + 1, size - 1)
+    return low, high
+
+
+def source_window(shape, new_height, new_width, tile):
+    """
+    Source pixels read by one tile of the resized image.
+
+    Args:
+        shape: (height, width) of the full image
+        new_height, new_width: Size of the full resized image
+        tile: Tuple (row, col, height, width) in resized coordinates
+
+    Returns:
+        Tuple (row0, col0, row1, col1) of the half-open source window
+    """
+    height, width = shape
+    row, col, tile_h, tile_w = tile
+    if row < 0 or col < 0 or tile_h < 1 or tile_w < 1 \
+            or row + tile_h > new_height or col + tile_w > new_width:
+        raise ValueError(f"Tile {tile} lies outside the {new_height}x{new_width} resized image")
+    row0 = source_position(row, height, new_height)[0]
+    row1 = source_position(row + tile_h - 1, height, new_height)[1] + 1
+    col0 = source_position(col, width, new_width)[0]
+    col1 = source_position(col + tile_w - 1, width, new_width)[1] + 1
+    return row0, col0, row1, col1
+
 
-def resize_image_bilinear(image_array, new_height, new_width):
+def resize_image_bilinear(image_array, new_height, new_width, tile=None):
     """
     Resize an image using bilinear interpolation.
     Matches the algorithm from Veritas resize.rs.
@@ -21,20 +63,18 @@ def resize_image_bilinear(image_array, new_height, new_width):
         image_array: 2D numpy array of pixel values (grayscale, 0-255)
         new_height: Target height
         new_width: Target width
+        tile: Optional (row, col, height, width); only that part of the resized image is computed
     
     Returns:
-        2D numpy array of resized pixels
+        2D numpy array of resized pixels (the tile only, if given)
     """
     height, width = image_array.shape
+    row0, col0, tile_h, tile_w = tile if tile else (0, 0, new_height, new_width)
     
-    # Calculate ratios
-    x_ratio = float(width - 1) / float(new_width - 1) if new_width > 1 else 0
-    y_ratio = float(height - 1) / float(new_height - 1) if new_height > 1 else 0
+    resized = np.zeros((tile_h, tile_w), dtype=np.uint8)
     
-    resized = np.zeros((new_height, new_width), dtype=np.uint8)
-    
-    for i in range(new_height):
-        for j in range(new_width):
+    for i in range(row0, row0 + tile_h):
+        for j in range(col0, col0 + tile_w):
             # Calculate source positions (matching Veritas resize.rs logic)
             x_l = int((width - 1) * j / (new_width - 1)) if new_width > 1 else 0
             y_l = int((height - 1) * i / (new_height - 1)) if new_height > 1 else 0
@@ -42,11 +82,11 @@ def resize_image_bilinear(image_array, new_height, new_width):
             x_h = x_l if x_l * (new_width - 1) == (width - 1) * j else min(x_l + 1, width - 1)
             y_h = y_l if y_l * (new_height - 1) == (height - 1) * i else min(y_l + 1, height - 1)
             
-            # Get 4 corner pixels
-            a = image_array[y_l, x_l]
-            b = image_array[y_l, x_h]
-            c = image_array[y_h, x_l]
-            d = image_array[y_h, x_h]
+            # Get 4 corner pixels (as Python ints: the weighted sum overflows uint8)
+            a = int(image_array[y_l, x_l])
+            b = int(image_array[y_l, x_h])
+            c = int(image_array[y_h, x_l])
+            d = int(image_array[y_h, x_h])
             
             # Calculate weighted ratios (matching Veritas resize.rs)
             x_ratio_weighted = ((width - 1) * j) - (new_width - 1) * ((width - 1) * j // (new_width - 1)) if new_width > 1 else 0
@@ -60,7 +100,7 @@ def resize_image_bilinear(image_array, new_height, new_width):
                  d * x_ratio_weighted * y_ratio_weighted)
             
             new_val = int(round(s / denom)) if denom > 0 else int(round((a + b + c + d) / 4))
-            resized[i, j] = max(0, min(255, new_val))
+            resized[i - row0, j - col0] = max(0, min(255, new_val))
     
     return resized
 
@@ -81,8 +121,15 @@ def main():
                        choices=['SD', 'FHD'],
                        default='SD',
                        help='Target resolution (default: SD)')
+    parser.add_argument('--tile', nargs=4, type=int,
+                       metavar=('ROW', 'COL', 'HEIGHT', 'WIDTH'),
+                       help='Write one tile of the resized image and its source window')
+    add_profile_arguments(parser)
+    add_store_arguments(parser)
     
     args = parser.parse_args()
+    profiler = StageProfiler.from_args('veritas/resize', args)
+    store = OriginalStore.from_args(args)
     
     # Get dimensions based on resolutions (matching VIMz)
     from_sizes = {
@@ -105,7 +152,7 @@ def main():
     
     try:
         # Load original image
-        with Image.open(args.input) as image:
+        with profiler.stage('decode'), Image.open(args.input) as image:
             # Convert to grayscale
             if image.mode != 'L':
                 image = image.convert('L')
@@ -114,36 +161,67 @@ def main():
             print(f"Image size: {image_np.shape[0]}x{image_np.shape[1]} pixels")
         
         # Apply resize transformation
-        resized_np = resize_image_bilinear(image_np, to_height, to_width)
+        tile = tuple(args.tile) if args.tile else None
+        with profiler.stage('transform'):
+            resized_np = resize_image_bilinear(image_np, to_height, to_width, tile)
         
         print(f"Resized to: {resized_np.shape[0]}x{resized_np.shape[1]} pixels")
         
+        # A tile only carries the source pixels its interpolation reads
+        tile_header = None
+        if tile:
+            row0, col0, row1, col1 = source_window(image_np.shape, to_height, to_width, tile)
+            tile_header = {
+                "row": tile[0],
+                "col": tile[1],
+                "height": tile[2],
+                "width": tile[3],
+                "source_row": row0,
+                "source_col": col0,
+                "image_height": image_np.shape[0],
+                "image_width": image_np.shape[1],
+                "resized_image_height": to_height,
+                "resized_image_width": to_width
+            }
+            image_np = image_np[row0:row1, col0:col1]
+            print(f"Tile source window: rows {row0}-{row1}, cols {col0}-{col1}")
+        
         # Convert to lists for JSON serialization
-        original = image_np.tolist()
-        resized = resized_np.tolist()
+        with profiler.stage('encode'):
+            if store:
+                original_field = {"original_ref": store.original_ref(
+                    image_np, 'veritas', image_np.tolist, args.output)}
+            else:
+                original_field = {"original": image_np.tolist()}
+            resized = resized_np.tolist()
         
         # Create output structure (matching Veritas expected format)
-        output = {
-            "original": original,
+        output = dict(original_field)
+        output.update({
             "resized": resized,
-            "original_height": len(original),
-            "original_width": len(original[0]) if original else 0,
+            "original_height": image_np.shape[0],
+            "original_width": image_np.shape[1],
             "resized_height": len(resized),
             "resized_width": len(resized[0]) if resized else 0,
             "from_resolution": args.from_res,
             "to_resolution": args.to_res
-        }
+        })
+        if tile_header:
+            output["tile"] = tile_header
         
         # Save to JSON
         output_path = Path(args.output)
         output_path.parent.mkdir(parents=True, exist_ok=True)
         
-        with open(output_path, 'w') as f:
-            json.dump(output, f, indent=2)
+        profiler.write_json(output, output_path, indent=2)
         
         print(f"✓ Saved: {args.output}")
-        print(f"  Original rows: {len(original)}")
+        if store:
+            print(f"  Original: {output['original_ref']['path']} (store)")
+        else:
+            print(f"  Original rows: {image_np.shape[0]}")
         print(f"  Resized rows: {len(resized)}")
+        profiler.finish()
         
     except Exception as e:
         print(f"Error: {e}")
@@ -1,75 +1,170 @@
-use anyhow::Result;
+use anyhow::{bail, Result};
+use clap::Parser;
 use plonky2::field::types::Field;
 use plonky2::iop::witness::{PartialWitness, WitnessWrite};
 use plonky2::plonk::circuit_builder::CircuitBuilder;
 use plonky2::plonk::circuit_data::CircuitConfig;
 use plonky2::plonk::config::{GenericConfig, PoseidonGoldilocksConfig};
 use serde_json::Value;
-use std::fs;
 use std::time::Instant;
 
-static H : usize = 720;
-static W : usize = 1280;
-// Starting at position (1,1) - top-left after border
-// Blur region for 4GB RAM system
-//static BLUR_H : usize = 80;
-//static BLUR_W : usize = 80;
-// Blur region for server (c7a.4xlarge: 32GB RAM)
-// Conservative: 400×700 (~25GB estimated, safe)
-//static BLUR_H : usize = 400;
-//static BLUR_W : usize = 700;
-// Moderate: 500×900 (~35GB estimated, may fail on 32GB)
-static BLUR_H : usize = 500;
-static BLUR_W : usize = 900;
-// Full image: 718×1278 (~64GB estimated, will fail on 32GB)
-//static BLUR_H : usize = 718;
-//static BLUR_W : usize = 1278;
+#[path = "common/input.rs"]
+mod input;
+#[path = "common/proof_io.rs"]
+mod proof_io;
+
+// Image size and blur region are read at runtime, so one binary serves every
+// size. Region sizes used so far (start at (1,1), the top-left after the border):
+//   4GB RAM laptop:                80x80
+//   c7a.4xlarge (32GB), safe:      400x700 (~25GB)
+//   c7a.4xlarge (32GB), moderate:  500x900 (~35GB, may fail)
+//   full HD image:                 718x1278 (~64GB)
+#[derive(Parser)]
+#[command(about = "Prove a 3x3 box blur over a region of a grayscale image")]
+struct Args {
+    /// Input JSON written by benchmark/blur/blur.py
+    json_path: String,
+    /// Expected image height (default: taken from the input)
+    #[arg(long)]
+    height: Option<usize>,
+    /// Expected image width (default: taken from the input)
+    #[arg(long)]
+    width: Option<usize>,
+    /// Blur region; overrides the input's "blur_region" (default: 500x900 at 1,1, see DEFAULT_BLUR_REGION)
+    #[arg(long, num_args = 4, value_names = ["START_ROW", "START_COL", "HEIGHT", "WIDTH"])]
+    blur_region: Option<Vec<usize>>,
+    /// Also write the proof with its public inputs here, and the verifier key next to it
+    /// as <name>_vk.bin (read by the verify-benchmark example)
+    #[arg(long)]
+    proof: Option<String>,
+}
+
+fn load_matrix(rows: &Vec<Value>) -> Vec<Vec<usize>> {
+    let mut vals = Vec::new();
+    for row in rows {
+        let row_array = row.as_array().unwrap();
+        let mut pixel_row = Vec::new();
+        for pixel in row_array {
+            pixel_row.push(pixel.as_u64().unwrap() as usize);
+        }
+        vals.push(pixel_row);
+    }
+    vals
+}
+
+// Rebuild the full blurred image from whichever encoding blur.py wrote:
+// "blurred" (full matrix), "blurred_region" (region pixels + offsets) or
+// "blurred_delta" (one [row, start_col, [values...]] run per changed row). Pixels
+// outside the region or runs are unchanged from the original.
+fn load_blurred(data: &Value, w_r_vals: &Vec<Vec<usize>>) -> Vec<Vec<usize>> {
+    if let Some(blurred) = data["blurred"].as_array() {
+        return load_matrix(blurred);
+    }
+
+    let mut x_r_vals = w_r_vals.clone();
+    if data["blurred_region"].is_object() {
+        let region = &data["blurred_region"];
+        let start_row = region["start_row"].as_u64().unwrap() as usize;
+        let start_col = region["start_col"].as_u64().unwrap() as usize;
+        let pixels = load_matrix(region["pixels"].as_array().unwrap());
+        for (i, pixel_row) in pixels.iter().enumerate() {
+            for (j, &pixel) in pixel_row.iter().enumerate() {
+                x_r_vals[start_row + i][start_col + j] = pixel;
+            }
+        }
+    } else if let Some(delta) = data["blurred_delta"].as_array() {
+        for run in delta {
+            let run = run.as_array().unwrap();
+            let i = run[0].as_u64().unwrap() as usize;
+            let start_col = run[1].as_u64().unwrap() as usize;
+            for (j, pixel) in run[2].as_array().unwrap().iter().enumerate() {
+                x_r_vals[i][start_col + j] = pixel.as_u64().unwrap() as usize;
+            }
+        }
+    } else {
+        panic!("Input has no \"blurred\", \"blurred_region\" or \"blurred_delta\" field");
+    }
+    x_r_vals
+}
+
+// Region proven when neither --blur-region nor the input header sets one: 500x900 at (1, 1),
+// the largest that fits 32 GB hosts (~35 GB estimated). The whole HD interior (718x1278)
+// needs ~64 GB and must be asked for explicitly; blur.py --tile inputs carry their interior.
+const DEFAULT_BLUR_REGION: [usize; 4] = [1, 1, 500, 900];
+
+// Half-open blur bounds (start_row, start_col, end_row, end_col), clamped to the
+// interior exactly like blur_bounds() in blur.py so the kernel never leaves the image.
+fn blur_bounds(h: usize, w: usize, region: Option<&Vec<usize>>) -> Result<(usize, usize, usize, usize)> {
+    let r = region.cloned().unwrap_or_else(|| DEFAULT_BLUR_REGION.to_vec());
+    let (start_row, start_col) = (r[0], r[1]);
+    if start_row < 1 || start_col < 1 || r[2] == 0 || r[3] == 0 {
+        bail!("Blur region must start at row/col >= 1 and be non-empty, got {:?}", r);
+    }
+    let end_row = (start_row + r[2]).min(h - 1);
+    let end_col = (start_col + r[3]).min(w - 1);
+    if start_row >= end_row || start_col >= end_col {
+        bail!("Blur region {:?} lies outside the {}x{} image interior", r, h, w);
+    }
+    Ok((start_row, start_col, end_row, end_col))
+}
 
 fn main() -> Result<()> {
     const D: usize = 2;
     type C = PoseidonGoldilocksConfig;
     type F = <C as GenericConfig<D>>::F;
 
+    let args = Args::parse();
+
     // Load image data from JSON
-    let json_path = std::env::args().nth(1).expect("Usage: blur-benchmark <json_file_path>");
-    let json_str = fs::read_to_string(&json_path)?;
-    let data: Value = serde_json::from_str(&json_str)?;
+    let (data, parse): (Value, _) = input::load_input(&args.json_path)?;
 
     let original = data["original"].as_array().unwrap();
-    let blurred = data["blurred"].as_array().unwrap();
-
-    let mut w_r_vals = Vec::new();
-    let mut x_r_vals = Vec::new();
 
     // Load original image
-    for row in original {
-        let row_array = row.as_array().unwrap();
-        let mut pixel_row = Vec::new();
-        for pixel in row_array {
-            pixel_row.push(pixel.as_u64().unwrap() as usize);
-        }
-        w_r_vals.push(pixel_row);
-    }
+    let w_r_vals = load_matrix(original);
 
-    // Load blurred image
-    for row in blurred {
-        let row_array = row.as_array().unwrap();
-        let mut pixel_row = Vec::new();
-        for pixel in row_array {
-            pixel_row.push(pixel.as_u64().unwrap() as usize);
+    // Load blurred image (full, region or delta encoding)
+    let x_r_vals = load_blurred(&data, &w_r_vals);
+    parse.done();
+
+    // Image dimensions come from the data; the header and CLI flags must agree with it
+    let H = w_r_vals.len();
+    let W = if H > 0 { w_r_vals[0].len() } else { 0 };
+    if H < 3 || W < 3 {
+        bail!("Image must be at least 3x3, got {}x{}", H, W);
+    }
+    if w_r_vals.iter().any(|row| row.len() != W) {
+        bail!("Original image rows have different lengths");
+    }
+    for (name, expected, actual) in [
+        ("height", args.height.or(data["height"].as_u64().map(|v| v as usize)), H),
+        ("width", args.width.or(data["width"].as_u64().map(|v| v as usize)), W),
+    ] {
+        if let Some(expected) = expected {
+            if expected != actual {
+                bail!("Image {} mismatch: expected {}, got {}", name, expected, actual);
+            }
         }
-        x_r_vals.push(pixel_row);
     }
-
-    // Verify dimensions match
-    if w_r_vals.len() != H || w_r_vals[0].len() != W {
-        panic!("Image dimensions mismatch: expected {}x{}, got {}x{}", 
-               H, W, w_r_vals.len(), w_r_vals[0].len());
+    if x_r_vals.len() != H || x_r_vals.iter().any(|row| row.len() != W) {
+        bail!("Blurred image dimensions mismatch: expected {}x{}, got {}x{}",
+              H, W, x_r_vals.len(), x_r_vals.first().map_or(0, |row| row.len()));
     }
-    if x_r_vals.len() != H || x_r_vals[0].len() != W {
-        panic!("Blurred image dimensions mismatch: expected {}x{}, got {}x{}", 
-               H, W, x_r_vals.len(), x_r_vals[0].len());
+
+    // Blur region: CLI flag, then the input header, then DEFAULT_BLUR_REGION
+    let header_region: Option<Vec<usize>> = data["blur_region"].as_array()
+        .map(|r| r.iter().map(|v| v.as_u64().unwrap() as usize).collect());
+    let region = args.blur_region.as_ref().or(header_region.as_ref());
+    if let Some(r) = region {
+        if r.len() != 4 {
+            bail!("Blur region needs 4 values (start_row start_col height width), got {:?}", r);
+        }
     }
+    let (start_row, start_col, end_row, end_col) = blur_bounds(H, W, region)?;
+    let BLUR_H = end_row - start_row;
+    let BLUR_W = end_col - start_col;
+    let in_region = |i: usize, j: usize| i >= start_row && i < end_row && j >= start_col && j < end_col;
+    println!("Image: {}x{}, blur region: rows {}..{}, cols {}..{}", H, W, start_row, end_row, start_col, end_col);
 
     // Circuit build time (equivalent to VIMz "Key Generation")
     let circuit_start = Instant::now();
@@ -90,7 +185,7 @@ fn main() -> Result<()> {
     for i in 0..H {
         let mut x_r_target_row = Vec::new();
         for j in 0..W {
-            if i > 0 && i < 1 + BLUR_H && j > 0 && j < 1 + BLUR_W {
+            if in_region(i, j) {
                 // in blur region
                 let mut all_r = Vec::new();
 
@@ -157,7 +252,7 @@ fn main() -> Result<()> {
 
     for i in 0..BLUR_H {
         for j in 0..BLUR_W {
-            pw.set_target(x_r_targets[i][j], F::from_canonical_u32(x_r_vals[i+1][j+1] as u32));
+            pw.set_target(x_r_targets[i][j], F::from_canonical_u32(x_r_vals[start_row + i][start_col + j] as u32));
         }
     }
 
@@ -165,11 +260,14 @@ fn main() -> Result<()> {
     let proof = data.prove(pw)?;
     let proof_time = proof_start.elapsed();
     println!("Proof generation took: {:.9}s", proof_time.as_secs_f64());
+    if let Some(path) = &args.proof {
+        proof_io::write_artifacts(path, &proof, &data)?;
+    }
 
     let mut ctr = 0;
     for i in 0..H {
         for j in 0..W {
-            if !(i > 0 && i < 1 + BLUR_H && j > 0 && j < 1 + BLUR_W) {
+            if !in_region(i, j) {
                 // Public inputs are the original border pixels (w_r_vals), not blurred ones
                 assert!(w_r_vals[i][j] as u64 == proof.public_inputs[ctr].0,
                     "Public input mismatch at ({}, {}): expected {}, got {}", 
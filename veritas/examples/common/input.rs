@@ -0,0 +1,107 @@
+// Input loading shared by the *-benchmark examples (included with #[path]).
+//
+// Inputs may be plain JSON or compressed by compressed_io.py: the decoder is picked
+// from the extension, .gz (gzip, every member) or .zst (zstd, every frame).
+//
+// The two input phases are timed in the format parsed by extract_veritas_metrics.py:
+//
+//   Input load took: 0.012345678s (1234567 bytes on disk, 4567890 bytes decoded)
+//   Input parse took: 0.234567890s (4567890 bytes)
+//
+// Load is only reading and decompressing the input (and its original store block). Parse is
+// everything else: the original_ref header pass, the store block's sha256 check, the JSON
+// parse and the per-pixel conversion each example does afterwards; the example ends it with
+// InputParse::done().
+
+use anyhow::{bail, Context, Result};
+use serde::Deserialize;
+use serde_json::Value;
+use std::fs::File;
+use std::io::{BufReader, Read};
+use std::path::Path;
+use std::time::{Duration, Instant};
+
+pub fn read_input(path: &str) -> Result<String> {
+    let file = File::open(path).with_context(|| format!("Cannot open input {}", path))?;
+    let mut reader: Box<dyn Read> = match Path::new(path).extension().and_then(|e| e.to_str()) {
+        Some("gz") => Box::new(flate2::read::MultiGzDecoder::new(BufReader::new(file))),
+        Some("zst") => Box::new(zstd::stream::read::Decoder::new(file)?),
+        _ => Box::new(file),
+    };
+    let mut json_str = String::new();
+    reader
+        .read_to_string(&mut json_str)
+        .with_context(|| format!("Cannot read input {}", path))?;
+    Ok(json_str)
+}
+
+// Parse phase of an input, from the original_ref header pass until done(), minus the time
+// spent reading the store block in between (which is load)
+pub struct InputParse {
+    start: Instant,
+    excluded: Duration,
+    bytes: usize,
+}
+
+impl InputParse {
+    pub fn done(self) {
+        let elapsed = self.start.elapsed() - self.excluded;
+        println!("Input parse took: {:.9}s ({} bytes)", elapsed.as_secs_f64(), self.bytes);
+    }
+}
+
+// Just the store reference of an input; serde skips the other fields without building them
+#[derive(Deserialize)]
+struct StoreRefHeader {
+    original_ref: Option<StoreRef>,
+}
+
+#[derive(Deserialize)]
+struct StoreRef {
+    path: String,
+    sha256: String,
+}
+
+// Parsed input with an "original_ref" (original_store.py) replaced by the "original" block
+// it references. The store file is resolved relative to the input and checked against its
+// sha256, the address it is stored under.
+pub fn load_input(path: &str) -> Result<(Value, InputParse)> {
+    let load_start = Instant::now();
+    let mut on_disk = std::fs::metadata(path).map(|m| m.len()).unwrap_or(0);
+    let json_str = read_input(path)?;
+    let mut load = load_start.elapsed();
+
+    let parse_start = Instant::now();
+    let mut block_read = Duration::ZERO;
+    let mut block = None;
+    // Only the store reference needs a look before the full parse
+    if json_str.contains("\"original_ref\"") {
+        let header: StoreRefHeader = serde_json::from_str(&json_str).context("Invalid original_ref")?;
+        if let Some(reference) = header.original_ref {
+            let read_start = Instant::now();
+            let block_path = Path::new(path).parent().unwrap_or(Path::new(".")).join(&reference.path);
+            let block_path = block_path.to_string_lossy().to_string();
+            on_disk += std::fs::metadata(&block_path).map(|m| m.len()).unwrap_or(0);
+            let text = read_input(&block_path)?;
+            block_read = read_start.elapsed();
+            load += block_read;
+            if reference.sha256 != sha256::digest(text.as_str()) {
+                bail!("Original store block {} does not match its sha256", block_path);
+            }
+            block = Some(text);
+        }
+    }
+    let decoded = json_str.len() + block.as_ref().map_or(0, |b| b.len());
+    println!("Input load took: {:.9}s ({} bytes on disk, {} bytes decoded)",
+             load.as_secs_f64(), on_disk, decoded);
+
+    let parse = InputParse { start: parse_start, excluded: block_read, bytes: decoded };
+    let mut data: Value = serde_json::from_str(&json_str)?;
+    if let Some(block) = block {
+        let original: Value = serde_json::from_str(&block)?;
+        let fields = data.as_object_mut().context("Input must be a JSON object")?;
+        fields.remove("original_ref");
+        fields.insert("original".to_string(), original);
+    }
+    Ok((data, parse))
+}
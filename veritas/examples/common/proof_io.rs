@@ -0,0 +1,54 @@
+// Proof artifacts of the *-benchmark examples (included with #[path]), read back by the
+// verify-benchmark example:
+//
+//   <name>_proof.json  the proof with its public inputs (serde JSON)
+//   <name>_vk.bin      the verifier circuit data (plonky2's binary encoding)
+//
+// The circuits depend on the image dimensions, so every proof gets its own verifier key.
+#![allow(dead_code)]
+
+use anyhow::{anyhow, Context, Result};
+use plonky2::plonk::circuit_data::{CircuitData, VerifierCircuitData};
+use plonky2::plonk::config::{GenericConfig, PoseidonGoldilocksConfig};
+use plonky2::plonk::proof::ProofWithPublicInputs;
+use plonky2::util::serialization::DefaultGateSerializer;
+use std::path::{Path, PathBuf};
+
+pub const D: usize = 2;
+pub type C = PoseidonGoldilocksConfig;
+pub type F = <C as GenericConfig<D>>::F;
+pub type Proof = ProofWithPublicInputs<F, C, D>;
+pub type VerifierData = VerifierCircuitData<F, C, D>;
+
+// <dir>/<name>_proof.json -> <dir>/<name><suffix>
+pub fn artifact_path(proof_path: &Path, suffix: &str) -> PathBuf {
+    let name = proof_path.file_name().and_then(|n| n.to_str()).unwrap_or("proof");
+    let stem = match name.rfind("_proof.") {
+        Some(end) => &name[..end],
+        None => name.split('.').next().unwrap_or(name),
+    };
+    proof_path.with_file_name(format!("{}{}", stem, suffix))
+}
+
+pub fn write_artifacts(proof_path: &str, proof: &Proof, data: &CircuitData<F, C, D>) -> Result<()> {
+    let proof_bytes = serde_json::to_vec(proof)?;
+    std::fs::write(proof_path, &proof_bytes).with_context(|| format!("Cannot write proof {}", proof_path))?;
+    let vk_bytes = data
+        .verifier_data()
+        .to_bytes(&DefaultGateSerializer)
+        .map_err(|e| anyhow!("Cannot serialize the verifier data: {:?}", e))?;
+    let vk_path = artifact_path(Path::new(proof_path), "_vk.bin");
+    std::fs::write(&vk_path, &vk_bytes).with_context(|| format!("Cannot write verifier key {}", vk_path.display()))?;
+    println!("Proof written to: {} ({} bytes, verifier key {} bytes)", proof_path, proof_bytes.len(), vk_bytes.len());
+    Ok(())
+}
+
+pub fn read_verifier_data(path: &Path) -> Result<VerifierData> {
+    let bytes = std::fs::read(path).with_context(|| format!("Cannot read verifier key {}", path.display()))?;
+    VerifierCircuitData::from_bytes(bytes, &DefaultGateSerializer)
+        .map_err(|e| anyhow!("Cannot deserialize verifier key {}: {:?}", path.display(), e))
+}
+
+pub fn parse_proof(bytes: &[u8]) -> Result<Proof> {
+    Ok(serde_json::from_slice(bytes)?)
+}
@@ -1,27 +1,52 @@
-use anyhow::Result;
+use anyhow::{bail, Result};
+use clap::Parser;
 use plonky2::field::types::Field;
 use plonky2::iop::witness::{PartialWitness, WitnessWrite};
 use plonky2::plonk::circuit_builder::CircuitBuilder;
 use plonky2::plonk::circuit_data::CircuitConfig;
 use plonky2::plonk::config::{GenericConfig, PoseidonGoldilocksConfig};
 use serde_json::Value;
-use std::fs;
 use std::time::Instant; 
 
+#[path = "common/input.rs"]
+mod input;
+#[path = "common/proof_io.rs"]
+mod proof_io;
+
+#[derive(Parser)]
+#[command(about = "Prove a crop of a grayscale image")]
+struct Args {
+    /// Input JSON written by benchmark/crop/crop.py
+    json_path: String,
+    /// Expected original height (default: taken from the input)
+    #[arg(long)]
+    height: Option<usize>,
+    /// Expected original width (default: taken from the input)
+    #[arg(long)]
+    width: Option<usize>,
+    /// Also write the proof with its public inputs here, and the verifier key next to it
+    /// as <name>_vk.bin (read by the verify-benchmark example)
+    #[arg(long)]
+    proof: Option<String>,
+}
+
 fn main() -> Result<()> {
     const D: usize = 2;
     type C = PoseidonGoldilocksConfig;
     type F = <C as GenericConfig<D>>::F;
 
+    let args = Args::parse();
+
     // Load image data from JSON
-    let json_path = std::env::args().nth(1).expect("Usage: crop-benchmark <json_file_path>");
-    let json_str = fs::read_to_string(&json_path)?;
-    let data: Value = serde_json::from_str(&json_str)?;
+    let (data, parse): (Value, _) = input::load_input(&args.json_path)?;
 
     let original = data["original"].as_array().unwrap();
     let cropped = data["cropped"].as_array().unwrap();
-    let crop_x = data["crop_x"].as_u64().unwrap() as usize;
-    let crop_y = data["crop_y"].as_u64().unwrap() as usize;
+    // The offsets must be the ones the input was cropped at, so they only come from the input
+    let (crop_x, crop_y) = match (data["crop_x"].as_u64(), data["crop_y"].as_u64()) {
+        (Some(x), Some(y)) => (x as usize, y as usize),
+        _ => bail!("Input has no \"crop_x\"/\"crop_y\" offsets"),
+    };
 
     let mut w_r_vals = Vec::new();
     let mut x_r_vals = Vec::new();
@@ -45,6 +70,33 @@ fn main() -> Result<()> {
         }
         x_r_vals.push(pixel_row);
     }
+    parse.done();
+
+    // Dimensions come from the data; the header and CLI flags must agree with it
+    let orig_height = w_r_vals.len();
+    let orig_width = if orig_height > 0 { w_r_vals[0].len() } else { 0 };
+    let crop_height = x_r_vals.len();
+    let crop_width = if crop_height > 0 { x_r_vals[0].len() } else { 0 };
+    for (name, expected, actual) in [
+        ("height", args.height.or(data["height"].as_u64().map(|v| v as usize)), orig_height),
+        ("width", args.width.or(data["width"].as_u64().map(|v| v as usize)), orig_width),
+        ("crop height", data["crop_height"].as_u64().map(|v| v as usize), crop_height),
+        ("crop width", data["crop_width"].as_u64().map(|v| v as usize), crop_width),
+    ] {
+        if let Some(expected) = expected {
+            if expected != actual {
+                bail!("Image {} mismatch: expected {}, got {}", name, expected, actual);
+            }
+        }
+    }
+    if w_r_vals.iter().any(|row| row.len() != orig_width) || x_r_vals.iter().any(|row| row.len() != crop_width) {
+        bail!("Image rows have different lengths");
+    }
+    if crop_width == 0 || crop_height == 0 || crop_x + crop_width > orig_width || crop_y + crop_height > orig_height {
+        bail!("Crop {}x{} at ({}, {}) does not fit in the {}x{} original",
+              crop_height, crop_width, crop_x, crop_y, orig_height, orig_width);
+    }
+    println!("Image: {}x{}, crop: {}x{} at ({}, {})", orig_height, orig_width, crop_height, crop_width, crop_x, crop_y);
 
     let OLD_SIZE = w_r_vals.len() * w_r_vals[0].len();
     let NEW_SIZE = x_r_vals.len() * x_r_vals[0].len();
@@ -65,10 +117,6 @@ fn main() -> Result<()> {
     }
 
     // Extract the cropped region from original (starting at crop_x, crop_y)
-    let orig_width = w_r_vals[0].len();
-    let crop_width = x_r_vals[0].len();
-    let crop_height = x_r_vals.len();
-    
     let mut expected_cropped = Vec::new();
     for i in 0..crop_height {
         for j in 0..crop_width {
@@ -121,6 +169,9 @@ fn main() -> Result<()> {
     let proof = data.prove(pw)?;
     let proof_time = proof_start.elapsed();
     println!("Proof generation took: {:.9}s", proof_time.as_secs_f64());
+    if let Some(path) = &args.proof {
+        proof_io::write_artifacts(path, &proof, &data)?;
+    }
 
     // Verification time (equivalent to VIMz "RecursiveSNARK verify")
     let verify_start = Instant::now();
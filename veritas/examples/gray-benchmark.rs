@@ -1,22 +1,44 @@
-use anyhow::Result;
+use anyhow::{bail, Result};
+use clap::Parser;
 use plonky2::field::types::Field;
 use plonky2::iop::witness::{PartialWitness, WitnessWrite};
 use plonky2::plonk::circuit_builder::CircuitBuilder;
 use plonky2::plonk::circuit_data::CircuitConfig;
 use plonky2::plonk::config::{GenericConfig, PoseidonGoldilocksConfig};
 use serde_json::Value;
-use std::fs;
 use std::time::Instant;
 
+#[path = "common/input.rs"]
+mod input;
+#[path = "common/proof_io.rs"]
+mod proof_io;
+
+#[derive(Parser)]
+#[command(about = "Prove an RGB to grayscale conversion")]
+struct Args {
+    /// Input JSON written by benchmark/grayscale/grayscale.py
+    json_path: String,
+    /// Expected image height (default: taken from the input)
+    #[arg(long)]
+    height: Option<usize>,
+    /// Expected image width (default: taken from the input)
+    #[arg(long)]
+    width: Option<usize>,
+    /// Also write the proof with its public inputs here, and the verifier key next to it
+    /// as <name>_vk.bin (read by the verify-benchmark example)
+    #[arg(long)]
+    proof: Option<String>,
+}
+
 fn main() -> Result<()> {
     const D: usize = 2;
     type C = PoseidonGoldilocksConfig;
     type F = <C as GenericConfig<D>>::F;
 
+    let args = Args::parse();
+
     // Load image data from JSON
-    let json_path = std::env::args().nth(1).expect("Usage: gray-benchmark <json_file_path>");
-    let json_str = fs::read_to_string(&json_path)?;
-    let data: Value = serde_json::from_str(&json_str)?;
+    let (data, parse): (Value, _) = input::load_input(&args.json_path)?;
 
     let original = data["original"].as_array().unwrap();
     let grayscale = data["grayscale"].as_array().unwrap();
@@ -32,6 +54,25 @@ fn main() -> Result<()> {
     let width = original[0].as_array().unwrap().len();
     let total_pixels = height * width;
 
+    // Dimensions come from the data; the header and CLI flags must agree with it
+    for (name, expected, actual) in [
+        ("height", args.height.or(data["height"].as_u64().map(|v| v as usize)), height),
+        ("width", args.width.or(data["width"].as_u64().map(|v| v as usize)), width),
+    ] {
+        if let Some(expected) = expected {
+            if expected != actual {
+                bail!("Image {} mismatch: expected {}, got {}", name, expected, actual);
+            }
+        }
+    }
+    if original.iter().any(|row| row.as_array().unwrap().len() != width)
+        || grayscale.len() != height
+        || grayscale.iter().any(|row| row.as_array().unwrap().len() != width)
+    {
+        bail!("Original and grayscale images must both be {}x{}", height, width);
+    }
+    println!("Image: {}x{}", height, width);
+
     for row in original {
         let row_array = row.as_array().unwrap();
         for pixel in row_array {
@@ -48,6 +89,7 @@ fn main() -> Result<()> {
             x_vals.push(pixel.as_u64().unwrap() as u32);
         }
     }
+    parse.done();
 
     // Compute remainders using VIMz formula: (299*R + 587*G + 114*B) / 1000
     // Veritas circuit uses: (299*R + 587*G + 114*B) - 1000*x
@@ -118,6 +160,9 @@ fn main() -> Result<()> {
     let proof = data.prove(pw)?;
     let proof_time = proof_start.elapsed();
     println!("Proof generation took: {:.9}s", proof_time.as_secs_f64());
+    if let Some(path) = &args.proof {
+        proof_io::write_artifacts(path, &proof, &data)?;
+    }
 
     // Verification time (equivalent to VIMz "RecursiveSNARK verify")
     let verify_start = Instant::now();
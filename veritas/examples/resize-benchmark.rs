@@ -1,13 +1,41 @@
-use anyhow::Result;
+use anyhow::{anyhow, bail, Result};
+use clap::Parser;
 use plonky2::field::types::Field;
 use plonky2::iop::witness::{PartialWitness, WitnessWrite};
 use plonky2::plonk::circuit_builder::CircuitBuilder;
 use plonky2::plonk::circuit_data::CircuitConfig;
 use plonky2::plonk::config::{GenericConfig, PoseidonGoldilocksConfig};
 use serde_json::Value;
-use std::fs;
 use std::time::Instant;
 
+#[path = "common/input.rs"]
+mod input;
+#[path = "common/proof_io.rs"]
+mod proof_io;
+
+#[derive(Parser)]
+#[command(about = "Prove a bilinear resize of a grayscale image")]
+struct Args {
+    /// Input JSON written by benchmark/resize/resize.py
+    json_path: String,
+    /// Expected original height (default: taken from the input)
+    #[arg(long)]
+    height: Option<usize>,
+    /// Expected original width (default: taken from the input)
+    #[arg(long)]
+    width: Option<usize>,
+    /// Expected resized height (default: taken from the input)
+    #[arg(long)]
+    resized_height: Option<usize>,
+    /// Expected resized width (default: taken from the input)
+    #[arg(long)]
+    resized_width: Option<usize>,
+    /// Also write the proof with its public inputs here, and the verifier key next to it
+    /// as <name>_vk.bin (read by the verify-benchmark example)
+    #[arg(long)]
+    proof: Option<String>,
+}
+
 fn get_positions(i: usize, j: usize, w_orig: usize, h_orig: usize, w_new: usize, h_new: usize) -> (usize, usize, usize, usize) {
     let x_l = if w_new > 1 { (w_orig - 1) * j / (w_new - 1) } else { 0 };
     let y_l = if h_new > 1 { (h_orig - 1) * i / (h_new - 1) } else { 0 };
@@ -37,10 +65,10 @@ fn main() -> Result<()> {
     type C = PoseidonGoldilocksConfig;
     type F = <C as GenericConfig<D>>::F;
 
+    let args = Args::parse();
+
     // Load image data from JSON
-    let json_path = std::env::args().nth(1).expect("Usage: resize-benchmark <json_file_path>");
-    let json_str = fs::read_to_string(&json_path)?;
-    let data: Value = serde_json::from_str(&json_str)?;
+    let (data, parse): (Value, _) = input::load_input(&args.json_path)?;
 
     let original = data["original"].as_array().unwrap();
     let resized = data["resized"].as_array().unwrap();
@@ -68,28 +96,79 @@ fn main() -> Result<()> {
         }
         x_r_vals.push(pixel_row);
     }
+    parse.done();
 
+    // Dimensions come from the data; the header and CLI flags must agree with it
     let H_ORIG = w_r_vals.len();
-    let W_ORIG = w_r_vals[0].len();
+    let W_ORIG = if H_ORIG > 0 { w_r_vals[0].len() } else { 0 };
     let H_NEW = x_r_vals.len();
-    let W_NEW = x_r_vals[0].len();
+    let W_NEW = if H_NEW > 0 { x_r_vals[0].len() } else { 0 };
+    let header = |key: &str| data[key].as_u64().map(|v| v as usize);
+    for (name, expected, actual) in [
+        ("original height", args.height.or(header("original_height")), H_ORIG),
+        ("original width", args.width.or(header("original_width")), W_ORIG),
+        ("resized height", args.resized_height.or(header("resized_height")), H_NEW),
+        ("resized width", args.resized_width.or(header("resized_width")), W_NEW),
+    ] {
+        if let Some(expected) = expected {
+            if expected != actual {
+                bail!("Image {} mismatch: expected {}, got {}", name, expected, actual);
+            }
+        }
+    }
+    if W_ORIG == 0 || W_NEW == 0 || w_r_vals.iter().any(|row| row.len() != W_ORIG)
+        || x_r_vals.iter().any(|row| row.len() != W_NEW)
+    {
+        bail!("Images must be non-empty with rows of equal length");
+    }
+    println!("Image: {}x{} -> {}x{}", H_ORIG, W_ORIG, H_NEW, W_NEW);
+
+    // A tile of a larger resize (benchmark/resize/resize.py --tile) keeps the full
+    // image's sampling grid: positions and weights use the full dimensions and the
+    // tile offsets, and pixels are read from the tile's source window.
+    let tile = &data["tile"];
+    let (ROW0, COL0, SRC_ROW0, SRC_COL0, FULL_H_ORIG, FULL_W_ORIG, FULL_H_NEW, FULL_W_NEW) = if tile.is_object() {
+        let field = |key: &str| -> Result<usize> {
+            tile[key].as_u64().map(|v| v as usize)
+                .ok_or_else(|| anyhow!("Tile header is missing \"{}\"", key))
+        };
+        (field("row")?, field("col")?, field("source_row")?, field("source_col")?,
+         field("image_height")?, field("image_width")?,
+         field("resized_image_height")?, field("resized_image_width")?)
+    } else {
+        (0, 0, 0, 0, H_ORIG, W_ORIG, H_NEW, W_NEW)
+    };
+    if tile.is_object() {
+        println!("Tile: rows {}..{}, cols {}..{} of {}x{} -> {}x{}",
+                 ROW0, ROW0 + H_NEW, COL0, COL0 + W_NEW, FULL_H_ORIG, FULL_W_ORIG, FULL_H_NEW, FULL_W_NEW);
+    }
+
+    // Source positions of resized pixel (i, j), relative to the loaded window
+    let positions = |i: usize, j: usize| -> Result<(usize, usize, usize, usize)> {
+        let (x_l, y_l, x_h, y_h) = get_positions(ROW0 + i, COL0 + j, FULL_W_ORIG, FULL_H_ORIG, FULL_W_NEW, FULL_H_NEW);
+        if x_l < SRC_COL0 || y_l < SRC_ROW0 || x_h - SRC_COL0 >= W_ORIG || y_h - SRC_ROW0 >= H_ORIG {
+            bail!("Source window does not cover resized pixel ({}, {})", ROW0 + i, COL0 + j);
+        }
+        Ok((x_l - SRC_COL0, y_l - SRC_ROW0, x_h - SRC_COL0, y_h - SRC_ROW0))
+    };
+    let ratios = |i: usize, j: usize| get_ratios(ROW0 + i, COL0 + j, FULL_W_ORIG, FULL_H_ORIG, FULL_W_NEW, FULL_H_NEW);
 
     // Compute expected resized values and remainders (matching resize.rs logic)
     for i in 0..H_NEW {
         let mut rem_r_row = Vec::new();
         for j in 0..W_NEW {
-            let (x_l, y_l, x_h, y_h) = get_positions(i, j, W_ORIG, H_ORIG, W_NEW, H_NEW);
-            let (x_ratio_weighted, y_ratio_weighted) = get_ratios(i, j, W_ORIG, H_ORIG, W_NEW, H_NEW);
+            let (x_l, y_l, x_h, y_h) = positions(i, j)?;
+            let (x_ratio_weighted, y_ratio_weighted) = ratios(i, j);
 
             let a = w_r_vals[y_l][x_l] as usize;
             let b = w_r_vals[y_l][x_h] as usize;
             let c = w_r_vals[y_h][x_l] as usize;
             let d = w_r_vals[y_h][x_h] as usize;
 
-            let denom = if W_NEW > 1 && H_NEW > 1 { (W_NEW - 1) * (H_NEW - 1) } else { 1 };
-            let s = a * (W_NEW - 1 - x_ratio_weighted) * (H_NEW - 1 - y_ratio_weighted) 
-                    + b * x_ratio_weighted * (H_NEW - 1 - y_ratio_weighted) 
-                    + c * y_ratio_weighted * (W_NEW - 1 - x_ratio_weighted) 
+            let denom = if FULL_W_NEW > 1 && FULL_H_NEW > 1 { (FULL_W_NEW - 1) * (FULL_H_NEW - 1) } else { 1 };
+            let s = a * (FULL_W_NEW - 1 - x_ratio_weighted) * (FULL_H_NEW - 1 - y_ratio_weighted) 
+                    + b * x_ratio_weighted * (FULL_H_NEW - 1 - y_ratio_weighted) 
+                    + c * y_ratio_weighted * (FULL_W_NEW - 1 - x_ratio_weighted) 
                     + d * x_ratio_weighted * y_ratio_weighted;
 
             let new = ((s as f64) / (denom as f64)).round() as usize;
@@ -122,14 +201,14 @@ fn main() -> Result<()> {
             w_r_targets.push(c);
             w_r_targets.push(d);
 
-            let (x_ratio_weighted, y_ratio_weighted) = get_ratios(i, j, W_ORIG, H_ORIG, W_NEW, H_NEW);
+            let (x_ratio_weighted, y_ratio_weighted) = ratios(i, j);
 
             let mut all = Vec::new();
 
-            let _denom = if W_NEW > 1 && H_NEW > 1 { (W_NEW - 1) * (H_NEW - 1) } else { 1 };
-            let a_const = ((W_NEW - 1 - x_ratio_weighted) * (H_NEW - 1 - y_ratio_weighted)) as u32;
-            let b_const = (x_ratio_weighted * (H_NEW - 1 - y_ratio_weighted)) as u32;
-            let c_const = (y_ratio_weighted * (W_NEW - 1 - x_ratio_weighted)) as u32;
+            let _denom = if FULL_W_NEW > 1 && FULL_H_NEW > 1 { (FULL_W_NEW - 1) * (FULL_H_NEW - 1) } else { 1 };
+            let a_const = ((FULL_W_NEW - 1 - x_ratio_weighted) * (FULL_H_NEW - 1 - y_ratio_weighted)) as u32;
+            let b_const = (x_ratio_weighted * (FULL_H_NEW - 1 - y_ratio_weighted)) as u32;
+            let c_const = (y_ratio_weighted * (FULL_W_NEW - 1 - x_ratio_weighted)) as u32;
             let d_const = (x_ratio_weighted * y_ratio_weighted) as u32;
             all.push(builder.mul_const(F::from_canonical_u32(a_const), a));
             all.push(builder.mul_const(F::from_canonical_u32(b_const), b));
@@ -158,7 +237,7 @@ fn main() -> Result<()> {
 
     for i in 0..H_NEW {
         for j in 0..W_NEW {
-            let (x_l, y_l, x_h, y_h) = get_positions(i, j, W_ORIG, H_ORIG, W_NEW, H_NEW);
+            let (x_l, y_l, x_h, y_h) = positions(i, j)?;
 
             pw.set_target(w_r_targets[4 * i * W_NEW + 4 * j], F::from_canonical_u32(w_r_vals[y_l][x_l]));
             pw.set_target(w_r_targets[4 * i * W_NEW + 4 * j + 1], F::from_canonical_u32(w_r_vals[y_l][x_h]));
@@ -170,11 +249,14 @@ fn main() -> Result<()> {
     let proof = data.prove(pw)?;
     let proof_time = proof_start.elapsed();
     println!("Proof generation took: {:.9}s", proof_time.as_secs_f64());
+    if let Some(path) = &args.proof {
+        proof_io::write_artifacts(path, &proof, &data)?;
+    }
 
     // Verification time (equivalent to VIMz "RecursiveSNARK verify")
     let verify_start = Instant::now();
 
-    let denom = if W_NEW > 1 && H_NEW > 1 { (W_NEW - 1) * (H_NEW - 1) } else { 1 };
+    let denom = if FULL_W_NEW > 1 && FULL_H_NEW > 1 { (FULL_W_NEW - 1) * (FULL_H_NEW - 1) } else { 1 };
 
     for i in 0..H_NEW {
         for j in 0..W_NEW {
@@ -0,0 +1,114 @@
+use anyhow::{bail, Result};
+use clap::Parser;
+use std::collections::HashMap;
+use std::path::PathBuf;
+use std::sync::atomic::{AtomicUsize, Ordering};
+use std::sync::{Arc, Mutex};
+use std::time::Instant;
+
+#[path = "common/proof_io.rs"]
+mod proof_io;
+
+#[derive(Parser)]
+#[command(about = "Verify a directory of proofs written by the *-benchmark examples with --proof")]
+struct Args {
+    /// Directory with <name>_proof.json and <name>_vk.bin files
+    proof_dir: String,
+    /// Concurrent verification workers
+    #[arg(long, default_value_t = 1)]
+    workers: usize,
+}
+
+// Resident set size counters of this process from /proc (kB): "VmRSS:" now, "VmHWM:" peak
+fn rss_kb(field: &str) -> u64 {
+    std::fs::read_to_string("/proc/self/status")
+        .ok()
+        .and_then(|status| {
+            status
+                .lines()
+                .find(|line| line.starts_with(field))
+                .and_then(|line| line.split_whitespace().nth(1))
+                .and_then(|value| value.parse().ok())
+        })
+        .unwrap_or(0)
+}
+
+// Reset the VmHWM peak to the current resident set ("5" > clear_refs, Linux 4.0+), so the
+// peak reported after the run excludes transients of loading proofs and keys
+fn reset_peak_rss() {
+    if let Err(e) = std::fs::write("/proc/self/clear_refs", "5") {
+        eprintln!("Warning: cannot reset the peak RSS ({}), memory per worker includes loading", e);
+    }
+}
+
+// Proofs and verifier keys are read up front, so a verification's latency is proof
+// deserialization plus VerifierCircuitData::verify. Same output as `vimz --verify`,
+// parsed by verify_throughput.py:
+//   VERIFY <name> <ok|failed> <latency_us>
+//   VERIFY_SUMMARY workers=4 proofs=100 elapsed_us=... baseline_rss_kb=... peak_rss_kb=...
+fn main() -> Result<()> {
+    let args = Args::parse();
+
+    let mut proofs: Vec<PathBuf> = std::fs::read_dir(&args.proof_dir)?
+        .filter_map(|entry| entry.ok().map(|e| e.path()))
+        .filter(|path| path.file_name().and_then(|n| n.to_str()).map_or(false, |n| n.ends_with("_proof.json")))
+        .collect();
+    proofs.sort();
+    if proofs.is_empty() {
+        bail!("No *_proof.json files in {}", args.proof_dir);
+    }
+
+    // Proofs of same-sized images share a circuit: deserialize each distinct key once
+    let mut keys: HashMap<Vec<u8>, Arc<proof_io::VerifierData>> = HashMap::new();
+    let mut jobs = Vec::with_capacity(proofs.len());
+    for path in &proofs {
+        let vk_path = proof_io::artifact_path(path, "_vk.bin");
+        let vk_bytes = std::fs::read(&vk_path)?;
+        let vk = match keys.get(&vk_bytes) {
+            Some(vk) => vk.clone(),
+            None => {
+                let vk = Arc::new(proof_io::read_verifier_data(&vk_path)?);
+                keys.insert(vk_bytes, vk.clone());
+                vk
+            }
+        };
+        let name = proof_io::artifact_path(path, "").file_name().unwrap().to_string_lossy().to_string();
+        jobs.push((name, std::fs::read(path)?, vk));
+    }
+
+    let workers = args.workers.max(1);
+    println!("Verifying {} proof(s) with {} worker(s), {} verifier key(s)", jobs.len(), workers, keys.len());
+    reset_peak_rss();
+    let baseline_rss = rss_kb("VmRSS:");
+    let next = AtomicUsize::new(0);
+    let results = Mutex::new(Vec::with_capacity(jobs.len()));
+    let start = Instant::now();
+    std::thread::scope(|scope| {
+        for _ in 0..workers {
+            scope.spawn(|| loop {
+                let index = next.fetch_add(1, Ordering::Relaxed);
+                if index >= jobs.len() {
+                    break;
+                }
+                let (name, bytes, vk) = &jobs[index];
+                let job_start = Instant::now();
+                let ok = proof_io::parse_proof(bytes).and_then(|proof| vk.verify(proof)).is_ok();
+                results.lock().unwrap().push((name.clone(), ok, job_start.elapsed()));
+            });
+        }
+    });
+    let elapsed = start.elapsed();
+
+    for (name, ok, latency) in results.into_inner().unwrap() {
+        println!("VERIFY {} {} {}", name, if ok { "ok" } else { "failed" }, latency.as_micros());
+    }
+    println!(
+        "VERIFY_SUMMARY workers={} proofs={} elapsed_us={} baseline_rss_kb={} peak_rss_kb={}",
+        workers,
+        jobs.len(),
+        elapsed.as_micros(),
+        baseline_rss,
+        rss_kb("VmHWM:")
+    );
+    Ok(())
+}
@@ -6,7 +6,8 @@
 TRANSFORMATION="${1:-resize}"  # Default to resize
 INPUT_DIR="${2:-passports_hd}"
 OUTPUT_DIR="${3:-contrast/outputs_hd}"
-FACTOR="${4:-1.5}"  # For contrast/brightness
+FACTOR="${4:-1.5}"  # For contrast/brightness (quoted list, e.g. "1.2 1.4 1.5", runs a factor sweep)
+read -r -a FACTORS <<< "$FACTOR"
 
 SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 FULL_INPUT_DIR="$SCRIPT_DIR/$INPUT_DIR"
@@ -21,6 +22,26 @@ echo "Found $TOTAL image(s) to process"
 echo "Transformation: $TRANSFORMATION"
 echo ""
 
+# COMPRESS=zst or COMPRESS=gz writes .json.zst / .json.gz inputs (see compressed_io.py;
+# ZKP_GZIP_LEVEL / ZKP_ZSTD_LEVEL set the level per format, ZKP_COMPRESS_THREADS the zstd threads)
+OUTPUT_EXT=".json${COMPRESS:+.$COMPRESS}"
+
+# PROFILE=1 times each converter stage and prints a per-stage table at the end
+PROFILE_ARGS=()
+PROFILE_LOG="$FULL_OUTPUT_DIR/conversion_profile.jsonl"
+if [ "${PROFILE:-0}" == "1" ]; then
+    mkdir -p "$FULL_OUTPUT_DIR"
+    : > "$PROFILE_LOG"
+    PROFILE_ARGS=(--profile-log "$PROFILE_LOG")
+fi
+
+# DEDUP=1 writes each image's original once into the original store (ORIGINAL_STORE,
+# default originals/ next to this script) and references it by hash (see original_store.py)
+STORE_ARGS=()
+if [ "${DEDUP:-0}" == "1" ]; then
+    STORE_ARGS=(--original-store "${ORIGINAL_STORE:-$SCRIPT_DIR/originals}")
+fi
+
 # Counter for progress
 COUNT=0
 
@@ -37,58 +58,69 @@ for img in "$FULL_INPUT_DIR"/*.png; do
         
         # Choose the appropriate converter and parameters
         if [ "$TRANSFORMATION" == "resize" ]; then
-            OUTPUT_FILE="$FULL_OUTPUT_DIR/${BASENAME}.json"
-            python3 "$SCRIPT_DIR/resize/resize.py" \
+            OUTPUT_FILE="$FULL_OUTPUT_DIR/${BASENAME}${OUTPUT_EXT}"
+            python3 "$SCRIPT_DIR/resize/resize.py" "${PROFILE_ARGS[@]}" "${STORE_ARGS[@]}" \
                 -i "$img" \
                 -o "$OUTPUT_FILE" \
                 --from-res HD \
                 --to-res SD
         
         elif [ "$TRANSFORMATION" == "contrast" ]; then
-            OUTPUT_FILE="$FULL_OUTPUT_DIR/${BASENAME}.json"
-            python3 "$SCRIPT_DIR/contrast/contrast.py" \
+            OUTPUT_FILE="$FULL_OUTPUT_DIR/${BASENAME}${OUTPUT_EXT}"
+            python3 "$SCRIPT_DIR/contrast/contrast.py" "${PROFILE_ARGS[@]}" "${STORE_ARGS[@]}" \
                 -i "$img" \
                 -o "$OUTPUT_FILE" \
                 -r HD \
-                -f "$FACTOR"
+                -f "${FACTORS[@]}"
         
         elif [ "$TRANSFORMATION" == "crop" ]; then
-            OUTPUT_FILE="$FULL_OUTPUT_DIR/${BASENAME}.json"
+            OUTPUT_FILE="$FULL_OUTPUT_DIR/${BASENAME}${OUTPUT_EXT}"
             # Default crop coordinates (can be customized)
             CROP_X=${5:-0}
             CROP_Y=${6:-0}
-            python3 "$SCRIPT_DIR/crop/crop.py" \
+            python3 "$SCRIPT_DIR/crop/crop.py" "${PROFILE_ARGS[@]}" "${STORE_ARGS[@]}" \
                 -i "$img" \
                 -o "$OUTPUT_FILE" \
                 -r HD \
                 --crop-x "$CROP_X" \
                 --crop-y "$CROP_Y"
         
+        elif [ "$TRANSFORMATION" == "crop-sweep" ]; then
+            # One output per crop offset (X,Y ...) given from the 4th argument on (crop
+            # takes no factor); the original is compressed once per image. The offsets
+            # place the SD window the HD crop circuit cuts out, hence -r SD.
+            OUTPUT_FILE="$FULL_OUTPUT_DIR/${BASENAME}${OUTPUT_EXT}"
+            python3 "$SCRIPT_DIR/crop/crop.py" "${PROFILE_ARGS[@]}" "${STORE_ARGS[@]}" \
+                -i "$img" \
+                -o "$OUTPUT_FILE" \
+                -r SD \
+                --offsets "${@:4}"
+        
         elif [ "$TRANSFORMATION" == "grayscale" ]; then
-            OUTPUT_FILE="$FULL_OUTPUT_DIR/${BASENAME}.json"
-            python3 "$SCRIPT_DIR/grayscale/grayscale.py" \
+            OUTPUT_FILE="$FULL_OUTPUT_DIR/${BASENAME}${OUTPUT_EXT}"
+            python3 "$SCRIPT_DIR/grayscale/grayscale.py" "${PROFILE_ARGS[@]}" "${STORE_ARGS[@]}" \
                 -i "$img" \
                 -o "$OUTPUT_FILE" \
                 -r HD
         
         elif [ "$TRANSFORMATION" == "brightness" ]; then
-            OUTPUT_FILE="$FULL_OUTPUT_DIR/${BASENAME}.json"
-            python3 "$SCRIPT_DIR/brightness/brightness.py" \
+            OUTPUT_FILE="$FULL_OUTPUT_DIR/${BASENAME}${OUTPUT_EXT}"
+            python3 "$SCRIPT_DIR/brightness/brightness.py" "${PROFILE_ARGS[@]}" "${STORE_ARGS[@]}" \
                 -i "$img" \
                 -o "$OUTPUT_FILE" \
                 -r HD \
-                -f "$FACTOR"
+                -f "${FACTORS[@]}"
         
         elif [ "$TRANSFORMATION" == "sharpness" ]; then
-            OUTPUT_FILE="$FULL_OUTPUT_DIR/${BASENAME}.json"
-            python3 "$SCRIPT_DIR/sharpness/sharpness.py" \
+            OUTPUT_FILE="$FULL_OUTPUT_DIR/${BASENAME}${OUTPUT_EXT}"
+            python3 "$SCRIPT_DIR/sharpness/sharpness.py" "${PROFILE_ARGS[@]}" "${STORE_ARGS[@]}" \
                 -i "$img" \
                 -o "$OUTPUT_FILE" \
                 -r HD
         
         elif [ "$TRANSFORMATION" == "blur" ]; then
-            OUTPUT_FILE="$FULL_OUTPUT_DIR/${BASENAME}.json"
-            python3 "$SCRIPT_DIR/blur/blur.py" \
+            OUTPUT_FILE="$FULL_OUTPUT_DIR/${BASENAME}${OUTPUT_EXT}"
+            python3 "$SCRIPT_DIR/blur/blur.py" "${PROFILE_ARGS[@]}" "${STORE_ARGS[@]}" \
                 -i "$img" \
                 -o "$OUTPUT_FILE" \
                 -r HD
@@ -113,3 +145,7 @@ echo "Processed $COUNT image(s)"
 echo "JSON files saved to: $FULL_OUTPUT_DIR"
 echo "========================================="
 
+if [ "${PROFILE:-0}" == "1" ] && [ -s "$PROFILE_LOG" ]; then
+    echo ""
+    python3 "$SCRIPT_DIR/../../stage_profiler.py" "$PROFILE_LOG"
+fi
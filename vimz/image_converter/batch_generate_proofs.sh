@@ -14,6 +14,16 @@ INPUT_DIR="${1:-image_converter/resize/outputs_hd}"  # Default to outputs_hd
 OUTPUT_DIR="${2:-image_converter/resize/proofs}"     # Default to proofs directory
 TRANSFORMATION="${3:-resize}"                        # Transformation type
 RESOLUTION="${4:-HD}"                                # Resolution
+# Set STEP_TIMING=1 to log per-step witness generation and folding times
+VIMZ_EXTRA_ARGS=()
+if [ "${STEP_TIMING:-0}" == "1" ]; then
+    VIMZ_EXTRA_ARGS+=(--step-timing)
+fi
+# Set PROOF_FORMAT=bincode to write binary proofs (<name>_proof.bin) instead of JSON
+PROOF_EXT="json"
+if [ "${PROOF_FORMAT:-json}" == "bincode" ]; then
+    PROOF_EXT="bin"
+fi
 
 # Construct full paths
 FULL_INPUT_DIR="$PROJECT_ROOT/$INPUT_DIR"
@@ -65,10 +75,19 @@ if ! command -v vimz &> /dev/null; then
 fi
 
 # Count total files
-TOTAL=$(find "$FULL_INPUT_DIR" -name "*.json" | wc -l)
+TOTAL=$(find "$FULL_INPUT_DIR" \( -name "*.json" -o -name "*.json.gz" -o -name "*.json.zst" \) | wc -l)
 echo "Found $TOTAL JSON file(s) to process"
 echo ""
 
+# Pre-flight check of every input before the first proof (set VALIDATE=0 to skip)
+if [ "${VALIDATE:-1}" == "1" ]; then
+    if ! python3 "$PROJECT_ROOT/../input_validator.py" vimz "$TRANSFORMATION" "$FULL_INPUT_DIR" --resolution "$RESOLUTION" --quiet; then
+        echo "Error: Invalid inputs in $FULL_INPUT_DIR (fix them or set VALIDATE=0)"
+        exit 1
+    fi
+    echo ""
+fi
+
 # Array to store all results
 declare -a JSON_RESULTS
 
@@ -76,11 +95,13 @@ declare -a JSON_RESULTS
 COUNT=0
 
 # Process each JSON file
-for json_file in "$FULL_INPUT_DIR"/*.json; do
+# Plain, gzip and zstd inputs (the provers decompress .gz/.zst themselves)
+for json_file in "$FULL_INPUT_DIR"/*.json "$FULL_INPUT_DIR"/*.json.gz "$FULL_INPUT_DIR"/*.json.zst; do
     if [ -f "$json_file" ]; then
         COUNT=$((COUNT + 1))
-        BASENAME=$(basename "$json_file" .json)
-        OUTPUT_PROOF="$FULL_OUTPUT_DIR/${BASENAME}_proof.json"
+        BASENAME=$(basename "$json_file")
+        BASENAME="${BASENAME%%.json*}"
+        OUTPUT_PROOF="$FULL_OUTPUT_DIR/${BASENAME}_proof.$PROOF_EXT"
         LOG_FILE="$FULL_OUTPUT_DIR/${BASENAME}_output.log"
         
         echo "[$COUNT/$TOTAL] Processing: $BASENAME"
@@ -99,7 +120,8 @@ for json_file in "$FULL_INPUT_DIR"/*.json; do
             --input "$json_file" \
             --output "$OUTPUT_PROOF" \
             --resolution "$RESOLUTION" \
-            --witnessgenerator "$WITNESS_GEN") \
+            --witnessgenerator "$WITNESS_GEN" \
+            "${VIMZ_EXTRA_ARGS[@]}") \
             > "$LOG_FILE" 2> "$TIME_STATS"
         VIMZ_EXIT=$?
         
@@ -107,9 +129,11 @@ for json_file in "$FULL_INPUT_DIR"/*.json; do
         echo "" >> "$LOG_FILE"
         echo "=== Memory and Resource Statistics ===" >> "$LOG_FILE"
         cat "$TIME_STATS" >> "$LOG_FILE"
+        # Cores the prover could use, read by the extract_*_metrics.py efficiency metrics
+        echo "Cores available: ${RAYON_NUM_THREADS:-$(nproc)}" >> "$LOG_FILE"
         
         if [ $VIMZ_EXIT -eq 0 ]; then
-            echo "  ✓ Proof saved: ${BASENAME}_proof.json"
+            echo "  ✓ Proof saved: ${BASENAME}_proof.$PROOF_EXT"
             
             # Extract metrics from log file
             KEY_GEN=$(grep "Creating keys from R1CS took" "$LOG_FILE" | grep -oP "took \K[0-9.]+" || echo "N/A")
@@ -4,12 +4,17 @@ Convert an image to JSON format for blur transformation.
 Uses convolution kernel to blur the image.
 """
 
-import json
 import sys
 import argparse
+from pathlib import Path
 from PIL import Image
 import numpy as np
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'py_modules'))
+import repo_modules  # noqa: F401
+from stage_profiler import StageProfiler, add_profile_arguments
+from original_store import OriginalStore, add_store_arguments
+
 
 def compress(image_array):
     """
@@ -106,19 +111,21 @@ def main():
                        choices=['SD', 'HD', 'FHD', '4K'],
                        default='HD',
                        help='Image resolution (default: HD)')
+    add_profile_arguments(parser)
+    add_store_arguments(parser)
     
     args = parser.parse_args()
+    profiler = StageProfiler.from_args('vimz/blur', args)
+    store = OriginalStore.from_args(args)
     
     print(f"Processing: {args.input}")
     print(f"Resolution: {args.resolution}")
     
     try:
         # Load original image
-        with Image.open(args.input) as image:
-            image_np = np.array(image)
-        
-        # Compress original
-        compressed_original = compress(image_np)
+        with profiler.stage('decode'):
+            with Image.open(args.input) as image:
+                image_np = np.array(image)
         
         # Create compressed zeros row (one row of zeros for padding)
         # Number of zeros = image width / 10 (one hex value per 10 pixels)
@@ -126,23 +133,32 @@ def main():
         zeros_per_row = width // 10
         compressed_zeros = [["0x00"] * zeros_per_row]
         
-        # Blur and compress transformed
-        compressed_transformed = blur_and_compress(image_np)
+        # Compress original, or reference it in the original store (padding added on load)
+        with profiler.stage('compress'):
+            if store:
+                original_field = {"original_ref": store.original_ref(
+                    image_np, 'vimz', lambda: compress(image_np), args.output, pad_rows=1)}
+            else:
+                original_field = {"original": compressed_zeros + compress(image_np) + compressed_zeros}
+        
+        # Blur and compress transformed (one pass, so both count as transform)
+        with profiler.stage('transform'):
+            compressed_transformed = blur_and_compress(image_np)
         
         # Create output structure
         # Original is padded with zeros: zeros + original + zeros
-        output = {
-            "original": compressed_zeros + compressed_original + compressed_zeros,
-            "transformed": compressed_transformed
-        }
+        output = dict(original_field, transformed=compressed_transformed)
         
         # Save to JSON
-        with open(args.output, 'w') as f:
-            json.dump(output, f, indent=4)
+        profiler.write_json(output, args.output, indent=4)
         
         print(f"✓ Saved: {args.output}")
-        print(f"  Original rows: {len(output['original'])} (with padding)")
+        if store:
+            print(f"  Original: {output['original_ref']['path']} (store)")
+        else:
+            print(f"  Original rows: {len(output['original'])} (with padding)")
         print(f"  Transformed rows: {len(compressed_transformed)}")
+        profiler.finish()
         
     except Exception as e:
         print(f"Error: {e}")
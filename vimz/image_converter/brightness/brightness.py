@@ -1,14 +1,25 @@
 #!/usr/bin/env python3
 """
 Convert an image to JSON format for brightness transformation.
+
+Several factors (-f 1.2 1.4 1.5) run a sweep: the image is decoded and the
+original compressed and serialized once, and one JSON per factor is written
+as <output_stem>_f<factor>.json.
 """
 
-import json
 import sys
 import argparse
+from pathlib import Path
 from PIL import Image
 import numpy as np
 
+# Shared point-operation engine (256-entry lookup tables) and the root modules
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'py_modules'))
+import repo_modules  # noqa: F401
+from image_formatter import apply_lut, brightness_lut, write_factor_outputs
+from stage_profiler import StageProfiler, add_profile_arguments
+from original_store import OriginalStore, add_store_arguments
+
 
 def compress(image_array):
     """
@@ -35,22 +46,17 @@ def compress(image_array):
     return output_array
 
 
-def adjust_brightness_and_compress(image_array, brightness_factor):
+def adjust_brightness_and_compress(image_array, brightness_factor, profiler):
     """
     Adjust brightness and return compressed result.
-    Matches the algorithm from image_formatter.py
+    Matches the algorithm from image_formatter.py (lookup table, one gather).
     """
-    # Convert to float for calculations
-    np_image_float = image_array.astype(float)
-    
-    # Multiply by brightness factor
-    adjusted_image_float = np_image_float * brightness_factor
-    
-    # Clip to valid range [0, 255] and convert back to uint8
-    adjusted_image = np.clip(adjusted_image_float, 0, 255).astype(np.uint8)
+    with profiler.stage('transform'):
+        adjusted_image = apply_lut(image_array, brightness_lut(brightness_factor))
     
     # Compress
-    compressed = compress(adjusted_image)
+    with profiler.stage('compress'):
+        compressed = compress(adjusted_image)
     
     return compressed
 
@@ -65,41 +71,46 @@ def main():
                        choices=['SD', 'HD', 'FHD', '4K'],
                        default='HD',
                        help='Image resolution (default: HD)')
-    parser.add_argument('--factor', '-f', type=float, default=1.5,
-                       help='Brightness factor (default: 1.5)')
+    parser.add_argument('--factor', '-f', type=float, nargs='+', default=[1.5],
+                       help='Brightness factor(s); several values write one JSON per factor (default: 1.5)')
+    add_profile_arguments(parser)
+    add_store_arguments(parser)
     
     args = parser.parse_args()
+    profiler = StageProfiler.from_args('vimz/brightness', args)
+    store = OriginalStore.from_args(args)
     
     print(f"Processing: {args.input}")
     print(f"Resolution: {args.resolution}")
-    print(f"Brightness factor: {args.factor}")
+    print(f"Brightness factor(s): {', '.join(f'{f:g}' for f in args.factor)}")
     
     try:
         # Load original image
-        with Image.open(args.input) as image:
-            image_np = np.array(image)
+        with profiler.stage('decode'):
+            with Image.open(args.input) as image:
+                image_np = np.array(image)
         
-        # Compress original
-        compressed_original = compress(image_np)
-        
-        # Apply brightness and compress
-        compressed_transformed = adjust_brightness_and_compress(image_np, args.factor)
-        
-        # Create output structure
-        output = {
-            "original": compressed_original,
-            "transformed": compressed_transformed,
-            "factor": int(args.factor * 10)  # Store as integer (* 10 to match expected format)
-        }
+        # Compress original, or reference it in the original store
+        with profiler.stage('compress'):
+            if store:
+                original_field = {"original_ref": store.original_ref(
+                    image_np, 'vimz', lambda: compress(image_np), args.output)}
+            else:
+                original_field = {"original": compress(image_np)}
         
-        # Save to JSON
-        with open(args.output, 'w') as f:
-            json.dump(output, f, indent=4)
+        # Apply brightness per factor, compress and save
+        written = write_factor_outputs(original_field, image_np, args.factor, args.output,
+                                       adjust_brightness_and_compress, profiler)
         
-        print(f"✓ Saved: {args.output}")
-        print(f"  Original rows: {len(compressed_original)}")
-        print(f"  Transformed rows: {len(compressed_transformed)}")
-        print(f"  Factor: {output['factor']}")
+        for path, fields in written:
+            print(f"✓ Saved: {path}")
+            if store:
+                print(f"  Original: {original_field['original_ref']['path']} (store)")
+            else:
+                print(f"  Original rows: {len(original_field['original'])}")
+            print(f"  Transformed rows: {len(fields['transformed'])}")
+            print(f"  Factor: {fields['factor']}")
+        profiler.finish()
         
     except Exception as e:
         print(f"Error: {e}")
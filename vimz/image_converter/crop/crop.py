@@ -2,14 +2,25 @@
 """
 Convert an image to JSON format for crop transformation.
 Uses optimized_crop circuit which only needs original image and info field.
+
+Sweep mode (--offsets / --grid) compresses and serializes the original once
+and writes one input per crop offset as <output_stem>_x<X>_y<Y>.json.
 """
 
 import json
 import sys
 import argparse
+from pathlib import Path
 from PIL import Image
 import numpy as np
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'py_modules'))
+import repo_modules  # noqa: F401
+from stage_profiler import StageProfiler, add_profile_arguments
+from original_store import OriginalStore, add_store_arguments
+from compressed_io import open_text
+from crop_sweep import add_sweep_arguments, sweep_offsets, sweep_output_path
+
 
 def compress(image_array):
     """
@@ -36,6 +47,29 @@ def compress(image_array):
     return output_array
 
 
+def write_sweep(original_field, offsets, output, profiler):
+    """
+    Write one crop input per offset, serializing the original only once.
+
+    Only "info" changes between offsets, so the JSON text up to the "info"
+    key is reused verbatim. Each file is byte-identical to a single run.
+    """
+    with profiler.stage('serialize'):
+        template = json.dumps(dict(original_field, info=0), indent=4)
+        head = template[:template.rindex('"info": ')]
+    
+    written = []
+    for crop_x, crop_y in offsets:
+        info = crop_x * 2**24 + crop_y * 2**12
+        path = sweep_output_path(output, crop_x, crop_y)
+        with profiler.stage('write'):
+            with open_text(path, 'w') as f:
+                f.write(head)
+                f.write(f'"info": {info}\n}}')
+        written.append((path, info))
+    return written
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='Convert an image to JSON format for crop transformation'
@@ -48,8 +82,14 @@ def main():
                        help='Image resolution (default: HD)')
     parser.add_argument('--crop-x', type=int, default=0, help='Crop X coordinate (default: 0)')
     parser.add_argument('--crop-y', type=int, default=0, help='Crop Y coordinate (default: 0)')
+    add_sweep_arguments(parser)
+    add_profile_arguments(parser)
+    add_store_arguments(parser)
     
     args = parser.parse_args()
+    profiler = StageProfiler.from_args('vimz/crop', args)
+    store = OriginalStore.from_args(args)
+    offsets = sweep_offsets(args)
     
     # Get crop dimensions based on resolution
     sizes = {
@@ -63,38 +103,57 @@ def main():
     
     print(f"Processing: {args.input}")
     print(f"Resolution: {args.resolution} ({width}x{height})")
-    print(f"Crop coordinates: ({args.crop_x}, {args.crop_y})")
+    if offsets:
+        print(f"Crop sweep: {len(offsets)} offset(s)")
+    else:
+        print(f"Crop coordinates: ({args.crop_x}, {args.crop_y})")
     
     try:
         # Load original image
-        with Image.open(args.input) as image:
-            image_np = np.array(image)
+        with profiler.stage('decode'):
+            with Image.open(args.input) as image:
+                image_np = np.array(image)
         
         # Check dimensions
         actual_height, actual_width = image_np.shape[:2]
-        if actual_width < args.crop_x + width or actual_height < args.crop_y + height:
-            print(f"Error: Image too small for crop. Image is {actual_width}x{actual_height}, need at least {args.crop_x + width}x{args.crop_y + height}")
-            sys.exit(1)
+        for crop_x, crop_y in offsets or [(args.crop_x, args.crop_y)]:
+            if actual_width < crop_x + width or actual_height < crop_y + height:
+                print(f"Error: Image too small for crop. Image is {actual_width}x{actual_height}, need at least {crop_x + width}x{crop_y + height}")
+                sys.exit(1)
+        
+        # Compress original (full image, not cropped), or reference it in the original store
+        with profiler.stage('compress'):
+            if store:
+                original_field = {"original_ref": store.original_ref(
+                    image_np, 'vimz', lambda: compress(image_np), args.output)}
+            else:
+                original_field = {"original": compress(image_np)}
         
-        # Compress original (full image, not cropped)
-        compressed_original = compress(image_np)
+        if offsets:
+            written = write_sweep(original_field, offsets, args.output, profiler)
+            for path, info in written:
+                print(f"✓ Saved: {path} (info: {info})")
+            if not store:
+                print(f"  Original rows: {len(original_field['original'])}")
+            profiler.finish()
+            return
         
         # Encode crop coordinates as: x * 2^24 + y * 2^12
         info = args.crop_x * 2**24 + args.crop_y * 2**12
         
         # Create output structure
-        output = {
-            "original": compressed_original,
-            "info": info
-        }
+        output = dict(original_field, info=info)
         
         # Save to JSON
-        with open(args.output, 'w') as f:
-            json.dump(output, f, indent=4)
+        profiler.write_json(output, args.output, indent=4)
         
         print(f"✓ Saved: {args.output}")
-        print(f"  Original rows: {len(compressed_original)}")
+        if store:
+            print(f"  Original: {output['original_ref']['path']} (store)")
+        else:
+            print(f"  Original rows: {len(output['original'])}")
         print(f"  Info: {info}")
+        profiler.finish()
         
     except Exception as e:
         print(f"Error: {e}")
@@ -7,12 +7,17 @@ Outputs: {
 }
 """
 
-import json
 import sys
 import argparse
+from pathlib import Path
 from PIL import Image
 import numpy as np
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'py_modules'))
+import repo_modules  # noqa: F401
+from stage_profiler import StageProfiler, add_profile_arguments
+from original_store import OriginalStore, add_store_arguments
+
 
 def compress(image_array):
     # Compress image array to hex format - groups of 10 pixels per hex value.
@@ -41,25 +46,33 @@ def main():
     parser.add_argument('--input', '-i', required=True, help='Input image file')
     parser.add_argument('--output', '-o', required=True, help='Output JSON file')
     parser.add_argument('--resolution', '-r', choices=['SD', 'HD', 'FHD', '4K'], default='HD')
+    add_profile_arguments(parser)
+    add_store_arguments(parser)
 
     args = parser.parse_args()
+    profiler = StageProfiler.from_args('vimz/grayscale', args)
+    store = OriginalStore.from_args(args)
 
     try:
         with Image.open(args.input) as image:
-            image_np = np.array(image)
-            grayscale_image = image.convert('L')
-            grayscale_np = np.array(grayscale_image)
+            with profiler.stage('decode'):
+                image_np = np.array(image)
+            with profiler.stage('transform'):
+                grayscale_image = image.convert('L')
+                grayscale_np = np.array(grayscale_image)
 
-        original_compressed = compress(image_np)
-        transformed_compressed = compress(grayscale_np)
+        with profiler.stage('compress'):
+            if store:
+                original_field = {"original_ref": store.original_ref(
+                    image_np, 'vimz', lambda: compress(image_np), args.output)}
+            else:
+                original_field = {"original": compress(image_np)}
+            transformed_compressed = compress(grayscale_np)
 
-        out = {
-            "original": original_compressed,
-            "transformed": transformed_compressed,
-        }
-        with open(args.output, 'w') as f:
-            json.dump(out, f, indent=4)
+        out = dict(original_field, transformed=transformed_compressed)
+        profiler.write_json(out, args.output, indent=4)
         print(f"✓ Saved: {args.output}")
+        profiler.finish()
     except Exception as e:
         print(f"Error: {e}")
         import traceback
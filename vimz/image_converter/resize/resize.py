@@ -4,12 +4,17 @@ Convert an image to JSON format for resize transformation.
 This is Step 1 of the implementation plan - RESIZE only.
 """
 
-import json
 import sys
 import argparse
+from pathlib import Path
 from PIL import Image
 import numpy as np
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'py_modules'))
+import repo_modules  # noqa: F401
+from stage_profiler import StageProfiler, add_profile_arguments
+from original_store import OriginalStore, add_store_arguments
+
 
 def compress(image_array):
     """
@@ -98,8 +103,12 @@ def main():
                        help='Source resolution (default: HD)')
     parser.add_argument('--to-res', choices=['SD', 'FHD'], required=True,
                        help='Target resolution')
+    add_profile_arguments(parser)
+    add_store_arguments(parser)
     
     args = parser.parse_args()
+    profiler = StageProfiler.from_args('vimz/resize', args)
+    store = OriginalStore.from_args(args)
     
     # Get dimensions based on resolutions
     from_sizes = {
@@ -121,34 +130,39 @@ def main():
     
     try:
         # Load original image
-        with Image.open(args.input) as image:
-            image_np = np.array(image)
+        with profiler.stage('decode'):
+            with Image.open(args.input) as image:
+                image_np = np.array(image)
         
         # Check dimensions match expected source
         actual_height, actual_width = image_np.shape[:2]
         if actual_width != from_width or actual_height != from_height:
             print(f"Warning: Image dimensions are {actual_width}x{actual_height}, expected {from_width}x{from_height}")
         
-        # Compress original
-        compressed_original = compress(image_np)
-        
         # Resize and compress transformed
-        resized_image = resize_image(image_np, to_height, to_width)
-        compressed_transformed = compress(resized_image)
+        with profiler.stage('transform'):
+            resized_image = resize_image(image_np, to_height, to_width)
+        with profiler.stage('compress'):
+            if store:
+                original_field = {"original_ref": store.original_ref(
+                    image_np, 'vimz', lambda: compress(image_np), args.output)}
+            else:
+                original_field = {"original": compress(image_np)}
+            compressed_transformed = compress(resized_image)
         
         # Create output structure
-        output = {
-            "original": compressed_original,
-            "transformed": compressed_transformed
-        }
+        output = dict(original_field, transformed=compressed_transformed)
         
         # Save to JSON
-        with open(args.output, 'w') as f:
-            json.dump(output, f, indent=4)
+        profiler.write_json(output, args.output, indent=4)
         
         print(f"✓ Saved: {args.output}")
-        print(f"  Original rows: {len(compressed_original)}")
+        if store:
+            print(f"  Original: {output['original_ref']['path']} (store)")
+        else:
+            print(f"  Original rows: {len(output['original'])}")
         print(f"  Transformed rows: {len(compressed_transformed)}")
+        profiler.finish()
         
     except Exception as e:
         print(f"Error: {e}")
@@ -1,16 +1,20 @@
-use std::{collections::HashMap, env::current_dir, time::Instant, fs::File, io::{Write, Read}};
+use std::{collections::HashMap, env::current_dir, path::{Path, PathBuf}, time::{Duration, Instant}, fs::File, io::{BufReader, Write, Read}};
+use std::sync::{atomic::{AtomicUsize, Ordering}, Mutex};
 use clap::{App, Arg};
 
 use nova_scotia::{
-    circom::reader::load_r1cs, create_public_params, create_recursive_circuit, FileLocation, F, S,
+    circom::{circuit::{CircomCircuit, R1CS}, reader::{generate_witness_from_bin, load_r1cs}},
+    create_public_params, create_recursive_circuit, FileLocation, C1, C2, F, S,
 };
 use nova_snark::{
     provider,
-    traits::{circuit::StepCircuit, Group},
-    CompressedSNARK, PublicParams,
+    traits::{circuit::{StepCircuit, TrivialTestCircuit}, Group},
+    CompressedSNARK, PublicParams, RecursiveSNARK,
 };
-use serde::{Serialize, Deserialize};
-use serde_json::json;
+use num_bigint::BigInt;
+use num_traits::Num;
+use serde::{de::DeserializeOwned, Serialize, Deserialize};
+use serde_json::{json, Value};
 
 #[derive(Deserialize)]
 struct ZKronoInput {
@@ -44,16 +48,453 @@ struct ZKronoInputCropOpt {
     info: u64
 }
 
+// Input handed to the circom witness generator for one step (same layout nova_scotia uses)
+#[derive(Serialize)]
+struct CircomInput {
+    step_in: Vec<String>,
+
+    #[serde(flatten)]
+    extra: HashMap<String, Value>,
+}
+
+type G1 = pasta_curves::pallas::Point;
+type G2 = pasta_curves::vesta::Point;
+
+fn to_hex(x: &F<G1>) -> String {
+    format!("{:?}", x).strip_prefix("0x").unwrap().to_string()
+}
+
+// Input JSON as written by the converters: plain, or compressed by compressed_io.py
+// (.gz = gzip, .zst = zstd), picked from the extension.
+fn read_input(path: &str) -> String {
+    let file = File::open(path).expect("Failed to open the file");
+    let mut reader: Box<dyn Read> = match Path::new(path).extension().and_then(|e| e.to_str()) {
+        Some("gz") => Box::new(flate2::read::MultiGzDecoder::new(BufReader::new(file))),
+        Some("zst") => Box::new(zstd::stream::read::Decoder::new(file).expect("Failed to start zstd decoder")),
+        _ => Box::new(file),
+    };
+    let mut json_string = String::new();
+    reader.read_to_string(&mut json_string).expect("Unable to read from the file");
+    json_string
+}
+
+// Input as read from disk (the load phase): the JSON text and, for an input with an
+// "original_ref" (original_store.py), the store block it references with the number of zero
+// padding rows blur/sharpness need restored. The block's sha256 is checked by the pre-flight
+// validation of proof_runner.py. on_disk counts the input and its store block. load is the
+// time spent reading and decompressing only; the original_ref header pass is JSON parsing,
+// so its time is kept in header_parse and counted by parse_input.
+struct LoadedInput {
+    json: String,
+    block: Option<(String, usize)>,
+    on_disk: u64,
+    load: Duration,
+    header_parse: Duration,
+}
+
+impl LoadedInput {
+    fn decoded_bytes(&self) -> usize {
+        self.json.len() + self.block.as_ref().map_or(0, |(block, _)| block.len())
+    }
+}
+
+// Just the store reference of an input; serde skips the other fields without building them
+#[derive(Deserialize)]
+struct StoreRefHeader {
+    original_ref: Option<StoreRef>,
+}
+
+#[derive(Deserialize)]
+struct StoreRef {
+    path: String,
+    #[serde(default)]
+    pad_rows: usize,
+}
+
+// The store file is resolved relative to the input. Merging the block into the input is
+// left to parse_input, so it is timed as parsing.
+fn load_input(path: &str) -> LoadedInput {
+    let file_size = |p: &Path| std::fs::metadata(p).map_or(0, |m| m.len());
+    let start = Instant::now();
+    let json = read_input(path);
+    let mut load = start.elapsed();
+    let mut header_parse = Duration::ZERO;
+    let mut on_disk = file_size(Path::new(path));
+    let mut block = None;
+    if json.contains("\"original_ref\"") {
+        let start = Instant::now();
+        let header: StoreRefHeader = serde_json::from_str(&json).expect("Deserialization of original_ref failed");
+        header_parse = start.elapsed();
+        if let Some(reference) = header.original_ref {
+            let start = Instant::now();
+            let block_path = Path::new(path).parent().unwrap_or(Path::new(".")).join(&reference.path);
+            on_disk += file_size(&block_path);
+            block = Some((read_input(block_path.to_str().unwrap()), reference.pad_rows));
+            load += start.elapsed();
+        }
+    }
+    LoadedInput { json, block, on_disk, load, header_parse }
+}
+
+// The input with its store block (if any) put back as the "original" field
+fn merge_original(json: &str, block: &str, pad_rows: usize) -> Value {
+    let mut data: Value = serde_json::from_str(json).expect("Deserialization failed");
+    let mut original: Value = serde_json::from_str(block).expect("Deserialization of the original store block failed");
+    if pad_rows > 0 {
+        let rows = original.as_array_mut().expect("original must be a list of rows");
+        let width = rows.first().and_then(|row| row.as_array()).map_or(0, |row| row.len());
+        let zeros = Value::Array(vec![json!("0x00"); width]);
+        for _ in 0..pad_rows {
+            rows.insert(0, zeros.clone());
+            rows.push(zeros.clone());
+        }
+    }
+    let fields = data.as_object_mut().expect("input must be a JSON object");
+    fields.remove("original_ref");
+    fields.insert("original".to_string(), original);
+    data
+}
+
+// Proof encoding, picked from the output extension: .bin / .bincode = bincode, anything
+// else JSON. bincode proofs are a fraction of the size and need no text parsing, which is
+// what matters for verifiers that load many proofs.
+// Every extension from_path/detect maps to a format; --verify collects proofs and keys by these
+const PROOF_EXTENSIONS: [&str; 3] = ["json", "bin", "bincode"];
+
+#[derive(Clone, Copy, PartialEq)]
+enum ProofFormat {
+    Json,
+    Bincode,
+}
+
+impl ProofFormat {
+    fn from_path(path: &str) -> ProofFormat {
+        match Path::new(path).extension().and_then(|e| e.to_str()) {
+            Some("bin") | Some("bincode") => ProofFormat::Bincode,
+            _ => ProofFormat::Json,
+        }
+    }
+
+    // Format of a proof file: known extensions decide, otherwise a JSON proof is recognized
+    // by its opening brace (so a proof renamed without its extension still loads).
+    fn detect(path: &str, bytes: &[u8]) -> ProofFormat {
+        match Path::new(path).extension().and_then(|e| e.to_str()) {
+            Some("json") => ProofFormat::Json,
+            Some("bin") | Some("bincode") => ProofFormat::Bincode,
+            _ => match bytes.iter().find(|b| !b.is_ascii_whitespace()) {
+                Some(b'{') => ProofFormat::Json,
+                _ => ProofFormat::Bincode,
+            },
+        }
+    }
+
+    fn name(&self) -> &'static str {
+        match self {
+            ProofFormat::Json => "json",
+            ProofFormat::Bincode => "bincode",
+        }
+    }
+}
+
+fn serialize_proof<T: Serialize>(proof: &T, format: ProofFormat) -> Vec<u8> {
+    match format {
+        ProofFormat::Json => serde_json::to_vec(proof).expect("Serialization failed"),
+        ProofFormat::Bincode => bincode::serialize(proof).expect("Serialization failed"),
+    }
+}
+
+fn deserialize_proof<T: DeserializeOwned>(bytes: &[u8], format: ProofFormat) -> T {
+    match format {
+        ProofFormat::Json => serde_json::from_slice(bytes).expect("Deserialization failed"),
+        ProofFormat::Bincode => bincode::deserialize(bytes).expect("Deserialization failed"),
+    }
+}
+
+// One line per proof I/O step, parsed by extract_vimz_metrics.py:
+// "Proof serialization took 0.012345s (bincode, 10432 bytes)"
+fn print_proof_io(step: &str, format: ProofFormat, bytes: usize, elapsed: Duration) {
+    println!("Proof {} took {:.6}s ({}, {} bytes)", step, elapsed.as_secs_f64(), format.name(), bytes);
+}
+
+// Public inputs of a proof, written next to it as <name>_public.json for --verify
+#[derive(Serialize, Deserialize)]
+struct PublicInputs {
+    iteration_count: usize,
+    z0_primary: Vec<F<G1>>,
+    z0_secondary: Vec<F<G2>>,
+}
+
+type Proof = CompressedSNARK<G1, G2, C1<G1>, C2<G2>, S<G1>, S<G2>>;
+type VerifierKey = nova_snark::VerifierKey<G1, G2, C1<G1>, C2<G2>, S<G1>, S<G2>>;
+
+// <dir>/<name>_proof.<ext> -> <dir>/<name><suffix>
+fn artifact_path(proof_path: &str, suffix: &str) -> PathBuf {
+    let path = Path::new(proof_path);
+    let name = path.file_name().and_then(|n| n.to_str()).unwrap_or("proof");
+    let stem = match name.rfind("_proof.") {
+        Some(end) => &name[..end],
+        None => name.split('.').next().unwrap_or(name),
+    };
+    path.with_file_name(format!("{}{}", stem, suffix))
+}
+
+// What --verify needs besides the proof: its public inputs, and the verifier key of the
+// circuit. The key only depends on the R1CS, so it is written once per circuit into the
+// proof directory (<circuit>_vk.<ext>, same encoding as the proof) and reused.
+fn write_verifier_artifacts(proof_path: &str, circuit_stem: &str, format: ProofFormat,
+                            vk: &VerifierKey, public: &PublicInputs) {
+    let public_path = artifact_path(proof_path, "_public.json");
+    std::fs::write(&public_path, serde_json::to_vec(public).unwrap()).expect("Unable to write the public inputs");
+
+    let extension = Path::new(proof_path).extension().and_then(|e| e.to_str()).unwrap_or("json");
+    let vk_path = Path::new(proof_path).with_file_name(format!("{}_vk.{}", circuit_stem, extension));
+    // A key left by an earlier build of the circuit differs from this one and is replaced;
+    // concurrent provers of the same circuit write identical keys, rename keeps it atomic
+    let vk_bytes = serialize_proof(vk, format);
+    if std::fs::read(&vk_path).ok().as_deref() != Some(vk_bytes.as_slice()) {
+        let tmp = vk_path.with_extension(format!("{}.{}.tmp", extension, std::process::id()));
+        std::fs::write(&tmp, &vk_bytes).expect("Unable to write the verifier key");
+        std::fs::rename(&tmp, &vk_path).expect("Unable to write the verifier key");
+        println!("Verifier key has been written to {}", vk_path.display());
+    }
+}
+
+// Resident set size counters of this process from /proc (kB): "VmRSS" now, "VmHWM" peak
+fn rss_kb(field: &str) -> u64 {
+    std::fs::read_to_string("/proc/self/status")
+        .ok()
+        .and_then(|status| {
+            status
+                .lines()
+                .find(|line| line.starts_with(field))
+                .and_then(|line| line.split_whitespace().nth(1))
+                .and_then(|value| value.parse().ok())
+        })
+        .unwrap_or(0)
+}
+
+// Reset the VmHWM peak to the current resident set ("5" > clear_refs, Linux 4.0+), so the
+// peak reported after the run excludes transients of loading proofs and keys
+fn reset_peak_rss() {
+    if let Err(e) = std::fs::write("/proc/self/clear_refs", "5") {
+        eprintln!("Warning: cannot reset the peak RSS ({}), memory per worker includes loading", e);
+    }
+}
+
+// Verify-only mode: every <name>_proof.{json,bin,bincode} in dir is checked against the circuit's
+// verifier key in the proof's encoding and its <name>_public.json by `workers` threads. Proofs are read up front,
+// so a verification's latency is deserialization plus CompressedSNARK::verify. Output is
+// parsed by verify_throughput.py:
+//   VERIFY <name> <ok|failed> <latency_us>
+//   VERIFY_SUMMARY workers=4 proofs=100 elapsed_us=... baseline_rss_kb=... peak_rss_kb=...
+fn verify_dir(dir: &str, vk_path: Option<&str>, workers: usize) {
+    let dir = Path::new(dir);
+    let mut proofs = Vec::new();
+    let mut keys = Vec::new();
+    for entry in std::fs::read_dir(dir).expect("Unable to read the proof directory") {
+        let path = entry.expect("Unable to read the proof directory").path();
+        let name = path.file_name().and_then(|n| n.to_str()).unwrap_or("").to_string();
+        let has_suffix = |kind: &str| PROOF_EXTENSIONS.iter().any(|ext| name.ends_with(&format!("_{}.{}", kind, ext)));
+        if has_suffix("proof") {
+            proofs.push(path);
+        } else if has_suffix("vk") {
+            keys.push(path);
+        }
+    }
+    proofs.sort();
+
+    let jobs: Vec<(String, Vec<u8>, ProofFormat, PublicInputs)> = proofs
+        .iter()
+        .map(|path| {
+            let path_str = path.to_str().unwrap();
+            let bytes = std::fs::read(path).expect("Unable to read the proof");
+            let public_path = artifact_path(path_str, "_public.json");
+            let public: PublicInputs = serde_json::from_slice(
+                &std::fs::read(&public_path).unwrap_or_else(|_| panic!("Missing {}", public_path.display())),
+            )
+            .expect("Deserialization of the public inputs failed");
+            let name = artifact_path(path_str, "").file_name().unwrap().to_str().unwrap().to_string();
+            let format = ProofFormat::detect(path_str, &bytes);
+            (name, bytes, format, public)
+        })
+        .collect();
+
+    // --vk applies to every proof; otherwise each encoding present takes the one key file
+    // written in that encoding, since a directory proven in both holds <circuit>_vk.json
+    // and <circuit>_vk.bin
+    let key_files: Vec<(ProofFormat, PathBuf)> = match vk_path {
+        Some(path) => vec![(ProofFormat::from_path(path), PathBuf::from(path))],
+        None => [ProofFormat::Json, ProofFormat::Bincode]
+            .iter()
+            .copied()
+            .filter(|format| jobs.iter().any(|(_, _, f, _)| f == format))
+            .map(|format| {
+                let matching: Vec<&PathBuf> = keys
+                    .iter()
+                    .filter(|key| ProofFormat::from_path(key.to_str().unwrap()) == format)
+                    .collect();
+                match matching.as_slice() {
+                    [key] => (format, (*key).clone()),
+                    _ => panic!("Expected one {} verifier key in {} (found {}), pass --vk",
+                                format.name(), dir.display(), matching.len()),
+                }
+            })
+            .collect(),
+    };
+    let vks: Vec<(ProofFormat, VerifierKey)> = key_files
+        .iter()
+        .map(|(format, vk_file)| {
+            let vk_bytes = std::fs::read(vk_file).expect("Unable to read the verifier key");
+            (*format, deserialize_proof(&vk_bytes, ProofFormat::detect(vk_file.to_str().unwrap(), &vk_bytes)))
+        })
+        .collect();
+    let vk_for = |format: ProofFormat| match vk_path {
+        Some(_) => &vks[0].1,
+        None => &vks.iter().find(|(f, _)| *f == format).unwrap().1,
+    };
+
+    let key_names: Vec<String> = key_files.iter().map(|(_, vk_file)| vk_file.display().to_string()).collect();
+    println!("Verifying {} proof(s) with {} worker(s), verifier key {}", jobs.len(), workers, key_names.join(", "));
+    reset_peak_rss();
+    let baseline_rss = rss_kb("VmRSS:");
+    let next = AtomicUsize::new(0);
+    let results = Mutex::new(Vec::with_capacity(jobs.len()));
+    let start = Instant::now();
+    std::thread::scope(|scope| {
+        for _ in 0..workers.max(1) {
+            scope.spawn(|| loop {
+                let index = next.fetch_add(1, Ordering::Relaxed);
+                if index >= jobs.len() {
+                    break;
+                }
+                let (name, bytes, format, public) = &jobs[index];
+                let job_start = Instant::now();
+                let proof: Proof = deserialize_proof(bytes, *format);
+                let ok = proof
+                    .verify(vk_for(*format), public.iteration_count, public.z0_primary.clone(), public.z0_secondary.clone())
+                    .is_ok();
+                results.lock().unwrap().push((name.clone(), ok, job_start.elapsed()));
+            });
+        }
+    });
+    let elapsed = start.elapsed();
+
+    for (name, ok, latency) in results.into_inner().unwrap() {
+        println!("VERIFY {} {} {}", name, if ok { "ok" } else { "failed" }, latency.as_micros());
+    }
+    println!(
+        "VERIFY_SUMMARY workers={} proofs={} elapsed_us={} baseline_rss_kb={} peak_rss_kb={}",
+        workers.max(1),
+        jobs.len(),
+        elapsed.as_micros(),
+        baseline_rss,
+        rss_kb("VmHWM:")
+    );
+}
+
+// Deserialize the input into the function's ZKronoInput* struct, timed as the parse phase
+// (including the original_ref header pass and the merge of an original store block):
+// "Input parse took 0.234567s (4567890 bytes)"
+fn parse_input<T: DeserializeOwned>(input: &LoadedInput) -> T {
+    let start = Instant::now();
+    let parsed: T = match &input.block {
+        None => serde_json::from_str(&input.json).expect("Deserialization failed"),
+        Some((block, pad_rows)) => serde_json::from_value(merge_original(&input.json, block, *pad_rows))
+            .expect("Deserialization failed"),
+    };
+    let elapsed = start.elapsed() + input.header_parse;
+    println!("Input parse took {:.6}s ({} bytes)", elapsed.as_secs_f64(), input.decoded_bytes());
+    parsed
+}
+
+fn print_step_timing(label: &str, durations: &[Duration]) {
+    // One compact line per phase: comma-separated microseconds, one value per step
+    let values: Vec<String> = durations.iter().map(|d| d.as_micros().to_string()).collect();
+    println!("STEP_TIMING {} {}", label, values.join(","));
+}
+
+/// Same as nova_scotia::create_recursive_circuit (binary witness generator), but
+/// times the witness generation and the folding of every step separately.
+fn create_recursive_circuit_timed(
+    witness_generator_file: &Path,
+    r1cs: R1CS<F<G1>>,
+    private_inputs: Vec<HashMap<String, Value>>,
+    start_public_input: Vec<F<G1>>,
+    pp: &PublicParams<G1, G2, C1<G1>, C2<G2>>,
+) -> RecursiveSNARK<G1, G2, C1<G1>, C2<G2>> {
+    // Per-process witness file so concurrent jobs in the same directory don't clash
+    let witness_generator_output = current_dir().unwrap().join(format!("circom_witness_{}.wtns", std::process::id()));
+    let iteration_count = private_inputs.len();
+
+    let start = Instant::now();
+    let mut witness_times = Vec::with_capacity(iteration_count);
+    let mut current_public_input: Vec<String> = start_public_input.iter().map(to_hex).collect();
+    let mut circuit_iterations = Vec::with_capacity(iteration_count);
+    for private_input in private_inputs {
+        let step_start = Instant::now();
+        let decimal_stringified_input: Vec<String> = current_public_input
+            .iter()
+            .map(|x| BigInt::from_str_radix(x, 16).unwrap().to_str_radix(10))
+            .collect();
+        let input = CircomInput {
+            step_in: decimal_stringified_input,
+            extra: private_input,
+        };
+        let input_json = serde_json::to_string(&input).unwrap();
+        let witness = generate_witness_from_bin::<F<G1>>(witness_generator_file, &input_json, &witness_generator_output);
+        let circuit = CircomCircuit {
+            r1cs: r1cs.clone(),
+            witness: Some(witness),
+        };
+        current_public_input = circuit.get_public_outputs().iter().map(to_hex).collect();
+        circuit_iterations.push(circuit);
+        witness_times.push(step_start.elapsed());
+    }
+    let _ = std::fs::remove_file(&witness_generator_output);
+    println!("Witness generation took {:.6}s", start.elapsed().as_secs_f64());
+
+    let start = Instant::now();
+    let mut prove_times = Vec::with_capacity(iteration_count);
+    let circuit_secondary = TrivialTestCircuit::default();
+    let z0_secondary = vec![F::<G2>::from(0)];
+    // RecursiveSNARK::new folds the first step, so its time is step 0's prove time
+    let step_start = Instant::now();
+    let mut recursive_snark = RecursiveSNARK::<G1, G2, C1<G1>, C2<G2>>::new(
+        pp,
+        &circuit_iterations[0],
+        &circuit_secondary,
+        start_public_input.clone(),
+        z0_secondary.clone(),
+    );
+    let mut first_step = step_start.elapsed();
+    for circuit in circuit_iterations.iter() {
+        let step_start = Instant::now();
+        let res = recursive_snark.prove_step(
+            pp,
+            circuit,
+            &circuit_secondary,
+            start_public_input.clone(),
+            z0_secondary.clone(),
+        );
+        assert!(res.is_ok());
+        prove_times.push(step_start.elapsed() + first_step);
+        first_step = Duration::ZERO;
+    }
+    println!("Folding took {:.6}s", start.elapsed().as_secs_f64());
+
+    print_step_timing("witness_us", &witness_times);
+    print_step_timing("prove_us", &prove_times);
+    recursive_snark
+}
+
 
 fn fold_fold_fold(selected_function: String,
             circuit_filepath: String,
             witness_gen_filepath: String,
             output_file_path: String,
             input_file_path: String,
-            resolution: String) {
-    type G1 = pasta_curves::pallas::Point;
-    type G2 = pasta_curves::vesta::Point;
-
+            resolution: String,
+            step_timing: bool) {
     println!(
         "Running NOVA with witness generator: {} and group: {}",
         witness_gen_filepath,
@@ -68,19 +509,24 @@ fn fold_fold_fold(selected_function: String,
     }
     let root = current_dir().unwrap();
 
+    let circuit_stem = Path::new(&circuit_filepath).file_stem().and_then(|s| s.to_str()).unwrap_or("circuit").to_string();
     let circuit_file = root.join(circuit_filepath);
     let r1cs = load_r1cs::<G1, G2>(&FileLocation::PathBuf(circuit_file));
     let witness_generator_file = root.join(witness_gen_filepath);
 
-    let mut input_file = File::open(input_file_path.clone()).expect("Failed to open the file");
-    let mut input_file_json_string = String::new();
-    input_file.read_to_string(&mut input_file_json_string).expect("Unable to read from the file");
+    let input = load_input(&input_file_path);
+    println!(
+        "Input load took {:.6}s ({} bytes on disk, {} bytes decoded)",
+        input.load.as_secs_f64(),
+        input.on_disk,
+        input.decoded_bytes()
+    );
     
     let mut private_inputs = Vec::new();
     let mut start_public_input: Vec<F::<G1>> = Vec::new();
 
     if selected_function == "hash" {
-        let input_data: ZKronoInputCrop = serde_json::from_str(&input_file_json_string).expect("Deserialization failed");
+        let input_data: ZKronoInputCrop = parse_input(&input);
         start_public_input.push(F::<G1>::from(0));
         for i in 0..iteration_count {
             let mut private_input = HashMap::new();
@@ -89,7 +535,7 @@ fn fold_fold_fold(selected_function: String,
             private_inputs.push(private_input);
         }
     } else if selected_function == "crop" {
-        let input_data: ZKronoInputCrop = serde_json::from_str(&input_file_json_string).expect("Deserialization failed");
+        let input_data: ZKronoInputCrop = parse_input(&input);
         start_public_input.push(F::<G1>::from(0));
         start_public_input.push(F::<G1>::from(0));
         start_public_input.push(F::<G1>::from(input_data.info));  // x|y|index
@@ -101,7 +547,7 @@ fn fold_fold_fold(selected_function: String,
         }
     }
     else if selected_function == "fixedcrop" {
-        let input_data: ZKronoInputCropOpt = serde_json::from_str(&input_file_json_string).expect("Deserialization failed");
+        let input_data: ZKronoInputCropOpt = parse_input(&input);
         start_public_input.push(F::<G1>::from(0));
         start_public_input.push(F::<G1>::from(0));
         start_public_input.push(F::<G1>::from(0));  // x|y|index
@@ -112,7 +558,7 @@ fn fold_fold_fold(selected_function: String,
             private_inputs.push(private_input);
         }
     } else if selected_function == "resize" {
-        let input_data: ZKronoInput = serde_json::from_str(&input_file_json_string).expect("Deserialization failed");
+        let input_data: ZKronoInput = parse_input(&input);
         iteration_count = 240;
         if resolution == "4K" {
             iteration_count = 1080;
@@ -136,7 +582,7 @@ fn fold_fold_fold(selected_function: String,
         start_public_input.push(F::<G1>::from(0));
         start_public_input.push(F::<G1>::from(0));
         if selected_function == "contrast" {
-            let input_data: ZKronoInputContrast = serde_json::from_str(&input_file_json_string).expect("Deserialization failed");
+            let input_data: ZKronoInputContrast = parse_input(&input);
             start_public_input.push(F::<G1>::from(input_data.factor));  // contrast factor
             for i in 0..iteration_count {
                 let mut private_input = HashMap::new();
@@ -146,7 +592,7 @@ fn fold_fold_fold(selected_function: String,
                 private_inputs.push(private_input);
             }
         } else if selected_function == "brightness" {
-            let input_data: ZKronoInputBrightness = serde_json::from_str(&input_file_json_string).expect("Deserialization failed");
+            let input_data: ZKronoInputBrightness = parse_input(&input);
             start_public_input.push(F::<G1>::from(input_data.factor));  // brightness factor
             for i in 0..iteration_count {
                 let mut private_input = HashMap::new();
@@ -156,7 +602,7 @@ fn fold_fold_fold(selected_function: String,
                 private_inputs.push(private_input);
             }
         } else if selected_function == "blur" || selected_function == "sharpness"  {
-            let input_data: ZKronoInput = serde_json::from_str(&input_file_json_string).expect("Deserialization failed");
+            let input_data: ZKronoInput = parse_input(&input);
             start_public_input.push(F::<G1>::from(0));  // row1 hash
             start_public_input.push(F::<G1>::from(0));  // row2 hash
             for i in 0..iteration_count {
@@ -167,7 +613,7 @@ fn fold_fold_fold(selected_function: String,
                 private_inputs.push(private_input);
             }
         } else {
-            let input_data: ZKronoInput = serde_json::from_str(&input_file_json_string).expect("Deserialization failed");
+            let input_data: ZKronoInput = parse_input(&input);
             for i in 0..iteration_count {
                 let mut private_input = HashMap::new();
                 // private_input.insert("adder".to_string(), json!(i+2));
@@ -213,14 +659,24 @@ fn fold_fold_fold(selected_function: String,
 
     println!("Creating a RecursiveSNARK...");
     let start = Instant::now();
-    let recursive_snark = create_recursive_circuit(
-        FileLocation::PathBuf(witness_generator_file),
-        r1cs,
-        private_inputs,
-        start_public_input.to_vec(),
-        &pp,
-    )
-    .unwrap();
+    let recursive_snark = if step_timing {
+        create_recursive_circuit_timed(
+            &witness_generator_file,
+            r1cs,
+            private_inputs,
+            start_public_input.to_vec(),
+            &pp,
+        )
+    } else {
+        create_recursive_circuit(
+            FileLocation::PathBuf(witness_generator_file),
+            r1cs,
+            private_inputs,
+            start_public_input.to_vec(),
+            &pp,
+        )
+        .unwrap()
+    };
     println!("RecursiveSNARK creation took {:?}", start.elapsed());
 
     // TODO: empty?
@@ -252,25 +708,35 @@ fn fold_fold_fold(selected_function: String,
     let compressed_snark = res.unwrap();
 
     //--- dump data ---//
-    // Create some data to serialize as JSON
-    
-    // Serialize the data to a JSON string
-    let json_string = serde_json::to_string(&compressed_snark).unwrap();
-
-    // Open a file for writing
+    let format = ProofFormat::from_path(&output_file_path);
+    let start = Instant::now();
+    let proof_bytes = serialize_proof(&compressed_snark, format);
+    let serialize_time = start.elapsed();
+    let start = Instant::now();
     let mut file = File::create(output_file_path.clone()).expect("Unable to create the file");
+    file.write_all(&proof_bytes).expect("Unable to write to the file");
+    let write_time = start.elapsed();
 
-    // Write the JSON string to the file
-    file.write_all(json_string.as_bytes()).expect("Unable to write to the file");
-
-    println!("Data has been written to output.json");
+    println!("Proof has been written to {}", output_file_path);
+    print_proof_io("serialization", format, proof_bytes.len(), serialize_time);
+    print_proof_io("write", format, proof_bytes.len(), write_time);
+    let public = PublicInputs {
+        iteration_count,
+        z0_primary: start_public_input.to_vec(),
+        z0_secondary: z0_secondary.to_vec(),
+    };
+    write_verifier_artifacts(&output_file_path, &circuit_stem, format, &vk, &public);
 
     println!("-------------- Load Data --------");
-    let mut file = File::open(output_file_path.clone()).expect("Unable to open the file");
-    let mut json_string = String::new();
-    file.read_to_string(&mut json_string).expect("Unable to read from the file");
-    
-    let compressed_snark2: CompressedSNARK<_, _, _, _, _, _> = serde_json::from_str(&json_string).expect("Deserialization failed");
+    let start = Instant::now();
+    let proof_bytes = std::fs::read(&output_file_path).expect("Unable to read from the file");
+    let read_time = start.elapsed();
+    let format = ProofFormat::detect(&output_file_path, &proof_bytes);
+    let start = Instant::now();
+    let compressed_snark2: CompressedSNARK<_, _, _, _, _, _> = deserialize_proof(&proof_bytes, format);
+    let deserialize_time = start.elapsed();
+    print_proof_io("read", format, proof_bytes.len(), read_time);
+    print_proof_io("deserialization", format, proof_bytes.len(), deserialize_time);
 
     // verify the compressed SNARK
     println!("Verifying a CompressedSNARK...");
@@ -296,7 +762,7 @@ fn main() {
         .about("Prove the truthfulness of your media! \n The naming rationale: Verifiable Image Manipulation based on ZKP. \n Pronunciation: /ˈwɪmzi/, just like whimsy :D")
         .arg(
             Arg::with_name("input")
-            .required(true)
+            .required_unless("verify")
             .short("i")
             .long("input")
             .value_name("FILE")
@@ -305,16 +771,16 @@ fn main() {
         )
         .arg(
             Arg::with_name("output")
-            .required(true)
+            .required_unless("verify")
             .short("o")
             .long("output")
             .value_name("FILE")
-            .help("This file will contain the final Proof to be verified by others.")
+            .help("This file will contain the final Proof to be verified by others (.bin or .bincode: bincode, otherwise JSON).")
             .takes_value(true)
         )
         .arg(
             Arg::with_name("circuit")
-            .required(true)
+            .required_unless("verify")
             .short("c")
             .long("circuit")
             .value_name("R1CS FILE")
@@ -323,7 +789,7 @@ fn main() {
         )
         .arg(
             Arg::with_name("witnessgenerator")
-            .required(true)
+            .required_unless("verify")
             .short("w")
             .long("witnessgenerator")
             .value_name("BINARY/WASM FILE")
@@ -332,7 +798,7 @@ fn main() {
         )
         .arg(
             Arg::with_name("function")
-            .required(true)
+            .required_unless("verify")
             .short("f")
             .long("function")
             .value_name("FUNCTION")
@@ -342,7 +808,7 @@ fn main() {
         )
         .arg(
             Arg::with_name("resolution")
-            .required(true)
+            .required_unless("verify")
             .short("r")
             .long("resolution")
             .value_name("RESOLUTION")
@@ -350,14 +816,47 @@ fn main() {
             .takes_value(true)
             .possible_values(&["SD", "HD", "FHD", "4K", "8K"])
         )
+        .arg(
+            Arg::with_name("steptiming")
+            .long("step-timing")
+            .help("Print witness generation and folding time for every step (binary witness generators only).")
+        )
+        .arg(
+            Arg::with_name("verify")
+            .long("verify")
+            .value_name("PROOF DIR")
+            .help("Verify-only mode: verify every *_proof.json / *_proof.bin in the directory with its *_public.json.")
+            .takes_value(true)
+        )
+        .arg(
+            Arg::with_name("vk")
+            .long("vk")
+            .value_name("FILE")
+            .help("Verifier key for --verify (default: the *_vk.{json,bin,bincode} in the proof directory matching each proof's encoding).")
+            .takes_value(true)
+        )
+        .arg(
+            Arg::with_name("workers")
+            .long("workers")
+            .value_name("N")
+            .help("Concurrent verification workers for --verify (default: 1).")
+            .takes_value(true)
+        )
         .get_matches();
 
+    if let Some(proof_dir) = matches.value_of("verify") {
+        let workers = matches.value_of("workers").map_or(1, |n| n.parse().expect("--workers must be a number"));
+        verify_dir(proof_dir, matches.value_of("vk"), workers);
+        return;
+    }
+
     let witness_gen_filepath = matches.value_of("witnessgenerator").unwrap();
     let circuit_filepath = matches.value_of("circuit").unwrap();
     let output_filepath = matches.value_of("output").unwrap();
     let input_filepath = matches.value_of("input").unwrap();
     let selected_function = matches.value_of("function").unwrap();
     let resolution = matches.value_of("resolution").unwrap();
+    let step_timing = matches.is_present("steptiming");
 
     println!(" ________________________________________________________");
     println!("                                                         ");
@@ -381,6 +880,7 @@ fn main() {
                 witness_gen_filepath.to_string(),
                 output_filepath.to_string(),
                 input_filepath.to_string(),
-                resolution.to_string()
+                resolution.to_string(),
+                step_timing
             );
 }
\ No newline at end of file
@@ -1,16 +1,46 @@
-import tkinter as tk
-from tkinter import filedialog
+"""
+VIMz image formatter.
+
+Library usage (headless, no GUI or plotting imports):
+    from image_formatter import compress, blur_array, build_transformation
+
+Command line (non-interactive):
+    python3 image_formatter.py -i image.png -t brightness --factor 1.4 -o out.json
+    python3 image_formatter.py -i image.png -t crop --crop-x 236 --crop-y 105 --crop-size SD
+
+Without --transform the original interactive flow is used (Tk file dialog when
+no --input is given, then prompts). tkinter and matplotlib are only imported
+when the dialog or --show is used.
+"""
+
+import argparse
 import json
+import sys
+from pathlib import Path
 from PIL import Image
 import numpy as np
-import matplotlib.pyplot as plt
-import math
 
 
 VESTA_PRIME = 28948022309329048855892746252171976963363056481941647379679742748393362948097
 
+TRANSFORMS = ['crop', 'resize', 'grayscale', 'brightness', 'contrast', 'sharpen', 'blur']
+
+CROP_SIZES = {
+    'SD': (640, 480),     # (width, height)
+    'HD': (1280, 720),
+    'FHD': (1920, 1080),
+}
+
+RESIZE_TARGETS = {
+    'HD-SD': (480, 640),      # (height, width)
+    '4K-FHD': (1080, 1920),
+}
+
 
 def get_image_path():
+    import tkinter as tk
+    from tkinter import filedialog
+
     root = tk.Tk()
     root.withdraw()
     file_path = filedialog.askopenfilename()
@@ -25,12 +55,12 @@ def plot_images_side_by_side_auto_size(np_image1, np_image2):
     Args:
     np_image1 (numpy.ndarray): The first input image as a NumPy array.
     np_image2 (numpy.ndarray): The second input image as a NumPy array.
-    title1 (str): The title for the first subfigure.
-    title2 (str): The title for the second subfigure.
 
     Returns:
     None
     """
+    import matplotlib.pyplot as plt
+
     height1, width1 = np_image1.shape[:2]
     height2, width2 = np_image2.shape[:2]
 
@@ -78,6 +108,11 @@ def compress(image_in):
     return output_array
 
 
+def compressed_zeros(image_np):
+    """One compressed row of zeros, used to pad the original for 3x3 kernels."""
+    return [["0x00"] * (len(image_np[0]) // 10)]
+
+
 def conv2d(array, kernel, weight=1):
     # Get the dimensions of the input array and kernel
     array_height, array_width = len(array), len(array[0])
@@ -89,7 +124,7 @@ def conv2d(array, kernel, weight=1):
     for i in range(array_height):
         for j in range(array_width):
             extended[i+border_size][j+border_size] = array[i][j]
-    
+
     # Initialize the output (convolved) array
     convolved_array = [[0 for _ in range(array_width)] for _ in range(array_height)]
 
@@ -110,266 +145,376 @@ def conv2d(array, kernel, weight=1):
     return convolved_array
 
 
-def sharppen_image(image_path):
+# ---------------------------------------------------------------------------
+# Array transforms (headless library API)
+# ---------------------------------------------------------------------------
+
+def sharpen_array(image_np):
     kernel = np.array([
         [0, -1, 0],
         [-1, 5, -1],
         [0, -1, 0]
     ])
-    with Image.open(image_path) as image:
-        image_np = np.array(image)
-        r_channel, g_channel, b_channel = np.rollaxis(image_np, axis=-1)
-        r_adjusted = conv2d(r_channel, kernel)
-        g_adjusted = conv2d(g_channel, kernel)
-        b_adjusted = conv2d(b_channel, kernel)
-        adjusted_image = np.dstack((r_adjusted, g_adjusted, b_adjusted))
-        plot_images_side_by_side_auto_size(np.array(image), adjusted_image)
-
-        return compress(adjusted_image), [["0x00"] * (len(image_np[0]) // 10)]
+    r_channel, g_channel, b_channel = np.rollaxis(image_np, axis=-1)
+    r_adjusted = conv2d(r_channel, kernel)
+    g_adjusted = conv2d(g_channel, kernel)
+    b_adjusted = conv2d(b_channel, kernel)
+    return np.dstack((r_adjusted, g_adjusted, b_adjusted))
 
 
-def blur_image(image_path):
+def blur_array(image_np):
     kernel = np.array([
         [1, 1, 1],
         [1, 1, 1],
         [1, 1, 1]
     ])
-    with Image.open(image_path) as image:
-        image_np = np.array(image)
-        r_channel, g_channel, b_channel = np.rollaxis(image_np, axis=-1)
+    r_channel, g_channel, b_channel = np.rollaxis(image_np, axis=-1)
+    r_adjusted = conv2d(r_channel, kernel, 9)
+    g_adjusted = conv2d(g_channel, kernel, 9)
+    b_adjusted = conv2d(b_channel, kernel, 9)
+    return np.dstack((r_adjusted, g_adjusted, b_adjusted))
+
+
+def grayscale_array(image):
+    """Grayscale via PIL convert('L'); accepts a PIL image or an RGB array."""
+    if not isinstance(image, Image.Image):
+        image = Image.fromarray(np.asarray(image, dtype=np.uint8))
+    return np.array(image.convert('L'))
+
+
+# Point operations map every uint8 value independently, so they are applied
+# as a 256-entry lookup table computed with the exact float expression of the
+# original per-pixel code (same truncation and clipping), then one gather.
 
-        r_adjusted = conv2d(r_channel, kernel, 9)
-        g_adjusted = conv2d(g_channel, kernel, 9)
-        b_adjusted = conv2d(b_channel, kernel, 9)
-        adjusted_image = np.dstack((r_adjusted, g_adjusted, b_adjusted))
-        plot_images_side_by_side_auto_size(np.array(image), adjusted_image)
+def brightness_lut(brightness_factor):
+    """Table for clip(v * factor, 0, 255) truncated to uint8."""
+    values = np.arange(256, dtype=np.uint8).astype(float) * brightness_factor
+    return np.clip(values, 0, 255).astype(np.uint8)
 
-        return compress(adjusted_image), [["0x00"] * (len(image_np[0]) // 10)]
 
+def contrast_lut(desired_contrast):
+    """Table for clip((v - 128) * factor + 128, 0, 255) truncated to uint8."""
+    # r_mean = int(np.mean(r_channel) *1000)
+    mean = int(128 *1000)
+    values = np.arange(256, dtype=np.uint8)
+    return ((values - float(mean) / 1000) * desired_contrast + float(mean) / 1000).clip(0, 255).astype(np.uint8)
 
 
+def apply_lut(image_np, lut):
+    """Apply a 256-entry lookup table to a uint8 image with a single gather."""
+    return lut[np.asarray(image_np, dtype=np.uint8)]
 
 
-def convert_to_grayscale(image_path):
+def contrast_array(image_np, desired_contrast):
+    return apply_lut(image_np, contrast_lut(desired_contrast))
+
+
+def brightness_array(image_np, brightness_factor):
+    return apply_lut(image_np, brightness_lut(brightness_factor))
+
+
+# Factor sweeps of the brightness/contrast converters: one input per factor.
+# compressed_io lives at the repository root, which the converters put on sys.path.
+
+def factor_output_path(output, factor):
+    """Output path for one factor of a sweep: <stem>_f<factor><suffix>."""
+    from compressed_io import split_name
+    stem, suffix = split_name(output)
+    return Path(output).with_name(f"{stem}_f{factor:g}{suffix or '.json'}")
+
+
+def write_factor_outputs(original_field, image_np, factors, output, transform, profiler):
+    """
+    Write one JSON per factor, serializing the original only once.
+
+    transform(image_np, factor, profiler) returns the compressed "transformed" rows.
+    The "original" block (or its "original_ref") is dumped once and joined with
+    the per-factor fields, so each file is byte-identical to a single-factor run.
+    A single factor is written to output itself.
+    """
+    from compressed_io import open_text
+    with profiler.stage('serialize'):
+        head = json.dumps(original_field, indent=4)[:-2]
+
+    written = []
+    for factor in factors:
+        fields = {
+            "transformed": transform(image_np, factor, profiler),
+            "factor": int(factor * 10)  # Store as integer (* 10 to match expected format)
+        }
+        with profiler.stage('serialize'):
+            tail = json.dumps(fields, indent=4)[1:]
+
+        path = Path(output) if len(factors) == 1 else factor_output_path(output, factor)
+        with profiler.stage('write'):
+            with open_text(path, 'w') as f:
+                f.write(head)
+                f.write(',')
+                f.write(tail)
+        written.append((path, fields))
+    return written
+
+
+def crop_array(image_np, x: int, y: int, new_width: int, new_height: int):
+    return image_np[y:y+new_height, x:x+new_width]
+
+
+def resize_array(img_array, new_height: int, new_width: int):
+    # Get the dimensions of the original image
+    height, width, channels = img_array.shape
+
+    x_ratio = float(width) / float(new_width)
+    y_ratio = float(height) / float(new_height)
+
+    # Initialize the new image array
+    new_img_array = np.zeros((new_height, new_width, channels), dtype=np.uint8)
+
+    if height == 720:
+        # Perform bilinear interpolation
+        for i in range(new_height):
+            for j in range(new_width):
+                x_l = int(j * x_ratio)
+                x_h = int(j * x_ratio) + 1
+                y_l = int(i * y_ratio)
+                y_h = int(i * y_ratio) + 1
+
+                a = img_array[y_l, x_l]
+                b = img_array[y_l, x_h]
+                c = img_array[y_h, x_l]
+                d = img_array[y_h, x_h]
+
+                weight = 2 if i % 2 == 0 else 1
+                weight = float(weight) / 3
+                summ = a * weight + b * weight \
+                    + c * (1 - weight) + d * (1 - weight)
+                new_img_array[i, j] = summ / 2
+    else:
+        # Perform bilinear interpolation
+        for i in range(new_height):
+            for j in range(new_width):
+                x_l = int(j * x_ratio)
+                x_h = int(j * x_ratio) + 1
+                y_l = int(i * y_ratio)
+                y_h = int(i * y_ratio) + 1
+
+                a = img_array[y_l, x_l]
+                b = img_array[y_l, x_h]
+                c = img_array[y_h, x_l]
+                d = img_array[y_h, x_h]
+
+                weight = float(1) / 2
+                summ = a * weight + b * weight + c * weight + d * weight
+                new_img_array[i, j] = summ / 2
+
+    return new_img_array
+
+
+# ---------------------------------------------------------------------------
+# Path-based helpers (plot only when show=True)
+# ---------------------------------------------------------------------------
+
+def sharppen_image(image_path, show=False):
     with Image.open(image_path) as image:
-        grayscale_image = image.convert('L')
-        plot_images_side_by_side_auto_size(np.array(image), np.array(grayscale_image))
-        return compress(grayscale_image)
+        image_np = np.array(image)
+    adjusted_image = sharpen_array(image_np)
+    if show:
+        plot_images_side_by_side_auto_size(image_np, adjusted_image)
+    return compress(adjusted_image), compressed_zeros(image_np)
 
 
-def adjust_contrast(image_path, desired_contrast):
+def blur_image(image_path, show=False):
     with Image.open(image_path) as image:
         image_np = np.array(image)
-        r_channel, g_channel, b_channel = np.rollaxis(image_np, axis=-1)
-        # r_mean = int(np.mean(r_channel) *1000)
-        # b_mean = int(np.mean(b_channel) *1000)
-        # g_mean = int(np.mean(b_channel) *1000)
-        r_mean = int(128 *1000)
-        b_mean = int(128 *1000)
-        g_mean = int(128 *1000)
-        r_adjusted = ((r_channel - float(r_mean) / 1000) * desired_contrast + float(r_mean) / 1000).clip(0, 255).astype(np.uint8)
-        g_adjusted = ((g_channel - float(g_mean) / 1000) * desired_contrast + float(g_mean) / 1000).clip(0, 255).astype(np.uint8)
-        b_adjusted = ((b_channel - float(b_mean) / 1000) * desired_contrast + float(b_mean) / 1000).clip(0, 255).astype(np.uint8)
-        adjusted_image = np.dstack((r_adjusted, g_adjusted, b_adjusted))
-        
+    adjusted_image = blur_array(image_np)
+    if show:
         plot_images_side_by_side_auto_size(image_np, adjusted_image)
-        return compress(adjusted_image)
+    return compress(adjusted_image), compressed_zeros(image_np)
+
+
+def convert_to_grayscale(image_path, show=False):
+    with Image.open(image_path) as image:
+        grayscale_np = grayscale_array(image)
+        if show:
+            plot_images_side_by_side_auto_size(np.array(image), grayscale_np)
+    return compress(grayscale_np)
+
+
+def adjust_contrast(image_path, desired_contrast, show=False):
+    with Image.open(image_path) as image:
+        image_np = np.array(image)
+    adjusted_image = contrast_array(image_np, desired_contrast)
+    if show:
+        plot_images_side_by_side_auto_size(image_np, adjusted_image)
+    return compress(adjusted_image)
 
 
 def compress_image(image_path):
     with Image.open(image_path) as image:
         return compress(image)
-    
 
-def adjust_brightness(np_image, brightness_factor):
+
+def adjust_brightness(image_path, brightness_factor, show=False):
     with Image.open(image_path) as image:
         image_np = np.array(image)
-        np_image_float = image_np.astype(float)
-        adjusted_image_float = np_image_float * brightness_factor
-        adjusted_image = np.clip(adjusted_image_float, 0, 255).astype(np.uint8)
-
+    adjusted_image = brightness_array(image_np, brightness_factor)
+    if show:
         plot_images_side_by_side_auto_size(image_np, adjusted_image)
-    
-        return compress(adjusted_image)
-    
+    return compress(adjusted_image)
+
 
-def crop_image(image_path, x: int, y:int, new_width: int, new_height:int):
+def crop_image(image_path, x: int, y:int, new_width: int, new_height:int, show=False):
     with Image.open(image_path) as image:
         image_np = np.array(image)
-        adjusted_image = image_np[y:y+new_height, x:x+new_width]
-        # adjusted_image = [[image_np[i][j] for j in range(x, x+new_width)] for i in range(y, y+new_height)]
+    adjusted_image = crop_array(image_np, x, y, new_width, new_height)
+    if show:
         plot_images_side_by_side_auto_size(image_np, adjusted_image)
-    
-        return compress(adjusted_image)
-    
+    return compress(adjusted_image)
 
-def resize_image(image_path, new_height:int, new_width: int):
-    with Image.open(image_path) as image:
-        # image_np = np.array(image)
-        # adjusted_image = image.resize((new_width, new_height), resample=Image.Resampling.BILINEAR)
-        # adjusted_image_np = np.array(adjusted_image)
 
-        # adjusted_image = [[image_np[i][j] for j in range(x, x+new_width)] for i in range(y, y+new_height)]
-        
+def resize_image(image_path, new_height:int, new_width: int, show=False):
+    with Image.open(image_path) as image:
         img_array = np.array(image)
-
-        # Get the dimensions of the original image
-        height, width, channels = img_array.shape
-        
-        # Calculate the scaling factors for each dimension
-        # scale_y = (new_height - 1) / (height - 1)
-        # scale_x = (new_width - 1) / (width - 1)
-
-        x_ratio = float(width) / float(new_width)
-        y_ratio = float(height) / float(new_height)
-
-        # Initialize the new image array
-        new_img_array = np.zeros((new_height, new_width, channels), dtype=np.uint8)
-
-        if height == 720:
-            # Perform bilinear interpolation
-            for i in range(new_height):
-                for j in range(new_width):
-                    x_l = int(j * x_ratio)
-                    x_h = int(j * x_ratio) + 1
-                    y_l = int(i * y_ratio)
-                    y_h = int(i * y_ratio) + 1
-                    
-                    a = img_array[y_l, x_l]
-                    b = img_array[y_l, x_h]
-                    c = img_array[y_h, x_l]
-                    d = img_array[y_h, x_h]
-
-                    weight = 2 if i % 2 == 0 else 1
-                    weight = float(weight) / 3
-                    summ = a * weight + b * weight \
-                        + c * (1 - weight) + d * (1 - weight)
-                    new_img_array[i, j] = summ / 2
-        else:
-            # Perform bilinear interpolation
-            for i in range(new_height):
-                for j in range(new_width):
-                    x_l = int(j * x_ratio)
-                    x_h = int(j * x_ratio) + 1
-                    y_l = int(i * y_ratio)
-                    y_h = int(i * y_ratio) + 1
-                    
-                    a = img_array[y_l, x_l]
-                    b = img_array[y_l, x_h]
-                    c = img_array[y_h, x_l]
-                    d = img_array[y_h, x_h]
-
-                    weight = float(1) / 2
-                    summ = a * weight + b * weight + c * weight + d * weight
-                    new_img_array[i, j] = summ / 2
-
+    new_img_array = resize_array(img_array, new_height, new_width)
+    if show:
         plot_images_side_by_side_auto_size(img_array, new_img_array)
-
-        return compress(new_img_array)
+    return compress(new_img_array)
 
 
-# Get the image path using Tkinter file dialog
-image_path = get_image_path()
+def build_transformation(image_path, transform, factor=1.0, x=0, y=0,
+                         crop_size='SD', resize='HD-SD', show=False):
+    """
+    Build the VIMz input for one transformation.
 
-if image_path:
-    # Example usage
-    
-    # Crop the image and save it
-    compressed_original_image = compress_image(image_path)
+    Returns:
+        Dict with "original" plus the transform-specific fields
+        ("transformed", "info" or "factor").
+    """
     out = {
-        "original": compressed_original_image,
+        "original": compress_image(image_path),
     }
-    print("Image compressed successfully.")
-    cmd = int(input("Enter your command (default[1]): 1) crop, 2) resize, 3) greyscale, 4) brightness,"
-                    " 5) contrast, 6) sharpen, 7) blur: ") or "1")
-    
-    if cmd == 1:
-        output_path = 'transformation_crop.json'  # Path to save the cropped image
-        x = int(input("Enter x coordination:"))
-        y = int(input("Enter y coordination:"))
-        crop_size = int(input("Enter crop_size: 1) SD, 2) HD, 3) FHD: "))
-        if crop_size == 1:
-            w = 640
-            h = 480
-        elif crop_size == 2:
-            w = 1280
-            h = 720
-        elif crop_size == 3:
-            w = 1920
-            h = 1080
-        else:
-            print("The entered command was wrong. It should an Integer from 1 to 3.")
-            exit()
-        compressed_transformed_image = crop_image(image_path, x, y, w, h)
-        print("Applied CROP filter successfully.")
 
+    if transform == 'crop':
+        w, h = CROP_SIZES[crop_size]
+        crop_image(image_path, x, y, w, h, show=show)
         out["info"] = x * 2**24 + y * 2**12
 
-    elif cmd == 2:
-        output_path = 'transformation_resize.json'  # Path to save the resized image
-        new_size = int(input("Enter resize: 1) HD --> SD, 2) 4K --> FHD: "))
-        if new_size == 1:
-            w = 640
-            h = 480
-        elif new_size == 2:
-            w = 1920
-            h = 1080
-        else:
-            print("The entered command was wrong. It should an Integer from 1 to 2.")
-        compressed_transformed_image = resize_image(image_path, h, w)
-        print("Applied RESIZE filter successfully.")
+    elif transform == 'resize':
+        h, w = RESIZE_TARGETS[resize]
+        out["transformed"] = resize_image(image_path, h, w, show=show)
 
-        out["transformed"] = compressed_transformed_image
+    elif transform == 'grayscale':
+        out["transformed"] = convert_to_grayscale(image_path, show=show)
 
-    elif cmd == 3:
-        output_path = 'transformation_greyscale.json'  # Path to save the cropped image
-        compressed_transformed_image = convert_to_grayscale(image_path)
-        print("Applied GREYSCALE filter successfully.")
+    elif transform == 'brightness':
+        out["transformed"] = adjust_brightness(image_path, factor, show=show)
+        out["factor"] = int(factor * 10)
 
-        out["transformed"] = compressed_transformed_image
+    elif transform == 'contrast':
+        out["transformed"] = adjust_contrast(image_path, factor, show=show)
+        out["factor"] = int(factor * 10)
 
+    elif transform == 'sharpen':
+        compressed_transformed_image, zeros = sharppen_image(image_path, show=show)
+        out["transformed"] = compressed_transformed_image
+        out["original"] = zeros + out["original"] + zeros
 
-    elif cmd == 4:
-        output_path = 'transformation_brightness.json'  # Path to save the cropped image
-        desired_brightness = float(input("Enter desired brightness factor (1.00 = no effect):"))
-        compressed_transformed_image = adjust_brightness(image_path, desired_brightness)
-        print("Applied BRIGHTNESS filter successfully.")
-        
+    elif transform == 'blur':
+        compressed_transformed_image, zeros = blur_image(image_path, show=show)
         out["transformed"] = compressed_transformed_image
-        out["factor"] = int(desired_brightness * 10)
+        out["original"] = zeros + out["original"] + zeros
 
+    else:
+        raise ValueError(f"Unknown transform: {transform}")
 
-    elif cmd == 5:
-        output_path = 'transformation_contrast.json'  # Path to save the cropped image
-        desired_contrast = float(input("Enter desired contrast (1.00 = no effect):"))
-        compressed_transformed_image = adjust_contrast(image_path, desired_contrast)
-        print("Applied CONTRAST filter successfully.")
-        
-        out["transformed"] = compressed_transformed_image
-        out["factor"] = int(desired_contrast*10)
+    return out
 
-    elif cmd == 6:
-        output_path = 'transformation_sharpen.json'  # Path to save the cropped image
-        compressed_transformed_image, compressed_zeros = sharppen_image(image_path)
-        print("Applied SHARPNESS filter successfully.")
-        
-        out["transformed"] = compressed_transformed_image
-        out["original"] = compressed_zeros + out["original"] + compressed_zeros
 
-    elif cmd == 7:
-        output_path = 'transformation_blur.json'  # Path to save the cropped image
-        compressed_transformed_image, compressed_zeros = blur_image(image_path)
-        print("Applied BLUR filter successfully.")
-        
-        out["transformed"] = compressed_transformed_image
-        out["original"] = compressed_zeros + out["original"] + compressed_zeros
+def default_output_path(transform):
+    name = 'greyscale' if transform == 'grayscale' else transform
+    return f'transformation_{name}.json'
 
-    else:
+
+def prompt_transformation():
+    """Ask for the transformation and its parameters (original interactive flow)."""
+    cmd = int(input("Enter your command (default[1]): 1) crop, 2) resize, 3) greyscale, 4) brightness,"
+                    " 5) contrast, 6) sharpen, 7) blur: ") or "1")
+    if cmd < 1 or cmd > 7:
         print("The entered command was wrong. It should an Integer from 1 to 7.")
-        exit()
-    
+        sys.exit(1)
+    transform = TRANSFORMS[cmd - 1]
+    params = {}
+
+    if transform == 'crop':
+        params['x'] = int(input("Enter x coordination:"))
+        params['y'] = int(input("Enter y coordination:"))
+        crop_size = int(input("Enter crop_size: 1) SD, 2) HD, 3) FHD: "))
+        if crop_size not in (1, 2, 3):
+            print("The entered command was wrong. It should an Integer from 1 to 3.")
+            sys.exit(1)
+        params['crop_size'] = ['SD', 'HD', 'FHD'][crop_size - 1]
+    elif transform == 'resize':
+        new_size = int(input("Enter resize: 1) HD --> SD, 2) 4K --> FHD: "))
+        if new_size not in (1, 2):
+            print("The entered command was wrong. It should an Integer from 1 to 2.")
+            sys.exit(1)
+        params['resize'] = ['HD-SD', '4K-FHD'][new_size - 1]
+    elif transform == 'brightness':
+        params['factor'] = float(input("Enter desired brightness factor (1.00 = no effect):"))
+    elif transform == 'contrast':
+        params['factor'] = float(input("Enter desired contrast (1.00 = no effect):"))
+
+    return transform, params
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Convert an image to a VIMz transformation JSON'
+    )
+    parser.add_argument('--input', '-i', help='Input image file (default: file dialog)')
+    parser.add_argument('--output', '-o', help='Output JSON file (default: transformation_<name>.json)')
+    parser.add_argument('--transform', '-t', choices=TRANSFORMS,
+                        help='Transformation to apply (default: interactive prompt)')
+    parser.add_argument('--factor', '-f', type=float, default=1.0,
+                        help='Brightness/contrast factor (default: 1.0)')
+    parser.add_argument('--crop-x', type=int, default=0, help='Crop X coordinate (default: 0)')
+    parser.add_argument('--crop-y', type=int, default=0, help='Crop Y coordinate (default: 0)')
+    parser.add_argument('--crop-size', choices=list(CROP_SIZES), default='SD',
+                        help='Crop size (default: SD)')
+    parser.add_argument('--resize', choices=list(RESIZE_TARGETS), default='HD-SD',
+                        help='Resize mode (default: HD-SD)')
+    parser.add_argument('--show', action='store_true',
+                        help='Plot the original and transformed images (needs matplotlib)')
+
+    args = parser.parse_args()
+
+    # Get the image path using Tkinter file dialog
+    image_path = args.input or get_image_path()
+    if not image_path:
+        print("No image selected.")
+        return
+
+    if args.transform:
+        transform = args.transform
+        params = {
+            'factor': args.factor,
+            'x': args.crop_x,
+            'y': args.crop_y,
+            'crop_size': args.crop_size,
+            'resize': args.resize,
+        }
+        show = args.show
+    else:
+        transform, params = prompt_transformation()
+        show = True
+
+    out = build_transformation(image_path, transform, show=show, **params)
+    print(f"Applied {transform.upper()} filter successfully.")
+
+    output_path = args.output or default_output_path(transform)
     with open(output_path, 'w') as fp:
         json.dump(out, fp, indent=4)
     print("Image data dumped successfully.")
-else:
-    print("No image selected.")
+
+
+if __name__ == '__main__':
+    main()